@@ -5,176 +5,306 @@ Caches responses for frequently accessed endpoints like:
 - Personas list
 - Models list
 - Static configuration data
+
+Entries are Redis hashes holding the raw body bytes next to a small JSON
+metadata blob (status, headers, ETag), so nothing is re-encoded. Misses
+that will be cached are held until their body is complete, so the first
+response already carries the ETag; other responses stream through;
+concurrent misses for one key share a single upstream call; entries past
+their TTL are served stale for a grace window while one background
+request refreshes them.
 """
+import asyncio
 import hashlib
 import json
 import time
-from typing import Optional, Dict, Any
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.datastructures import Headers
+from typing import Any, Dict, List, Optional, Tuple
 
-from app.shared.redis_client import redis_client
+from app.shared.redis_client import async_redis_client
+from app.shared.jwt_verification_cache import verify_supabase_token
 from app.shared.logging import logger
 
+# Vary rules: cache one copy per authenticated principal, or one for everybody
+VARY_PRINCIPAL = "principal"
+VARY_PUBLIC = "public"
+
+# Headers never replayed from the cache
+_HOP_HEADERS = {b"content-length", b"date", b"transfer-encoding", b"connection", b"etag"}
+
+# (meta, body) for a cached response
+CacheEntry = Tuple[Dict[str, Any], bytes]
+
 
-class CacheMiddleware(BaseHTTPMiddleware):
+class CacheMiddleware:
     """
     Response caching middleware for gateway
-    
+
     Features:
     - Selective endpoint caching
-    - User-specific cache keys
-    - Configurable TTLs
+    - Per-principal or shared cache entries (vary rules)
+    - ETag / If-None-Match revalidation
+    - Request coalescing and stale-while-revalidate
     - Cache invalidation support
     """
-    
-    # Endpoints to cache with TTL in seconds
+
+    # Endpoints to cache: (TTL in seconds, vary rule)
     CACHEABLE_ENDPOINTS = {
-        "/api/v1/chat/personas": 300,       # 5 minutes
-        "/api/v1/models": 600,              # 10 minutes
-        "/api/v1/chat/models": 600,         # 10 minutes
-        "/api/v1/auth/validate": 60,        # 1 minute
-        "/health": 10,                      # 10 seconds
-        "/api/v1/chat/status": 30,          # 30 seconds
+        "/api/v1/chat/personas": (300, VARY_PRINCIPAL),     # 5 minutes
+        "/api/v1/models": (600, VARY_PRINCIPAL),            # 10 minutes
+        "/api/v1/chat/models": (600, VARY_PRINCIPAL),       # 10 minutes
+        "/api/v1/auth/validate": (60, VARY_PRINCIPAL),      # 1 minute
+        "/health": (10, VARY_PUBLIC),                       # 10 seconds
+        "/api/v1/chat/status": (30, VARY_PRINCIPAL),        # 30 seconds
     }
-    
+
+    # How long past its TTL an entry may be served while it is refreshed
+    STALE_WHILE_REVALIDATE_S = 30
+
+    cache_prefix = "gateway:cache:"
+
     def __init__(self, app):
-        super().__init__(app)
-        self.redis = redis_client
-        self.cache_prefix = "gateway:cache:"
-    
-    def _should_cache(self, path: str, method: str) -> Optional[int]:
-        """Check if endpoint should be cached and return TTL"""
+        self.app = app
+        self.redis = async_redis_client
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._revalidating: set = set()
+
+    def _should_cache(self, path: str, method: str) -> Optional[Tuple[int, str]]:
+        """Check if endpoint should be cached and return (TTL, vary rule)"""
         if method != "GET":
             return None
-            
-        for endpoint, ttl in self.CACHEABLE_ENDPOINTS.items():
+
+        for endpoint, rule in self.CACHEABLE_ENDPOINTS.items():
             if path.startswith(endpoint):
-                return ttl
+                return rule
         return None
-    
-    def _get_cache_key(self, request: Request) -> str:
-        """Generate cache key based on request properties"""
-        # Include user identity in cache key
-        auth_header = request.headers.get("authorization", "")
-        api_key = request.headers.get("x-api-key", "")
-        
-        # Create unique key components
-        components = [
-            self.cache_prefix,
-            request.url.path,
-            str(dict(request.query_params)),
-            auth_header[:20] if auth_header else "",  # First 20 chars
-            api_key[:20] if api_key else "",          # First 20 chars
-        ]
-        
-        # Hash for consistent length
-        key_string = ":".join(components)
+
+    async def _resolve_principal(self, headers: Dict[bytes, bytes]) -> Optional[str]:
+        """
+        Identify who the response is for.
+
+        Returns None when the credentials cannot be verified here; such
+        requests bypass the cache and the endpoint produces its own error.
+        """
+        authorization = headers.get(b"authorization", b"").decode("latin-1")
+        if authorization.lower().startswith("bearer "):
+            try:
+                claims = await verify_supabase_token(authorization[7:].strip())
+            except Exception:
+                return None
+            return f"user:{claims.get('sub')}"
+
+        api_key = headers.get(b"x-api-key", b"").decode("latin-1")
+        if api_key:
+            return f"apikey:{hashlib.sha256(api_key.encode()).hexdigest()[:32]}"
+        return "anonymous"
+
+    def _get_cache_key(self, path: str, query_string: bytes, principal: str) -> str:
+        """Generate cache key from the request path, query and principal"""
+        key_string = ":".join([path, query_string.decode("latin-1"), principal])
         key_hash = hashlib.sha256(key_string.encode()).hexdigest()[:32]
-        
-        return f"{self.cache_prefix}{request.url.path}:{key_hash}"
-    
-    async def dispatch(self, request: Request, call_next):
+        return f"{self.cache_prefix}{path}:{key_hash}"
+
+    async def __call__(self, scope, receive, send):
         """Process request with caching logic"""
-        
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
         # Check if endpoint should be cached
-        ttl = self._should_cache(request.url.path, request.method)
-        if not ttl:
-            return await call_next(request)
-        
-        # Generate cache key
-        cache_key = self._get_cache_key(request)
-        
+        rule = self._should_cache(scope["path"], scope["method"])
+        if not rule:
+            return await self.app(scope, receive, send)
+        ttl, vary = rule
+
+        headers = dict(scope.get("headers") or [])
+        principal = "*" if vary == VARY_PUBLIC else await self._resolve_principal(headers)
+        if principal is None:
+            return await self.app(scope, receive, send)
+        cache_key = self._get_cache_key(scope["path"], scope.get("query_string", b""), principal)
+        if_none_match = headers.get(b"if-none-match", b"").decode("latin-1")
+
         # Try to get from cache
+        entry = await self._read(cache_key)
+        if entry:
+            meta, body = entry
+            age = time.time() - meta["stored_at"]
+            if age < ttl + self.STALE_WHILE_REVALIDATE_S:
+                stale = age >= ttl
+                if stale:
+                    self._schedule_revalidation(scope, cache_key, ttl)
+                logger.debug(f"Cache {'STALE' if stale else 'HIT'} for {scope['path']}")
+                return await self._send_cached(send, meta, body, if_none_match, "STALE" if stale else "HIT", ttl)
+
+        # Another request is already fetching this key: share its result
+        pending = self._inflight.get(cache_key)
+        if pending is not None:
+            entry = await asyncio.shield(pending)
+            if entry:
+                return await self._send_cached(send, entry[0], entry[1], if_none_match, "HIT", ttl)
+            return await self.app(scope, receive, send)
+
+        # Cache miss - stream the upstream response through while collecting it
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[cache_key] = future
         try:
-            cached_data = await self.redis.get(cache_key)
-            if cached_data:
-                # Parse cached response
-                cached_response = json.loads(cached_data)
-                
-                # Create response with cached data
-                response = Response(
-                    content=cached_response["body"],
-                    status_code=cached_response["status_code"],
-                    headers=cached_response["headers"],
-                    media_type=cached_response.get("media_type", "application/json")
-                )
-                
-                # Add cache hit header
-                response.headers["X-Cache"] = "HIT"
-                response.headers["X-Cache-TTL"] = str(ttl)
-                
-                logger.debug(f"Cache HIT for {request.url.path}")
-                return response
-                
+            entry = await self._fetch(scope, receive, send, cache_key, ttl, if_none_match)
+        except BaseException:
+            if not future.done():
+                future.set_result(None)
+            raise
+        finally:
+            self._inflight.pop(cache_key, None)
+        if not future.done():
+            future.set_result(entry)
+
+    async def _fetch(self, scope, receive, send, cache_key: str, ttl: int, if_none_match: str) -> Optional[CacheEntry]:
+        """Run the endpoint and send its response; store 200 responses."""
+        start: Dict[str, Any] = {}
+        chunks: List[bytes] = []
+        entry: Optional[CacheEntry] = None
+        held = False
+
+        async def send_wrapper(message):
+            nonlocal entry, held
+            if message["type"] == "http.response.start":
+                start.update(message)
+                # Hold 200s until the body is complete so the ETag can go with it
+                held = message["status"] == 200
+                if not held:
+                    await send(message)
+                return
+            if message["type"] != "http.response.body" or not held:
+                await send(message)
+                return
+
+            chunks.append(message.get("body", b""))
+            if message.get("more_body"):
+                return
+            held = False
+            entry = self._make_entry(start, chunks)
+            if entry is not None:
+                await self._send_cached(send, entry[0], entry[1], if_none_match, "MISS", ttl)
+            else:
+                await send(start)
+                await send({"type": "http.response.body", "body": b"".join(chunks)})
+
+        await self.app(scope, receive, send_wrapper)
+        if entry is not None:
+            await self._write(cache_key, ttl, entry)
+        return entry
+
+    async def _store(self, cache_key: str, ttl: int, start: Dict[str, Any], chunks: List[bytes]) -> Optional[CacheEntry]:
+        entry = self._make_entry(start, chunks)
+        if entry is not None:
+            await self._write(cache_key, ttl, entry)
+        return entry
+
+    @staticmethod
+    def _make_entry(start: Dict[str, Any], chunks: List[bytes]) -> Optional[CacheEntry]:
+        # Only cache successful, shareable responses
+        if start.get("status") != 200:
+            return None
+        headers = [(bytes(k).lower(), bytes(v)) for k, v in start.get("headers", [])]
+        for name, value in headers:
+            if name == b"set-cookie" or (name == b"cache-control" and b"no-store" in value.lower()):
+                return None
+
+        body = b"".join(chunks)
+        meta = {
+            "status": 200,
+            "headers": [
+                [k.decode("latin-1"), v.decode("latin-1")]
+                for k, v in headers if k not in _HOP_HEADERS
+            ],
+            "etag": f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+            "stored_at": time.time()
+        }
+        return meta, body
+
+    async def _write(self, cache_key: str, ttl: int, entry: CacheEntry):
+        meta, body = entry
+        try:
+            await self.redis.hset_bytes(
+                cache_key,
+                {"meta": json.dumps(meta).encode(), "body": body},
+                ex=ttl + self.STALE_WHILE_REVALIDATE_S
+            )
+            logger.debug(f"Cached response for {cache_key} (TTL: {ttl}s)")
+        except Exception as e:
+            logger.warning(f"Cache write error: {e}")
+
+    async def _read(self, cache_key: str) -> Optional[CacheEntry]:
+        try:
+            fields = await self.redis.hgetall_bytes(cache_key)
+            if b"meta" not in fields or b"body" not in fields:
+                return None
+            return json.loads(fields[b"meta"]), fields[b"body"]
         except Exception as e:
-            logger.warning(f"Cache read error: {e}")
             # Continue without cache on error
-        
-        # Cache miss - process request
-        response = await call_next(request)
-        
-        # Only cache successful responses
-        if response.status_code == 200:
-            try:
-                # Read response body
-                body = b""
-                async for chunk in response.body_iterator:
-                    body += chunk
-                
-                # Cache the response
-                cache_data = {
-                    "body": body.decode("utf-8"),
-                    "status_code": response.status_code,
-                    "headers": dict(response.headers),
-                    "media_type": response.media_type,
-                    "cached_at": time.time()
-                }
-                
-                await self.redis.setex(
-                    cache_key,
-                    ttl,
-                    json.dumps(cache_data)
-                )
-                
-                # Create new response with body
-                response = Response(
-                    content=body,
-                    status_code=response.status_code,
-                    headers=dict(response.headers),
-                    media_type=response.media_type
-                )
-                
-                # Add cache miss header
-                response.headers["X-Cache"] = "MISS"
-                response.headers["X-Cache-TTL"] = str(ttl)
-                
-                logger.debug(f"Cached response for {request.url.path} (TTL: {ttl}s)")
-                
-            except Exception as e:
-                logger.warning(f"Cache write error: {e}")
-                # Return original response on cache error
-        
-        return response
-    
+            logger.warning(f"Cache read error: {e}")
+            return None
+
+    async def _send_cached(self, send, meta: Dict[str, Any], body: bytes, if_none_match: str, state: str, ttl: int):
+        headers = [(k.encode("latin-1"), v.encode("latin-1")) for k, v in meta["headers"]]
+        headers += [
+            (b"etag", meta["etag"].encode()),
+            (b"x-cache", state.encode()),
+            (b"x-cache-ttl", str(ttl).encode())
+        ]
+
+        if meta["etag"] in {tag.strip() for tag in if_none_match.split(",")} or if_none_match.strip() == "*":
+            await send({"type": "http.response.start", "status": 304, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        headers.append((b"content-length", str(len(body)).encode()))
+        await send({"type": "http.response.start", "status": meta["status"], "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+    def _schedule_revalidation(self, scope, cache_key: str, ttl: int):
+        """Refresh a stale entry once in the background."""
+        if cache_key in self._revalidating or cache_key in self._inflight:
+            return
+        self._revalidating.add(cache_key)
+        asyncio.create_task(self._revalidate(dict(scope), cache_key, ttl))
+
+    async def _revalidate(self, scope, cache_key: str, ttl: int):
+        start: Dict[str, Any] = {}
+        chunks: List[bytes] = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                start.update(message)
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        try:
+            await self.app(scope, receive, send)
+            await self._store(cache_key, ttl, start, chunks)
+        except Exception as e:
+            logger.warning(f"Cache revalidation failed for {scope['path']}: {e}")
+        finally:
+            self._revalidating.discard(cache_key)
+
     @classmethod
     async def invalidate_cache(cls, pattern: str):
         """Invalidate cache entries matching pattern"""
         try:
-            redis = redis_client
+            redis = async_redis_client
             cache_pattern = f"{cls.cache_prefix}{pattern}*"
-            
+
             # Find all matching keys
             keys = []
             async for key in redis.scan_iter(match=cache_pattern):
                 keys.append(key)
-            
+
             # Delete all matching keys
             if keys:
                 await redis.delete(*keys)
                 logger.info(f"Invalidated {len(keys)} cache entries matching {pattern}")
-                
+
         except Exception as e:
             logger.error(f"Cache invalidation error: {e}")
 
@@ -182,4 +312,4 @@ class CacheMiddleware(BaseHTTPMiddleware):
 # Helper function for manual cache invalidation
 async def invalidate_gateway_cache(endpoint: str):
     """Invalidate gateway cache for specific endpoint"""
-    await CacheMiddleware.invalidate_cache(endpoint)
\ No newline at end of file
+    await CacheMiddleware.invalidate_cache(endpoint)
@@ -46,10 +46,14 @@ from app.shared import (
     supabase_health_check
 )
 from app.shared.security import get_current_user_ws
+from app.shared.jwt_verification_cache import jwt_claims_cache, supabase_signing_keys
 from app.shared.config import GaiaSettings, get_settings
-from app.shared.redis_client import redis_client, CacheManager
+from app.shared.redis_client import redis_client, async_redis_client, CacheManager
 from app.gateway.cache_middleware import CacheMiddleware
+from app.gateway.overhead_middleware import GatewayOverheadMiddleware
+from app.gateway.upstream_pool import upstream_pool, CircuitOpenError
 from app.services.gateway.routes.locations_endpoints import router as locations_router
+from app.services.locations.waypoint_reader import waypoint_reader
 
 # Configure logging for gateway service
 logger = configure_logging_for_service("gateway")
@@ -89,8 +93,8 @@ app = FastAPI(
 )
 
 # Add response caching middleware for static endpoints
-# TODO: Fix Content-Length issue with CacheMiddleware
-# app.add_middleware(CacheMiddleware)
+if settings.GATEWAY_RESPONSE_CACHE_ENABLED:
+    app.add_middleware(CacheMiddleware)
 
 # Add GZip compression middleware (30-50% smaller responses)
 app.add_middleware(GZipMiddleware, minimum_size=1000)
@@ -104,6 +108,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Outermost, so gateway overhead covers every other middleware
+app.add_middleware(GatewayOverheadMiddleware)
+
 # Add rate limiting
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
@@ -145,10 +152,16 @@ async def forward_request_to_service(
     params: Optional[Dict[str, Any]] = None,
     json_data: Optional[Dict[str, Any]] = None,
     files: Optional[Dict[str, Any]] = None,
-    stream: bool = False
+    stream: bool = False,
+    parse_json: bool = False
 ):
-    """Forward a request to a specific service and return the response."""
-    
+    """
+    Forward a request to a specific service and return the response.
+
+    JSON responses are passed through as the upstream's raw bytes; callers
+    that post-process the payload pass parse_json=True to get the decoded
+    body instead.
+    """
     if service_name not in SERVICE_URLS:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -158,8 +171,6 @@ async def forward_request_to_service(
     service_url = SERVICE_URLS[service_name]
     full_url = f"{service_url}{path}"
     
-    client = await get_http_client()
-    
     try:
         logger.service(f"Forwarding {method} request to {service_name}: {path}")
         
@@ -175,20 +186,23 @@ async def forward_request_to_service(
             # to avoid closing the stream prematurely
             logger.service(f"Detected streaming request to {service_name}")
             
-            # Make the streaming request
-            response = await client.request(
-                method=method,
-                url=full_url,
+            # Make the streaming request; the body is read as it arrives
+            response = await upstream_pool.request(
+                service_name,
+                method,
+                full_url,
+                stream=True,
                 headers=headers,
                 params=params,
                 json=json_data,
-                files=files,
-                extensions={"stream": True}
+                files=files
             )
             
             # Check status before proceeding
             if response.status_code >= 400:
                 # Handle error responses
+                await response.aread()
+                await response.aclose()
                 error_text = response.text
                 logger.error(f"Service {service_name} returned error {response.status_code}: {error_text}")
                 raise HTTPException(
@@ -225,16 +239,19 @@ async def forward_request_to_service(
             else:
                 # Not actually streaming, read the full response
                 logger.service(f"Non-streaming response from {service_name} (content-type: {content_type})")
-                content = response.content
-                if content_type.startswith("application/json"):
+                try:
+                    content = await response.aread()
+                finally:
+                    await response.aclose()
+                if content_type.startswith("application/json") and parse_json:
                     return response.json()
-                else:
-                    return Response(content=content, media_type=content_type)
+                return Response(content=content, status_code=response.status_code, media_type=content_type)
         else:
             # Non-streaming request
-            response = await client.request(
-                method=method,
-                url=full_url,
+            response = await upstream_pool.request(
+                service_name,
+                method,
+                full_url,
                 headers=headers,
                 params=params,
                 json=json_data,
@@ -257,7 +274,11 @@ async def forward_request_to_service(
                 return Response(status_code=204)
             
             # Handle different response types
-            if response.headers.get("content-type", "").startswith("application/json"):
+            content_type = response.headers.get("content-type", "")
+            if content_type.startswith("application/json"):
+                if not parse_json:
+                    # Raw pass-through: no decode/re-encode round-trip
+                    return Response(content=response.content, status_code=response.status_code, media_type=content_type)
                 try:
                     return response.json()
                 except Exception as json_error:
@@ -290,6 +311,13 @@ async def forward_request_to_service(
             status_code=e.response.status_code,
             detail=f"Service error: {e.response.text}"
         )
+    except CircuitOpenError as e:
+        logger.warning(str(e))
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Service {service_name} unavailable",
+            headers={"Retry-After": str(max(1, int(e.retry_in_s)))}
+        )
     except httpx.RequestError as e:
         logger.error(f"Failed to connect to service {service_name}: {e}")
         raise HTTPException(
@@ -347,6 +375,21 @@ async def health_check():
         "supabase": supabase_health
     }
 
+# Auth cache counters (no authentication required, like /health)
+@app.get("/metrics/auth", tags=["Health"])
+async def auth_metrics():
+    """JWT verification cache and Redis client counters."""
+    return {
+        "jwt_verification": jwt_claims_cache.get_stats(),
+        "redis": async_redis_client.get_stats()
+    }
+
+# Upstream pool counters (no authentication required, like /health)
+@app.get("/metrics/upstream", tags=["Health"])
+async def upstream_metrics():
+    """Per-service circuit state, upstream latency and gateway overhead histograms."""
+    return upstream_pool.get_stats()
+
 # Root endpoint (same as LLM Platform)
 @app.get("/")
 @limiter.limit(f"{settings.RATE_LIMIT_REQUESTS}/{settings.RATE_LIMIT_PERIOD}")
@@ -639,7 +682,8 @@ async def v03_chat(
         method="POST", 
         json_data=body,
         headers=headers,
-        stream=body.get("stream", False)
+        stream=body.get("stream", False),
+        parse_json=True
     )
     
     # If streaming, return as-is but with clean format conversion
@@ -681,7 +725,8 @@ async def v03_list_conversations(
         service_name="chat",
         path="/conversations",
         method="GET",
-        headers=dict(request.headers)
+        headers=dict(request.headers),
+        parse_json=True
     )
     
     # Get response data
@@ -734,7 +779,8 @@ async def v03_create_conversation(
         path="/conversations",
         method="POST",
         json_data=body,
-        headers=dict(request.headers)
+        headers=dict(request.headers),
+        parse_json=True
     )
     
     # Get response data
@@ -1351,6 +1397,9 @@ async def startup_event():
     """Initialize gateway service and connections."""
     log_service_startup("gateway", "0.2", settings.SERVICE_PORT)
     
+    # Prefetch JWT signing keys so request auth never waits on them
+    supabase_signing_keys.start()
+    
     # Initialize NATS connection
     try:
         logger.info("Initializing NATS connection for service coordination with IP address")
@@ -1364,6 +1413,9 @@ async def startup_event():
             timestamp=datetime.now()
         )
         await nats_client.publish(NATSSubjects.SERVICE_HEALTH, startup_event.model_dump_json())
+
+        # Drop cached waypoints when KB waypoint files change
+        await waypoint_reader.subscribe_to_invalidations(nats_client)
         
     except Exception as e:
         logger.error(f"Failed to initialize NATS connection: {e}")
@@ -1404,6 +1456,11 @@ async def shutdown_event():
     global http_client
     if http_client:
         await http_client.aclose()
+    await upstream_pool.close()
+    
+    # Stop signing key refresh and release the shared Redis pool
+    await supabase_signing_keys.stop()
+    await async_redis_client.close()
     
     # Publish shutdown event to NATS
     try:
@@ -0,0 +1,40 @@
+"""
+Gateway overhead measurement.
+
+Times each HTTP request from the moment it reaches the gateway until the
+response starts, minus the time spent waiting on upstream services, and
+records the difference in the upstream pool's gateway_overhead histogram.
+Auth, middleware, routing and response serialization are all included.
+Requests that never reach an upstream (cache hits, rejected auth) are not
+recorded.
+"""
+import time
+
+from app.gateway.upstream_pool import RequestTiming, request_timing
+
+
+class GatewayOverheadMiddleware:
+    """Pure ASGI middleware; add it last so it wraps every other layer."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        started = time.perf_counter()
+        timing = RequestTiming()
+        token = request_timing.set(timing)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and timing.pool is not None:
+                # For streams both sides stop at the response headers
+                elapsed = time.perf_counter() - started
+                timing.pool.record_overhead(timing.service_name, elapsed - timing.upstream_s)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_timing.reset(token)
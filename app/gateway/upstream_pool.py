@@ -0,0 +1,259 @@
+"""
+Per-service upstream connection pools for the gateway.
+
+Each backend service gets its own httpx.AsyncClient with explicit
+connection limits and keep-alive, negotiating HTTP/2 where the upstream
+offers it. Every service also has a circuit breaker, so a dead backend
+fails fast instead of tying up connections until timeout, and latency
+histograms for both the upstream round-trip and the time the gateway
+itself adds to a proxied request. The latter is recorded by
+GatewayOverheadMiddleware, which reads the upstream time of the current
+request from request_timing.
+"""
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+import httpx
+
+from app.shared.config import settings
+from app.shared.latency_histogram import LatencyHistogram
+from app.shared.logging import get_logger
+
+logger = get_logger("gateway_upstream")
+
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+
+
+class RequestTiming:
+    """Upstream time spent on behalf of one gateway request."""
+
+    __slots__ = ("pool", "service_name", "upstream_s")
+
+    def __init__(self):
+        self.pool: Optional["UpstreamPool"] = None
+        self.service_name: Optional[str] = None
+        self.upstream_s = 0.0
+
+
+# Set per request by GatewayOverheadMiddleware
+request_timing: ContextVar[Optional[RequestTiming]] = ContextVar("gateway_request_timing", default=None)
+
+
+class CircuitOpenError(Exception):
+    """Raised when a service's circuit breaker rejects a request."""
+
+    def __init__(self, service_name: str, retry_in_s: float):
+        super().__init__(f"Circuit open for {service_name}, retry in {retry_in_s:.1f}s")
+        self.service_name = service_name
+        self.retry_in_s = retry_in_s
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    Opens after failure_threshold failures in a row, rejects requests for
+    reset_timeout_s, then lets a single probe through (half-open); the
+    probe's outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout_s: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_s = reset_timeout_s
+
+        self.state = BREAKER_CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+        self._stats = {"successes": 0, "failures": 0, "rejected": 0, "opened": 0}
+
+    def before_request(self):
+        """Admit a request or raise CircuitOpenError."""
+        if self.state == BREAKER_CLOSED:
+            return
+        if self.state == BREAKER_OPEN:
+            remaining = self.opened_at + self.reset_timeout_s - time.monotonic()
+            if remaining > 0:
+                self._stats["rejected"] += 1
+                raise CircuitOpenError(self.name, remaining)
+            self.state = BREAKER_HALF_OPEN
+        if self._probe_in_flight:
+            self._stats["rejected"] += 1
+            raise CircuitOpenError(self.name, 0.0)
+        self._probe_in_flight = True
+
+    def record_success(self):
+        self._stats["successes"] += 1
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+        self.state = BREAKER_CLOSED
+
+    def record_failure(self):
+        self._stats["failures"] += 1
+        self.consecutive_failures += 1
+        self._probe_in_flight = False
+        if self.state == BREAKER_HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != BREAKER_OPEN:
+                self._stats["opened"] += 1
+            self.state = BREAKER_OPEN
+            self.opened_at = time.monotonic()
+
+    def release_probe(self):
+        """Free the half-open probe slot when a request ended without an outcome."""
+        self._probe_in_flight = False
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            **self._stats
+        }
+
+
+class UpstreamPool:
+    """Pooled clients, circuit breakers and latency histograms per service."""
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry_s: float = 30.0,
+        http2: bool = True,
+        timeout_s: float = 30.0,
+        failure_threshold: int = 5,
+        reset_timeout_s: float = 30.0
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry_s
+        )
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning("GATEWAY_UPSTREAM_HTTP2 enabled but h2 is not installed, using HTTP/1.1")
+                http2 = False
+        self.http2 = http2
+        self.timeout_s = timeout_s
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_s = reset_timeout_s
+
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._upstream_latency: Dict[str, LatencyHistogram] = {}
+        self._overhead: Dict[str, LatencyHistogram] = {}
+
+    def client(self, service_name: str) -> httpx.AsyncClient:
+        """Return the service's pooled client, creating it on first use."""
+        client = self._clients.get(service_name)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout_s),
+                limits=self.limits,
+                http2=self.http2,
+                headers={"User-Agent": "GaiaGateway/1.0"}
+            )
+            self._clients[service_name] = client
+        return client
+
+    def breaker(self, service_name: str) -> CircuitBreaker:
+        breaker = self._breakers.get(service_name)
+        if breaker is None:
+            breaker = self._breakers[service_name] = CircuitBreaker(
+                service_name, self.failure_threshold, self.reset_timeout_s
+            )
+        return breaker
+
+    async def request(self, service_name: str, method: str, url: str, stream: bool = False, **kwargs) -> httpx.Response:
+        """
+        Send a request through the service's pool and breaker.
+
+        With stream=True the body is left unread and the caller must
+        aclose() the response; latency then covers time to headers.
+
+        Raises:
+            CircuitOpenError: If the service's circuit is open
+            httpx.RequestError: If the upstream could not be reached
+        """
+        breaker = self.breaker(service_name)
+        breaker.before_request()
+
+        client = self.client(service_name)
+        started = time.perf_counter()
+        try:
+            response = await client.send(client.build_request(method, url, **kwargs), stream=stream)
+        except httpx.RequestError:
+            breaker.record_failure()
+            raise
+        except BaseException:
+            breaker.release_probe()
+            raise
+        elapsed = time.perf_counter() - started
+        self._histogram(self._upstream_latency, service_name).observe(elapsed)
+
+        timing = request_timing.get()
+        if timing is not None:
+            timing.pool = self
+            timing.service_name = service_name
+            timing.upstream_s += elapsed
+
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return response
+
+    def record_overhead(self, service_name: str, seconds: float):
+        """Record the time the gateway added on top of the upstream calls of a request."""
+        self._histogram(self._overhead, service_name).observe(max(seconds, 0.0))
+
+    def get_stats(self) -> Dict[str, Any]:
+        services = set(self._breakers) | set(self._upstream_latency)
+        return {
+            "limits": {
+                "max_connections": self.limits.max_connections,
+                "max_keepalive_connections": self.limits.max_keepalive_connections,
+                "keepalive_expiry_s": self.limits.keepalive_expiry,
+                "http2": self.http2
+            },
+            "services": {
+                name: {
+                    "circuit": self.breaker(name).get_stats(),
+                    "upstream_latency": self._histogram(self._upstream_latency, name).get_stats(),
+                    "gateway_overhead": self._histogram(self._overhead, name).get_stats()
+                }
+                for name in sorted(services)
+            }
+        }
+
+    async def close(self):
+        for client in self._clients.values():
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning(f"Error closing upstream client: {e}")
+        self._clients.clear()
+
+    @staticmethod
+    def _histogram(histograms: Dict[str, LatencyHistogram], service_name: str) -> LatencyHistogram:
+        histogram = histograms.get(service_name)
+        if histogram is None:
+            histogram = histograms[service_name] = LatencyHistogram()
+        return histogram
+
+
+# Global instance
+upstream_pool = UpstreamPool(
+    max_connections=settings.GATEWAY_UPSTREAM_MAX_CONNECTIONS,
+    max_keepalive_connections=settings.GATEWAY_UPSTREAM_MAX_KEEPALIVE,
+    keepalive_expiry_s=settings.GATEWAY_UPSTREAM_KEEPALIVE_EXPIRY,
+    http2=settings.GATEWAY_UPSTREAM_HTTP2,
+    timeout_s=settings.GATEWAY_REQUEST_TIMEOUT,
+    failure_threshold=settings.GATEWAY_BREAKER_FAILURE_THRESHOLD,
+    reset_timeout_s=settings.GATEWAY_BREAKER_RESET_SECONDS
+)
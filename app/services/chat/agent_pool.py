@@ -0,0 +1,163 @@
+"""
+Bounded pool of initialized mcp-agent agents.
+
+HotLoadedChatService used to keep one Agent (plus attached LLM) per
+user:persona for the life of the process. Agents are now shared per
+persona, capped by count with LRU eviction, and closed once idle. An
+agent is never evicted while a request is using it.
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+AgentFactory = Callable[[str], Awaitable[Any]]
+AgentCloser = Callable[[Any], Awaitable[None]]
+
+
+async def close_agent(value: Any):
+    """Exit the agent of an (agent, llm) pair"""
+    agent, _llm = value
+    await agent.__aexit__(None, None, None)
+
+
+class _PooledAgent:
+
+    def __init__(self, value: Any):
+        self.value = value
+        self.in_use = 0
+        self.last_used = time.monotonic()
+
+
+class AgentPool:
+    """LRU + idle-time bounded pool of agents keyed by persona."""
+
+    def __init__(
+        self,
+        factory: AgentFactory,
+        max_agents: int = 8,
+        idle_ttl_s: float = 900.0,
+        close: AgentCloser = close_agent
+    ):
+        self.factory = factory
+        self.max_agents = max_agents
+        self.idle_ttl_s = idle_ttl_s
+        self.close_value = close
+
+        self._entries: "OrderedDict[str, _PooledAgent]" = OrderedDict()
+        self._creation_locks: Dict[str, asyncio.Lock] = {}
+        self._reaper: Optional[asyncio.Task] = None
+        self._stats = {"hits": 0, "misses": 0, "evictions_lru": 0, "evictions_idle": 0, "close_errors": 0}
+
+    @asynccontextmanager
+    async def lease(self, key: str):
+        """Yield the pooled value for key, creating it on a miss"""
+        entry = await self._acquire(key)
+        try:
+            yield entry.value
+        finally:
+            entry.in_use -= 1
+            entry.last_used = time.monotonic()
+            await self.evict()
+
+    async def evict(self):
+        """Close idle agents and trim the pool back to max_agents"""
+        now = time.monotonic()
+        victims: List[Tuple[str, _PooledAgent]] = []
+
+        for key, entry in list(self._entries.items()):
+            if not entry.in_use and now - entry.last_used >= self.idle_ttl_s:
+                victims.append((key, self._entries.pop(key)))
+                self._stats["evictions_idle"] += 1
+
+        # Oldest first; agents in use stay even if that means running over the cap
+        for key, entry in list(self._entries.items()):
+            if len(self._entries) <= self.max_agents:
+                break
+            if not entry.in_use:
+                victims.append((key, self._entries.pop(key)))
+                self._stats["evictions_lru"] += 1
+
+        for key, entry in victims:
+            await self._close(key, entry)
+
+    def start_reaper(self, interval_s: Optional[float] = None):
+        """Periodically evict idle agents even when no requests arrive"""
+        if self._reaper is not None and not self._reaper.done():
+            return
+        interval_s = interval_s or max(1.0, self.idle_ttl_s / 4)
+        self._reaper = asyncio.create_task(self._reap_loop(interval_s))
+
+    async def close(self):
+        """Stop the reaper and close every pooled agent"""
+        if self._reaper is not None:
+            self._reaper.cancel()
+            try:
+                await self._reaper
+            except asyncio.CancelledError:
+                pass
+            self._reaper = None
+
+        entries, self._entries = list(self._entries.items()), OrderedDict()
+        for key, entry in entries:
+            await self._close(key, entry)
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "size": len(self._entries),
+            "max_agents": self.max_agents,
+            "idle_ttl_s": self.idle_ttl_s,
+            "in_use": sum(1 for entry in self._entries.values() if entry.in_use),
+            "hit_rate": round(self._stats["hits"] / lookups, 3) if lookups else 0.0
+        }
+
+    async def _acquire(self, key: str) -> _PooledAgent:
+        entry = self._entries.get(key)
+        if entry is None:
+            lock = self._creation_locks.setdefault(key, asyncio.Lock())
+            async with lock:
+                # Concurrent first requests for a persona create one agent
+                entry = self._entries.get(key)
+                if entry is None:
+                    self._stats["misses"] += 1
+                    try:
+                        entry = _PooledAgent(await self.factory(key))
+                    finally:
+                        # Also on failure, so keys that never got an agent do not pile up
+                        if self._creation_locks.get(key) is lock:
+                            del self._creation_locks[key]
+                    self._entries[key] = entry
+                    logger.debug(f"Created pooled agent for {key}")
+                else:
+                    self._stats["hits"] += 1
+                # Claim before releasing the lock so eviction cannot take it
+                entry.in_use += 1
+        else:
+            self._stats["hits"] += 1
+            entry.in_use += 1
+
+        self._entries.move_to_end(key)
+        entry.last_used = time.monotonic()
+        return entry
+
+    async def _close(self, key: str, entry: _PooledAgent):
+        try:
+            await self.close_value(entry.value)
+            logger.debug(f"Closed pooled agent for {key}")
+        except Exception as e:
+            self._stats["close_errors"] += 1
+            logger.warning(f"Error closing pooled agent for {key}: {e}")
+
+    async def _reap_loop(self, interval_s: float):
+        while True:
+            await asyncio.sleep(interval_s)
+            try:
+                await self.evict()
+            except Exception as e:
+                logger.warning(f"Agent pool reaper error: {e}")
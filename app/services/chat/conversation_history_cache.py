@@ -0,0 +1,156 @@
+"""
+Per-conversation message cache for chat context building.
+
+build_context only needs the tail of a conversation, not every message.
+This cache keeps a token-budgeted window of the newest messages per
+conversation, loaded once with a bounded query off the event loop and then
+kept current by write-through from ChatConversationStore.add_message.
+Messages that fall out of the window are folded into a short digest, so a
+conversation with hundreds of turns costs the same per turn as a new one.
+"""
+import asyncio
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Tuple
+
+from app.shared.logging import setup_service_logger
+
+logger = setup_service_logger("chat_history_cache")
+
+# (conversation_id, limit) -> (newest messages oldest-first, total message count)
+HistoryLoader = Callable[[str, int], Tuple[List[Dict[str, Any]], int]]
+
+DIGEST_SNIPPET_CHARS = 120
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate (~4 characters per token), same as the providers use."""
+    return max(1, len(text or "") // 4)
+
+
+@dataclass
+class _HistoryEntry:
+    """Cached window for one conversation."""
+    messages: Deque[Dict[str, Any]] = field(default_factory=deque)  # Oldest first
+    window_tokens: int = 0
+    total_count: int = 0
+    older_count: int = 0  # Messages before the window
+    digest: Deque[str] = field(default_factory=lambda: deque(maxlen=8))  # Newest older turns
+    loaded_at: float = field(default_factory=time.time)
+
+
+class ConversationHistoryCache:
+    """LRU of token-budgeted conversation tails with write-through appends."""
+
+    def __init__(
+        self,
+        loader: HistoryLoader,
+        token_budget: int = 4000,
+        max_load: int = 60,
+        max_conversations: int = 1000,
+        ttl_seconds: float = 900
+    ):
+        self._loader = loader
+        self.token_budget = token_budget
+        self.max_load = max_load
+        self.max_conversations = max_conversations
+        self.ttl_seconds = ttl_seconds
+
+        # add_message runs in worker threads, lookups on the event loop
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, _HistoryEntry]" = OrderedDict()
+        # Bumped on every append/invalidate so a load racing a write isn't cached
+        self._generations: Dict[str, int] = {}
+        self._stats = {"hits": 0, "misses": 0, "appends": 0, "evictions": 0}
+
+    async def get_history(self, conversation_id: str) -> Dict[str, Any]:
+        """
+        Return {"messages", "summary", "total_count"} for a conversation.
+
+        messages is the newest window that fits the token budget (oldest
+        first, starting with a user turn); summary describes anything older.
+        """
+        with self._lock:
+            entry = self._entries.get(conversation_id)
+            if entry and time.time() - entry.loaded_at < self.ttl_seconds:
+                self._entries.move_to_end(conversation_id)
+                self._stats["hits"] += 1
+                return self._snapshot(entry)
+            self._stats["misses"] += 1
+            generation = self._generations.get(conversation_id, 0)
+
+        messages, total_count = await asyncio.to_thread(self._loader, conversation_id, self.max_load)
+
+        entry = _HistoryEntry(total_count=total_count, older_count=max(0, total_count - len(messages)))
+        for message in messages:
+            self._push(entry, message)
+
+        with self._lock:
+            if self._generations.get(conversation_id, 0) == generation:
+                self._entries[conversation_id] = entry
+                self._entries.move_to_end(conversation_id)
+                while len(self._entries) > self.max_conversations:
+                    evicted, _ = self._entries.popitem(last=False)
+                    self._generations.pop(evicted, None)
+                    self._stats["evictions"] += 1
+            return self._snapshot(entry)
+
+    def append(self, conversation_id: str, message: Dict[str, Any]):
+        """Write-through for a message that was just persisted."""
+        with self._lock:
+            self._generations[conversation_id] = self._generations.get(conversation_id, 0) + 1
+            entry = self._entries.get(conversation_id)
+            if entry is None:
+                return  # Next get_history loads it from the database
+            entry.total_count += 1
+            self._push(entry, message)
+            self._stats["appends"] += 1
+
+    def invalidate(self, conversation_id: str):
+        """Drop a conversation's window (e.g. on delete)."""
+        with self._lock:
+            self._generations[conversation_id] = self._generations.get(conversation_id, 0) + 1
+            self._entries.pop(conversation_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "conversations": len(self._entries), "token_budget": self.token_budget}
+
+    def _push(self, entry: _HistoryEntry, message: Dict[str, Any]):
+        """Append to the window, then fold the oldest messages out of it until it fits."""
+        entry.messages.append({
+            "role": message["role"],
+            "content": message.get("content") or "",
+            "created_at": message.get("created_at", "")
+        })
+        entry.window_tokens += estimate_tokens(entry.messages[-1]["content"])
+
+        while len(entry.messages) > 1 and (
+            entry.window_tokens > self.token_budget or entry.messages[0]["role"] != "user"
+        ):
+            oldest = entry.messages.popleft()
+            entry.window_tokens -= estimate_tokens(oldest["content"])
+            entry.older_count += 1
+            if oldest["role"] in ("user", "assistant"):
+                snippet = " ".join(oldest["content"].split())[:DIGEST_SNIPPET_CHARS]
+                entry.digest.append(f"- {oldest['role'].capitalize()}: {snippet}")
+
+    @staticmethod
+    def _snapshot(entry: _HistoryEntry) -> Dict[str, Any]:
+        summary = None
+        if entry.older_count:
+            summary = f"{entry.older_count} earlier messages are not shown."
+            if entry.digest:
+                summary += " The most recent of them:\n" + "\n".join(entry.digest)
+        return {
+            "messages": list(entry.messages),
+            "summary": summary,
+            "total_count": entry.total_count
+        }
@@ -0,0 +1,191 @@
+"""
+Batched conversation persistence for the chat service.
+
+Chat turns are queued and written by a single background flusher: every
+turn that arrives within a short coalescing window goes into one
+ChatConversationStore.add_messages_batch transaction. The queue is bounded,
+so if Postgres slows down callers wait to enqueue instead of piling up
+unbounded work in memory.
+
+If the flusher cannot run, turns are written straight through instead of
+waiting on a queue nobody drains.
+"""
+import asyncio
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.shared.config import settings
+from app.shared.logging import setup_service_logger
+from . import conversation_store
+
+logger = setup_service_logger("chat_conversation_persistence")
+
+
+class ConversationPersistencePipeline:
+    """Bounded queue of chat turns flushed in coalesced transactions."""
+
+    def __init__(
+        self,
+        store=None,
+        flush_interval_s: float = 0.05,
+        max_batch_messages: int = 200,
+        queue_size: int = 1000,
+        save_timeout_s: float = 10.0
+    ):
+        self._store = store
+        self.flush_interval_s = flush_interval_s
+        self.max_batch_messages = max_batch_messages
+        self.queue_size = queue_size
+        self.save_timeout_s = save_timeout_s
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._stats = {"turns": 0, "messages": 0, "flushes": 0, "failed_flushes": 0, "direct_writes": 0}
+
+    @property
+    def store(self):
+        # Resolved per call when not given, so the store can be swapped at runtime
+        return self._store or conversation_store.chat_conversation_store
+
+    async def save_turn(
+        self,
+        conversation_id: str,
+        messages: List[Dict[str, Any]]
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Persist one turn's messages ({"role", "content", ...}) in order.
+
+        Resolves once the batch containing the turn is committed; returns the
+        stored message dicts (None for an unknown or inactive conversation).
+
+        Raises:
+            asyncio.TimeoutError: If the turn is not committed within save_timeout_s
+        """
+        future = await self.submit_turn(conversation_id, messages)
+        # shield: a timed-out caller must not cancel the future the flusher resolves
+        return await asyncio.wait_for(asyncio.shield(future), self.save_timeout_s)
+
+    async def submit_turn(
+        self,
+        conversation_id: str,
+        messages: List[Dict[str, Any]]
+    ) -> asyncio.Future:
+        """
+        Queue one turn without waiting for it to be committed.
+
+        Returns a future with save_turn's result. Only waits when the queue
+        is full, or when the turn is written straight through.
+        """
+        uuid.UUID(str(conversation_id))  # Reject fallback/invalid IDs before they can fail a whole batch
+
+        future = asyncio.get_running_loop().create_future()
+        items = [{**message, "conversation_id": conversation_id} for message in messages]
+        if not self._ensure_worker():
+            await self._write_through(items, future)
+            return future
+        await self._queue.put((items, future))  # Waits when the flusher is behind
+        return future
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._stats, "queued_turns": self._queue.qsize() if self._queue else 0}
+
+    async def shutdown(self):
+        """Flush queued turns and stop the background writer."""
+        if self._worker is None:
+            return
+        await self._queue.put(None)
+        await self._worker
+        self._worker = None
+        self._queue = None
+
+    def _ensure_worker(self) -> bool:
+        """Start the flusher if needed; False if it cannot run."""
+        loop = asyncio.get_running_loop()
+        same_loop = self._worker is not None and self._worker.get_loop() is loop
+        if same_loop and not self._worker.done():
+            return True
+        # Keep the existing queue so turns queued before a restart still get written;
+        # a queue (and its futures) from another, finished event loop cannot be drained
+        if self._queue is None or (self._worker is not None and not same_loop):
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+        run = self._run()
+        try:
+            worker = asyncio.create_task(run)
+        except RuntimeError:
+            worker = None
+        if not isinstance(worker, asyncio.Task):
+            run.close()
+            self._worker = None
+            logger.warning("Conversation persistence flusher unavailable, writing turns directly")
+            return False
+        self._worker = worker
+        return True
+
+    async def _write_through(self, items: List[Dict[str, Any]], future: asyncio.Future):
+        try:
+            results = await asyncio.to_thread(self.store.add_messages_batch, items)
+        except Exception as e:
+            logger.error(f"Failed to persist chat turn: {e}")
+            future.set_exception(e)
+            return
+        self._stats["direct_writes"] += 1
+        self._stats["turns"] += 1
+        self._stats["messages"] += len(items)
+        future.set_result(results)
+
+    async def _run(self):
+        """Collect turns for up to flush_interval_s, then write them in one transaction."""
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            first = await self._queue.get()
+            if first is None:
+                break
+
+            batch = [first]
+            batch_messages = len(first[0])
+            deadline = loop.time() + self.flush_interval_s
+            while batch_messages < self.max_batch_messages:
+                timeout = deadline - loop.time()
+                try:
+                    turn = self._queue.get_nowait() if timeout <= 0 else await asyncio.wait_for(self._queue.get(), timeout)
+                except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                    break
+                if turn is None:
+                    stopping = True
+                    break
+                batch.append(turn)
+                batch_messages += len(turn[0])
+
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[Tuple[List[Dict[str, Any]], asyncio.Future]]):
+        items = [item for turn_items, _ in batch for item in turn_items]
+        try:
+            results = await asyncio.to_thread(self.store.add_messages_batch, items)
+        except Exception as e:
+            logger.error(f"Failed to persist {len(batch)} chat turns: {e}")
+            self._stats["failed_flushes"] += 1
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self._stats["flushes"] += 1
+        self._stats["turns"] += len(batch)
+        self._stats["messages"] += len(items)
+
+        offset = 0
+        for turn_items, future in batch:
+            if not future.done():
+                future.set_result(results[offset:offset + len(turn_items)])
+            offset += len(turn_items)
+
+
+# Global instance
+conversation_persistence = ConversationPersistencePipeline(
+    flush_interval_s=settings.CHAT_PERSIST_FLUSH_INTERVAL_S,
+    max_batch_messages=settings.CHAT_PERSIST_MAX_BATCH_MESSAGES,
+    queue_size=settings.CHAT_PERSIST_QUEUE_SIZE,
+    save_timeout_s=settings.CHAT_PERSIST_SAVE_TIMEOUT_S
+)
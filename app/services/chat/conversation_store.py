@@ -2,14 +2,18 @@
 Database-backed conversation store for the chat service.
 Moved from web service to centralize conversation management.
 """
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, func
+from sqlalchemy import desc, func, insert
+from sqlalchemy.exc import IntegrityError
 from app.shared.database import get_database_session
 from app.models.database import User, Conversation, ChatMessage
 from app.shared.logging import setup_service_logger
+from app.shared.config import settings
+from .conversation_history_cache import ConversationHistoryCache
+from .user_resolution_cache import UserResolutionCache
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
 logger = setup_service_logger("chat_conversation_store")
 
@@ -17,6 +21,18 @@ class ChatConversationStore:
     """Database-backed conversation storage using PostgreSQL"""
     
     def __init__(self):
+        self.history_cache = ConversationHistoryCache(
+            loader=self.get_recent_messages,
+            token_budget=settings.CHAT_HISTORY_TOKEN_BUDGET,
+            max_load=settings.CHAT_HISTORY_MAX_LOAD,
+            max_conversations=settings.CHAT_HISTORY_CACHE_MAX_CONVERSATIONS,
+            ttl_seconds=settings.CHAT_HISTORY_CACHE_TTL_SECONDS
+        )
+        self.user_cache = UserResolutionCache(
+            max_entries=settings.CHAT_USER_CACHE_MAX_ENTRIES,
+            ttl_s=settings.CHAT_USER_CACHE_TTL_SECONDS,
+            use_redis=settings.CHAT_USER_CACHE_REDIS
+        )
         logger.info("Initialized ChatConversationStore")
     
     def _get_db_session(self):
@@ -95,20 +111,64 @@ class ChatConversationStore:
         finally:
             db.close()
     
+    def _resolve_user_id(self, user_id: str, user_email: Optional[str] = None) -> uuid.UUID:
+        """Resolve an auth identity to User.id, consulting the user resolution cache first.
+        
+        _get_or_create_user checks the email first when one is given, so that is
+        the cache key in that case and user_id otherwise.
+        """
+        if user_email and user_id != "dev-user-id":
+            key = self.user_cache.identity_key("email", user_email)
+        else:
+            key = self.user_cache.identity_key("id", user_id)
+        
+        cached = self.user_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        user = self._get_or_create_user(user_id, user_email)
+        self.user_cache.set(key, user.id)
+        return user.id
+    
+    def invalidate_user(self, user_uuid: uuid.UUID, identities: Tuple[Optional[str], ...] = ()) -> None:
+        """Drop cached resolutions for a user after it is updated or deleted.
+        
+        identities are previous user_ids/emails the user was resolved by.
+        """
+        identities = [value for value in identities if value]
+        keys = [self.user_cache.identity_key("id", value) for value in identities]
+        keys += [self.user_cache.identity_key("email", value) for value in identities if "@" in value]
+        self.user_cache.invalidate_user(user_uuid, keys)
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Counters for the store's in-process caches"""
+        return {
+            "user_resolution": self.user_cache.get_stats(),
+            "conversation_history": self.history_cache.stats()
+        }
+    
     def create_conversation(self, user_id: str, title: str = "New Conversation", user_email: Optional[str] = None) -> Dict[str, Any]:
         """Create a new conversation"""
         db = self._get_db()
         try:
-            user = self._get_or_create_user(user_id, user_email) # Pass user_email
+            user_uuid = self._resolve_user_id(user_id, user_email)
             
             conversation = Conversation(
-                user_id=user.id,
+                user_id=user_uuid,
                 title=title,
                 preview="",
                 is_active=True
             )
             db.add(conversation)
-            db.commit()
+            try:
+                db.commit()
+            except IntegrityError:
+                # Cached User.id no longer exists; resolve from the database once more
+                db.rollback()
+                self.invalidate_user(user_uuid, (user_id, user_email))
+                conversation.user_id = self._resolve_user_id(user_id, user_email)
+                db.add(conversation)
+                db.commit()
             db.refresh(conversation)
             
             logger.info(f"Created conversation {conversation.id} for user {user_id}")
@@ -127,10 +187,10 @@ class ChatConversationStore:
         """Get all conversations for a user"""
         db = self._get_db()
         try:
-            user = self._get_or_create_user(user_id)
+            user_uuid = self._resolve_user_id(user_id)
             
             conversations = db.query(Conversation).filter(
-                Conversation.user_id == user.id,
+                Conversation.user_id == user_uuid,
                 Conversation.is_active == True
             ).order_by(desc(Conversation.updated_at)).all()
             
@@ -160,11 +220,11 @@ class ChatConversationStore:
                 logger.warning(f"Invalid conversation ID format: {conversation_id}")
                 return None
             
-            user = self._get_or_create_user(user_id)
+            user_uuid = self._resolve_user_id(user_id)
             
             conversation = db.query(Conversation).filter(
                 Conversation.id == conversation_id,
-                Conversation.user_id == user.id,
+                Conversation.user_id == user_uuid,
                 Conversation.is_active == True
             ).first()
             
@@ -187,11 +247,11 @@ class ChatConversationStore:
         """Update conversation metadata"""
         db = self._get_db()
         try:
-            user = self._get_or_create_user(user_id)
+            user_uuid = self._resolve_user_id(user_id)
             
             conversation = db.query(Conversation).filter(
                 Conversation.id == conversation_id,
-                Conversation.user_id == user.id
+                Conversation.user_id == user_uuid
             ).first()
             
             if not conversation:
@@ -215,11 +275,11 @@ class ChatConversationStore:
         """Delete a conversation (soft delete)"""
         db = self._get_db()
         try:
-            user = self._get_or_create_user(user_id)
+            user_uuid = self._resolve_user_id(user_id)
             
             conversation = db.query(Conversation).filter(
                 Conversation.id == conversation_id,
-                Conversation.user_id == user.id
+                Conversation.user_id == user_uuid
             ).first()
             
             if not conversation:
@@ -229,6 +289,7 @@ class ChatConversationStore:
             conversation.is_active = False
             conversation.updated_at = func.current_timestamp()
             db.commit()
+            self.history_cache.invalidate(conversation_id)
             
             logger.info(f"Deleted conversation {conversation_id}")
             return True
@@ -269,7 +330,7 @@ class ChatConversationStore:
             
             logger.info(f"Added {role} message to conversation {conversation_id}")
             
-            return {
+            result = {
                 "id": str(message.id),
                 "role": message.role,
                 "content": message.content,
@@ -278,6 +339,79 @@ class ChatConversationStore:
                 "tokens_used": message.tokens_used,
                 "created_at": message.created_at.isoformat()
             }
+            self.history_cache.append(str(conversation_id), result)
+            return result
+        finally:
+            db.close()
+    
+    def add_messages_batch(self, items: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+        """Add messages for one or more conversations in a single transaction.
+        
+        Each item has conversation_id, role, content and optional model/provider/
+        tokens_used. IDs and timestamps are assigned client-side (in item order),
+        so no refresh round-trip is needed. Returns one message dict per item, or
+        None where the conversation doesn't exist or is inactive.
+        """
+        if not items:
+            return []
+        
+        db = self._get_db()
+        try:
+            conversation_ids = {uuid.UUID(str(item["conversation_id"])) for item in items}
+            owners = dict(db.query(Conversation.id, Conversation.user_id).filter(
+                Conversation.id.in_(conversation_ids),
+                Conversation.is_active == True
+            ).all())
+            
+            # Strictly increasing timestamps keep ORDER BY created_at stable within a turn
+            base_time = datetime.now(timezone.utc).replace(tzinfo=None)
+            rows = []
+            results = []
+            for index, item in enumerate(items):
+                conversation_id = uuid.UUID(str(item["conversation_id"]))
+                if conversation_id not in owners:
+                    results.append(None)
+                    continue
+                
+                row = {
+                    "id": uuid.uuid4(),
+                    "user_id": owners[conversation_id],
+                    "conversation_id": conversation_id,
+                    "role": item["role"],
+                    "content": item["content"],
+                    "model": item.get("model"),
+                    "provider": item.get("provider"),
+                    "tokens_used": item.get("tokens_used"),
+                    "created_at": base_time + timedelta(microseconds=index)
+                }
+                rows.append(row)
+                results.append({
+                    "id": str(row["id"]),
+                    "conversation_id": str(conversation_id),
+                    "role": row["role"],
+                    "content": row["content"],
+                    "model": row["model"],
+                    "provider": row["provider"],
+                    "tokens_used": row["tokens_used"],
+                    "created_at": row["created_at"].isoformat()
+                })
+            
+            if rows:
+                db.execute(insert(ChatMessage), rows)
+                db.query(Conversation).filter(
+                    Conversation.id.in_({row["conversation_id"] for row in rows})
+                ).update({Conversation.updated_at: func.current_timestamp()}, synchronize_session=False)
+                db.commit()
+            
+            for result in results:
+                if result is not None:
+                    self.history_cache.append(result["conversation_id"], result)
+            
+            logger.info(f"Added {len(rows)} messages to {len({row['conversation_id'] for row in rows})} conversations")
+            return results
+        except Exception:
+            db.rollback()
+            raise
         finally:
             db.close()
     
@@ -306,15 +440,42 @@ class ChatConversationStore:
         finally:
             db.close()
     
+    def get_recent_messages(self, conversation_id: str, limit: int) -> Tuple[List[Dict[str, Any]], int]:
+        """Get the newest `limit` messages (oldest first) and the total message count"""
+        db = self._get_db()
+        try:
+            total_count = db.query(func.count(ChatMessage.id)).filter(
+                ChatMessage.conversation_id == conversation_id
+            ).scalar() or 0
+            
+            messages = db.query(ChatMessage).filter(
+                ChatMessage.conversation_id == conversation_id
+            ).order_by(desc(ChatMessage.created_at)).limit(limit).all()
+            
+            result = [
+                {
+                    "id": str(msg.id),
+                    "role": msg.role,
+                    "content": msg.content,
+                    "created_at": msg.created_at.isoformat()
+                }
+                for msg in reversed(messages)
+            ]
+            
+            logger.debug(f"Retrieved {len(result)}/{total_count} recent messages for conversation {conversation_id}")
+            return result, total_count
+        finally:
+            db.close()
+    
     def search_conversations(self, user_id: str, query: str) -> List[Dict[str, Any]]:
         """Search conversations by title or content"""
         db = self._get_db()
         try:
-            user = self._get_or_create_user(user_id)
+            user_uuid = self._resolve_user_id(user_id)
             
             # Search in conversation titles and message content
             conversations = db.query(Conversation).filter(
-                Conversation.user_id == user.id,
+                Conversation.user_id == user_uuid,
                 Conversation.is_active == True
             ).filter(
                 # Search in title or preview
@@ -341,15 +502,15 @@ class ChatConversationStore:
         """Get conversation statistics for a user"""
         db = self._get_db()
         try:
-            user = self._get_or_create_user(user_id)
+            user_uuid = self._resolve_user_id(user_id)
             
             total_conversations = db.query(Conversation).filter(
-                Conversation.user_id == user.id,
+                Conversation.user_id == user_uuid,
                 Conversation.is_active == True
             ).count()
             
             total_messages = db.query(ChatMessage).filter(
-                ChatMessage.user_id == user.id
+                ChatMessage.user_id == user_uuid
             ).count()
             
             return {
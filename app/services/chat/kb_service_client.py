@@ -0,0 +1,199 @@
+"""
+Shared keep-alive client for chat -> KB service tool calls.
+
+KBToolExecutor used to open a fresh httpx.AsyncClient (and so a new TCP,
+possibly TLS, connection) for every tool call. All executors now share
+one bounded connection pool per event loop, with per-tool timeouts,
+jittered retries for failures that are safe to retry, and per-tool
+latency histograms.
+"""
+import asyncio
+import logging
+import random
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+
+from app.shared.config import settings
+from app.shared.latency_histogram import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+# Per-tool request timeouts in seconds; other tools use KB_TOOL_TIMEOUT_SECONDS
+TOOL_TIMEOUTS_S = {
+    "check_quest_state": 10.0,
+    "accept_bottle_from_player": 10.0,
+    "grant_quest_reward": 10.0,
+    "get_player_inventory": 10.0,
+}
+
+# Tools that change state: only retried when the request never reached the KB service
+NON_IDEMPOTENT_TOOLS = {
+    "execute_game_command",
+    "interact_with_experience",
+    "accept_bottle_from_player",
+    "grant_quest_reward",
+}
+
+# Upstream statuses worth retrying for idempotent tools
+RETRY_STATUS_CODES = {502, 503, 504}
+
+# The request was not sent, so any tool may retry
+_NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+# The connection failed mid-request (e.g. a stale keep-alive socket)
+_TRANSIENT_ERRORS = (httpx.NetworkError, httpx.RemoteProtocolError)
+
+
+class KBServiceClient:
+    """Pooled KB service client with retries and per-tool metrics."""
+
+    def __init__(
+        self,
+        base_url: str,
+        max_connections: int = 50,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry_s: float = 30.0,
+        default_timeout_s: float = 30.0,
+        max_retries: int = 2,
+        retry_base_delay_s: float = 0.1
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry_s
+        )
+        self.default_timeout_s = default_timeout_s
+        self.max_retries = max_retries
+        self.retry_base_delay_s = retry_base_delay_s
+
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Closes of clients replaced on a loop change, referenced until done
+        self._closing: set = set()
+        self._latency: Dict[str, LatencyHistogram] = {}
+        self._tool_stats: Dict[str, Dict[str, int]] = {}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared client, created lazily on the running event loop"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        # httpx connections are bound to the loop that opened them
+        if self._client is None or self._client.is_closed or (loop is not None and self._client_loop is not loop):
+            if self._client is not None and not self._client.is_closed:
+                self._close_later(self._client, self._client_loop, loop)
+            self._client = httpx.AsyncClient(base_url=self.base_url, limits=self.limits)
+            self._client_loop = loop
+        return self._client
+
+    def timeout_for(self, tool_name: str) -> float:
+        return TOOL_TIMEOUTS_S.get(tool_name, self.default_timeout_s)
+
+    async def request(self, tool_name: str, method: str, path: str, **kwargs) -> httpx.Response:
+        """
+        Send one tool call to the KB service.
+
+        Connection failures are retried for every tool; dropped connections
+        and 502/503/504 only for tools without side effects.
+
+        Raises:
+            httpx.RequestError: If the KB service could not be reached
+        """
+        idempotent = tool_name not in NON_IDEMPOTENT_TOOLS
+        kwargs.setdefault("timeout", self.timeout_for(tool_name))
+        stats = self._stats(tool_name)
+        stats["calls"] += 1
+        started = time.perf_counter()
+
+        try:
+            for attempt in range(self.max_retries + 1):
+                last_attempt = attempt == self.max_retries
+                try:
+                    response = await self.client.request(method, path, **kwargs)
+                except _NOT_SENT_ERRORS:
+                    if last_attempt:
+                        raise
+                except _TRANSIENT_ERRORS:
+                    if last_attempt or not idempotent:
+                        raise
+                else:
+                    if response.status_code not in RETRY_STATUS_CODES or last_attempt or not idempotent:
+                        return response
+                    await response.aclose()
+
+                stats["retries"] += 1
+                await asyncio.sleep(random.uniform(0, self.retry_base_delay_s * 2 ** attempt))
+        except Exception:
+            stats["errors"] += 1
+            raise
+        finally:
+            self._histogram(tool_name).observe(time.perf_counter() - started)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "limits": {
+                "max_connections": self.limits.max_connections,
+                "max_keepalive_connections": self.limits.max_keepalive_connections,
+                "keepalive_expiry_s": self.limits.keepalive_expiry
+            },
+            "tools": {
+                name: {**self._tool_stats[name], "latency": self._histogram(name).get_stats()}
+                for name in sorted(self._tool_stats)
+            }
+        }
+
+    async def close(self):
+        """Close the shared client and its connections"""
+        if self._client is not None:
+            client, self._client, self._client_loop = self._client, None, None
+            await client.aclose()
+
+    def _close_later(
+        self,
+        client: httpx.AsyncClient,
+        old_loop: Optional[asyncio.AbstractEventLoop],
+        loop: asyncio.AbstractEventLoop
+    ):
+        """Close a client replaced on a loop change, on its own loop if that still runs"""
+        if old_loop is not None and old_loop.is_running() and not old_loop.is_closed():
+            asyncio.run_coroutine_threadsafe(self._aclose_quietly(client), old_loop)
+            return
+        task = loop.create_task(self._aclose_quietly(client))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    @staticmethod
+    async def _aclose_quietly(client: httpx.AsyncClient):
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.debug(f"Error closing replaced KB client: {e}")
+
+    def _stats(self, tool_name: str) -> Dict[str, int]:
+        stats = self._tool_stats.get(tool_name)
+        if stats is None:
+            stats = self._tool_stats[tool_name] = {"calls": 0, "retries": 0, "errors": 0}
+        return stats
+
+    def _histogram(self, tool_name: str) -> LatencyHistogram:
+        histogram = self._latency.get(tool_name)
+        if histogram is None:
+            histogram = self._latency[tool_name] = LatencyHistogram()
+        return histogram
+
+
+# Global instance
+kb_service_client = KBServiceClient(
+    base_url=settings.KB_SERVICE_URL or "http://kb-service:8000",
+    max_connections=settings.KB_TOOL_MAX_CONNECTIONS,
+    max_keepalive_connections=settings.KB_TOOL_MAX_KEEPALIVE,
+    keepalive_expiry_s=settings.KB_TOOL_KEEPALIVE_EXPIRY,
+    default_timeout_s=settings.KB_TOOL_TIMEOUT_SECONDS,
+    max_retries=settings.KB_TOOL_MAX_RETRIES,
+    retry_base_delay_s=settings.KB_TOOL_RETRY_BASE_DELAY
+)
@@ -2,7 +2,8 @@
 KB Tools for LLM Integration
 
 Provides direct KB service tools that can be used by the LLM during chat.
-These tools make HTTP calls to the KB service endpoints.
+These tools make HTTP calls to the KB service endpoints over the shared
+kb_service_client connection pool.
 """
 
 import httpx
@@ -10,13 +11,10 @@ import json
 import logging
 from typing import Dict, Any, List, Optional
 from app.shared.config import settings
+from .kb_service_client import kb_service_client
 
 logger = logging.getLogger(__name__)
 
-# KB service URL
-KB_SERVICE_URL = settings.KB_SERVICE_URL or "http://kb-service:8000"
-
-
 # Tool definitions for LLM
 KB_TOOLS = [
     {
@@ -419,25 +417,25 @@ class KBToolExecutor:
     async def _search_kb(self, query: str, limit: int) -> Dict[str, Any]:
         """Search the knowledge base."""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{KB_SERVICE_URL}/search",
-                    json={"message": query},
-                    headers=self.headers,
-                    timeout=30.0
-                )
+            response = await kb_service_client.request(
+                "search_knowledge_base",
+                "POST",
+                "/search",
+                json={"message": query},
+                headers=self.headers
+            )
                 
-                if response.status_code == 200:
-                    result = response.json()
-                    # KB service returns {status, response, metadata} format
-                    logger.info(f"KB search response for '{query}': status={result.get('status')}, has_response={bool(result.get('response'))}, metadata={result.get('metadata')}")
-                    if result.get("status") == "success":
-                        content = result.get("response", "No results found")
-                        return {"success": True, "content": content}
-                    else:
-                        return {"success": False, "error": result.get("response", "Unknown error")}
+            if response.status_code == 200:
+                result = response.json()
+                # KB service returns {status, response, metadata} format
+                logger.info(f"KB search response for '{query}': status={result.get('status')}, has_response={bool(result.get('response'))}, metadata={result.get('metadata')}")
+                if result.get("status") == "success":
+                    content = result.get("response", "No results found")
+                    return {"success": True, "content": content}
                 else:
-                    return {"success": False, "error": f"HTTP {response.status_code}"}
+                    return {"success": False, "error": result.get("response", "Unknown error")}
+            else:
+                return {"success": False, "error": f"HTTP {response.status_code}"}
                     
         except Exception as e:
             logger.error(f"KB search error: {e}")
@@ -446,23 +444,23 @@ class KBToolExecutor:
     async def _read_file(self, path: str) -> Dict[str, Any]:
         """Read a file from the knowledge base."""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{KB_SERVICE_URL}/read",
-                    json={"message": path},
-                    headers=self.headers,
-                    timeout=30.0
-                )
+            response = await kb_service_client.request(
+                "read_kb_file",
+                "POST",
+                "/read",
+                json={"message": path},
+                headers=self.headers
+            )
                 
-                if response.status_code == 200:
-                    result = response.json()
-                    if result.get("status") == "success":
-                        content = result.get("response", "File not found")
-                        return {"success": True, "content": content}
-                    else:
-                        return {"success": False, "error": result.get("response", "Unknown error")}
+            if response.status_code == 200:
+                result = response.json()
+                if result.get("status") == "success":
+                    content = result.get("response", "File not found")
+                    return {"success": True, "content": content}
                 else:
-                    return {"success": False, "error": f"HTTP {response.status_code}"}
+                    return {"success": False, "error": result.get("response", "Unknown error")}
+            else:
+                return {"success": False, "error": f"HTTP {response.status_code}"}
                     
         except Exception as e:
             logger.error(f"KB read error: {e}")
@@ -471,23 +469,23 @@ class KBToolExecutor:
     async def _list_directory(self, path: str) -> Dict[str, Any]:
         """List directory contents in the knowledge base."""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{KB_SERVICE_URL}/list",
-                    json={"message": path},
-                    headers=self.headers,
-                    timeout=30.0
-                )
+            response = await kb_service_client.request(
+                "list_kb_directory",
+                "POST",
+                "/list",
+                json={"message": path},
+                headers=self.headers
+            )
                 
-                if response.status_code == 200:
-                    result = response.json()
-                    if result.get("status") == "success":
-                        content = result.get("response", "Directory not found")
-                        return {"success": True, "content": content}
-                    else:
-                        return {"success": False, "error": result.get("response", "Unknown error")}
+            if response.status_code == 200:
+                result = response.json()
+                if result.get("status") == "success":
+                    content = result.get("response", "Directory not found")
+                    return {"success": True, "content": content}
                 else:
-                    return {"success": False, "error": f"HTTP {response.status_code}"}
+                    return {"success": False, "error": result.get("response", "Unknown error")}
+            else:
+                return {"success": False, "error": f"HTTP {response.status_code}"}
                     
         except Exception as e:
             logger.error(f"KB list error: {e}")
@@ -496,23 +494,23 @@ class KBToolExecutor:
     async def _load_context(self, topic: str, depth: int) -> Dict[str, Any]:
         """Load context around a topic."""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{KB_SERVICE_URL}/context",
-                    json={"message": f"{topic} (depth: {depth})"},
-                    headers=self.headers,
-                    timeout=30.0
-                )
+            response = await kb_service_client.request(
+                "load_kb_context",
+                "POST",
+                "/context",
+                json={"message": f"{topic} (depth: {depth})"},
+                headers=self.headers
+            )
                 
-                if response.status_code == 200:
-                    result = response.json()
-                    if result.get("status") == "success":
-                        content = result.get("response", "Context not found")
-                        return {"success": True, "content": content}
-                    else:
-                        return {"success": False, "error": result.get("response", "Unknown error")}
+            if response.status_code == 200:
+                result = response.json()
+                if result.get("status") == "success":
+                    content = result.get("response", "Context not found")
+                    return {"success": True, "content": content}
                 else:
-                    return {"success": False, "error": f"HTTP {response.status_code}"}
+                    return {"success": False, "error": result.get("response", "Unknown error")}
+            else:
+                return {"success": False, "error": f"HTTP {response.status_code}"}
                     
         except Exception as e:
             logger.error(f"KB context error: {e}")
@@ -525,23 +523,23 @@ class KBToolExecutor:
             if focus:
                 message += f" focusing on: {focus}"
                 
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{KB_SERVICE_URL}/synthesize",
-                    json={"message": message},
-                    headers=self.headers,
-                    timeout=30.0
-                )
+            response = await kb_service_client.request(
+                "synthesize_kb_information",
+                "POST",
+                "/synthesize",
+                json={"message": message},
+                headers=self.headers
+            )
                 
-                if response.status_code == 200:
-                    result = response.json()
-                    if result.get("status") == "success":
-                        content = result.get("response", "Synthesis failed")
-                        return {"success": True, "content": content}
-                    else:
-                        return {"success": False, "error": result.get("response", "Unknown error")}
+            if response.status_code == 200:
+                result = response.json()
+                if result.get("status") == "success":
+                    content = result.get("response", "Synthesis failed")
+                    return {"success": True, "content": content}
                 else:
-                    return {"success": False, "error": f"HTTP {response.status_code}"}
+                    return {"success": False, "error": result.get("response", "Unknown error")}
+            else:
+                return {"success": False, "error": f"HTTP {response.status_code}"}
                     
         except Exception as e:
             logger.error(f"KB synthesize error: {e}")
@@ -561,23 +559,23 @@ class KBToolExecutor:
 
             search_query = context_search_map.get(context_type, context_type)
 
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{KB_SERVICE_URL}/search",
-                    json={"message": f"KOS context: {search_query}"},
-                    headers=self.headers,
-                    timeout=30.0
-                )
-
-                if response.status_code == 200:
-                    result = response.json()
-                    if result.get("status") == "success":
-                        content = result.get("response", "Context not found")
-                        return {"success": True, "content": content, "context_type": context_type}
-                    else:
-                        return {"success": False, "error": result.get("response", "Unknown error")}
+            response = await kb_service_client.request(
+                "load_kos_context",
+                "POST",
+                "/search",
+                json={"message": f"KOS context: {search_query}"},
+                headers=self.headers
+            )
+
+            if response.status_code == 200:
+                result = response.json()
+                if result.get("status") == "success":
+                    content = result.get("response", "Context not found")
+                    return {"success": True, "content": content, "context_type": context_type}
                 else:
-                    return {"success": False, "error": f"HTTP {response.status_code}"}
+                    return {"success": False, "error": result.get("response", "Unknown error")}
+            else:
+                return {"success": False, "error": f"HTTP {response.status_code}"}
 
         except Exception as e:
             logger.error(f"KOS context load error: {e}")
@@ -605,42 +603,42 @@ class KBToolExecutor:
             if session_state:
                 payload["session_state"] = session_state
 
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{KB_SERVICE_URL}/game/command",
-                    json=payload,
-                    headers=self.headers,
-                    timeout=30.0
-                )
-
-                if response.status_code == 200:
-                    result = response.json()
-                    # Game command endpoint returns structured GameCommandResponse
-                    return result
-                elif response.status_code == 403:
-                    return {
-                        "success": False,
-                        "error": {
-                            "code": "insufficient_permissions",
-                            "message": "You don't have permission to execute this command"
-                        }
+            response = await kb_service_client.request(
+                "execute_game_command",
+                "POST",
+                "/game/command",
+                json=payload,
+                headers=self.headers
+            )
+
+            if response.status_code == 200:
+                result = response.json()
+                # Game command endpoint returns structured GameCommandResponse
+                return result
+            elif response.status_code == 403:
+                return {
+                    "success": False,
+                    "error": {
+                        "code": "insufficient_permissions",
+                        "message": "You don't have permission to execute this command"
                     }
-                elif response.status_code == 404:
-                    return {
-                        "success": False,
-                        "error": {
-                            "code": "experience_not_found",
-                            "message": f"Experience '{experience}' not found"
-                        }
+                }
+            elif response.status_code == 404:
+                return {
+                    "success": False,
+                    "error": {
+                        "code": "experience_not_found",
+                        "message": f"Experience '{experience}' not found"
                     }
-                else:
-                    return {
-                        "success": False,
-                        "error": {
-                            "code": "http_error",
-                            "message": f"HTTP {response.status_code}"
-                        }
+                }
+            else:
+                return {
+                    "success": False,
+                    "error": {
+                        "code": "http_error",
+                        "message": f"HTTP {response.status_code}"
                     }
+                }
 
         except Exception as e:
             logger.error(f"Game command execution error: {e}")
@@ -686,51 +684,51 @@ class KBToolExecutor:
             if experience:
                 payload["experience"] = experience
 
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{KB_SERVICE_URL}/experience/interact",
-                    json=payload,
-                    headers=self.headers,
-                    timeout=30.0
-                )
-
-                if response.status_code == 200:
-                    result = response.json()
-                    # Experience endpoint returns InteractResponse model
-                    return result
-                elif response.status_code == 401:
-                    return {
-                        "success": False,
-                        "error": {
-                            "code": "unauthorized",
-                            "message": "Authentication required"
-                        }
+            response = await kb_service_client.request(
+                "interact_with_experience",
+                "POST",
+                "/experience/interact",
+                json=payload,
+                headers=self.headers
+            )
+
+            if response.status_code == 200:
+                result = response.json()
+                # Experience endpoint returns InteractResponse model
+                return result
+            elif response.status_code == 401:
+                return {
+                    "success": False,
+                    "error": {
+                        "code": "unauthorized",
+                        "message": "Authentication required"
                     }
-                elif response.status_code == 404:
-                    return {
-                        "success": False,
-                        "error": {
-                            "code": "experience_not_found",
-                            "message": "Experience not found"
-                        }
+                }
+            elif response.status_code == 404:
+                return {
+                    "success": False,
+                    "error": {
+                        "code": "experience_not_found",
+                        "message": "Experience not found"
                     }
-                elif response.status_code == 500:
-                    error_detail = response.json().get("detail", "Internal server error")
-                    return {
-                        "success": False,
-                        "error": {
-                            "code": "server_error",
-                            "message": error_detail
-                        }
+                }
+            elif response.status_code == 500:
+                error_detail = response.json().get("detail", "Internal server error")
+                return {
+                    "success": False,
+                    "error": {
+                        "code": "server_error",
+                        "message": error_detail
                     }
-                else:
-                    return {
-                        "success": False,
-                        "error": {
-                            "code": "http_error",
-                            "message": f"HTTP {response.status_code}"
-                        }
+                }
+            else:
+                return {
+                    "success": False,
+                    "error": {
+                        "code": "http_error",
+                        "message": f"HTTP {response.status_code}"
                     }
+                }
 
         except httpx.TimeoutException:
             logger.error("Experience interaction timeout")
@@ -774,24 +772,24 @@ class KBToolExecutor:
         Future: KB service would handle this internally when generating NPC dialogue.
         """
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{KB_SERVICE_URL}/experience/{experience}/quest/state",
-                    json={
-                        "quest_id": quest_id,
-                        "user_id": self.auth_principal.get("user_id")
-                    },
-                    headers=self.headers,
-                    timeout=10.0
-                )
+            response = await kb_service_client.request(
+                "check_quest_state",
+                "POST",
+                f"/experience/{experience}/quest/state",
+                json={
+                    "quest_id": quest_id,
+                    "user_id": self.auth_principal.get("user_id")
+                },
+                headers=self.headers
+            )
 
-                if response.status_code == 200:
-                    return response.json()
-                else:
-                    return {
-                        "success": False,
-                        "error": f"HTTP {response.status_code}"
-                    }
+            if response.status_code == 200:
+                return response.json()
+            else:
+                return {
+                    "success": False,
+                    "error": f"HTTP {response.status_code}"
+                }
 
         except Exception as e:
             logger.error(f"Check quest state error: {e}")
@@ -805,25 +803,25 @@ class KBToolExecutor:
         Future: KB service would handle this as part of "give_item" fast command.
         """
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{KB_SERVICE_URL}/experience/{experience}/npc/accept_item",
-                    json={
-                        "item_id": bottle_id,
-                        "npc_id": "louisa",  # Hardcoded for MVP
-                        "user_id": self.auth_principal.get("user_id")
-                    },
-                    headers=self.headers,
-                    timeout=10.0
-                )
+            response = await kb_service_client.request(
+                "accept_bottle_from_player",
+                "POST",
+                f"/experience/{experience}/npc/accept_item",
+                json={
+                    "item_id": bottle_id,
+                    "npc_id": "louisa",  # Hardcoded for MVP
+                    "user_id": self.auth_principal.get("user_id")
+                },
+                headers=self.headers
+            )
 
-                if response.status_code == 200:
-                    return response.json()
-                else:
-                    return {
-                        "success": False,
-                        "error": f"HTTP {response.status_code}"
-                    }
+            if response.status_code == 200:
+                return response.json()
+            else:
+                return {
+                    "success": False,
+                    "error": f"HTTP {response.status_code}"
+                }
 
         except Exception as e:
             logger.error(f"Accept bottle error: {e}")
@@ -842,25 +840,25 @@ class KBToolExecutor:
         Future: KB service would handle rewards as part of quest completion logic.
         """
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{KB_SERVICE_URL}/experience/{experience}/quest/reward",
-                    json={
-                        "reward_type": reward_type,
-                        "reward_data": reward_data,
-                        "user_id": self.auth_principal.get("user_id")
-                    },
-                    headers=self.headers,
-                    timeout=10.0
-                )
+            response = await kb_service_client.request(
+                "grant_quest_reward",
+                "POST",
+                f"/experience/{experience}/quest/reward",
+                json={
+                    "reward_type": reward_type,
+                    "reward_data": reward_data,
+                    "user_id": self.auth_principal.get("user_id")
+                },
+                headers=self.headers
+            )
 
-                if response.status_code == 200:
-                    return response.json()
-                else:
-                    return {
-                        "success": False,
-                        "error": f"HTTP {response.status_code}"
-                    }
+            if response.status_code == 200:
+                return response.json()
+            else:
+                return {
+                    "success": False,
+                    "error": f"HTTP {response.status_code}"
+                }
 
         except Exception as e:
             logger.error(f"Grant reward error: {e}")
@@ -874,21 +872,21 @@ class KBToolExecutor:
         Future: KB service would include inventory in NPC dialogue context automatically.
         """
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{KB_SERVICE_URL}/experience/{experience}/player/inventory",
-                    headers=self.headers,
-                    params={"user_id": self.auth_principal.get("user_id")},
-                    timeout=10.0
-                )
-
-                if response.status_code == 200:
-                    return response.json()
-                else:
-                    return {
-                        "success": False,
-                        "error": f"HTTP {response.status_code}"
-                    }
+            response = await kb_service_client.request(
+                "get_player_inventory",
+                "GET",
+                f"/experience/{experience}/player/inventory",
+                headers=self.headers,
+                params={"user_id": self.auth_principal.get("user_id")}
+            )
+
+            if response.status_code == 200:
+                return response.json()
+            else:
+                return {
+                    "success": False,
+                    "error": f"HTTP {response.status_code}"
+                }
 
         except Exception as e:
             logger.error(f"Get inventory error: {e}")
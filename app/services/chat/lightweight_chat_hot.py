@@ -4,11 +4,12 @@ Hot-Loaded Lightweight Chat with mcp-agent
 TODO: This is Tech Debt, remove
 Keeps mcp-agent initialized and ready to minimize per-request overhead.
 """
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List
 from fastapi import Depends, HTTPException
 import logging
 import time
 import asyncio
+from collections import OrderedDict
 from contextlib import asynccontextmanager
 
 from mcp_agent.app import MCPApp
@@ -17,8 +18,10 @@ from mcp_agent.workflows.llm.augmented_llm_anthropic import AnthropicAugmentedLL
 from mcp_agent.workflows.llm.augmented_llm_openai import OpenAIAugmentedLLM
 from mcp_agent.workflows.llm.augmented_llm import RequestParams
 
+from app.shared.config import settings
 from app.shared.security import get_current_auth_legacy as get_current_auth
 from app.models.chat import ChatRequest, Message
+from .agent_pool import AgentPool
 
 logger = logging.getLogger(__name__)
 
@@ -29,15 +32,26 @@ class HotLoadedChatService:
     
     Minimizes per-request overhead by maintaining:
     - MCPApp context
-    - Agent instances
+    - A bounded pool of Agent instances, shared per persona
     - LLM connections
+
+    Agents hold no per-user state: each user's recent history is injected
+    into the prompt, so one agent serves every user of a persona.
     """
     
     def __init__(self):
         self.app = MCPApp(name="gaia_hot_chat")
-        self.chat_histories: Dict[str, List[Message]] = {}
+        # LRU order: least recently active user first
+        self.chat_histories: "OrderedDict[str, List[Message]]" = OrderedDict()
+        self._history_touched: Dict[str, float] = {}
+        self.history_max_users = settings.CHAT_HOT_HISTORY_MAX_USERS
+        self.history_idle_ttl_s = settings.CHAT_HOT_HISTORY_IDLE_SECONDS
         self._initialized = False
-        self._agents: Dict[str, Agent] = {}  # Cache agents by user
+        self._agents = AgentPool(
+            self._create_agent,
+            max_agents=settings.CHAT_HOT_AGENT_POOL_MAX,
+            idle_ttl_s=settings.CHAT_HOT_AGENT_IDLE_SECONDS
+        )
         self._mcp_context = None
         self._lock = asyncio.Lock()
         
@@ -56,40 +70,56 @@ class HotLoadedChatService:
             # Start MCPApp context and keep it running
             self._mcp_context = self.app.run()
             await self._mcp_context.__aenter__()
+            self._agents.start_reaper()
             
             init_time = time.time() - start_time
             logger.info(f"✅ Hot-loaded mcp-agent ready in {init_time:.2f}s")
             self._initialized = True
     
-    async def get_or_create_agent(self, user_id: str, persona: Optional[str] = None) -> Agent:
-        """Get cached agent or create new one for user"""
-        agent_key = f"{user_id}:{persona or 'default'}"
-        
-        if agent_key not in self._agents:
-            # Create agent with user-specific context
-            instruction = """You are a helpful AI assistant integrated with Gaia platform.
-            Maintain a conversational tone and be helpful, accurate, and concise."""
-            
-            if persona:
-                instruction += f"\nAdopt the personality of: {persona}"
-            
-            agent = Agent(
-                name=f"gaia_chat_{user_id[:8]}",
-                instruction=instruction,
-                server_names=[]  # No MCP servers for speed
-            )
-            
-            # Initialize agent
-            await agent.__aenter__()
-            
+    async def _create_agent(self, persona_key: str):
+        """Create and initialize the shared agent for one persona"""
+        instruction = """You are a helpful AI assistant integrated with Gaia platform.
+        Maintain a conversational tone and be helpful, accurate, and concise."""
+        
+        if persona_key != "default":
+            instruction += f"\nAdopt the personality of: {persona_key}"
+        
+        agent = Agent(
+            name=f"gaia_chat_{persona_key[:32]}",
+            instruction=instruction,
+            server_names=[]  # No MCP servers for speed
+        )
+        
+        # Initialize agent
+        await agent.__aenter__()
+        try:
             # Attach LLM (reused across requests)
             llm = await agent.attach_llm(AnthropicAugmentedLLM)
-            
-            # Store both agent and LLM reference
-            self._agents[agent_key] = (agent, llm)
-            logger.debug(f"Created new agent for {agent_key}")
+        except Exception:
+            await agent.__aexit__(None, None, None)
+            raise
         
-        return self._agents[agent_key]
+        return agent, llm
+    
+    def _history_for(self, auth_key: str) -> List[Message]:
+        """Get a user's history, evicting idle and least recently active users"""
+        now = time.monotonic()
+        history = self.chat_histories.get(auth_key)
+        if history is None:
+            history = self.chat_histories[auth_key] = []
+            logger.debug(f"Initialized chat history for user: {auth_key}")
+        self.chat_histories.move_to_end(auth_key)
+        self._history_touched[auth_key] = now
+        
+        while len(self.chat_histories) > 1:
+            oldest = next(iter(self.chat_histories))
+            idle = now - self._history_touched[oldest] >= self.history_idle_ttl_s
+            if not idle and len(self.chat_histories) <= self.history_max_users:
+                break
+            del self.chat_histories[oldest]
+            del self._history_touched[oldest]
+        
+        return history
     
     async def process_chat(
         self,
@@ -108,20 +138,12 @@ class HotLoadedChatService:
         if not auth_key:
             raise HTTPException(status_code=401, detail="Invalid auth")
         
-        # Initialize chat history if needed
-        if auth_key not in self.chat_histories:
-            self.chat_histories[auth_key] = []
-            logger.debug(f"Initialized chat history for user: {auth_key}")
-        
-        # Get or create agent for this user
-        agent, llm = await self.get_or_create_agent(
-            auth_key, 
-            request.persona if hasattr(request, 'persona') else None
-        )
+        history = self._history_for(auth_key)
+        persona = getattr(request, 'persona', None) or "default"
         
         # Build conversation context
         context_messages = []
-        for msg in self.chat_histories[auth_key][-10:]:  # Last 10 messages
+        for msg in history[-10:]:  # Last 10 messages
             context_messages.append(f"{msg.role}: {msg.content}")
         
         # Add current message
@@ -132,30 +154,32 @@ class HotLoadedChatService:
         
         # Generate response (agent and LLM already initialized)
         start_time = time.time()
-        response = await llm.generate_str(
-            message=full_prompt,
-            request_params=RequestParams(
-                model=request.model or "claude-sonnet-4-5",
-                temperature=0.7,
-                max_tokens=2000
+        async with self._agents.lease(persona) as (agent, llm):
+            response = await llm.generate_str(
+                message=full_prompt,
+                request_params=RequestParams(
+                    model=request.model or "claude-sonnet-4-5",
+                    temperature=0.7,
+                    max_tokens=2000,
+                    use_history=False  # Shared agent; history is in the prompt
+                )
             )
-        )
         
         response_time = time.time() - start_time
         
         # Update history
-        self.chat_histories[auth_key].extend([
+        history.extend([
             Message(role="user", content=request.message),
             Message(role="assistant", content=response)
         ])
         
         # Keep history manageable
-        if len(self.chat_histories[auth_key]) > 50:
-            self.chat_histories[auth_key] = self.chat_histories[auth_key][-50:]
+        if len(history) > 50:
+            del history[:-50]
         
         # Return Gaia-compatible response
         return {
-            "id": f"chat-{auth_key}-{len(self.chat_histories[auth_key])}",
+            "id": f"chat-{auth_key}-{len(history)}",
             "object": "chat.completion",
             "created": int(time.time()),
             "model": request.model or "claude-sonnet-4-5",
@@ -182,15 +206,24 @@ class HotLoadedChatService:
             logger.info("🛑 Shutting down hot-loaded mcp-agent...")
             
             # Clean up agents
-            for agent, llm in self._agents.values():
-                await agent.__aexit__(None, None, None)
+            await self._agents.close()
             
             # Clean up MCPApp context
             if self._mcp_context:
                 await self._mcp_context.__aexit__(None, None, None)
             
             self._initialized = False
-            self._agents.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Agent pool and history sizes for monitoring"""
+        return {
+            "agent_pool": self._agents.get_stats(),
+            "chat_histories": {
+                "users": len(self.chat_histories),
+                "max_users": self.history_max_users,
+                "idle_ttl_s": self.history_idle_ttl_s
+            }
+        }
 
 
 # Global instance - stays hot across requests
@@ -76,7 +76,35 @@ async def lifespan(app: FastAPI):
         await hot_chat_service.cleanup()
     except Exception as e:
         logger.warning(f"⚠️ Error cleaning up hot chat service: {e}")
-    
+
+    # Flush pending conversation writes
+    try:
+        from .conversation_persistence import conversation_persistence
+        await conversation_persistence.shutdown()
+    except Exception as e:
+        logger.warning(f"⚠️ Error flushing conversation persistence: {e}")
+
+    # Close the shared Claude connection pool
+    try:
+        from app.services.llm.claude_provider import ClaudeProvider
+        await ClaudeProvider.close_pool()
+    except Exception as e:
+        logger.warning(f"⚠️ Error closing Claude connection pool: {e}")
+
+    # Close the shared KB tool client
+    try:
+        from .kb_service_client import kb_service_client
+        await kb_service_client.close()
+    except Exception as e:
+        logger.warning(f"⚠️ Error closing KB tool client: {e}")
+
+    # Release the shared Redis pool
+    try:
+        from app.shared.redis_client import async_redis_client
+        await async_redis_client.close()
+    except Exception as e:
+        logger.warning(f"⚠️ Error closing Redis pool: {e}")
+
     await nats_client.disconnect()
 
 # Create FastAPI app
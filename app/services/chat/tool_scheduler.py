@@ -0,0 +1,118 @@
+"""
+Scheduler for the KB tool calls an LLM emits in a single turn.
+
+Read-only tools (search, read, quest state, inventory, ...) have no side
+effects, so a run of them executes concurrently under a per-request cap
+and the turn waits for the slowest call instead of the sum of all calls.
+Mutating tools act as barriers within the turn: everything the model
+listed before them finishes first, and they run one at a time. Across
+requests, mutations for the same user and experience are serialized so
+two turns cannot interleave writes to the same game state.
+
+Results always come back in the order the model emitted the calls.
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+from app.shared.config import settings
+from .kb_service_client import NON_IDEMPOTENT_TOOLS
+
+logger = logging.getLogger(__name__)
+
+# Tools that change game or KB state
+MUTATING_TOOLS = NON_IDEMPOTENT_TOOLS
+
+ToolCall = Tuple[str, Dict[str, Any]]
+ToolExecutor = Callable[[str, Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+
+def is_read_only(tool_name: str) -> bool:
+    return tool_name not in MUTATING_TOOLS
+
+
+class ToolCallScheduler:
+    """Runs a turn's tool calls: read-only batches in parallel, mutations serialized."""
+
+    def __init__(self, max_concurrency: int = 4):
+        self.max_concurrency = max_concurrency
+        # "<user>:<experience>" -> (lock, number of holders and waiters)
+        self._mutation_locks: Dict[str, Tuple[asyncio.Lock, int]] = {}
+
+    async def run(self, calls: List[ToolCall], execute: ToolExecutor, user_id: str) -> List[Dict[str, Any]]:
+        """Execute calls and return their results in call order."""
+        results: List[Dict[str, Any]] = [{}] * len(calls)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        started = time.perf_counter()
+
+        async def read(index: int):
+            async with semaphore:
+                results[index] = await self._execute(execute, *calls[index])
+
+        batch: List[int] = []
+        for index, (tool_name, arguments) in enumerate(calls):
+            if is_read_only(tool_name):
+                batch.append(index)
+                continue
+            if batch:
+                await asyncio.gather(*(read(i) for i in batch))
+                batch = []
+            async with self._mutation_lock(self.mutation_key(user_id, arguments)):
+                results[index] = await self._execute(execute, tool_name, arguments)
+        if batch:
+            await asyncio.gather(*(read(i) for i in batch))
+
+        if len(calls) > 1:
+            logger.info(f"Executed {len(calls)} tool calls in {(time.perf_counter() - started) * 1000:.0f}ms")
+        return results
+
+    @staticmethod
+    def mutation_key(user_id: str, arguments: Dict[str, Any]) -> str:
+        return f"{user_id}:{arguments.get('experience') or '*'}"
+
+    async def _execute(self, execute: ToolExecutor, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        # One failing call must not cancel its siblings
+        try:
+            return await execute(tool_name, arguments)
+        except Exception as e:
+            logger.error(f"Tool {tool_name} failed: {e}")
+            return {"success": False, "error": str(e)}
+
+    def _mutation_lock(self, key: str) -> "_KeyedLock":
+        return _KeyedLock(self._mutation_locks, key)
+
+
+class _KeyedLock:
+    """Async context manager for one key's lock; drops the lock once unused."""
+
+    def __init__(self, locks: Dict[str, Tuple[asyncio.Lock, int]], key: str):
+        self.locks = locks
+        self.key = key
+
+    async def __aenter__(self):
+        lock, users = self.locks.get(self.key, (None, 0))
+        if lock is None:
+            lock = asyncio.Lock()
+        self.locks[self.key] = (lock, users + 1)
+        try:
+            await lock.acquire()
+        except BaseException:
+            self._release_user()
+            raise
+        return self
+
+    async def __aexit__(self, *exc):
+        self.locks[self.key][0].release()
+        self._release_user()
+
+    def _release_user(self):
+        lock, users = self.locks[self.key]
+        if users <= 1:
+            del self.locks[self.key]
+        else:
+            self.locks[self.key] = (lock, users - 1)
+
+
+# Global instance
+kb_tool_scheduler = ToolCallScheduler(max_concurrency=settings.KB_TOOL_MAX_CONCURRENCY)
@@ -12,13 +12,15 @@ import time
 import uuid
 import json
 import asyncio
+import hashlib
+from collections import OrderedDict, deque
 from typing import Dict, Any, Optional, List, AsyncGenerator
 from enum import Enum
 
 from app.services.llm.chat_service import chat_service
 from app.services.streaming_buffer import StreamBuffer
 from app.services.chat.lightweight_chat_hot import hot_chat_service
-from app.services.llm import LLMProvider
+from app.services.llm import LLMProvider, CacheablePrompt
 import httpx
 from app.shared.config import settings
 from .kb_tools import (
@@ -29,6 +31,7 @@ from .kb_tools import (
     KB_SEARCH_TOOLS,
     GENERAL_KB_TOOLS
 )
+from .tool_scheduler import kb_tool_scheduler
 from app.shared.nats_client import NATSSubjects
 from app.shared.stream_utils import merge_async_streams
 
@@ -137,6 +140,11 @@ class UnifiedChatHandler:
         self.include_aux_tools = settings.CHAT_INCLUDE_AUX_TOOLS
         self._experience_cache = {"timestamp": 0.0, "data": []}
         self._experience_cache_ttl = settings.CHAT_EXPERIENCE_CACHE_TTL_SECONDS
+        self._experience_catalog_version = 0
+        # (persona, persona text hash, catalog version, directives, aux tools) -> prompt prefix
+        self._prompt_prefix_cache: "OrderedDict[tuple, str]" = OrderedDict()
+        self._prompt_prefix_stats = {"hits": 0, "misses": 0}
+        self.streaming_routing_mode = settings.CHAT_STREAMING_ROUTING_MODE
         self._current_persona_name = "default"  # Track current persona for tool filtering
 
         # Routing tools definition (for services that need routing)
@@ -217,6 +225,8 @@ class UnifiedChatHandler:
             "avg_routing_time_ms": 0,
             "avg_total_time_ms": 0
         }
+        # Recent time-to-first-chunk samples per route (streaming only)
+        self._ttfc_samples: Dict[str, deque] = {}
 
     def _get_routing_tools_for_persona(self, persona_name: str) -> List[Dict]:
         """
@@ -521,7 +531,8 @@ class UnifiedChatHandler:
                     await self._save_conversation_messages(
                         conversation_id=conversation_id,
                         message=message,
-                        response=response_content
+                        response=response_content,
+                        wait=False  # Don't hold the response for the batch flush
                     )
                     
                     return {
@@ -583,7 +594,8 @@ class UnifiedChatHandler:
                     await self._save_conversation_messages(
                         conversation_id=conversation_id,
                         message=message,
-                        response=result.get("response", "")
+                        response=result.get("response", ""),
+                        wait=False  # Don't hold the response for the batch flush
                     )
 
                     # Add conversation_id to metadata
@@ -715,7 +727,8 @@ class UnifiedChatHandler:
                 await self._save_conversation_messages(
                     conversation_id=conversation_id,
                     message=message,
-                    response=content
+                    response=content,
+                    wait=False  # Don't hold the response for the batch flush
                 )
                 
                 return {
@@ -757,7 +770,8 @@ class UnifiedChatHandler:
             await self._save_conversation_messages(
                 conversation_id=conversation_id,
                 message=message,
-                response=result.get("response", "")
+                response=result.get("response", ""),
+                wait=False  # Don't hold the response for the batch flush
             )
             
             result["_metadata"] = {
@@ -788,6 +802,11 @@ class UnifiedChatHandler:
 
         Yields OpenAI-compatible SSE chunks for streaming, with NATS events prioritized.
 
+        Routing mode (CHAT_STREAMING_ROUTING_MODE): "streaming" streams the routing
+        call and forwards direct answers token by token, switching to tool execution
+        if the stream ends in tool_use; "buffered" waits for a full non-streaming
+        routing decision first. Time-to-first-chunk per route is in get_metrics().
+
         TODO: REFACTOR NEEDED - Code Duplication with process()
         ========================================================================
         This method shares ~60% of its code with process() (~240 lines).
@@ -842,11 +861,11 @@ class UnifiedChatHandler:
         See also: process() at line 208 (needs same refactor)
         ========================================================================
         """
-        print(f"[TTFC DEBUG] process_stream() called with message: {message[:50]}")
         start_time = time.time()
         request_id = f"chat-{uuid.uuid4()}"
         first_content_time = None  # Track when first text content is sent
         time_to_first_chunk_ms = None  # Will be set when first chunk is sent
+        route_type = None
 
         # Update metrics
         self._routing_metrics["total_requests"] += 1
@@ -864,6 +883,7 @@ class UnifiedChatHandler:
 
         # Track accumulated response for saving after streaming
         accumulated_response = ""
+        streamed_preamble = ""  # Text streamed before the model switched to a tool call
 
         # NATS world_update subscription
         # Subscribe to user-specific NATS subject for real-time state updates
@@ -902,8 +922,6 @@ class UnifiedChatHandler:
                 "timestamp": int(time.time())
             }
 
-            print(f"[TTFC DEBUG] Metadata yielded, starting routing decision...")
-
             # Make routing decision
             llm_start = time.time()
             # Prepare messages for routing decision
@@ -935,20 +953,38 @@ class UnifiedChatHandler:
             all_tools = routing_tools + kb_tools
             logger.info(f"[TOOL FILTERING STREAM] Persona '{self._current_persona_name}' gets {len(routing_tools)} routing tools + {len(kb_tools)} KB tools")
 
-            # First, make routing decision (non-streaming)
-            routing_response = await chat_service.chat_completion(
-                messages=messages,
-                system_prompt=system_prompt,  # PASS SYSTEM PROMPT AS PARAMETER!
-                tools=all_tools,
-                tool_choice={"type": "auto"},
-                temperature=0.7,
-                max_tokens=4096,
-                request_id=f"{request_id}-routing"
-            )
+            direct_streamed = False
+            if self.streaming_routing_mode == "streaming":
+                # Streaming-first routing: direct answers go out as tokens arrive,
+                # tool_use blocks at the end of the stream switch to tool execution
+                decision = {}
+                async for chunk in self._stream_routing_response(
+                    messages, system_prompt, all_tools, request_id, nats_queue, decision
+                ):
+                    yield chunk
+                routing_response = decision["routing_response"]
+                if decision.get("first_content_time"):
+                    first_content_time = decision["first_content_time"]
+                    time_to_first_chunk_ms = int((first_content_time - start_time) * 1000)
+                    logger.info(f"[{request_id}] Time to first content chunk: {time_to_first_chunk_ms}ms (streamed routing)")
+                direct_streamed = not routing_response.get("tool_calls")
+                if routing_response.get("tool_calls"):
+                    streamed_preamble = routing_response.get("response", "")
+            else:
+                # Buffered routing: full non-streaming decision before any content
+                routing_response = await chat_service.chat_completion(
+                    messages=messages,
+                    system_prompt=system_prompt,  # PASS SYSTEM PROMPT AS PARAMETER!
+                    tools=all_tools,
+                    tool_choice={"type": "auto"},
+                    temperature=0.7,
+                    max_tokens=4096,
+                    request_id=f"{request_id}-routing"
+                )
 
             llm_time = (time.time() - llm_start) * 1000
 
-            print(f"[TTFC DEBUG] LLM routing done in {llm_time:.0f}ms, has tool_calls: {bool(routing_response.get('tool_calls'))}")
+            logger.debug(f"[{request_id}] LLM routing done in {llm_time:.0f}ms, has tool_calls: {bool(routing_response.get('tool_calls'))}")
 
             # Check if LLM made tool calls
             if routing_response.get("tool_calls"):
@@ -965,7 +1001,6 @@ class UnifiedChatHandler:
                     route_type = RouteType.DIRECT  # KB tools are direct responses
                     self._routing_metrics[route_type] += 1
 
-                    print(f"[TTFC DEBUG] Taking KB TOOL streaming path: {tool_name}")
                     logger.info(f"[{request_id}] Executing KB tool in streaming mode: {tool_name}")
                     
                     # Execute KB tool
@@ -1025,7 +1060,6 @@ class UnifiedChatHandler:
                         if first_content_time is None:
                             first_content_time = time.time()
                             time_to_first_chunk_ms = int((first_content_time - start_time) * 1000)
-                            print(f"[TTFC] [{request_id}] Time to first content chunk: {time_to_first_chunk_ms}ms")
                             logger.info(f"[{request_id}] Time to first content chunk: {time_to_first_chunk_ms}ms")
 
                         yield {
@@ -1073,7 +1107,6 @@ class UnifiedChatHandler:
                     route_type = RouteType.MCP_AGENT
                     self._routing_metrics[route_type] += 1
 
-                    print(f"[TTFC DEBUG] Taking MCP AGENT streaming path")
                     logger.info(f"[{request_id}] Routing to MCP agent with simulated streaming")
                     
                     from app.models.chat import ChatRequest
@@ -1531,69 +1564,62 @@ class UnifiedChatHandler:
                 route_type = RouteType.DIRECT
                 self._routing_metrics[route_type] += 1
 
-                print(f"[TTFC DEBUG] Taking DIRECT streaming path")
                 logger.info(f"[{request_id}] Direct streaming response")
 
                 # Stream the response from LLM
                 model = routing_response.get("model", "claude-haiku-4-5")
                 content = routing_response.get("response", "")
 
-                print(f"[TTFC DEBUG] Got content from routing_response, length: {len(content)}")
-                print(f"[TTFC DEBUG] Content preview: {content[:100] if content else 'EMPTY'}")
-
                 # Track for saving after streaming
                 accumulated_response = content
 
-                # For direct responses, we already have the full content
-                # Stream it in chunks for better UX
-                chunk_size = 20  # Characters per chunk
-
-                # Use StreamBuffer for sentence-aware chunking (error case)
-                buffer = StreamBuffer(preserve_json=True, chunking_mode="phrase")
-                print(f"[TTFC DEBUG] Starting buffer.process() loop...")
-                async for chunk_text in buffer.process(content):
-                    # Check for NATS events first (prioritized over LLM chunks)
-                    while not nats_queue.empty():
-                        try:
-                            nats_event = nats_queue.get_nowait()
-                            logger.info(f"[{request_id}] Yielding NATS event: {nats_event.get('type', 'unknown')}")
-                            yield nats_event  # Yield NATS event directly
-                        except asyncio.QueueEmpty:
-                            break
-
-                    print(f"[TTFC DEBUG] Got chunk from buffer, length: {len(chunk_text)}")
-                    # Track first content chunk timing
-                    if first_content_time is None:
-                        first_content_time = time.time()
-                        time_to_first_chunk_ms = int((first_content_time - start_time) * 1000)
-                        logger.info(f"[{request_id}] Time to first content chunk: {time_to_first_chunk_ms}ms (direct)")
+                # Buffered routing already has the full content - stream it in chunks for better UX
+                # (streamed routing has already forwarded it token by token)
+                if not direct_streamed:
+                    # Use StreamBuffer for sentence-aware chunking (error case)
+                    buffer = StreamBuffer(preserve_json=True, chunking_mode="phrase")
+                    async for chunk_text in buffer.process(content):
+                        # Check for NATS events first (prioritized over LLM chunks)
+                        while not nats_queue.empty():
+                            try:
+                                nats_event = nats_queue.get_nowait()
+                                logger.info(f"[{request_id}] Yielding NATS event: {nats_event.get('type', 'unknown')}")
+                                yield nats_event  # Yield NATS event directly
+                            except asyncio.QueueEmpty:
+                                break
 
-                    yield {
-                        "id": request_id,
-                        "object": "chat.completion.chunk",
-                        "created": int(time.time()),
-                        "model": model,
-                        "choices": [{
-                            "index": 0,
-                            "delta": {"content": chunk_text},
-                            "finish_reason": None
-                        }]
-                    }
-                    # Small delay to simulate streaming
-                    await asyncio.sleep(0.01)
-                async for chunk_text in buffer.flush():
-                    yield {
-                        "id": request_id,
-                        "object": "chat.completion.chunk",
-                        "created": int(time.time()),
-                        "model": model,
-                        "choices": [{
-                            "index": 0,
-                            "delta": {"content": chunk_text},
-                            "finish_reason": None
-                        }]
-                    }
-                    await asyncio.sleep(0.01)
+                        # Track first content chunk timing
+                        if first_content_time is None:
+                            first_content_time = time.time()
+                            time_to_first_chunk_ms = int((first_content_time - start_time) * 1000)
+                            logger.info(f"[{request_id}] Time to first content chunk: {time_to_first_chunk_ms}ms (direct)")
+
+                        yield {
+                            "id": request_id,
+                            "object": "chat.completion.chunk",
+                            "created": int(time.time()),
+                            "model": model,
+                            "choices": [{
+                                "index": 0,
+                                "delta": {"content": chunk_text},
+                                "finish_reason": None
+                            }]
+                        }
+                        # Small delay to simulate streaming
+                        await asyncio.sleep(0.01)
+                    async for chunk_text in buffer.flush():
+                        yield {
+                            "id": request_id,
+                            "object": "chat.completion.chunk",
+                            "created": int(time.time()),
+                            "model": model,
+                            "choices": [{
+                                "index": 0,
+                                "delta": {"content": chunk_text},
+                                "finish_reason": None
+                            }]
+                        }
+                        await asyncio.sleep(0.01)
                 
                 # Final chunk - send metadata then done (v0.3 format)
                 if time_to_first_chunk_ms is not None:
@@ -1633,6 +1659,9 @@ class UnifiedChatHandler:
                 }
             }
         finally:
+            if time_to_first_chunk_ms is not None:
+                self._record_time_to_first_chunk(route_type, time_to_first_chunk_ms)
+
             # Clean up NATS subscription
             if nats_client and nats_subject:
                 try:
@@ -1641,6 +1670,10 @@ class UnifiedChatHandler:
                 except Exception as e:
                     logger.warning(f"[{request_id}] Error unsubscribing from NATS: {e}")
 
+            # Keep any text the client already saw before a tool call
+            if streamed_preamble and accumulated_response:
+                accumulated_response = f"{streamed_preamble}\n\n{accumulated_response}"
+
             # Save conversation messages after streaming completes (success or error)
             if accumulated_response:
                 try:
@@ -1654,9 +1687,116 @@ class UnifiedChatHandler:
                     logger.error(f"[{request_id}] Failed to save streaming conversation: {save_error}")
                     # Don't re-raise - stream already sent to client
     
-    async def get_routing_prompt(self, context: dict) -> str:
+    def _format_conversation_summary(self, context: dict) -> str:
+        """Prompt lines for conversation turns older than the history window"""
+        summary = context.get("conversation_summary")
+        if not summary:
+            return ""
+        return f"\n**Earlier in this conversation**\n{summary}\n"
+
+    async def _stream_routing_response(
+        self,
+        messages: List[Dict[str, Any]],
+        system_prompt: str,
+        tools: List[Dict],
+        request_id: str,
+        nats_queue: asyncio.Queue,
+        decision: Dict[str, Any]
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        Run the routing call as a stream, forwarding text as it arrives.
+
+        Direct answers reach the client at first-token latency instead of after
+        a complete generation. Tool calls only surface when the stream ends, so
+        on completion decision["routing_response"] holds the same shape as the
+        non-streaming chat_completion result (response, model, tool_calls) and
+        the caller dispatches tools from there. Text streamed before a tool call
+        (e.g. "Let me check that...") stays with the client as a preamble.
+        """
+        text_parts = []
+        tool_calls = []
+        model = None
+        buffer = StreamBuffer(preserve_json=True, chunking_mode="phrase")
+
+        def content_chunk(chunk_text: str) -> Dict[str, Any]:
+            return {
+                "id": request_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model or "unknown",
+                "choices": [{
+                    "index": 0,
+                    "delta": {"content": chunk_text},
+                    "finish_reason": None
+                }]
+            }
+
+        async for event in chat_service.chat_completion_stream(
+            messages=messages,
+            system_prompt=system_prompt,
+            tools=tools,
+            tool_choice={"type": "auto"},
+            temperature=0.7,
+            max_tokens=4096,
+            request_id=f"{request_id}-routing"
+        ):
+            event_type = event.get("type")
+            if event_type == "model_selection":
+                model = event.get("model")
+                continue
+            if event_type == "error":
+                # chat_service retries another provider unless content already went out
+                if event.get("fallback_available") and not text_parts:
+                    logger.warning(f"[{request_id}] Routing stream error, provider fallback: {event.get('error')}")
+                    continue
+                raise RuntimeError(event.get("error", "Routing stream failed"))
+            if event_type != "content":
+                continue
+
+            model = event.get("model", model)
+            if event.get("tool_calls"):
+                tool_calls.extend(event["tool_calls"])
+
+            text = event.get("content")
+            if not text:
+                continue
+            text_parts.append(text)
+
+            async for chunk_text in buffer.process(text):
+                # NATS events are prioritized over LLM chunks
+                while not nats_queue.empty():
+                    try:
+                        nats_event = nats_queue.get_nowait()
+                        logger.info(f"[{request_id}] Yielding NATS event: {nats_event.get('type', 'unknown')}")
+                        yield nats_event
+                    except asyncio.QueueEmpty:
+                        break
+
+                decision.setdefault("first_content_time", time.time())
+                yield content_chunk(chunk_text)
+
+        async for chunk_text in buffer.flush():
+            decision.setdefault("first_content_time", time.time())
+            yield content_chunk(chunk_text)
+
+        # Streamed tool arguments arrive as a JSON string, empty for no-arg tools
+        for tool_call in tool_calls:
+            if tool_call["function"].get("arguments") == "":
+                tool_call["function"]["arguments"] = "{}"
+
+        decision["routing_response"] = {
+            "response": "".join(text_parts),
+            "model": model or "claude-haiku-4-5",
+            "tool_calls": tool_calls or None
+        }
+
+    async def get_routing_prompt(self, context: dict) -> CacheablePrompt:
         """
         System prompt that helps LLM make routing decisions with persona.
+
+        Persona text, tool docs and the experience catalog form a stable
+        prefix, memoized per persona and catalog version; the per-request
+        context follows it so providers can cache the prefix.
         """
         # Get persona prompt and name
         user_id = context.get('user_id', 'unknown')
@@ -1671,6 +1811,39 @@ class UnifiedChatHandler:
             self._current_persona_name = "default"
         
         experiences = await self._get_experience_catalog()
+        directive_enhanced = self._is_directive_enhanced_context(context)
+        prefix_key = (
+            self._current_persona_name,
+            hashlib.sha256(persona_prompt.encode()).hexdigest(),
+            self._experience_catalog_version,
+            directive_enhanced,
+            self.include_aux_tools
+        )
+        
+        prefix = self._prompt_prefix_cache.get(prefix_key)
+        if prefix is None:
+            self._prompt_prefix_stats["misses"] += 1
+            prefix = self._build_prompt_prefix(persona_prompt, experiences, directive_enhanced)
+            self._prompt_prefix_cache[prefix_key] = prefix
+            while len(self._prompt_prefix_cache) > settings.CHAT_PROMPT_PREFIX_CACHE_MAX_ENTRIES:
+                self._prompt_prefix_cache.popitem(last=False)
+        else:
+            self._prompt_prefix_stats["hits"] += 1
+            self._prompt_prefix_cache.move_to_end(prefix_key)
+        
+        # Volatile per-request fields go after the cacheable prefix
+        context_section = f"""
+
+**Current context**
+- User: {context.get('user_id', 'unknown')}
+- Conversation: {context.get('conversation_id', 'new')}
+- Message count: {context.get('message_count', 0)}
+{self._format_conversation_summary(context)}"""
+        
+        return CacheablePrompt(prefix, context_section)
+
+    def _build_prompt_prefix(self, persona_prompt: str, experiences: List[Dict[str, Any]], directive_enhanced: bool) -> str:
+        """Stable part of the routing prompt: persona, tool docs, experience catalog."""
         if experiences:
             max_entries = 5
             experience_lines = []
@@ -1696,11 +1869,6 @@ class UnifiedChatHandler:
 - Admin commands use the same tool but MUST start with `@` (e.g., `@list waypoints`). Never execute admin logic directly.
 - After the tool responds, summarize the narrative/state updates instead of fabricating outcomes.
 
-**Current context**
-- User: {context.get('user_id', 'unknown')}
-- Conversation: {context.get('conversation_id', 'new')}
-- Message count: {context.get('message_count', 0)}
-
 **Available experiences**
 {experience_list}
 
@@ -1760,8 +1928,8 @@ Use these tools to interact with the game state when talking to players:
 - Stay in character - use tools naturally, don't mention them explicitly
 """
 
-        # Check for directive-enhanced context and add JSON-RPC directive instructions
-        if self._is_directive_enhanced_context(context):
+        # Add JSON-RPC directive instructions for directive-enhanced contexts
+        if directive_enhanced:
             directive_section = """
 
 DIRECTIVE-ENHANCED RESPONSES:
@@ -1792,12 +1960,9 @@ Guidelines:
         # Check if persona prompt has {tools_section} placeholder
         if "{tools_section}" in persona_prompt:
             # Replace the placeholder with the tools section
-            final_prompt = persona_prompt.replace("{tools_section}", tools_section)
-        else:
-            # No placeholder, append tools section after persona
-            final_prompt = f"{persona_prompt}\n\n{tools_section}"
-        
-        return final_prompt
+            return persona_prompt.replace("{tools_section}", tools_section)
+        # No placeholder, append tools section after persona
+        return f"{persona_prompt}\n\n{tools_section}"
 
     async def _get_experience_catalog(self) -> List[Dict[str, Any]]:
         """Fetch and cache experience metadata for prompt construction."""
@@ -1823,6 +1988,8 @@ Guidelines:
         except Exception as e:
             logger.warning(f"Failed to fetch experience catalog: {e}")
 
+        if experiences != self._experience_cache["data"]:
+            self._experience_catalog_version += 1  # Invalidates memoized prompt prefixes
         self._experience_cache = {"timestamp": now, "data": experiences}
         return experiences
     
@@ -1880,22 +2047,25 @@ Guidelines:
         return tool_args_raw
     
     async def _execute_kb_tools(self, kb_calls: list, auth: dict, request_id: str) -> list:
-        """Execute KB tool calls and return results."""
+        """Execute KB tool calls and return results in call order."""
         kb_executor = KBToolExecutor(auth)
-        tool_results = []
+        calls = []
         
         for tool_call in kb_calls:
             tool_name = tool_call["function"]["name"]
             tool_args = self._parse_tool_arguments(tool_call)
             
             logger.info(f"[{request_id}] Executing KB tool: {tool_name} with args: {tool_args}")
-            result = await kb_executor.execute_tool(tool_name, tool_args)
-            tool_results.append({
-                "tool": tool_name,
-                "result": result
-            })
+            calls.append((tool_name, tool_args))
+        
+        # Independent read-only calls run concurrently; mutations stay ordered
+        user_id = auth.get("user_id") or auth.get("sub") or "unknown"
+        results = await kb_tool_scheduler.run(calls, kb_executor.execute_tool, user_id)
         
-        return tool_results
+        return [
+            {"tool": tool_name, "result": result}
+            for (tool_name, _), result in zip(calls, results)
+        ]
     
     async def build_context(self, auth: dict, additional_context: Optional[dict] = None) -> dict:
         """
@@ -1920,19 +2090,21 @@ Guidelines:
                 # First check if the conversation exists
                 # Use consistent user_id extraction
                 user_id = auth.get("user_id") or auth.get("sub") or "unknown"
-                conversation = chat_conversation_store.get_conversation(user_id, conversation_id)
+                conversation = await asyncio.to_thread(
+                    chat_conversation_store.get_conversation, user_id, conversation_id
+                )
                 
                 if conversation is None:
                     # Conversation doesn't exist - don't use this invalid ID
                     logger.info(f"Conversation {conversation_id} not found, will create new conversation")
                     context["conversation_id"] = None  # Don't preserve invalid IDs
                 else:
-                    # Load messages for the existing conversation
-                    messages = chat_conversation_store.get_messages(conversation_id)
+                    # Token-budgeted tail of the conversation (cached, write-through on add_message)
+                    history = await chat_conversation_store.history_cache.get_history(conversation_id)
                     
                     # Convert to conversation history format
                     conversation_history = []
-                    for msg in messages:
+                    for msg in history["messages"]:
                         conversation_history.append({
                             "role": msg["role"],
                             "content": msg["content"],
@@ -1940,9 +2112,14 @@ Guidelines:
                         })
                     
                     context["conversation_history"] = conversation_history
-                    context["message_count"] = len(conversation_history)
+                    context["message_count"] = history["total_count"]
+                    if history["summary"]:
+                        context["conversation_summary"] = history["summary"]
                     
-                    logger.info(f"Loaded {len(conversation_history)} messages for conversation {conversation_id}")
+                    logger.info(
+                        f"Loaded {len(conversation_history)}/{history['total_count']} messages "
+                        f"for conversation {conversation_id}"
+                    )
                 
             except Exception as e:
                 logger.error(f"Error loading conversation history: {e}")
@@ -2005,32 +2182,54 @@ Guidelines:
             # Fallback to user-based conversation ID
             return f"{user_id}_fallback_{int(time.time())}"
 
-    async def _save_conversation_messages(self, conversation_id: str, message: str, response: str) -> None:
+    async def _save_conversation_messages(
+        self,
+        conversation_id: str,
+        message: str,
+        response: str,
+        wait: bool = True
+    ) -> None:
         """Save user message and AI response to an existing conversation.
 
         This method assumes the conversation already exists and just adds the messages.
+        With wait=False the turn is only queued; the batched write completes after
+        the caller has returned its response.
         """
         try:
-            from .conversation_store import chat_conversation_store
+            from .conversation_persistence import conversation_persistence
 
-            # Save user message first
-            await asyncio.create_task(asyncio.to_thread(
-                chat_conversation_store.add_message,
-                conversation_id, "user", message
-            ))
+            # User message and AI response go out together in a batched transaction
+            turn = [
+                {"role": "user", "content": message},
+                {"role": "assistant", "content": response}
+            ]
+            if not wait:
+                future = await conversation_persistence.submit_turn(conversation_id, turn)
+                future.add_done_callback(lambda f: self._log_saved_turn(conversation_id, f))
+                return
 
-            # Save AI response
-            await asyncio.create_task(asyncio.to_thread(
-                chat_conversation_store.add_message,
-                conversation_id, "assistant", response
-            ))
-
-            logger.info(f"Saved messages to conversation {conversation_id}")
+            saved = await conversation_persistence.save_turn(conversation_id, turn)
+            self._log_saved_turn(conversation_id, saved=saved)
 
         except Exception as e:
             logger.error(f"Error saving conversation messages: {e}")
             # Don't fail the whole request if conversation saving fails
 
+    @staticmethod
+    def _log_saved_turn(conversation_id: str, future: Optional[asyncio.Future] = None, saved: Optional[list] = None):
+        """Log the outcome of a persisted turn (from its result or its future)"""
+        if future is not None:
+            if future.cancelled():
+                return
+            if future.exception() is not None:
+                logger.error(f"Error saving conversation messages: {future.exception()}")
+                return
+            saved = future.result()
+        if None in saved:
+            logger.warning(f"Conversation {conversation_id} not found, messages not saved")
+            return
+        logger.info(f"Saved messages to conversation {conversation_id}")
+
     async def _save_conversation(
         self,
         message: str,
@@ -2091,14 +2290,59 @@ Guidelines:
             (avg_total * (total - 1) + total_time_ms) / total
         )
     
+    def _record_time_to_first_chunk(self, route_type: Optional[RouteType], ttfc_ms: int):
+        """Record a streaming time-to-first-chunk sample for the route taken"""
+        route = route_type.value if route_type else "unknown"
+        samples = self._ttfc_samples.get(route)
+        if samples is None:
+            samples = self._ttfc_samples[route] = deque(maxlen=500)
+        samples.append(ttfc_ms)
+
+    def _time_to_first_chunk_summary(self) -> dict:
+        """Count/avg/p50/p95 of recent time-to-first-chunk samples per route"""
+        summary = {}
+        for route, samples in self._ttfc_samples.items():
+            ordered = sorted(samples)
+            summary[route] = {
+                "count": len(ordered),
+                "avg_ms": round(sum(ordered) / len(ordered), 1),
+                "p50_ms": ordered[len(ordered) // 2],
+                "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+            }
+        return summary
+
     def get_metrics(self) -> dict:
         """Get routing metrics for monitoring"""
+        from .conversation_store import chat_conversation_store
+        from .kb_service_client import kb_service_client
+        store_caches = chat_conversation_store.get_cache_stats()
+        kb_tool_calls = kb_service_client.get_stats()
+        hot_agents = self.mcp_hot_service.get_stats()
+        prompt_prefix_cache = {
+            **self._prompt_prefix_stats,
+            "entries": len(self._prompt_prefix_cache),
+            "experience_catalog_version": self._experience_catalog_version
+        }
+
         total = self._routing_metrics["total_requests"]
         if total == 0:
-            return self._routing_metrics
+            return {
+                **self._routing_metrics,
+                "streaming_routing_mode": self.streaming_routing_mode,
+                "conversation_store_caches": store_caches,
+                "kb_tool_calls": kb_tool_calls,
+                "prompt_prefix_cache": prompt_prefix_cache,
+                "hot_agents": hot_agents
+            }
             
         return {
             **self._routing_metrics,
+            "streaming_routing_mode": self.streaming_routing_mode,
+            "conversation_store_caches": store_caches,
+            "kb_tool_calls": kb_tool_calls,
+            "prompt_prefix_cache": prompt_prefix_cache,
+            "hot_agents": hot_agents,
+            "time_to_first_chunk": self._time_to_first_chunk_summary(),
             "distribution": {
                 RouteType.DIRECT: f"{(self._routing_metrics[RouteType.DIRECT] / total * 100):.1f}%",
                 RouteType.MCP_AGENT: f"{(self._routing_metrics[RouteType.MCP_AGENT] / total * 100):.1f}%",
@@ -0,0 +1,151 @@
+"""
+Auth identity -> User.id cache for the chat conversation store.
+
+Resolving a user costs up to three sequential SELECTs (email, UUID,
+email-as-id). The mapping almost never changes, so the store caches it
+per identity ("email:<email>" or "id:<user_id>") in an in-process LRU with
+an optional shared Redis tier. Callers are synchronous (the store runs in
+worker threads), so this cache is too.
+"""
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from app.shared.logging import setup_service_logger
+from app.shared.redis_client import redis_client
+
+logger = setup_service_logger("chat_user_resolution_cache")
+
+
+class UserResolutionCache:
+    """LRU + TTL (optionally Redis-backed) map of identity key to User.id."""
+
+    REDIS_PREFIX = "chat:user_res:"
+    REDIS_RECHECK_S = 60.0
+
+    def __init__(self, max_entries: int = 10000, ttl_s: int = 300, use_redis: bool = True):
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self.use_redis = use_redis
+
+        self._lock = threading.Lock()
+        # identity key -> (expires_at, user UUID)
+        self._entries: "OrderedDict[str, Tuple[float, uuid.UUID]]" = OrderedDict()
+        self._redis_available: Optional[bool] = None
+        self._redis_checked_at = 0.0
+        self._stats = {"hits": 0, "redis_hits": 0, "misses": 0, "stores": 0, "evictions": 0, "invalidations": 0}
+
+    @staticmethod
+    def identity_key(kind: str, value: str) -> str:
+        return f"{kind}:{value}"
+
+    def get(self, key: str) -> Optional[uuid.UUID]:
+        """Return the cached User.id for an identity key, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry:
+                expires_at, user_uuid = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return user_uuid
+                del self._entries[key]
+
+        if self._redis_ready():
+            try:
+                stored = redis_client.get(self.REDIS_PREFIX + key)
+            except Exception as e:
+                logger.warning(f"User resolution cache Redis read failed: {e}")
+                stored = None
+            if stored:
+                user_uuid = uuid.UUID(stored)
+                self._store_local(key, user_uuid)
+                with self._lock:
+                    self._stats["redis_hits"] += 1
+                return user_uuid
+
+        with self._lock:
+            self._stats["misses"] += 1
+        return None
+
+    def set(self, key: str, user_uuid: uuid.UUID) -> None:
+        """Cache a resolved identity in both tiers."""
+        self._store_local(key, user_uuid)
+        with self._lock:
+            self._stats["stores"] += 1
+
+        if self._redis_ready():
+            try:
+                redis_client.set(self.REDIS_PREFIX + key, str(user_uuid), ex=self.ttl_s)
+            except Exception as e:
+                logger.warning(f"User resolution cache Redis write failed: {e}")
+
+    def invalidate_user(self, user_uuid: uuid.UUID, identities: Iterable[str] = ()) -> int:
+        """
+        Drop every entry resolving to user_uuid after the user changed.
+
+        identities are extra identity keys (e.g. the user's old email) to clear
+        from Redis; the UUID's own keys and local matches are always cleared.
+
+        Returns:
+            Number of in-process entries removed
+        """
+        with self._lock:
+            keys = [k for k, (_, cached) in self._entries.items() if cached == user_uuid]
+            for key in keys:
+                del self._entries[key]
+            self._stats["invalidations"] += 1
+
+        if self._redis_ready():
+            redis_keys = {self.REDIS_PREFIX + k for k in (*keys, *identities, self.identity_key("id", str(user_uuid)))}
+            try:
+                # Raw client: RedisClient.delete is the async variant
+                redis_client.client.delete(*redis_keys)
+            except Exception as e:
+                logger.warning(f"User resolution cache Redis delete failed: {e}")
+        return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return cache counters."""
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["redis_hits"] + self._stats["misses"]
+            hits = self._stats["hits"] + self._stats["redis_hits"]
+            return {
+                **self._stats,
+                "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_s": self.ttl_s,
+                "redis_tier": bool(self._redis_available)
+            }
+
+    def _store_local(self, key: str, user_uuid: uuid.UUID) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_s, user_uuid)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def _redis_ready(self) -> bool:
+        """Check Redis availability, re-probing at most every REDIS_RECHECK_S."""
+        if not self.use_redis:
+            return False
+        now = time.monotonic()
+        if self._redis_available is None or (
+            not self._redis_available and now - self._redis_checked_at >= self.REDIS_RECHECK_S
+        ):
+            self._redis_checked_at = now
+            try:
+                self._redis_available = redis_client.is_connected()
+            except Exception:
+                self._redis_available = False
+            if not self._redis_available:
+                logger.info("User resolution cache running without Redis tier")
+        return self._redis_available
@@ -4,15 +4,12 @@ AR Locations API endpoints.
 Provides waypoint and location data for AR experiences.
 """
 from fastapi import APIRouter, HTTPException, Query
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List
 import logging
 
 from app.services.locations.waypoint_reader import waypoint_reader
 from app.services.locations.waypoint_transformer import transform_to_unity_format
-from app.services.locations.distance_utils import (
-    is_within_radius,
-    calculate_distance
-)
+from app.services.locations.spatial_index import get_spatial_index
 
 logger = logging.getLogger(__name__)
 
@@ -69,51 +66,10 @@ async def get_nearby_locations(
         # Load all waypoints for this experience from KB
         waypoints = await waypoint_reader.get_waypoints_for_experience(experience)
 
-        # Filter waypoints by distance and calculate distances for sorting
-        nearby_waypoints: List[Tuple[Dict[str, Any], float]] = []
-        non_gps_waypoints: List[Dict[str, Any]] = []
-
-        for index, waypoint in enumerate(waypoints):
-            if not isinstance(waypoint, dict):
-                logger.warning(
-                    "Skipping waypoint at index %s: expected dict but got %s",
-                    index,
-                    type(waypoint)
-                )
-                continue
-
-            location = waypoint.get("location")
-            if isinstance(location, dict):
-                lat = location.get("lat")
-                lng = location.get("lng")
-
-                if isinstance(lat, (int, float)) and isinstance(lng, (int, float)):
-                    try:
-                        if is_within_radius(center_lat, center_lng, lat, lng, radius):
-                            distance = calculate_distance(center_lat, center_lng, lat, lng)
-                            nearby_waypoints.append((waypoint, distance))
-                    except Exception as distance_error:
-                        logger.warning(
-                            "Skipping waypoint %s due to distance calculation error: %s",
-                            waypoint.get("id", "<unknown>"),
-                            distance_error
-                        )
-                else:
-                    logger.debug(
-                        "Waypoint %s has non-numeric GPS coordinates: %s",
-                        waypoint.get("id", "<unknown>"),
-                        location
-                    )
-                    non_gps_waypoints.append(waypoint)
-            else:
-                # Pathway waypoints (no GPS) - include separately after GPS-filtered entries
-                non_gps_waypoints.append(waypoint)
-
-        # Sort GPS-based waypoints by distance (closest first)
-        # Note: Pathway waypoints (non-GPS) are excluded from GPS-based queries
-        # They should only be included when part of an active mission context
-        nearby_waypoints.sort(key=lambda item: item[1])
-        ordered_waypoints = [waypoint for waypoint, _ in nearby_waypoints]
+        # Pathway waypoints (non-GPS) are not indexed - they are excluded from
+        # GPS-based queries and only included as part of an active mission context
+        index = get_spatial_index(experience, waypoints)
+        ordered_waypoints = [waypoint for waypoint, _ in index.query_radius(center_lat, center_lng, radius)]
 
         unity_locations: List[Dict[str, Any]] = []
         for waypoint in ordered_waypoints:
@@ -11,6 +11,8 @@ import logging
 
 from app.shared.security import get_current_auth_legacy as get_current_auth
 from .kb_agent import kb_agent
+from .command_registry import get_command_registry_stats, markdown_command_registry
+from .command_intent_matcher import command_match_metrics
 
 logger = logging.getLogger(__name__)
 
@@ -167,7 +169,10 @@ async def agent_status(
                     "decision_making",
                     "information_synthesis"
                 ],
-                "supported_modes": ["decision", "synthesis", "validation"]
+                "supported_modes": ["decision", "synthesis", "validation"],
+                "command_registry": get_command_registry_stats(),
+                "command_matching": command_match_metrics.get_stats(),
+                "command_response_cache": kb_agent.response_cache.get_stats() if kb_agent.response_cache else None
             }
         }
 
@@ -180,9 +185,13 @@ async def clear_cache(
     auth: dict = Depends(get_current_auth)
 ) -> Dict[str, Any]:
     """
-    Clear the KB agent's rule cache.
+    Clear the KB agent's rule cache and compiled markdown commands.
     """
     try:
+        markdown_command_registry.invalidate()
+        if kb_agent.response_cache:
+            kb_agent.response_cache.invalidate()
+
         if hasattr(kb_agent, 'rule_cache'):
             cache_size = len(kb_agent.rule_cache)
             kb_agent.rule_cache.clear()
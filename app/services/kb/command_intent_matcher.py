@@ -0,0 +1,202 @@
+"""
+Command Intent Matcher for GAIA Experiences
+
+Deterministic matching of player messages against the names and aliases
+declared in markdown command frontmatter. Runs before the LLM command
+classifier in KBIntelligentAgent._detect_command_type; only messages it
+can't match confidently go to the LLM.
+
+Architecture:
+- Normalize: lowercase, strip punctuation, drop leading filler ("please", "i want to")
+- Stage 1 (exact): whole message equals a name/alias            -> confidence 1.0
+- Stage 2 (token trie): message starts with a name/alias phrase -> confidence 0.95
+- Stage 3 (prefix): first word is an unambiguous prefix (>= 3 chars) of a name/alias
+- Stage 4 (fuzzy): first word is close to a single-word name/alias (typos)
+- Below the confidence threshold -> LLM fallback
+
+Author: GAIA Platform Team
+Created: 2026-10-16
+"""
+
+import re
+import logging
+from difflib import SequenceMatcher
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Leading words that carry no intent ("please go north", "i want to look")
+FILLER_WORDS = frozenset({
+    "please", "i", "id", "i'd", "want", "wanna", "would", "like", "to", "lets", "let's",
+    "can", "could", "you", "me", "try", "now", "then", "just", "ok", "okay"
+})
+
+EXACT_CONFIDENCE = 1.0
+TOKEN_CONFIDENCE = 0.95
+PREFIX_CONFIDENCE = 0.85
+FUZZY_MIN_RATIO = 0.8
+MIN_PREFIX_LENGTH = 3
+
+_PUNCTUATION = re.compile(r"[^\w@\-' ]+")
+
+
+def normalize_phrase(text: str) -> List[str]:
+    """Lowercase, strip punctuation and split into words (hyphen/underscore split too)."""
+    text = _PUNCTUATION.sub(" ", text.lower()).replace("_", " ").replace("-", " ")
+    return text.split()
+
+
+class CommandIntentMatcher:
+    """
+    Local intent matcher over one experience's markdown commands.
+
+    Key Responsibilities:
+    - Index command names and aliases as word sequences (token trie)
+    - Match a message through exact / trie / prefix / fuzzy stages
+    - Report the command and a confidence score, or None
+    """
+
+    def __init__(self, command_keywords: Dict[str, List[str]]):
+        """
+        Build matcher.
+
+        Args:
+            command_keywords: Command name -> [name, *aliases]
+        """
+        # Phrase (tuple of words) -> commands declaring it. Command names are
+        # kept separately so they win over another command's alias.
+        self._phrases: Dict[Tuple[str, ...], Set[str]] = {}
+        self._names: Dict[Tuple[str, ...], str] = {}
+        self._trie: Dict[str, Any] = {}
+
+        for command, keywords in command_keywords.items():
+            name_phrase = tuple(normalize_phrase(command.lstrip("@")))
+            if name_phrase:
+                self._names[name_phrase] = command
+            for keyword in keywords:
+                phrase = tuple(normalize_phrase(keyword.lstrip("@")))
+                if not phrase:
+                    continue
+                self._phrases.setdefault(phrase, set()).add(command)
+                node = self._trie
+                for word in phrase:
+                    node = node.setdefault(word, {})
+                node[None] = phrase  # terminal marker
+
+        self._single_words = sorted(p[0] for p in self._phrases if len(p) == 1)
+
+    def _resolve(self, phrase: Tuple[str, ...]) -> Optional[str]:
+        """Command for a phrase, or None if it is ambiguous."""
+        if phrase in self._names:
+            return self._names[phrase]
+        commands = self._phrases.get(phrase, set())
+        return next(iter(commands)) if len(commands) == 1 else None
+
+    def match(self, message: str) -> Tuple[Optional[str], float, str]:
+        """
+        Match a player message to a command.
+
+        Returns:
+            (command, confidence, stage) - command is None when nothing matched
+        """
+        words = normalize_phrase(message)
+        while words and words[0] in FILLER_WORDS:
+            words = words[1:]
+        if not words:
+            return None, 0.0, "none"
+
+        # Stage 1: exact
+        command = self._resolve(tuple(words))
+        if command:
+            return command, EXACT_CONFIDENCE, "exact"
+
+        # Stage 2: longest leading phrase in the trie ("go north" -> go)
+        node, longest = self._trie, None
+        for word in words:
+            node = node.get(word)
+            if node is None:
+                break
+            if None in node:
+                longest = node[None]
+        if longest:
+            command = self._resolve(longest)
+            if command:
+                return command, TOKEN_CONFIDENCE, "token"
+
+        first = words[0]
+
+        # Stage 3: unambiguous prefix ("inv" -> inventory)
+        if len(first) >= MIN_PREFIX_LENGTH:
+            candidates = {
+                self._resolve((word,)) for word in self._single_words if word.startswith(first)
+            }
+            if len(candidates) == 1 and None not in candidates:
+                return candidates.pop(), PREFIX_CONFIDENCE, "prefix"
+
+        # Stage 4: fuzzy ("inventroy" -> inventory); best command must be clearly ahead
+        scores: Dict[str, float] = {}
+        for word in self._single_words:
+            command = self._resolve((word,))
+            if command is None:
+                continue
+            ratio = SequenceMatcher(None, first, word).ratio()
+            if ratio > scores.get(command, 0.0):
+                scores[command] = ratio
+        if scores:
+            ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+            best_command, best_ratio = ranked[0]
+            runner_up = ranked[1][1] if len(ranked) > 1 else 0.0
+            if best_ratio >= FUZZY_MIN_RATIO and best_ratio - runner_up >= 0.1:
+                return best_command, round(best_ratio * 0.9, 3), "fuzzy"
+
+        return None, 0.0, "none"
+
+
+class CommandMatchMetrics:
+    """
+    Hit/miss counters for local matching vs. LLM classification.
+
+    Tracks how many classifier calls the matcher saved and the latency of
+    each path, so the estimated time saved can be reported.
+    """
+
+    def __init__(self):
+        self._stats = {
+            "local_hits": 0,
+            "llm_fallbacks": 0,
+            "local_ms_total": 0.0,
+            "llm_ms_total": 0.0
+        }
+        self._hits_by_stage: Dict[str, int] = {}
+
+    def record_local(self, stage: str, elapsed_ms: float) -> None:
+        self._stats["local_hits"] += 1
+        self._stats["local_ms_total"] += elapsed_ms
+        self._hits_by_stage[stage] = self._hits_by_stage.get(stage, 0) + 1
+
+    def record_llm(self, elapsed_ms: float) -> None:
+        self._stats["llm_fallbacks"] += 1
+        self._stats["llm_ms_total"] += elapsed_ms
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return matching metrics."""
+        hits = self._stats["local_hits"]
+        fallbacks = self._stats["llm_fallbacks"]
+        total = hits + fallbacks
+        avg_local = self._stats["local_ms_total"] / hits if hits else 0.0
+        avg_llm = self._stats["llm_ms_total"] / fallbacks if fallbacks else 0.0
+        return {
+            "local_hits": hits,
+            "llm_fallbacks": fallbacks,
+            "hit_rate": round(hits / total, 3) if total else 0.0,
+            "hits_by_stage": dict(self._hits_by_stage),
+            "avg_local_ms": round(avg_local, 3),
+            "avg_llm_ms": round(avg_llm, 1),
+            "llm_calls_saved": hits,
+            "estimated_ms_saved": round(hits * max(avg_llm - avg_local, 0.0), 1)
+        }
+
+
+# Global metrics shared by all experiences
+command_match_metrics = CommandMatchMetrics()
+
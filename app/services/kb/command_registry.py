@@ -10,9 +10,26 @@ Usage:
 
     schemas = get_command_schemas()
     # Returns dict of command name -> JSON Schema
+
+Also holds the compiled registry of markdown commands (game-logic/ and
+admin-logic/) used by the LLM command path, so command detection and
+markdown loading don't touch the disk per request:
+
+    from app.services.kb.command_registry import markdown_command_registry
+
+    commands = markdown_command_registry.get_commands("wylding-woods")
 """
 
-from typing import Dict, Any
+import time
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+from app.shared.config import settings
+from .command_intent_matcher import CommandIntentMatcher
+
+logger = logging.getLogger(__name__)
 
 
 # JSON Schema definitions for all fast commands
@@ -313,3 +330,272 @@ def get_commands_schema_response(timestamp: int) -> Dict[str, Any]:
         "schema_version": "1.0",
         "commands": COMMAND_SCHEMAS
     }
+
+
+# ===== MARKDOWN COMMAND REGISTRY =====
+
+# (dir_name, default_admin_required) - admin commands default to requiring permissions
+LOGIC_DIRECTORIES: List[Tuple[str, bool]] = [
+    ("game-logic", False),
+    ("admin-logic", True)
+]
+
+
+@dataclass
+class MarkdownCommand:
+    """A command defined by a markdown file with frontmatter."""
+    name: str
+    aliases: List[str]
+    requires_admin: bool
+    logic_dir: str
+    path: Path
+
+    @property
+    def keywords(self) -> List[str]:
+        """Command name followed by its aliases."""
+        return [self.name] + self.aliases
+
+
+@dataclass
+class _CompiledExperience:
+    commands: Dict[str, MarkdownCommand] = field(default_factory=dict)
+    # (logic_dir, file stem) -> markdown body
+    bodies: Dict[Tuple[str, str], str] = field(default_factory=dict)
+    # Directory and file mtimes the registry was compiled from
+    mtimes: Dict[Path, int] = field(default_factory=dict)
+    checked_at: float = 0.0
+    matcher: Optional[CommandIntentMatcher] = None
+
+
+def parse_command_frontmatter(content: str, default_admin: bool) -> Optional[Tuple[str, List[str], bool]]:
+    """
+    Extract command name, aliases and admin requirement from frontmatter.
+
+    Returns:
+        (command_name, aliases, requires_admin), or None if the file doesn't
+        declare a command
+    """
+    if not content.startswith("---"):
+        return None
+    frontmatter_end = content.find("---", 3)
+    if frontmatter_end == -1:
+        return None
+    frontmatter = content[3:frontmatter_end].strip()
+
+    command_name = None
+    aliases: List[str] = []
+    requires_admin = default_admin
+
+    for line in frontmatter.split("\n"):
+        line = line.strip()
+        if line.startswith("command:"):
+            command_name = line.split(":", 1)[1].strip()
+        elif line.startswith("aliases:"):
+            # Parse aliases list: [move, walk, travel]
+            aliases_str = line.split(":", 1)[1].strip()
+            if aliases_str.startswith("[") and aliases_str.endswith("]"):
+                aliases_str = aliases_str[1:-1]
+                aliases = [a.strip() for a in aliases_str.split(",")]
+        elif line.startswith("requires_admin:"):
+            admin_val = line.split(":", 1)[1].strip().lower()
+            requires_admin = admin_val == "true"
+
+    if not command_name:
+        return None
+    return command_name, aliases, requires_admin
+
+
+class MarkdownCommandRegistry:
+    """
+    Per-experience compiled registry of markdown commands.
+
+    Key Responsibilities:
+    - Parse game-logic/*.md and admin-logic/*.md once per experience
+    - Serve names, aliases, admin flags and markdown bodies from memory
+    - Recompile when file mtimes change (checked at most every
+      check_interval_s) or when invalidated by KB write / git sync hooks
+    """
+
+    def __init__(self, kb_root: Optional[Path] = None, check_interval_s: Optional[float] = None):
+        """
+        Initialize registry.
+
+        Args:
+            kb_root: KB root (defaults to settings.KB_PATH at lookup time)
+            check_interval_s: Minimum seconds between mtime checks
+        """
+        self.kb_root = kb_root
+        self.check_interval_s = (
+            settings.KB_COMMAND_REGISTRY_CHECK_INTERVAL_S
+            if check_interval_s is None else check_interval_s
+        )
+        self._experiences: Dict[Tuple[Path, str], _CompiledExperience] = {}
+        self._stats = {
+            "lookups": 0,
+            "compiles": 0,
+            "mtime_checks": 0,
+            "invalidations": 0,
+            "last_compile_ms": 0.0
+        }
+
+    def _root(self) -> Path:
+        return self.kb_root or Path(settings.KB_PATH)
+
+    # ===== LOOKUPS =====
+
+    def get_commands(self, experience: str) -> Dict[str, MarkdownCommand]:
+        """Get all markdown commands for an experience, keyed by command name."""
+        return self._get_compiled(experience).commands
+
+    def get_markdown(self, experience: str, command_type: str, is_admin_command: bool = False) -> Optional[str]:
+        """
+        Get the markdown body of {logic_dir}/{command_type}.md.
+
+        Returns:
+            Markdown content or None if no such file exists
+        """
+        logic_dir = "admin-logic" if is_admin_command else "game-logic"
+        return self._get_compiled(experience).bodies.get((logic_dir, command_type))
+
+    def get_intent_matcher(self, experience: str) -> CommandIntentMatcher:
+        """
+        Get the local intent matcher for an experience's player commands.
+
+        Admin commands are excluded; they are only reachable with an '@' prefix.
+        """
+        compiled = self._get_compiled(experience)
+        if compiled.matcher is None:
+            compiled.matcher = CommandIntentMatcher({
+                name: command.keywords
+                for name, command in compiled.commands.items()
+                if not command.requires_admin
+            })
+        return compiled.matcher
+
+    def _get_compiled(self, experience: str) -> _CompiledExperience:
+        self._stats["lookups"] += 1
+        key = (self._root(), experience)
+        compiled = self._experiences.get(key)
+
+        if compiled is None:
+            compiled = self._compile(key[0], experience)
+            self._experiences[key] = compiled
+        elif time.monotonic() - compiled.checked_at >= self.check_interval_s:
+            self._stats["mtime_checks"] += 1
+            if self._scan_mtimes(key[0], experience) != compiled.mtimes:
+                compiled = self._compile(key[0], experience)
+                self._experiences[key] = compiled
+            else:
+                compiled.checked_at = time.monotonic()
+
+        return compiled
+
+    # ===== COMPILATION =====
+
+    def _scan_mtimes(self, kb_root: Path, experience: str) -> Dict[Path, int]:
+        """Stat logic directories and their markdown files (no reads)."""
+        mtimes: Dict[Path, int] = {}
+        for dir_name, _ in LOGIC_DIRECTORIES:
+            logic_dir = kb_root / "experiences" / experience / dir_name
+            try:
+                mtimes[logic_dir] = logic_dir.stat().st_mtime_ns
+                for md_file in logic_dir.glob("*.md"):
+                    mtimes[md_file] = md_file.stat().st_mtime_ns
+            except OSError:
+                continue
+        return mtimes
+
+    def _compile(self, kb_root: Path, experience: str) -> _CompiledExperience:
+        start = time.perf_counter()
+        compiled = _CompiledExperience(mtimes=self._scan_mtimes(kb_root, experience))
+
+        for dir_name, default_admin in LOGIC_DIRECTORIES:
+            logic_dir = kb_root / "experiences" / experience / dir_name
+
+            if not logic_dir.exists():
+                if dir_name == "game-logic":
+                    logger.warning(f"Game logic directory not found: {logic_dir}")
+                continue
+
+            try:
+                for md_file in logic_dir.glob("*.md"):
+                    try:
+                        content = md_file.read_text()
+                        compiled.bodies[(dir_name, md_file.stem)] = content
+
+                        parsed = parse_command_frontmatter(content, default_admin)
+                        if parsed:
+                            command_name, aliases, requires_admin = parsed
+                            compiled.commands[command_name] = MarkdownCommand(
+                                name=command_name,
+                                aliases=aliases,
+                                requires_admin=requires_admin,
+                                logic_dir=dir_name,
+                                path=md_file
+                            )
+                            cmd_type = "admin" if requires_admin else "player"
+                            logger.info(f"Discovered {cmd_type} command '{command_name}' with aliases: {aliases}")
+
+                    except Exception as e:
+                        logger.error(f"Error parsing command file {md_file}: {e}")
+                        continue
+
+            except Exception as e:
+                logger.error(f"Error scanning {dir_name} directory for {experience}: {e}")
+
+        compiled.checked_at = time.monotonic()
+        self._stats["compiles"] += 1
+        self._stats["last_compile_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        logger.info(
+            f"Compiled command registry for '{experience}': {len(compiled.commands)} commands "
+            f"in {self._stats['last_compile_ms']}ms"
+        )
+        return compiled
+
+    # ===== INVALIDATION =====
+
+    def invalidate(self, experience: Optional[str] = None) -> None:
+        """Drop the compiled registry for an experience (or all experiences)."""
+        if experience is None:
+            self._experiences.clear()
+        else:
+            for key in [k for k in self._experiences if k[1] == experience]:
+                del self._experiences[key]
+        self._stats["invalidations"] += 1
+
+    def invalidate_path(self, path: str) -> bool:
+        """
+        Invalidate the experience owning a KB-relative path, if it is a command file.
+
+        Returns:
+            True if the path belonged to a logic directory
+        """
+        parts = Path(path.lstrip("/")).parts
+        logic_dirs = {dir_name for dir_name, _ in LOGIC_DIRECTORIES}
+        if len(parts) >= 3 and parts[0] == "experiences" and parts[2] in logic_dirs:
+            self.invalidate(parts[1])
+            return True
+        return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return registry counters."""
+        return {
+            **self._stats,
+            "experiences": len(self._experiences),
+            "commands": sum(len(c.commands) for c in self._experiences.values()),
+            "check_interval_s": self.check_interval_s
+        }
+
+
+# Global instance shared by the KB agent and the KB write endpoints
+markdown_command_registry = MarkdownCommandRegistry()
+
+
+def get_command_registry_stats() -> Dict[str, Any]:
+    """
+    Get markdown command registry stats for monitoring.
+
+    Returns:
+        Registry counters (lookups, compiles, cached experiences, ...)
+    """
+    return markdown_command_registry.get_stats()
@@ -0,0 +1,220 @@
+"""
+Command Response Cache for GAIA Experiences
+
+Caches the outcome of LLM-interpreted markdown commands so a command run
+against an identical state slice doesn't go back to the model.
+
+Architecture:
+- Key: sha256 over canonical JSON of (experience, command_type, normalized
+  message, relevant state slice, markdown hash)
+- State slice: player view without session/metadata bookkeeping, plus the
+  world state's current location subtree and non-location sections (npcs,
+  global flags). Any change to those produces a different key, so entries
+  never need explicit invalidation for correctness.
+- L1: in-process LRU with TTL
+- L2: Redis (shared across KB replicas), same TTL; optional
+- Per-experience opt-out: config.json capabilities.llm_response_cache = false
+- Only read-only outcomes (no state_updates, e.g. look, inventory) are
+  stored. A mutating outcome can depend on state outside the slice (a
+  move's destination, a give's target) and must not be replayed.
+
+Author: GAIA Platform Team
+Created: 2026-10-16
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+import logging
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+from app.shared.redis_client import redis_client
+from .command_intent_matcher import normalize_phrase
+from .resident_state_store import clone_document
+
+logger = logging.getLogger(__name__)
+
+# Player view sections that change every turn without affecting command outcomes
+VOLATILE_PLAYER_KEYS = ("session", "metadata")
+
+
+def _state_slice(player_view: Dict[str, Any], world_state: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract the part of the state a command outcome can depend on."""
+    player = {k: v for k, v in player_view.items() if k not in VOLATILE_PLAYER_KEYS}
+    if world_state is player_view:
+        return {"player": player}
+
+    world = {k: v for k, v in world_state.items() if k not in ("locations", "metadata")}
+    location_id = player_view.get("player", {}).get("current_location")
+    locations = world_state.get("locations", {})
+    if location_id and location_id in locations:
+        world["locations"] = {location_id: locations[location_id]}
+    else:
+        world["locations"] = locations
+    return {"player": player, "world": world}
+
+
+class CommandResponseCache:
+    """
+    Two-tier (in-process LRU + Redis) cache of markdown command outcomes.
+
+    Key Responsibilities:
+    - Build canonical cache keys from command, message, state slice and markdown
+    - LRU + TTL eviction in process
+    - Shared Redis tier so replicas reuse each other's results
+    - Hit/miss counters
+    """
+
+    REDIS_PREFIX = "kb:llm_cmd:"
+    REDIS_RECHECK_S = 60.0
+
+    def __init__(self, max_entries: int = 1000, ttl_s: int = 300, use_redis: bool = True):
+        """
+        Initialize cache.
+
+        Args:
+            max_entries: In-process LRU capacity
+            ttl_s: Entry lifetime (both tiers)
+            use_redis: Enable the shared Redis tier
+        """
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self.use_redis = use_redis
+
+        # key -> (expires_at, experience, value)
+        self._entries: "OrderedDict[str, Tuple[float, str, Dict[str, Any]]]" = OrderedDict()
+        self._redis_available: Optional[bool] = None
+        self._redis_checked_at = 0.0
+
+        self._stats = {
+            "hits": 0,
+            "redis_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0
+        }
+
+    @staticmethod
+    def make_key(
+        experience: str,
+        command_type: str,
+        message: str,
+        player_view: Dict[str, Any],
+        world_state: Dict[str, Any],
+        markdown_content: str
+    ) -> str:
+        """Canonical hash of everything a command outcome depends on."""
+        payload = {
+            "experience": experience,
+            "command": command_type,
+            "message": " ".join(normalize_phrase(message)),
+            "state": _state_slice(player_view, world_state),
+            "markdown": hashlib.sha256(markdown_content.encode()).hexdigest()
+        }
+        canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    @staticmethod
+    def is_cacheable(outcome: Dict[str, Any]) -> bool:
+        """Only successful, read-only outcomes may be reused."""
+        return not outcome.get("state_updates") and "error" not in (outcome.get("metadata") or {})
+
+    # ===== LOOKUP / STORE =====
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached outcome for key, or None."""
+        entry = self._entries.get(key)
+        if entry:
+            expires_at, _, value = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return clone_document(value)
+            del self._entries[key]
+
+        if await self._redis_ready():
+            try:
+                stored = await asyncio.to_thread(redis_client.get_json, self.REDIS_PREFIX + key)
+            except Exception as e:
+                logger.warning(f"Command cache Redis read failed: {e}")
+                stored = None
+            if stored:
+                self._store_local(key, stored.get("experience", ""), stored["value"])
+                self._stats["redis_hits"] += 1
+                return clone_document(stored["value"])
+
+        self._stats["misses"] += 1
+        return None
+
+    async def set(self, key: str, experience: str, value: Dict[str, Any]) -> None:
+        """Store a command outcome in both tiers."""
+        self._store_local(key, experience, clone_document(value))
+        self._stats["stores"] += 1
+
+        if await self._redis_ready():
+            try:
+                await asyncio.to_thread(
+                    redis_client.set_json,
+                    self.REDIS_PREFIX + key,
+                    {"experience": experience, "value": value},
+                    self.ttl_s
+                )
+            except Exception as e:
+                logger.warning(f"Command cache Redis write failed: {e}")
+
+    def _store_local(self, key: str, experience: str, value: Dict[str, Any]) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl_s, experience, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    async def _redis_ready(self) -> bool:
+        """Check Redis availability, re-probing at most every REDIS_RECHECK_S."""
+        if not self.use_redis:
+            return False
+        now = time.monotonic()
+        if self._redis_available is None or (
+            not self._redis_available and now - self._redis_checked_at >= self.REDIS_RECHECK_S
+        ):
+            self._redis_checked_at = now
+            try:
+                self._redis_available = await asyncio.to_thread(redis_client.is_connected)
+            except Exception:
+                self._redis_available = False
+            if not self._redis_available:
+                logger.info("Command cache running without Redis tier")
+        return self._redis_available
+
+    # ===== MAINTENANCE =====
+
+    def invalidate(self, experience: Optional[str] = None) -> int:
+        """
+        Drop in-process entries for an experience (or all).
+
+        Returns:
+            Number of entries removed
+        """
+        if experience is None:
+            count = len(self._entries)
+            self._entries.clear()
+            return count
+        keys = [k for k, (_, exp, _) in self._entries.items() if exp == experience]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return cache counters."""
+        lookups = self._stats["hits"] + self._stats["redis_hits"] + self._stats["misses"]
+        hits = self._stats["hits"] + self._stats["redis_hits"]
+        return {
+            **self._stats,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_s": self.ttl_s,
+            "redis_tier": bool(self._redis_available)
+        }
@@ -187,6 +187,11 @@ async def _execute_reset(
         # Step 1: Create backup
         backup_file = await _create_backup(experience_id, state_manager)
 
+        # Step 1.5: Drop resident (write-behind) state and journaled deltas so
+        # neither is flushed or replayed over the reset
+        state_manager.discard_resident_state(experience_id, include_players=not world_only)
+        state_manager.discard_world_journal(experience_id)
+
         # Step 2: Restore world state from template
         await _restore_world_from_template(experience_id, state_manager)
 
@@ -15,6 +15,11 @@ from app.services.llm.chat_service import MultiProviderChatService
 from app.services.llm.base import ModelCapability, LLMProvider
 from app.shared.config import settings
 from .unified_state_manager import UnifiedStateManager
+from .resident_state_store import ResidentStateStore
+from .state_journal import StateJournal
+from .command_registry import markdown_command_registry
+from .command_intent_matcher import command_match_metrics
+from .command_response_cache import CommandResponseCache
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
@@ -34,6 +39,8 @@ class KBIntelligentAgent:
         self.llm_service = None  # Lazy init
         self.kb_storage = None   # Injected from main
         self.state_manager = None  # UnifiedStateManager, initialized in initialize()
+        self.command_registry = markdown_command_registry  # Compiled game-logic/admin-logic commands
+        self.response_cache = None  # CommandResponseCache, initialized in initialize()
         self.rule_cache: Dict[str, Any] = {}
         self.context_cache: Dict[str, List[str]] = {}
 
@@ -45,9 +52,29 @@ class KBIntelligentAgent:
 
         # Initialize UnifiedStateManager
         kb_root = Path(settings.KB_PATH)
-        self.state_manager = UnifiedStateManager(kb_root)
+        state_store = None
+        if settings.KB_RESIDENT_STATE_ENABLED:
+            state_store = ResidentStateStore(
+                flush_interval_s=settings.KB_STATE_FLUSH_INTERVAL_S,
+                max_pending_writes=settings.KB_STATE_MAX_PENDING_WRITES,
+                max_documents=settings.KB_STATE_MAX_RESIDENT_DOCUMENTS
+            )
+        journal = None
+        if settings.KB_STATE_JOURNAL_ENABLED:
+            journal = StateJournal(
+                compact_every=settings.KB_STATE_JOURNAL_COMPACT_EVERY,
+                retain_entries=settings.KB_STATE_JOURNAL_RETAIN
+            )
+        self.state_manager = UnifiedStateManager(kb_root, state_store=state_store, journal=journal)
         logger.info(f"UnifiedStateManager initialized with KB root: {kb_root}")
 
+        if settings.KB_LLM_RESPONSE_CACHE_ENABLED:
+            self.response_cache = CommandResponseCache(
+                max_entries=settings.KB_LLM_RESPONSE_CACHE_MAX_ENTRIES,
+                ttl_s=settings.KB_LLM_RESPONSE_CACHE_TTL,
+                use_redis=settings.KB_LLM_RESPONSE_CACHE_REDIS
+            )
+
         logger.info("KB Intelligent Agent initialized")
 
     async def interpret_knowledge(
@@ -900,10 +927,23 @@ If action invalid or target not found, return:
             if not markdown_content:
                 return CommandResult(success=False, message_to_player=f"I don't understand how to '{command_type}'.")
 
-            # Step 3: Execute two-pass LLM command
-            logic_result = await self._execute_markdown_command(
-                markdown_content, message, player_view, world_state, config, user_id, request_id
-            )
+            # Step 3: Execute two-pass LLM command (reused for identical state slices)
+            cache_key = None
+            logic_result = None
+            if self.response_cache and config.get("capabilities", {}).get("llm_response_cache", True):
+                cache_key = self.response_cache.make_key(
+                    experience_id, command_type, message, player_view, world_state, markdown_content
+                )
+                logic_result = await self.response_cache.get(cache_key)
+                if logic_result is not None:
+                    logger.info(f"Command response cache hit for '{command_type}' ({experience_id})")
+
+            if logic_result is None:
+                logic_result = await self._execute_markdown_command(
+                    markdown_content, message, player_view, world_state, config, user_id, request_id
+                )
+                if cache_key and self.response_cache.is_cacheable(logic_result):
+                    await self.response_cache.set(cache_key, experience_id, logic_result)
 
             # Step 4: Apply state updates
             state_updates = logic_result.get("state_updates")
@@ -950,7 +990,7 @@ If action invalid or target not found, return:
 
     async def _discover_available_commands(self, experience: str) -> tuple[dict[str, list[str]], dict[str, bool]]:
         """
-        Discover available commands by scanning game-logic and admin-logic directories for .md files.
+        Get available commands from the compiled game-logic / admin-logic registry.
 
         Args:
             experience: Experience ID
@@ -960,78 +1000,19 @@ If action invalid or target not found, return:
             - commands: Dict mapping command name to list of aliases/synonyms
             - admin_required: Dict mapping command name to whether admin permission is required
         """
-        kb_root = Path(settings.KB_PATH)
-
-        commands = {}
-        admin_required = {}
-
-        # Scan both game-logic and admin-logic directories
-        directories = [
-            ("game-logic", False),  # (dir_name, default_admin_required)
-            ("admin-logic", True)   # Admin commands default to requiring permissions
-        ]
-
-        for dir_name, default_admin in directories:
-            logic_dir = kb_root / "experiences" / experience / dir_name
-
-            if not logic_dir.exists():
-                if dir_name == "game-logic":
-                    logger.warning(f"Game logic directory not found: {logic_dir}")
-                continue
-
-            try:
-                # Scan for .md files
-                for md_file in logic_dir.glob("*.md"):
-                    try:
-                        content = md_file.read_text()
-
-                        # Parse frontmatter to extract command name and aliases
-                        if content.startswith("---"):
-                            frontmatter_end = content.find("---", 3)
-                            if frontmatter_end != -1:
-                                frontmatter = content[3:frontmatter_end].strip()
-
-                                # Extract command name, aliases, and admin requirement
-                                command_name = None
-                                aliases = []
-                                requires_admin = default_admin
-
-                                for line in frontmatter.split("\n"):
-                                    line = line.strip()
-                                    if line.startswith("command:"):
-                                        command_name = line.split(":", 1)[1].strip()
-                                    elif line.startswith("aliases:"):
-                                        # Parse aliases list: [move, walk, travel]
-                                        aliases_str = line.split(":", 1)[1].strip()
-                                        if aliases_str.startswith("[") and aliases_str.endswith("]"):
-                                            aliases_str = aliases_str[1:-1]
-                                            aliases = [a.strip() for a in aliases_str.split(",")]
-                                    elif line.startswith("requires_admin:"):
-                                        # Check if admin required
-                                        admin_val = line.split(":", 1)[1].strip().lower()
-                                        requires_admin = admin_val == "true"
-
-                                if command_name:
-                                    # Combine command name with aliases
-                                    all_keywords = [command_name] + aliases
-                                    commands[command_name] = all_keywords
-                                    admin_required[command_name] = requires_admin
-
-                                    cmd_type = "admin" if requires_admin else "player"
-                                    logger.info(f"Discovered {cmd_type} command '{command_name}' with aliases: {aliases}")
-
-                    except Exception as e:
-                        logger.error(f"Error parsing command file {md_file}: {e}")
-                        continue
+        registry_commands = self.command_registry.get_commands(experience)
 
-            except Exception as e:
-                logger.error(f"Error scanning {dir_name} directory for {experience}: {e}")
+        commands = {name: command.keywords for name, command in registry_commands.items()}
+        admin_required = {name: command.requires_admin for name, command in registry_commands.items()}
 
         return commands, admin_required
 
     async def _detect_command_type(self, message: str, experience: str) -> tuple[str, bool]:
         """
-        Use LLM to detect which command type the user is trying to execute.
+        Detect which command type the user is trying to execute.
+
+        Matches declared names/aliases locally first; only low-confidence
+        messages go to the LLM classifier.
 
         Args:
             kb_agent_instance: KB agent for LLM access
@@ -1061,7 +1042,18 @@ If action invalid or target not found, return:
                 # Fall through to LLM for interpretation if not a direct admin command,
                 # or if it's an admin command but not marked as such in frontmatter (shouldn't happen if frontmatter is correct)
 
-        # Fallback to LLM for natural language command detection
+        # 2. Local alias matching - skips the LLM round-trip for "look", "go north", ...
+        t_match_start = time.perf_counter()
+        matched_command, confidence, stage = self.command_registry.get_intent_matcher(experience).match(message)
+        match_elapsed_ms = (time.perf_counter() - t_match_start) * 1000
+        if matched_command and confidence >= settings.KB_COMMAND_MATCH_THRESHOLD:
+            command_match_metrics.record_local(stage, match_elapsed_ms)
+            logger.info(
+                f"Matched command '{matched_command}' locally ({stage}, confidence={confidence})"
+            )
+            return matched_command, admin_required.get(matched_command, False)
+
+        # 3. Fallback to LLM for natural language command detection
 
         # Build command mapping text for LLM
         mapping_lines = []
@@ -1086,6 +1078,7 @@ Command:"""
 
         try:
             # Use fast model for quick detection
+            t_llm_start = time.perf_counter()
             response = await self.llm_service.chat_completion(
                 messages=[
                     {"role": "system", "content": "You are a command parser. Respond with ONLY the command name."},
@@ -1096,6 +1089,7 @@ Command:"""
                 temperature=0.1
             )
 
+            command_match_metrics.record_llm((time.perf_counter() - t_llm_start) * 1000)
             command_type = response["response"].strip().lower()
 
             # Validate it's a known command
@@ -1126,22 +1120,14 @@ Command:"""
         Returns:
             Markdown file content or None if not found
         """
-        kb_root = Path(settings.KB_PATH)
-
-        # Choose directory based on command type
         logic_dir = "admin-logic" if is_admin_command else "game-logic"
-        markdown_path = kb_root / "experiences" / experience / logic_dir / f"{command_type}.md"
+        markdown_content = self.command_registry.get_markdown(experience, command_type, is_admin_command)
 
-        try:
-            if markdown_path.exists():
-                logger.info(f"Loading {logic_dir} command: {command_type}")
-                return markdown_path.read_text()
-            else:
-                logger.warning(f"Markdown command file not found: {markdown_path}")
-                return None
-        except Exception as e:
-            logger.error(f"Error loading markdown file {markdown_path}: {e}")
-            return None
+        if markdown_content is not None:
+            logger.info(f"Loading {logic_dir} command: {command_type}")
+        else:
+            logger.warning(f"Markdown command file not found: {logic_dir}/{command_type}.md ({experience})")
+        return markdown_content
 
     async def _execute_markdown_command(
         self,
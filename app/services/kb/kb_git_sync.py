@@ -15,7 +15,7 @@ from typing import Dict, List, Any, Optional, Tuple
 
 from app.shared.config import settings
 from app.shared.logging import get_logger
-from app.shared.redis_client import redis_client
+from app.shared.redis_client import async_redis_client
 
 logger = get_logger(__name__)
 
@@ -559,8 +559,8 @@ class KBGitSync:
         """Get the commit hash of the last successful sync"""
         try:
             # Try Redis first
-            if hasattr(redis_client, 'get'):
-                cached = await redis_client.get("kb:last_sync_commit")
+            if hasattr(async_redis_client, 'get'):
+                cached = await async_redis_client.get("kb:last_sync_commit")
                 if cached:
                     return cached.decode() if isinstance(cached, bytes) else cached
             
@@ -574,8 +574,8 @@ class KBGitSync:
         """Update the last successful sync commit hash"""
         try:
             # Store in Redis if available
-            if hasattr(redis_client, 'set'):
-                await redis_client.set("kb:last_sync_commit", commit_hash, ex=86400*7)  # 1 week
+            if hasattr(async_redis_client, 'set'):
+                await async_redis_client.set("kb:last_sync_commit", commit_hash, ex=86400*7)  # 1 week
             
             self.last_sync_commit = commit_hash
             
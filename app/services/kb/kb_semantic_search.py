@@ -44,7 +44,7 @@ except ImportError:
     logging.warning("pgvector.asyncpg not available - vector type registration disabled")
 
 from app.shared.config import settings
-from app.shared.redis_client import redis_client
+from app.shared.redis_client import async_redis_client
 from app.shared.logging import get_logger
 from app.shared.database import get_database
 
@@ -58,6 +58,14 @@ class SemanticIndexer:
     Uses pgvector for PostgreSQL-native vector storage with incremental indexing.
     """
 
+    # Indexing pipeline tuning
+    PREPARE_CONCURRENCY = 8        # Files read/hashed/chunked in parallel worker threads
+    EMBED_BATCH_CHUNKS = 256       # Chunks per model.encode call (across files)
+    ENCODE_BATCH_SIZE = 64         # sentence-transformers internal batch size
+    PREPARED_QUEUE_SIZE = 512      # Prepared files buffered ahead of embedding
+    WRITE_QUEUE_SIZE = 4           # Embedded batches buffered ahead of the writer
+    WRITE_TIMEOUT_S = 60           # Per-statement timeout for bulk writes
+
     def __init__(self):
         self.kb_path = Path(getattr(settings, 'KB_PATH', '/kb'))
         self.indexing_queue = asyncio.Queue()
@@ -204,10 +212,16 @@ class SemanticIndexer:
     
     async def _run_pgvector_index(self, path: Path, namespace: str):
         """
-        Run pgvector indexing (async operation).
+        Run pgvector indexing as a pipelined, batched job.
+
+        Stages (connected by bounded queues for backpressure):
+        1. Prepare - read, hash and chunk changed files in worker threads
+        2. Embed   - batch chunks across files into large model.encode calls
+        3. Write   - one long-lived connection; per batch, delete old rows and
+                     bulk-insert metadata (executemany) and chunks (COPY)
 
-        Implements incremental indexing by checking file mtime against stored metadata.
-        Only reindexes files that have changed since last indexing.
+        Implements incremental indexing by checking file mtime against stored
+        metadata, and skips re-embedding when the content hash is unchanged.
         """
         import time
 
@@ -216,141 +230,294 @@ class SemanticIndexer:
         # Get embedding model
         model = self._get_embedding_model()
 
-        # Count files to index
-        md_files = list(path.rglob("*.md"))
+        # List and stat files off the event loop
+        md_files = await asyncio.to_thread(self._scan_markdown_files, path)
         total_files = len(md_files)
         logger.info(f"Found {total_files} markdown files in {path}")
 
         # Track progress
         self.indexing_progress = {
             "namespace": path.name,
+            "namespace_id": namespace,
             "total_files": total_files,
+            "files_to_index": 0,
+            "files_prepared": 0,
+            "files_embedded": 0,
+            "files_written": 0,
+            "files_unchanged": 0,
+            "files_failed": 0,
+            "chunks_written": 0,
             "start_time": start_time,
             "status": "indexing"
         }
+        progress = self.indexing_progress
 
         try:
             # Get existing file metadata from database
             async with self.db.acquire() as conn:
                 rows = await conn.fetch(
                     """
-                    SELECT relative_path, mtime, num_chunks
+                    SELECT relative_path, mtime, content_hash
                     FROM kb_semantic_index_metadata
                     WHERE namespace = $1
                     """,
                     namespace
                 )
-                existing_metadata = {row['relative_path']: (row['mtime'], row['num_chunks']) for row in rows}
+            existing_metadata = {row['relative_path']: (row['mtime'], row['content_hash']) for row in rows}
 
-                files_to_index = []
-                files_skipped = 0
+            files_to_index = []
+            files_skipped = 0
 
-                # Check which files need indexing
-                for md_file in md_files:
-                    relative_path = str(md_file.relative_to(path))
-                    file_mtime = md_file.stat().st_mtime
+            # Check which files need indexing
+            for md_file, relative_path, file_mtime in md_files:
+                if relative_path in existing_metadata:
+                    stored_mtime, _ = existing_metadata[relative_path]
+                    mtime_diff = abs(file_mtime - stored_mtime)
 
-                    if relative_path in existing_metadata:
-                        stored_mtime, _ = existing_metadata[relative_path]
-                        mtime_diff = abs(file_mtime - stored_mtime)
-
-                        # Skip if file hasn't changed (within 60 second tolerance for Docker volume mounts)
-                        # Larger tolerance handles filesystem sync delays and precision differences
-                        if mtime_diff < 60.0:
-                            files_skipped += 1
-                            continue
+                    # Skip if file hasn't changed (within 60 second tolerance for Docker volume mounts)
+                    # Larger tolerance handles filesystem sync delays and precision differences
+                    if mtime_diff < 60.0:
+                        files_skipped += 1
+                        continue
 
-                    files_to_index.append(md_file)
+                files_to_index.append((md_file, relative_path))
 
-                logger.info(f"Incremental indexing: {len(files_to_index)} new/changed files, {files_skipped} unchanged files")
+            logger.info(f"Incremental indexing: {len(files_to_index)} new/changed files, {files_skipped} unchanged files")
+            progress["files_to_index"] = len(files_to_index)
 
             if not files_to_index:
                 logger.info(f"No files need reindexing in {namespace}")
-                self.indexing_progress["status"] = "completed"
-                self.indexing_progress["elapsed_time"] = time.time() - start_time
+                progress["status"] = "completed"
+                progress["elapsed_time"] = time.time() - start_time
                 return
 
-            # Process files and generate embeddings
-            total_chunks_indexed = 0
+            stored_hashes = {rel: content_hash for rel, (_, content_hash) in existing_metadata.items()}
+            prepared_queue: asyncio.Queue = asyncio.Queue(maxsize=self.PREPARED_QUEUE_SIZE)
+            write_queue: asyncio.Queue = asyncio.Queue(maxsize=self.WRITE_QUEUE_SIZE)
 
-            for md_file in files_to_index:
-                try:
-                    content = md_file.read_text(encoding='utf-8')
-                    relative_path = str(md_file.relative_to(path))
-                    file_mtime = md_file.stat().st_mtime
+            stages = [
+                asyncio.create_task(self._prepare_stage(files_to_index, prepared_queue, progress)),
+                asyncio.create_task(self._embed_stage(model, prepared_queue, write_queue, stored_hashes, progress)),
+                asyncio.create_task(self._write_stage(namespace, write_queue, progress))
+            ]
+            try:
+                await asyncio.gather(*stages)
+            except BaseException:
+                for stage in stages:
+                    stage.cancel()
+                raise
 
-                    # Simple chunking - split by double newlines (paragraphs)
-                    chunks = [chunk.strip() for chunk in content.split('\n\n') if chunk.strip()]
-                    chunks = [chunk for chunk in chunks if len(chunk) > 50]  # Skip very short chunks
+            elapsed = time.time() - start_time
+            logger.info(
+                f"pgvector indexing completed in {elapsed:.1f}s: {progress['chunks_written']} chunks "
+                f"from {progress['files_written']} files ({progress['files_unchanged']} unchanged content, "
+                f"{progress['files_failed']} failed)"
+            )
 
-                    if not chunks:
-                        continue
+            # Update progress
+            progress["status"] = "completed"
+            progress["elapsed_time"] = elapsed
+            progress["completed_time"] = time.time()
+
+        except Exception as e:
+            logger.error(f"pgvector indexing failed: {e}", exc_info=True)
+            progress["status"] = "failed"
+            progress["error"] = str(e)
+
+    @staticmethod
+    def _scan_markdown_files(path: Path) -> List[tuple]:
+        """List markdown files with relative path and mtime (runs in a worker thread)."""
+        files = []
+        for md_file in path.rglob("*.md"):
+            try:
+                files.append((md_file, str(md_file.relative_to(path)), md_file.stat().st_mtime))
+            except OSError as e:
+                logger.warning(f"Failed to stat {md_file}: {e}")
+        return files
+
+    @staticmethod
+    def _prepare_file(md_file: Path, relative_path: str) -> Dict[str, Any]:
+        """Read, hash and chunk one file (runs in a worker thread)."""
+        content = md_file.read_text(encoding='utf-8')
+        file_mtime = md_file.stat().st_mtime
+
+        # Simple chunking - split by double newlines (paragraphs)
+        chunks = [chunk.strip() for chunk in content.split('\n\n') if chunk.strip()]
+        chunks = [chunk for chunk in chunks if len(chunk) > 50]  # Skip very short chunks
+
+        return {
+            "relative_path": relative_path,
+            "mtime": file_mtime,
+            "content_hash": hashlib.sha256(content.encode('utf-8')).hexdigest(),
+            "chunks": chunks
+        }
 
-                    # Generate embeddings for all chunks (offloaded to thread pool to avoid blocking event loop)
-                    embeddings = await asyncio.to_thread(
-                        model.encode, chunks, convert_to_numpy=True
-                    )
-
-                    # Store in database (direct await - no nested loop needed)
-                    async with self.db.acquire() as conn:
-                        # Register pgvector type for this connection
-                        if PGVECTOR_ASYNCPG_AVAILABLE:
-                            await register_vector(conn)
-
-                        async with conn.transaction():
-                            # Delete old chunks for this file
-                            await conn.execute(
-                                "DELETE FROM kb_semantic_index_metadata WHERE relative_path = $1 AND namespace = $2",
-                                relative_path, namespace
-                            )
-
-                            # Insert metadata
-                            await conn.execute(
-                                """
-                                INSERT INTO kb_semantic_index_metadata (relative_path, namespace, mtime, num_chunks)
-                                VALUES ($1, $2, $3, $4)
-                                """,
-                                relative_path, namespace, file_mtime, len(chunks)
-                            )
-
-                            # Insert chunks with embeddings
-                            for chunk_index, (chunk_text, embedding) in enumerate(zip(chunks, embeddings)):
-                                chunk_id = f"{namespace}:{relative_path}:{chunk_index}"
-
-                                # Convert numpy array to list for pgvector
-                                embedding_list = embedding.tolist()
-
-                                await conn.execute(
-                                    """
-                                    INSERT INTO kb_semantic_chunk_ids
-                                    (namespace, relative_path, chunk_id, chunk_index, chunk_text, embedding)
-                                    VALUES ($1, $2, $3, $4, $5, $6::vector)
-                                    ON CONFLICT (chunk_id) DO UPDATE
-                                    SET chunk_text = EXCLUDED.chunk_text,
-                                        embedding = EXCLUDED.embedding
-                                    """,
-                                    namespace, relative_path, chunk_id, chunk_index, chunk_text, embedding_list
-                                )
-
-                    total_chunks_indexed += len(chunks)
+    async def _prepare_stage(self, files: List[tuple], out_queue: asyncio.Queue, progress: Dict[str, Any]):
+        """Stage 1: prepare files concurrently, feeding the embed stage."""
+        semaphore = asyncio.Semaphore(self.PREPARE_CONCURRENCY)
 
+        async def prepare(md_file: Path, relative_path: str):
+            async with semaphore:
+                try:
+                    prepared = await asyncio.to_thread(self._prepare_file, md_file, relative_path)
                 except Exception as e:
                     logger.warning(f"Failed to process {md_file}: {e}")
+                    progress["files_failed"] += 1
+                    return
+            progress["files_prepared"] += 1
+            await out_queue.put(prepared)  # Blocks when the embedder falls behind
 
-            elapsed = time.time() - start_time
-            logger.info(f"pgvector indexing completed in {elapsed:.1f}s: {total_chunks_indexed} chunks from {len(files_to_index)} files")
+        try:
+            await asyncio.gather(*(prepare(md_file, rel) for md_file, rel in files))
+        finally:
+            await out_queue.put(None)
 
-            # Update progress
-            self.indexing_progress["status"] = "completed"
-            self.indexing_progress["elapsed_time"] = elapsed
-            self.indexing_progress["completed_time"] = time.time()
+    async def _embed_stage(
+        self,
+        model: "SentenceTransformer",
+        in_queue: asyncio.Queue,
+        out_queue: asyncio.Queue,
+        stored_hashes: Dict[str, Optional[str]],
+        progress: Dict[str, Any]
+    ):
+        """Stage 2: embed chunks from many files per model.encode call."""
+        pending: List[Dict[str, Any]] = []
+        pending_chunks = 0
+        unchanged: List[Dict[str, Any]] = []
+
+        async def flush():
+            nonlocal pending, pending_chunks
+            if not pending:
+                return
+            batch, pending, pending_chunks = pending, [], 0
+            texts = [chunk for prepared in batch for chunk in prepared["chunks"]]
+            try:
+                embeddings = await asyncio.to_thread(
+                    model.encode, texts, batch_size=self.ENCODE_BATCH_SIZE, convert_to_numpy=True
+                ) if texts else []
+            except Exception as e:
+                logger.warning(f"Embedding batch of {len(batch)} files failed: {e}")
+                progress["files_failed"] += len(batch)
+                return
+            offset = 0
+            for prepared in batch:
+                count = len(prepared["chunks"])
+                prepared["embeddings"] = embeddings[offset:offset + count]
+                offset += count
+            progress["files_embedded"] += len(batch)
+            await out_queue.put(("index", batch))
+
+        try:
+            while True:
+                prepared = await in_queue.get()
+                if prepared is None:
+                    break
+
+                # mtime changed but content didn't (e.g. git checkout) - no re-embedding
+                if stored_hashes.get(prepared["relative_path"]) == prepared["content_hash"]:
+                    unchanged.append(prepared)
+                    if len(unchanged) >= self.EMBED_BATCH_CHUNKS:
+                        await out_queue.put(("touch", unchanged))
+                        unchanged = []
+                    continue
+
+                pending.append(prepared)
+                pending_chunks += len(prepared["chunks"])
+                if pending_chunks >= self.EMBED_BATCH_CHUNKS:
+                    await flush()
+
+            await flush()
+            if unchanged:
+                await out_queue.put(("touch", unchanged))
+        finally:
+            await out_queue.put(None)
+
+    async def _write_stage(self, namespace: str, in_queue: asyncio.Queue, progress: Dict[str, Any]):
+        """Stage 3: bulk-write batches over one long-lived connection."""
+        async with self.db.acquire() as conn:
+            # Register pgvector type once for this connection
+            if PGVECTOR_ASYNCPG_AVAILABLE:
+                await register_vector(conn)
+
+            while True:
+                item = await in_queue.get()
+                if item is None:
+                    break
+                action, batch = item
+                try:
+                    if action == "touch":
+                        await self._touch_metadata(conn, namespace, batch)
+                        progress["files_unchanged"] += len(batch)
+                    else:
+                        await self._write_batch(conn, namespace, batch)
+                        progress["files_written"] += len(batch)
+                        progress["chunks_written"] += sum(len(p["chunks"]) for p in batch)
+                except Exception as e:
+                    logger.warning(f"Failed to write batch of {len(batch)} files: {e}")
+                    progress["files_failed"] += len(batch)
+
+    async def _touch_metadata(self, conn, namespace: str, batch: List[Dict[str, Any]]):
+        """Record the new mtime for files whose content is unchanged."""
+        await conn.executemany(
+            """
+            UPDATE kb_semantic_index_metadata
+            SET mtime = $3, last_indexed = NOW()
+            WHERE namespace = $1 AND relative_path = $2
+            """,
+            [(namespace, p["relative_path"], p["mtime"]) for p in batch],
+            timeout=self.WRITE_TIMEOUT_S
+        )
+
+    async def _write_batch(self, conn, namespace: str, batch: List[Dict[str, Any]]):
+        """Replace metadata and chunks for a batch of files in one transaction."""
+        relative_paths = [p["relative_path"] for p in batch]
+
+        async with conn.transaction():
+            # Delete old metadata for these files (chunks cascade via FK)
+            await conn.execute(
+                "DELETE FROM kb_semantic_index_metadata WHERE namespace = $1 AND relative_path = ANY($2::text[])",
+                namespace, relative_paths
+            )
+
+            # Insert metadata (files without chunks too, so they aren't re-read every run)
+            await conn.executemany(
+                """
+                INSERT INTO kb_semantic_index_metadata (relative_path, namespace, mtime, num_chunks, content_hash)
+                VALUES ($1, $2, $3, $4, $5)
+                """,
+                [(p["relative_path"], namespace, p["mtime"], len(p["chunks"]), p["content_hash"]) for p in batch],
+                timeout=self.WRITE_TIMEOUT_S
+            )
+
+            # Insert chunks with embeddings
+            records = [
+                (namespace, p["relative_path"], f"{namespace}:{p['relative_path']}:{chunk_index}",
+                 chunk_index, chunk_text, embedding)
+                for p in batch
+                for chunk_index, (chunk_text, embedding) in enumerate(zip(p["chunks"], p["embeddings"]))
+            ]
+            if not records:
+                return
+
+            if PGVECTOR_ASYNCPG_AVAILABLE:
+                # Binary COPY - the registered vector codec encodes numpy arrays directly
+                await conn.copy_records_to_table(
+                    "kb_semantic_chunk_ids",
+                    records=records,
+                    columns=["namespace", "relative_path", "chunk_id", "chunk_index", "chunk_text", "embedding"],
+                    timeout=self.WRITE_TIMEOUT_S
+                )
+            else:
+                await conn.executemany(
+                    """
+                    INSERT INTO kb_semantic_chunk_ids
+                    (namespace, relative_path, chunk_id, chunk_index, chunk_text, embedding)
+                    VALUES ($1, $2, $3, $4, $5, $6::vector)
+                    """,
+                    [(*record[:5], "[" + ",".join(map(str, record[5].tolist())) + "]") for record in records],
+                    timeout=self.WRITE_TIMEOUT_S
+                )
 
-        except Exception as e:
-            logger.error(f"pgvector indexing failed: {e}", exc_info=True)
-            self.indexing_progress["status"] = "failed"
-            self.indexing_progress["error"] = str(e)
-    
-    
     async def search_semantic(
         self,
         query: str,
@@ -501,10 +668,10 @@ class SemanticIndexer:
     async def _get_cached_result(self, cache_key: str) -> Optional[Dict[str, Any]]:
         """Retrieve cached search results from Redis."""
         try:
-            if not redis_client:
+            if not async_redis_client:
                 return None
                 
-            cached = await redis_client.get(cache_key)
+            cached = await async_redis_client.get(cache_key)
             if cached:
                 return json.loads(cached)
             return None
@@ -516,10 +683,10 @@ class SemanticIndexer:
     async def _cache_result(self, cache_key: str, result: Dict[str, Any]):
         """Cache search results in Redis."""
         try:
-            if not redis_client:
+            if not async_redis_client:
                 return
                 
-            await redis_client.setex(
+            await async_redis_client.setex(
                 cache_key,
                 self.cache_ttl,
                 json.dumps(result)
@@ -591,7 +758,7 @@ class SemanticIndexer:
     async def _invalidate_namespace_cache(self, namespace: str):
         """Invalidate all cached results for a namespace."""
         try:
-            if not redis_client:
+            if not async_redis_client:
                 return
                 
             # Use Redis SCAN to find all keys for this namespace
@@ -599,9 +766,9 @@ class SemanticIndexer:
             cursor = 0
             
             while True:
-                cursor, keys = await redis_client.scan(cursor, pattern)
+                cursor, keys = await async_redis_client.scan(cursor, pattern)
                 if keys:
-                    await redis_client.delete(*keys)
+                    await async_redis_client.delete(*keys)
                     logger.info(f"Invalidated {len(keys)} cache entries for namespace: {namespace}")
                 
                 if cursor == 0:
@@ -711,6 +878,7 @@ class SemanticIndexer:
                 "indexed": True,
                 "indexed_chunks": indexed_chunks,
                 "total_files": len(md_files),
+                "progress": self._progress_info(path),
                 "message": f"Index ready ({indexed_chunks:,} chunks, {indexed_files} indexed files, {len(md_files)} total files)"
             }
         else:
@@ -718,18 +886,7 @@ class SemanticIndexer:
             queue_size = self.indexing_queue.qsize()
 
             # Get detailed progress if available
-            progress_info = {}
-            if hasattr(self, 'indexing_progress'):
-                progress = self.indexing_progress
-                if progress.get("namespace") == path.name:
-                    import time
-                    elapsed = time.time() - progress.get("start_time", 0)
-                    progress_info = {
-                        "total_files": progress.get("total_files", 0),
-                        "elapsed_seconds": round(elapsed, 1),
-                        "estimated_per_file": round(elapsed / max(1, progress.get("total_files", 1)), 2),
-                        "current_status": progress.get("status", "unknown")
-                    }
+            progress_info = self._progress_info(path)
 
             return {
                 "status": "indexing" if queue_size > 0 else "not_indexed",
@@ -739,6 +896,29 @@ class SemanticIndexer:
                 "message": f"Indexing in progress (queue: {queue_size}, {progress_info.get('total_files', '?')} files)" if queue_size > 0 else "Not indexed yet"
             }
     
+    def _progress_info(self, path: Path) -> Dict[str, Any]:
+        """Progress of the current/last indexing run for a namespace path."""
+        progress = getattr(self, 'indexing_progress', None)
+        if not progress or progress.get("namespace") != path.name:
+            return {}
+
+        import time
+        elapsed = progress.get("elapsed_time", time.time() - progress.get("start_time", 0))
+        files_done = progress.get("files_written", 0) + progress.get("files_unchanged", 0)
+        return {
+            "total_files": progress.get("total_files", 0),
+            "files_to_index": progress.get("files_to_index", 0),
+            "files_prepared": progress.get("files_prepared", 0),
+            "files_embedded": progress.get("files_embedded", 0),
+            "files_written": progress.get("files_written", 0),
+            "files_unchanged": progress.get("files_unchanged", 0),
+            "files_failed": progress.get("files_failed", 0),
+            "chunks_written": progress.get("chunks_written", 0),
+            "elapsed_seconds": round(elapsed, 1),
+            "estimated_per_file": round(elapsed / max(1, files_done), 3),
+            "current_status": progress.get("status", "unknown")
+        }
+
     async def shutdown(self):
         """Shutdown the semantic indexer."""
         if self.indexing_task:
@@ -46,34 +46,27 @@ class KBStorageWithRBAC(KBStorageManager):
             # No user = no results (secure by default)
             return {"results": [], "total": 0}
         
-        # Get accessible paths for user
-        accessible_paths = await rbac_manager.get_accessible_kb_paths(user_id)
+        # Compiled once per user; filtering below is in memory
+        access_set = await rbac_manager.get_kb_access_set(user_id)
         
-        # Filter contexts by accessible paths
+        # Keep only requested contexts inside accessible roots
         if contexts:
-            filtered_contexts = []
-            for context in contexts:
-                for path in accessible_paths:
-                    if context.startswith(path):
-                        filtered_contexts.append(context)
-                        break
-            contexts = filtered_contexts if filtered_contexts else None
-        
-        # Perform search with filtered contexts
+            contexts = [context for context in contexts if access_set.within_roots(context)] or None
+        
+        # Perform search with filtered contexts (pushed down as path prefixes)
         results = await super().search_documents(
             query=query,
-            contexts=contexts or accessible_paths,
+            contexts=contexts or access_set.roots,
             limit=limit,
             include_content=include_content,
             **kwargs
         )
         
         # Double-check permissions on results (defense in depth)
-        filtered_results = []
-        for result in results.get("results", []):
-            doc_path = result.get("path", "")
-            if await rbac_manager.check_kb_access(user_id, doc_path, "read"):
-                filtered_results.append(result)
+        filtered_results = [
+            result for result in results.get("results", [])
+            if access_set.allows(result.get("path") or result.get("relative_path", ""))
+        ]
         
         results["results"] = filtered_results
         results["total"] = len(filtered_results)
@@ -213,13 +206,8 @@ class KBStorageWithRBAC(KBStorageManager):
         )
         
         # Filter by permissions
-        accessible_docs = []
-        for doc in all_docs:
-            doc_path = doc.get("path", "")
-            if await rbac_manager.check_kb_access(user_id, doc_path, "read"):
-                accessible_docs.append(doc)
-        
-        return accessible_docs
+        access_set = await rbac_manager.get_kb_access_set(user_id)
+        return [doc for doc in all_docs if access_set.allows(doc.get("path", ""))]
     
     async def share_document(
         self,
@@ -363,6 +351,10 @@ class KBStorageWithRBAC(KBStorageManager):
                         workspace_id, member_id, created_by
                     )
             
+            # New workspace root for every member's compiled permissions
+            for member_id in [created_by] + (initial_members or []):
+                await rbac_manager._invalidate_user_cache(member_id)
+            
             # Create KB directory for workspace
             workspace_kb_path = f"/kb/workspaces/{workspace_id}"
             if self.storage_mode == StorageMode.GIT:
@@ -428,6 +420,7 @@ Type: {workspace_type}
             await rbac_manager.add_team_member(
                 team_id, created_by, "owner", created_by
             )
+            await rbac_manager._invalidate_user_cache(created_by)
             
             # Create KB directory for team
             team_kb_path = f"/kb/teams/{team_id}"
@@ -25,7 +25,7 @@ from app.shared import (
 from app.shared.service_discovery import create_service_health_endpoint
 from datetime import datetime
 from app.shared.config import settings as config_settings
-from app.shared.redis_client import redis_client
+from app.shared.redis_client import async_redis_client
 from app.models.chat import ChatRequest
 from .kb_service import (
     kb_search_endpoint,
@@ -40,7 +40,12 @@ from .kb_service import (
 )
 from .kb_editor import kb_editor
 from .agent_endpoints import router as agent_router
-from .waypoints_api import router as waypoints_router
+from .waypoints_api import (
+    router as waypoints_router,
+    notify_waypoints_changed,
+    waypoint_experience_for_path
+)
+from .command_registry import markdown_command_registry
 from .game_commands_api import router as game_commands_router
 from .experience_endpoints import router as experience_router
 from .kb_agent import kb_agent
@@ -113,13 +118,22 @@ async def kb_service_lifespan(app: FastAPI):
         await nats_client.publish(NATSSubjects.SERVICE_HEALTH, startup_event.model_dump_json())
     except Exception as e:
         logger.warning(f"Could not connect to NATS: {e}")
+
+    # Waypoint cache invalidation (publish on KB writes, drop local reader cache on any replica's writes)
+    if nats_client:
+        try:
+            from . import waypoints_api
+            from app.services.locations.waypoint_reader import waypoint_reader
+            waypoints_api.nats_client = nats_client
+            await waypoint_reader.subscribe_to_invalidations(nats_client)
+        except Exception as e:
+            logger.warning(f"Waypoint cache invalidation not available: {e}")
     
     # Test Redis connection
-    try:
-        await redis_client.ping()
+    if await async_redis_client.ping():
         logger.info("Connected to Redis for caching")
-    except Exception as e:
-        logger.warning(f"Redis not available, caching disabled: {e}")
+    else:
+        logger.warning("Redis not available, caching disabled")
     
     # Initialize KB repository (clone from Git if needed)
     try:
@@ -207,6 +221,9 @@ async def kb_service_lifespan(app: FastAPI):
     # Shutdown sequence
     log_service_shutdown("kb")
     
+    # Release the shared Redis pool
+    await async_redis_client.close()
+    
     # Shutdown Semantic Indexer
     try:
         await semantic_indexer.shutdown()
@@ -214,6 +231,14 @@ async def kb_service_lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"Error shutting down semantic indexer: {e}")
     
+    # Flush resident experience state
+    try:
+        if kb_agent.state_manager:
+            await kb_agent.state_manager.close()
+            logger.info("Experience state flushed")
+    except Exception as e:
+        logger.warning(f"Error flushing experience state: {e}")
+
     # Shutdown Git sync manager
     try:
         from .kb_git_sync import kb_git_sync
@@ -523,6 +548,14 @@ async def invalidate_cache(
         "message": f"Cache invalidated for pattern: {pattern}"
     }
 
+async def _invalidate_kb_caches(*paths: str) -> None:
+    """Invalidate waypoint and markdown command caches for changed KB paths."""
+    experiences = {waypoint_experience_for_path(p) for p in paths}
+    for experience in experiences - {None}:
+        await notify_waypoints_changed(experience)
+    for path in paths:
+        markdown_command_registry.invalidate_path(path)
+
 # KB Write/Edit Endpoints
 @app.post("/write")
 async def kb_write_file(
@@ -553,6 +586,7 @@ async def kb_write_file(
         
         if result["success"]:
             logger.info(f"KB file written: {request.path} by {auth.get('email', 'unknown')}")
+            await _invalidate_kb_caches(request.path)
         else:
             logger.error(f"KB write failed: {request.path} - {result.get('error', 'Unknown error')}")
         
@@ -589,6 +623,7 @@ async def kb_delete_file(
         
         if result["success"]:
             logger.info(f"KB file deleted: {request.path} by {auth.get('email', 'unknown')}")
+            await _invalidate_kb_caches(request.path)
         else:
             logger.error(f"KB delete failed: {request.path} - {result.get('error', 'Unknown error')}")
         
@@ -626,6 +661,7 @@ async def kb_move_file(
         
         if result["success"]:
             logger.info(f"KB file moved: {request.old_path} -> {request.new_path} by {auth.get('email', 'unknown')}")
+            await _invalidate_kb_caches(request.old_path, request.new_path)
         else:
             logger.error(f"KB move failed: {request.old_path} - {result.get('error', 'Unknown error')}")
         
@@ -676,6 +712,8 @@ async def sync_from_git(
         
         if result["success"]:
             logger.info(f"Git sync from Git completed by {auth.get('email', 'unknown')}: {result.get('stats', {})}")
+            await notify_waypoints_changed(None)
+            markdown_command_registry.invalidate()
         else:
             logger.error(f"Git sync from Git failed: {result.get('message', 'Unknown error')}")
         
@@ -0,0 +1,323 @@
+"""
+Resident State Store for GAIA Experiences
+
+Optional write-behind cache for UnifiedStateManager. World and player documents
+stay parsed in memory; mutations apply to the resident copy and a background
+flusher writes dirty documents back to disk in batches.
+
+Architecture:
+- Documents are keyed by their on-disk path (world.json / view.json)
+- Reads return a private copy of the resident document (no disk I/O)
+- Writes replace the resident document and mark it dirty
+- At most max_documents stay resident; the least recently used clean
+  documents are evicted (dirty ones stay until flushed)
+- The flusher coalesces dirty documents into one batched, atomic write pass
+  (temp file + os.replace) every flush_interval_s, or sooner once
+  max_pending_writes unflushed mutations have accumulated. Documents are
+  snapshotted on the event loop and serialized in the worker thread
+
+Durability: at most flush_interval_s worth of mutations (bounded by
+max_pending_writes) can be lost on a hard crash. close() flushes everything.
+
+The store assumes it is the only writer of the files it manages, which holds
+for a single KB service process. Code that rewrites state files behind the
+manager's back must call discard() afterwards.
+
+Author: GAIA Platform Team
+Created: 2026-10-16
+"""
+
+import asyncio
+import json
+import os
+import time
+import logging
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Set, Tuple, Callable
+
+logger = logging.getLogger(__name__)
+
+
+def clone_document(value: Any) -> Any:
+    """
+    Copy a JSON-compatible document.
+
+    Much cheaper than copy.deepcopy() because it only has to handle the
+    types json.load() can produce.
+    """
+    if isinstance(value, dict):
+        return {k: clone_document(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [clone_document(v) for v in value]
+    return value
+
+
+class ResidentStateStore:
+    """
+    In-memory, write-behind store for experience state documents.
+
+    Key Responsibilities:
+    - Keep recently used world/view documents resident, bounded by count
+    - Track dirty documents and flush them in batched atomic writes
+    - Bound data loss by flush interval and pending-write count
+    - Expose counters for monitoring
+    """
+
+    def __init__(
+        self,
+        flush_interval_s: float = 1.0,
+        max_pending_writes: int = 100,
+        loader: Optional[Callable[[Path], Dict[str, Any]]] = None,
+        max_documents: int = 1000
+    ):
+        """
+        Initialize resident store.
+
+        Args:
+            flush_interval_s: Seconds between background flushes
+            max_pending_writes: Unflushed mutations that force an early flush
+            loader: Optional function used to load a document on first access
+                (defaults to json.load; UnifiedStateManager uses it to replay
+                the delta journal)
+            max_documents: Resident documents kept before clean ones are evicted
+        """
+        self.flush_interval_s = flush_interval_s
+        self.max_pending_writes = max_pending_writes
+        self.loader = loader
+        self.max_documents = max_documents
+
+        # LRU order: least recently used first
+        self._documents: "OrderedDict[Path, Dict[str, Any]]" = OrderedDict()
+        self._dirty: Dict[Path, float] = {}  # path -> time first dirtied
+        self._flushing: Set[Path] = set()  # Being written by the flusher
+        self._pending_writes = 0
+
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_requested: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._closed = False
+
+        self._stats = {
+            "loads": 0,
+            "reads": 0,
+            "writes": 0,
+            "flushes": 0,
+            "documents_flushed": 0,
+            "flush_errors": 0,
+            "evictions": 0,
+            "last_flush_ms": 0.0
+        }
+
+    # ===== DOCUMENT ACCESS =====
+
+    def contains(self, path: Path) -> bool:
+        """Return True if the document is resident or exists on disk."""
+        return path in self._documents or path.exists()
+
+    def read(self, path: Path) -> Dict[str, Any]:
+        """
+        Return a private copy of the document at path.
+
+        Loads from disk on first access.
+
+        Raises:
+            FileNotFoundError: If the document is neither resident nor on disk
+        """
+        document = self._get(path)
+        self._stats["reads"] += 1
+        return clone_document(document)
+
+    def peek(self, path: Path) -> Dict[str, Any]:
+        """
+        Return the resident document itself (no copy).
+
+        Callers must treat the result as read-only.
+        """
+        return self._get(path)
+
+    def write(self, path: Path, document: Dict[str, Any]) -> None:
+        """Replace the resident document and schedule it for flushing."""
+        self._documents[path] = document
+        self._documents.move_to_end(path)
+        self._dirty.setdefault(path, time.monotonic())
+        self._pending_writes += 1
+        self._stats["writes"] += 1
+        self._evict()
+
+        self._ensure_flusher()
+        if self._pending_writes >= self.max_pending_writes and self._flush_requested:
+            self._flush_requested.set()
+
+    def discard(self, path: Path) -> None:
+        """Forget a document (pending changes are dropped)."""
+        self._documents.pop(path, None)
+        self._dirty.pop(path, None)
+
+    def discard_under(self, root: Path) -> int:
+        """Forget every document below root. Returns number discarded."""
+        paths = [p for p in self._documents if root == p or root in p.parents]
+        for path in paths:
+            self.discard(path)
+        return len(paths)
+
+    def _get(self, path: Path) -> Dict[str, Any]:
+        document = self._documents.get(path)
+        if document is None:
+            return self._load(path)
+        self._documents.move_to_end(path)
+        return document
+
+    def _load(self, path: Path) -> Dict[str, Any]:
+        if self.loader:
+            document = self.loader(path)
+        else:
+            with open(path, 'r') as f:
+                document = json.load(f)
+        self._documents[path] = document
+        self._stats["loads"] += 1
+        self._evict()
+        return document
+
+    def _evict(self) -> None:
+        """Drop least recently used clean documents beyond max_documents."""
+        excess = len(self._documents) - self.max_documents
+        if excess <= 0:
+            return
+        # Dirty or in-flight documents only exist here; they stay until written
+        for path in [p for p in self._documents if p not in self._dirty and p not in self._flushing][:excess]:
+            del self._documents[path]
+            self._stats["evictions"] += 1
+
+    # ===== FLUSHING =====
+
+    def _ensure_flusher(self) -> None:
+        """Start the background flusher on first write (needs a running loop)."""
+        if self._closed or (self._flush_task and not self._flush_task.done()):
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # No loop (sync caller) - flush() / close() will persist
+
+        self._flush_requested = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._flush_task = loop.create_task(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        while not self._closed:
+            try:
+                await asyncio.wait_for(
+                    self._flush_requested.wait(), timeout=self.flush_interval_s
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._flush_requested.clear()
+            await self.flush()
+
+    async def flush(self) -> int:
+        """
+        Write every dirty document to disk in one batched pass.
+
+        Returns:
+            Number of documents written
+        """
+        if not self._dirty:
+            return 0
+
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+
+        async with self._flush_lock:
+            # Snapshot under the event loop so later writes are not lost;
+            # serializing happens in the worker thread
+            batch: List[Tuple[Path, Dict[str, Any]]] = []
+            for path in list(self._dirty):
+                document = self._documents.get(path)
+                if document is not None:
+                    batch.append((path, clone_document(document)))
+            self._dirty.clear()
+            self._pending_writes = 0
+
+            if not batch:
+                return 0
+
+            self._flushing = {path for path, _ in batch}
+            start = time.perf_counter()
+            try:
+                failed = await asyncio.to_thread(self._write_batch, batch)
+            finally:
+                self._flushing = set()
+            self._stats["last_flush_ms"] = round((time.perf_counter() - start) * 1000, 2)
+
+            # Re-queue failures so they are retried on the next pass
+            for path in failed:
+                self._dirty.setdefault(path, time.monotonic())
+
+            written = len(batch) - len(failed)
+            self._stats["flushes"] += 1
+            self._stats["documents_flushed"] += written
+            self._stats["flush_errors"] += len(failed)
+            logger.debug(f"Resident state flush wrote {written} document(s)")
+            self._evict()
+            return written
+
+    @staticmethod
+    def _write_batch(batch: List[Tuple[Path, Dict[str, Any]]]) -> List[Path]:
+        """Serialize and atomically write each document. Returns failed paths."""
+        failed = []
+        for path, document in batch:
+            tmp_path = path.with_name(f".{path.name}.tmp")
+            try:
+                payload = json.dumps(document, indent=2)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with open(tmp_path, 'w') as f:
+                    f.write(payload)
+                os.replace(tmp_path, path)
+            except (OSError, TypeError, ValueError) as e:
+                logger.error(f"Failed to flush resident state {path}: {e}")
+                failed.append(path)
+        return failed
+
+    def flush_path_sync(self, path: Path) -> None:
+        """Synchronously persist one document if it is dirty."""
+        if path not in self._dirty:
+            return
+        document = self._documents.get(path)
+        self._dirty.pop(path, None)
+        if document is not None:
+            failed = self._write_batch([(path, document)])
+            if failed:
+                self._dirty.setdefault(path, time.monotonic())
+
+    async def close(self) -> None:
+        """Stop the flusher and persist all pending changes."""
+        self._closed = True
+        if self._flush_task:
+            # Let an in-flight flush finish: cancelling it would not stop its
+            # worker-thread write, which would then race the final flush below
+            self._flush_requested.set()
+            try:
+                await self._flush_task
+            except Exception as e:
+                logger.error(f"Resident state flusher failed: {e}")
+            self._flush_task = None
+        await self.flush()
+
+    # ===== MONITORING =====
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return store counters."""
+        oldest_dirty = min(self._dirty.values()) if self._dirty else None
+        return {
+            **self._stats,
+            "resident_documents": len(self._documents),
+            "max_documents": self.max_documents,
+            "dirty_documents": len(self._dirty),
+            "pending_writes": self._pending_writes,
+            "oldest_dirty_age_s": (
+                round(time.monotonic() - oldest_dirty, 3) if oldest_dirty else 0.0
+            ),
+            "flush_interval_s": self.flush_interval_s,
+            "max_pending_writes": self.max_pending_writes
+        }
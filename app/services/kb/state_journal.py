@@ -0,0 +1,231 @@
+"""
+World State Delta Journal for GAIA Experiences
+
+Append-only journal of world state deltas, keyed by _version. Instead of
+rewriting world.json on every action, UnifiedStateManager appends the merge
+updates ($append/$remove markers included) as one JSON line and periodically
+compacts the journal into a world.json snapshot.
+
+Architecture:
+- Journal lives next to the snapshot: /experiences/{exp}/state/world.journal.jsonl
+- Each line: {"v": new_version, "base": previous_version, "ts": iso8601, "changes": {...}}
+- Readers load the snapshot and replay entries with v > snapshot _version
+- Compaction writes the snapshot atomically, then rewrites the journal keeping
+  the last retain_entries entries so reconnecting clients can still catch up
+
+Invariant: the journal holds every version newer than the on-disk snapshot.
+Entries at or below the snapshot version are ignored on replay, so a snapshot
+written by any path (compaction, resident flush, restore) never double-applies.
+
+Author: GAIA Platform Team
+Created: 2026-10-16
+"""
+
+import json
+import os
+import logging
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Callable
+
+logger = logging.getLogger(__name__)
+
+# Merge function signature: (current_state, updates) -> merged_state
+MergeFn = Callable[[Dict[str, Any], Dict[str, Any]], Dict[str, Any]]
+
+
+class StateJournal:
+    """
+    Append-only delta journal with snapshot compaction.
+
+    Key Responsibilities:
+    - Append one delta per world version (write cost ~ delta size)
+    - Replay snapshot + journal tail
+    - Compact journal into snapshot every compact_every entries
+    - Answer "all deltas since version N" for reconnecting clients
+    """
+
+    JOURNAL_SUFFIX = ".journal.jsonl"
+
+    def __init__(self, compact_every: int = 200, retain_entries: int = 50):
+        """
+        Initialize journal.
+
+        Args:
+            compact_every: Journal entries beyond the snapshot before compaction
+            retain_entries: Entries kept after compaction for client catch-up
+        """
+        self.compact_every = compact_every
+        self.retain_entries = retain_entries
+
+        # journal path -> entries newer than the snapshot (avoids re-counting lines)
+        self._uncompacted: Dict[Path, int] = {}
+
+        self._stats = {
+            "appends": 0,
+            "replayed_entries": 0,
+            "compactions": 0
+        }
+
+    def journal_path(self, snapshot_path: Path) -> Path:
+        """Get journal path for a snapshot file (world.json -> world.journal.jsonl)."""
+        return snapshot_path.with_name(snapshot_path.stem + self.JOURNAL_SUFFIX)
+
+    # ===== WRITE PATH =====
+
+    def append(
+        self,
+        snapshot_path: Path,
+        base_version: int,
+        new_version: int,
+        changes: Dict[str, Any],
+        timestamp: str
+    ) -> bool:
+        """
+        Append a delta entry.
+
+        Returns:
+            True if the journal is due for compaction
+        """
+        journal_path = self.journal_path(snapshot_path)
+        entry = {"v": new_version, "base": base_version, "ts": timestamp, "changes": changes}
+
+        with open(journal_path, 'a') as f:
+            f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+        self._stats["appends"] += 1
+        count = self._uncompacted.get(journal_path)
+        if count is None:
+            count = self._count_uncompacted(snapshot_path)
+        else:
+            count += 1
+        self._uncompacted[journal_path] = count
+        return count >= self.compact_every
+
+    def compact(self, snapshot_path: Path, state: Dict[str, Any]) -> None:
+        """
+        Write state as the new snapshot and trim the journal.
+
+        Args:
+            snapshot_path: world.json path
+            state: Fully replayed current state (must include metadata._version)
+        """
+        version = state.get("metadata", {}).get("_version", 0)
+        journal_path = self.journal_path(snapshot_path)
+
+        # 1. Snapshot first - entries <= version become redundant
+        tmp_path = snapshot_path.with_name(f".{snapshot_path.name}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, snapshot_path)
+
+        # 2. Keep a short tail for catch-up plus anything newer than the snapshot
+        entries = self._read_entries(journal_path)
+        older = [e for e in entries if e["v"] <= version][-self.retain_entries:] if self.retain_entries else []
+        newer = [e for e in entries if e["v"] > version]
+        tmp_journal = journal_path.with_name(f".{journal_path.name}.tmp")
+        with open(tmp_journal, 'w') as f:
+            for entry in older + newer:
+                f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        os.replace(tmp_journal, journal_path)
+
+        self._uncompacted[journal_path] = len(newer)
+        self._stats["compactions"] += 1
+        logger.info(
+            f"Compacted journal {journal_path.name} into snapshot v{version} "
+            f"(retained {len(older)} entries)"
+        )
+
+    def discard(self, snapshot_path: Path) -> None:
+        """Delete the journal (e.g. after a world reset)."""
+        journal_path = self.journal_path(snapshot_path)
+        if journal_path.exists():
+            journal_path.unlink()
+        self._uncompacted.pop(journal_path, None)
+
+    # ===== READ PATH =====
+
+    def replay(self, snapshot: Dict[str, Any], snapshot_path: Path, merge: MergeFn) -> Dict[str, Any]:
+        """
+        Apply journal entries newer than the snapshot.
+
+        Args:
+            snapshot: Parsed world.json
+            snapshot_path: world.json path
+            merge: Merge function (UnifiedStateManager._merge_updates)
+
+        Returns:
+            Current state
+        """
+        state = snapshot
+        version = state.get("metadata", {}).get("_version", 0)
+        applied = 0
+
+        for entry in self._read_entries(self.journal_path(snapshot_path)):
+            if entry["v"] <= version:
+                continue
+            state = merge(state, entry["changes"])
+            state.setdefault("metadata", {})
+            state["metadata"]["_version"] = entry["v"]
+            state["metadata"]["last_modified"] = entry["ts"]
+            version = entry["v"]
+            applied += 1
+
+        self._stats["replayed_entries"] += applied
+        return state
+
+    def get_entries_since(
+        self,
+        snapshot_path: Path,
+        since_version: int,
+        current_version: int
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get journal entries from since_version up to current_version.
+
+        Returns:
+            Entries in version order, or None if the journal no longer covers
+            the whole gap, e.g. compaction dropped them (client needs a full
+            snapshot instead)
+        """
+        if since_version >= current_version:
+            return []
+        entries = [
+            e for e in self._read_entries(self.journal_path(snapshot_path))
+            if since_version < e["v"] <= current_version
+        ]
+        if not entries or entries[0]["base"] != since_version or entries[-1]["v"] != current_version:
+            return None
+        return entries
+
+    def _read_entries(self, journal_path: Path) -> List[Dict[str, Any]]:
+        if not journal_path.exists():
+            return []
+        entries = []
+        with open(journal_path, 'r') as f:
+            for line_num, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # Torn final write after a crash - everything before it is intact
+                    logger.warning(f"Ignoring corrupt journal line {line_num} in {journal_path}")
+                    break
+        return entries
+
+    def _count_uncompacted(self, snapshot_path: Path) -> int:
+        try:
+            with open(snapshot_path, 'r') as f:
+                version = json.load(f).get("metadata", {}).get("_version", 0)
+        except (OSError, json.JSONDecodeError):
+            version = 0
+        return sum(1 for e in self._read_entries(self.journal_path(snapshot_path)) if e["v"] > version)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return journal counters."""
+        return {
+            **self._stats,
+            "compact_every": self.compact_every,
+            "retain_entries": self.retain_entries
+        }
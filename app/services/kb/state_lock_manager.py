@@ -0,0 +1,194 @@
+"""
+State Lock Manager for GAIA Experiences
+
+Non-blocking exclusive locks for shared experience state files.
+
+Architecture:
+- In-process: one asyncio.Lock per state path. Waiters queue FIFO and never
+  block the event loop.
+- Cross-process: fcntl advisory lock on a sidecar file ({name}.lock), acquired
+  in a worker thread so polling for another process's lock never stalls other
+  WebSocket connections. A sidecar keeps the lock valid when the state file is
+  replaced atomically (os.replace swaps the inode).
+- Both stages share one timeout budget; timeouts raise LockTimeoutError.
+
+Wait times are recorded so lock contention shows up in metrics.
+
+Author: GAIA Platform Team
+Created: 2026-10-16
+"""
+
+import asyncio
+import fcntl
+import os
+import time
+import logging
+from collections import deque
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Dict, Any, AsyncIterator, Deque
+
+logger = logging.getLogger(__name__)
+
+
+class LockTimeoutError(TimeoutError):
+    """Raised when a state lock can't be acquired within the timeout"""
+    pass
+
+
+class StateLockManager:
+    """
+    Per-path async lock manager with cross-process file locking.
+
+    Key Responsibilities:
+    - FIFO in-process queuing per state path (asyncio.Lock)
+    - Cross-process exclusion via fcntl.flock in a worker thread
+    - Real timeouts covering both stages
+    - Lock wait-time metrics
+    """
+
+    # Poll interval while another process holds the file lock (worker thread)
+    FILE_LOCK_POLL_S = 0.01
+
+    def __init__(self, sample_size: int = 1000):
+        """
+        Initialize lock manager.
+
+        Args:
+            sample_size: Number of recent wait times kept for percentile stats
+        """
+        self._locks: Dict[Path, asyncio.Lock] = {}
+        self._waits_ms: Deque[float] = deque(maxlen=sample_size)
+        self._stats = {
+            "acquired": 0,
+            "timeouts": 0,
+            "contended": 0,
+            "max_wait_ms": 0.0,
+            "total_wait_ms": 0.0
+        }
+
+    def _get_lock(self, path: Path) -> asyncio.Lock:
+        lock = self._locks.get(path)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[path] = lock
+        return lock
+
+    @asynccontextmanager
+    async def acquire(self, path: Path, timeout_ms: int) -> AsyncIterator[None]:
+        """
+        Hold an exclusive lock on path for the duration of the context.
+
+        Args:
+            path: State file to lock
+            timeout_ms: Total time allowed for in-process and cross-process waits
+
+        Raises:
+            LockTimeoutError: If the lock isn't acquired in time
+        """
+        timeout_s = timeout_ms / 1000.0
+        start = time.perf_counter()
+        lock = self._get_lock(path)
+
+        if lock.locked():
+            self._stats["contended"] += 1
+
+        try:
+            await asyncio.wait_for(lock.acquire(), timeout=timeout_s)
+        except asyncio.TimeoutError:
+            self._raise_timeout(path, timeout_ms, "in-process")
+
+        try:
+            remaining_s = max(0.0, timeout_s - (time.perf_counter() - start))
+            file_lock = asyncio.ensure_future(asyncio.to_thread(self._acquire_file_lock, path, remaining_s))
+            try:
+                # The worker thread can't be interrupted; if we're cancelled while it
+                # waits, it may still take the flock, so release it once it returns
+                fd = await asyncio.shield(file_lock)
+            except asyncio.CancelledError:
+                file_lock.add_done_callback(self._release_abandoned_file_lock)
+                raise
+            if fd is None:
+                self._raise_timeout(path, timeout_ms, "cross-process")
+
+            self._record_wait((time.perf_counter() - start) * 1000)
+            try:
+                yield
+            finally:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+                finally:
+                    os.close(fd)
+        finally:
+            lock.release()
+
+    def _acquire_file_lock(self, path: Path, timeout_s: float):
+        """
+        Take an exclusive fcntl lock on path (runs in a worker thread).
+
+        Returns:
+            Open file descriptor holding the lock, or None on timeout
+        """
+        lock_path = path.with_name(f"{path.name}.lock")
+        fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        deadline = time.monotonic() + timeout_s
+        while True:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return fd
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    os.close(fd)
+                    return None
+                time.sleep(self.FILE_LOCK_POLL_S)
+            except OSError:
+                os.close(fd)
+                raise
+
+    @staticmethod
+    def _release_abandoned_file_lock(file_lock: "asyncio.Future") -> None:
+        """Unlock and close a file lock acquired after its caller was cancelled."""
+        if file_lock.cancelled() or file_lock.exception() is not None:
+            return
+        fd = file_lock.result()
+        if fd is None:
+            return
+        try:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
+
+    def _record_wait(self, wait_ms: float) -> None:
+        self._waits_ms.append(wait_ms)
+        self._stats["acquired"] += 1
+        self._stats["total_wait_ms"] += wait_ms
+        if wait_ms > self._stats["max_wait_ms"]:
+            self._stats["max_wait_ms"] = wait_ms
+
+    def _raise_timeout(self, path: Path, timeout_ms: int, stage: str) -> None:
+        self._stats["timeouts"] += 1
+        logger.warning(f"Lock timeout ({stage}) on {path} after {timeout_ms}ms")
+        raise LockTimeoutError(
+            f"Failed to acquire lock on {path} within {timeout_ms}ms"
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return lock wait-time metrics."""
+        waits = sorted(self._waits_ms)
+
+        def percentile(p: float) -> float:
+            if not waits:
+                return 0.0
+            return round(waits[min(len(waits) - 1, int(len(waits) * p))], 3)
+
+        acquired = self._stats["acquired"]
+        return {
+            **self._stats,
+            "max_wait_ms": round(self._stats["max_wait_ms"], 3),
+            "total_wait_ms": round(self._stats["total_wait_ms"], 3),
+            "avg_wait_ms": round(self._stats["total_wait_ms"] / acquired, 3) if acquired else 0.0,
+            "p50_wait_ms": percentile(0.50),
+            "p99_wait_ms": percentile(0.99),
+            "tracked_paths": len(self._locks),
+            "held": sum(1 for lock in self._locks.values() if lock.locked())
+        }
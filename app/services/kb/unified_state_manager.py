@@ -14,16 +14,19 @@ Created: 2025-10-27
 """
 
 import json
-import fcntl
 import os
 import time
 import shutil
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime
 import logging
+from collections import OrderedDict
 
 from app.services.kb.template_loader import get_template_loader
+from app.services.kb.resident_state_store import ResidentStateStore, clone_document
+from app.services.kb.state_lock_manager import StateLockManager, LockTimeoutError
+from app.services.kb.state_journal import StateJournal
 
 logger = logging.getLogger(__name__)
 
@@ -74,7 +77,9 @@ class UnifiedStateManager:
         self,
         kb_root: Path,
         nats_client: Optional['NATSClient'] = None,
-        connection_manager: Optional['ExperienceConnectionManager'] = None
+        connection_manager: Optional['ExperienceConnectionManager'] = None,
+        state_store: Optional[ResidentStateStore] = None,
+        journal: Optional[StateJournal] = None
     ):
         """
         Initialize state manager.
@@ -83,6 +88,10 @@ class UnifiedStateManager:
             kb_root: Root path to knowledge base (contains /experiences/, /players/)
             nats_client: Optional NATS client for real-time world update events
             connection_manager: Optional connection manager for client version tracking
+            state_store: Optional resident store - keeps world/view documents in
+                memory and flushes them in the background (write-behind)
+            journal: Optional delta journal - shared world updates append a delta
+                instead of rewriting world.json, with periodic compaction
         """
         self.kb_root = Path(kb_root)
         self.experiences_path = self.kb_root / "experiences"
@@ -100,11 +109,47 @@ class UnifiedStateManager:
         # Template loader for entity blueprints
         self.template_loader = get_template_loader(kb_root)
 
+        # Resident (write-behind) state store (optional)
+        self.state_store = state_store
+
+        # Delta journal for shared world state (optional)
+        self.journal = journal
+
+        if self.state_store:
+            # Resident documents must include journaled deltas
+            self.state_store.loader = self._load_state_file
+
+        # Async lock manager for shared world state
+        self.lock_manager = StateLockManager()
+
+        # AOI cache: (experience, zone_id, world _version) -> areas payload
+        self._aoi_cache: "OrderedDict[Tuple[str, str, int], Dict[str, Any]]" = OrderedDict()
+        # Template-merged item payloads: (experience, template_id, instance json) -> item
+        self._aoi_item_cache: "OrderedDict[Tuple[str, str, str], Dict[str, Any]]" = OrderedDict()
+        # World file signature -> _version, so version checks skip the JSON parse
+        self._world_signatures: Dict[Path, Tuple[Tuple[int, ...], int]] = {}
+        # world path -> (stat signature, replayed state) so non-resident journaled
+        # reads and updates don't re-parse the snapshot and replay the whole journal
+        self._replayed_states: Dict[Path, Tuple[Tuple[int, ...], Dict[str, Any]]] = {}
+        self._aoi_stats = {"hits": 0, "misses": 0, "item_hits": 0, "item_misses": 0}
+
         logger.info(f"UnifiedStateManager initialized with KB root: {kb_root}")
         if self.nats_client:
             logger.info("Real-time NATS updates enabled")
         if self.connection_manager:
             logger.info("Client version tracking enabled")
+        if self.journal:
+            logger.info(f"World delta journal enabled (compact every {journal.compact_every} entries)")
+        if self.state_store:
+            logger.info(
+                f"Resident state enabled (flush every {state_store.flush_interval_s}s, "
+                f"max {state_store.max_pending_writes} pending writes)"
+            )
+
+    async def close(self) -> None:
+        """Flush pending resident state to disk."""
+        if self.state_store:
+            await self.state_store.close()
 
     # ===== CONFIG MANAGEMENT =====
 
@@ -277,6 +322,7 @@ class UnifiedStateManager:
         caps.setdefault("inventory_system", True)
         caps.setdefault("quest_system", False)
         caps.setdefault("combat_system", False)
+        caps.setdefault("llm_response_cache", True)  # Reuse LLM command outcomes for identical state
 
         return config
 
@@ -568,13 +614,12 @@ class UnifiedStateManager:
             # Load shared world state
             world_path = self._get_world_state_path(experience, config)
 
-            if not world_path.exists():
+            if not self._state_exists(world_path):
                 raise StateNotFoundError(
                     f"World state not found for '{experience}': {world_path}"
                 )
 
-            with open(world_path, 'r') as f:
-                world_state = json.load(f)
+            world_state = self._read_state(world_path)
 
             logger.debug(f"Loaded shared world state for '{experience}'")
             return world_state
@@ -589,8 +634,7 @@ class UnifiedStateManager:
 
             view_path = self._get_player_view_path(experience, user_id)
 
-            with open(view_path, 'r') as f:
-                view = json.load(f)
+            view = self._read_state(view_path)
 
             # For isolated model, view contains the world state
             logger.debug(f"Loaded isolated world state for '{experience}', user '{user_id}'")
@@ -640,11 +684,11 @@ class UnifiedStateManager:
             # Fallback: Use server's version (for non-WebSocket updates)
             if state_model == "shared":
                 world_path = self._get_world_state_path(experience, config)
-                current_state = json.loads(world_path.read_text()) if world_path.exists() else {}
+                current_state = self._peek_state(world_path)
             else:  # isolated
                 if user_id:
                     view_path = self._get_player_view_path(experience, user_id)
-                    current_state = json.loads(view_path.read_text()) if view_path.exists() else {}
+                    current_state = self._peek_state(view_path)
                 else:
                     current_state = {}
             base_version = current_state.get("metadata", {}).get("_version", 0)
@@ -685,6 +729,20 @@ class UnifiedStateManager:
 
         return updated_state
 
+    async def _get_world_version(self, experience: str) -> int:
+        """Get current world _version without copying the whole document."""
+        config = self.load_config(experience)
+        if config["state"]["model"] != "shared":
+            world_state = await self.get_world_state(experience)
+            return world_state.get("metadata", {}).get("_version", 0)
+
+        world_path = self._get_world_state_path(experience, config)
+        if not self._state_exists(world_path):
+            raise StateNotFoundError(
+                f"World state not found for '{experience}': {world_path}"
+            )
+        return self._peek_state(world_path).get("metadata", {}).get("_version", 0)
+
     async def _update_shared_world_state(
         self,
         experience: str,
@@ -695,7 +753,7 @@ class UnifiedStateManager:
         """Update shared world state with optional file locking."""
         world_path = self._get_world_state_path(experience, config)
 
-        if not world_path.exists():
+        if not self._state_exists(world_path):
             raise StateNotFoundError(
                 f"World state not found for '{experience}': {world_path}"
             )
@@ -703,7 +761,16 @@ class UnifiedStateManager:
         locking_enabled = use_locking and config["state"]["coordination"]["locking_enabled"]
         lock_timeout_ms = config["state"]["coordination"]["lock_timeout_ms"]
 
-        if locking_enabled:
+        if self.journal:
+            # Journal mode: append the delta, snapshot only on compaction
+            return await self._journaled_update(
+                world_path, updates, locking_enabled, lock_timeout_ms
+            )
+        elif self.state_store:
+            # Resident mode: this process owns the document and the merge runs
+            # without yielding to the event loop, so no file lock is needed
+            return await self._direct_update(world_path, updates)
+        elif locking_enabled:
             # Use file locking for concurrent access
             return await self._locked_update(world_path, updates, lock_timeout_ms)
         else:
@@ -739,53 +806,87 @@ class UnifiedStateManager:
         lock_timeout_ms: int
     ) -> Dict[str, Any]:
         """
-        Update file with exclusive file lock.
+        Update file with exclusive lock.
 
-        Uses fcntl.flock for POSIX systems.
+        Waits on the StateLockManager (asyncio lock in-process, fcntl.flock in a
+        worker thread across processes) so contention never blocks the event loop.
         """
-        lock_timeout_s = lock_timeout_ms / 1000.0
-        start_time = time.time()
-
-        with open(file_path, 'r+') as f:
-            # Try to acquire exclusive lock
-            while True:
-                try:
-                    fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
-                    break  # Lock acquired
-                except IOError:
-                    # Lock held by another process
-                    if time.time() - start_time > lock_timeout_s:
-                        raise StateLockError(
-                            f"Failed to acquire lock on {file_path} within {lock_timeout_ms}ms"
-                        )
-                    time.sleep(0.1)  # Wait 100ms before retry
-
-            try:
+        try:
+            async with self.lock_manager.acquire(file_path, lock_timeout_ms):
                 # Read current state
-                f.seek(0)
-                current_state = json.load(f)
+                with open(file_path, 'r') as f:
+                    current_state = json.load(f)
 
                 # Apply updates (merge)
                 updated_state = self._merge_updates(current_state, updates)
 
                 # Increment version for optimistic locking
-                if "metadata" not in updated_state:
-                    updated_state["metadata"] = {}
-                updated_state["metadata"]["_version"] = updated_state.get("metadata", {}).get("_version", 0) + 1
-                updated_state["metadata"]["last_modified"] = datetime.utcnow().isoformat() + "Z"
+                self._stamp_version(updated_state)
 
                 # Write back
-                f.seek(0)
-                f.truncate()
-                json.dump(updated_state, f, indent=2)
-                f.flush()
+                with open(file_path, 'w') as f:
+                    json.dump(updated_state, f, indent=2)
 
                 logger.debug(f"Locked update completed for {file_path}")
                 return updated_state
+        except LockTimeoutError as e:
+            raise StateLockError(str(e)) from e
+
+    async def _journaled_update(
+        self,
+        world_path: Path,
+        updates: Dict[str, Any],
+        locking_enabled: bool,
+        lock_timeout_ms: int
+    ) -> Dict[str, Any]:
+        """
+        Update shared world state by appending a delta to the journal.
+
+        Write cost depends on the delta size, not the world size; the full
+        snapshot is only rewritten when the journal is compacted.
+        """
+        # Resident mode serializes in-process; otherwise lock across processes
+        if locking_enabled and not self.state_store:
+            try:
+                async with self.lock_manager.acquire(world_path, lock_timeout_ms):
+                    return self._apply_journaled_update(world_path, updates)
+            except LockTimeoutError as e:
+                raise StateLockError(str(e)) from e
+        return self._apply_journaled_update(world_path, updates)
+
+    def _apply_journaled_update(
+        self,
+        world_path: Path,
+        updates: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Merge, journal and (when due) compact one world update."""
+        current_state = self._read_state(world_path)
+        base_version = current_state.get("metadata", {}).get("_version", 0)
+
+        updated_state = self._merge_updates(current_state, updates)
+        self._stamp_version(updated_state)
+        metadata = updated_state["metadata"]
+
+        compaction_due = self.journal.append(
+            world_path,
+            base_version=base_version,
+            new_version=metadata["_version"],
+            changes=updates,
+            timestamp=metadata["last_modified"]
+        )
+
+        if self.state_store:
+            updated_state = self._write_state(world_path, updated_state)
+
+        if compaction_due:
+            self.journal.compact(world_path, updated_state)
 
-            finally:
-                # Release lock
-                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        if not self.state_store:
+            # Next read/update starts from this state instead of a full replay
+            self._remember_replayed_state(world_path, updated_state)
+
+        logger.debug(f"Journaled update v{metadata['_version']} for {world_path}")
+        return updated_state
 
     async def _direct_update(
         self,
@@ -795,24 +896,20 @@ class UnifiedStateManager:
         """
         Update file directly without locking.
 
-        Used for isolated model or when locking disabled.
+        Used for isolated model, when locking disabled, or in resident mode
+        (where the write is deferred to the background flusher).
         """
         # Read current state
-        with open(file_path, 'r') as f:
-            current_state = json.load(f)
+        current_state = self._read_state(file_path)
 
         # Apply updates
         updated_state = self._merge_updates(current_state, updates)
 
         # Increment version
-        if "metadata" not in updated_state:
-            updated_state["metadata"] = {}
-        updated_state["metadata"]["_version"] = updated_state.get("metadata", {}).get("_version", 0) + 1
-        updated_state["metadata"]["last_modified"] = datetime.utcnow().isoformat() + "Z"
+        self._stamp_version(updated_state)
 
         # Write back
-        with open(file_path, 'w') as f:
-            json.dump(updated_state, f, indent=2)
+        updated_state = self._write_state(file_path, updated_state)
 
         logger.debug(f"Direct update completed for {file_path}")
         return updated_state
@@ -927,7 +1024,7 @@ class UnifiedStateManager:
         """
         view_path = self._get_player_view_path(experience, user_id)
 
-        if not view_path.exists():
+        if not self._state_exists(view_path):
             logger.info(f"First-time join: bootstrapping player '{user_id}' for '{experience}'")
             await self.bootstrap_player(experience, user_id)
         else:
@@ -956,14 +1053,13 @@ class UnifiedStateManager:
         """
         view_path = self._get_player_view_path(experience, user_id)
 
-        if not view_path.exists():
+        if not self._state_exists(view_path):
             raise StateNotFoundError(
                 f"Player view not found for user '{user_id}' in '{experience}'. "
                 f"Call ensure_player_initialized() first."
             )
 
-        with open(view_path, 'r') as f:
-            view = json.load(f)
+        view = self._read_state(view_path)
 
         logger.debug(f"Loaded player view for user '{user_id}' in '{experience}'")
         return view
@@ -993,13 +1089,11 @@ class UnifiedStateManager:
         view_path = self._get_player_view_path(experience, user_id)
 
         # Read current version before update
-        with open(view_path, 'r') as f:
-            current_view = json.load(f)
+        current_view = self._peek_state(view_path)
 
         # CRITICAL: Use world's incremental _version, not timestamps
         # This ensures consistency with update_world_state() versioning
-        world_state = await self.get_world_state(experience)
-        current_world_version = world_state.get("metadata", {}).get("_version", 0)
+        current_world_version = await self._get_world_version(experience)
 
         base_version = current_view.get("snapshot_version", current_world_version)
         new_version = current_world_version  # Player view versions track world version
@@ -1046,10 +1140,9 @@ class UnifiedStateManager:
         view_path = self._get_player_view_path(experience, user_id)
 
         # Check if already exists
-        if view_path.exists():
+        if self._state_exists(view_path):
             logger.warning(f"Player '{user_id}' already bootstrapped for '{experience}'")
-            with open(view_path, 'r') as f:
-                return json.load(f)
+            return self._read_state(view_path)
 
         # Create player directory if needed
         view_path.parent.mkdir(parents=True, exist_ok=True)
@@ -1068,8 +1161,7 @@ class UnifiedStateManager:
         view["snapshot_version"] = world_state.get("metadata", {}).get("_version", 0)
 
         # Write player view
-        with open(view_path, 'w') as f:
-            json.dump(view, f, indent=2)
+        view = self._write_state(view_path, view)
 
         logger.info(
             f"Bootstrapped player '{user_id}' for '{experience}' ({state_model} model), "
@@ -1156,6 +1248,168 @@ class UnifiedStateManager:
 
         return template
 
+    # ===== STATE FILE I/O =====
+
+    def _state_exists(self, file_path: Path) -> bool:
+        """Check whether a state document exists (resident or on disk)."""
+        if self.state_store:
+            return self.state_store.contains(file_path)
+        return file_path.exists()
+
+    def _load_state_file(self, file_path: Path) -> Dict[str, Any]:
+        """Load a state document from disk, replaying journaled deltas if any."""
+        journaled = self.journal is not None and self.journal.journal_path(file_path).exists()
+        if journaled:
+            signature = self._world_file_signature(file_path)
+            cached = self._replayed_states.get(file_path)
+            if cached and cached[0] == signature:
+                return clone_document(cached[1])
+
+        with open(file_path, 'r') as f:
+            state = json.load(f)
+        if journaled:
+            state = self.journal.replay(state, file_path, self._merge_updates)
+            self._remember_replayed_state(file_path, state)
+        return state
+
+    def _remember_replayed_state(self, file_path: Path, state: Dict[str, Any]) -> None:
+        """Cache a replayed state under the current snapshot + journal signature."""
+        self._replayed_states[file_path] = (self._world_file_signature(file_path), clone_document(state))
+
+    def _read_state(self, file_path: Path) -> Dict[str, Any]:
+        """Read a state document (from memory when resident state is enabled)."""
+        if self.state_store:
+            return self.state_store.read(file_path)
+        return self._load_state_file(file_path)
+
+    def _peek_state(self, file_path: Path) -> Dict[str, Any]:
+        """Read a state document for inspection only ({} if missing)."""
+        if not self._state_exists(file_path):
+            return {}
+        if self.state_store:
+            return self.state_store.peek(file_path)
+        return self._load_state_file(file_path)
+
+    def _write_state(self, file_path: Path, state: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Write a state document (write-behind when resident state is enabled).
+
+        Returns:
+            The written state, safe for the caller to keep and mutate
+        """
+        if self.state_store:
+            self.state_store.write(file_path, state)
+            return clone_document(state)
+        with open(file_path, 'w') as f:
+            json.dump(state, f, indent=2)
+        return state
+
+    def _stamp_version(self, state: Dict[str, Any]) -> None:
+        """Increment _version and last_modified for optimistic locking."""
+        if "metadata" not in state:
+            state["metadata"] = {}
+        state["metadata"]["_version"] = state.get("metadata", {}).get("_version", 0) + 1
+        state["metadata"]["last_modified"] = datetime.utcnow().isoformat() + "Z"
+
+    def discard_resident_state(self, experience: str, include_players: bool = True) -> int:
+        """
+        Drop resident documents for an experience.
+
+        Call before rewriting world.json or player views outside this manager
+        (e.g. admin reset) so stale documents are neither flushed over the new
+        files nor served to readers.
+
+        Args:
+            experience: Experience ID
+            include_players: Also drop resident player views
+
+        Returns:
+            Number of documents discarded (0 when resident state is disabled)
+        """
+        self._invalidate_aoi(experience)
+        if not self.state_store:
+            return 0
+
+        discarded = self.state_store.discard_under(self.experiences_path / experience)
+        if include_players and self.players_path.exists():
+            for player_dir in self.players_path.iterdir():
+                discarded += self.state_store.discard_under(player_dir / experience)
+        logger.info(f"Discarded {discarded} resident document(s) for '{experience}'")
+        return discarded
+
+    def discard_world_journal(self, experience: str) -> None:
+        """
+        Delete the world delta journal for an experience.
+
+        Call when world.json is replaced wholesale (e.g. reset from template);
+        otherwise stale deltas would be replayed on top of the new snapshot.
+        Also drops cached AOIs, since the version counter may restart.
+        """
+        self._invalidate_aoi(experience)
+        if not self.journal:
+            return
+        config = self.load_config(experience)
+        world_path = self._get_world_state_path(experience, config)
+        self.journal.discard(world_path)
+        self._replayed_states.pop(world_path, None)
+
+    async def get_world_deltas_since(
+        self,
+        experience: str,
+        since_version: int,
+        user_id: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get world deltas after since_version for a reconnecting client (v0.4 format).
+
+        Args:
+            experience: Experience ID
+            since_version: Last snapshot_version the client applied
+            user_id: User ID (for change formatting)
+
+        Returns:
+            Dict with base_version, snapshot_version and ordered deltas, or None
+            if the journal can't cover the gap (client needs a full AOI)
+        """
+        config = self.load_config(experience)
+        if not self.journal or config["state"]["model"] != "shared":
+            return None
+
+        world_path = self._get_world_state_path(experience, config)
+        current_version = await self._get_world_version(experience)
+        if since_version > current_version:
+            return None  # Client is ahead (e.g. world was reset)
+
+        entries = self.journal.get_entries_since(world_path, since_version, current_version)
+        if entries is None:
+            return None
+
+        deltas = []
+        for entry in entries:
+            deltas.append({
+                "base_version": entry["base"],
+                "snapshot_version": entry["v"],
+                "changes": await self._format_world_update_changes(
+                    entry["changes"], experience, user_id
+                )
+            })
+
+        return {
+            "base_version": since_version,
+            "snapshot_version": deltas[-1]["snapshot_version"] if deltas else since_version,
+            "deltas": deltas
+        }
+
+    def get_lock_stats(self) -> Dict[str, Any]:
+        """Return lock wait-time metrics for shared state updates."""
+        return self.lock_manager.get_stats()
+
+    def get_state_store_stats(self) -> Dict[str, Any]:
+        """Return resident store counters (or {"enabled": False})."""
+        if not self.state_store:
+            return {"enabled": False}
+        return {"enabled": True, **self.state_store.get_stats()}
+
     # ===== PATH HELPERS =====
 
     def _get_world_state_path(self, experience: str, config: Dict[str, Any]) -> Path:
@@ -1373,6 +1627,12 @@ class UnifiedStateManager:
         config = self.load_config(experience)
         world_path = self._get_world_state_path(experience, config)
 
+        if self.state_store:
+            # Back up what players see, not the last flushed snapshot
+            self.state_store.flush_path_sync(world_path)
+        if self.journal and self.journal.journal_path(world_path).exists():
+            self.journal.compact(world_path, self._load_state_file(world_path))
+
         if not world_path.exists():
             raise StateNotFoundError(
                 f"Cannot backup - world state not found for '{experience}': {world_path}"
@@ -1420,9 +1680,13 @@ class UnifiedStateManager:
         template["metadata"]["last_modified"] = datetime.utcnow().isoformat() + "Z"
         template["metadata"]["_restored_from_template"] = datetime.utcnow().isoformat() + "Z"
 
-        # Write restored state
-        with open(world_path, 'w') as f:
-            json.dump(template, f, indent=2)
+        # Write restored state (stale deltas must not replay on top of it)
+        # Version restarts at 1, so cached AOIs keyed by version are invalid
+        self._invalidate_aoi(experience)
+        if self.journal:
+            self.journal.discard(world_path)
+            self._replayed_states.pop(world_path, None)
+        template = self._write_state(world_path, template)
 
         logger.info(f"Restored world state for '{experience}' from template")
         return template
@@ -1449,6 +1713,8 @@ class UnifiedStateManager:
                 continue
 
             view_path = player_dir / experience / "view.json"
+            if self.state_store:
+                self.state_store.discard(view_path)
             if view_path.exists():
                 view_path.unlink()
                 deleted_count += 1
@@ -1536,6 +1802,9 @@ class UnifiedStateManager:
 
     # ===== AREA OF INTEREST (AOI) =====
 
+    AOI_CACHE_MAX_ZONES = 256
+    AOI_ITEM_CACHE_MAX = 10000
+
     async def build_aoi(
         self,
         experience: str,
@@ -1548,6 +1817,11 @@ class UnifiedStateManager:
         Constructs complete world state snapshot for player's current location,
         including zone info, areas with items/NPCs, and player state.
 
+        The areas block only changes when the world changes, so it is cached per
+        (experience, zone_id, world _version); only the zone and player blocks
+        are rebuilt per request. Cached areas are shared between callers and
+        must be treated as read-only.
+
         Args:
             experience: Experience ID (e.g., "wylding-woods")
             user_id: User ID
@@ -1573,25 +1847,127 @@ class UnifiedStateManager:
             f"(user: {user_id})"
         )
 
-        # Load world state to get items/NPCs at this location
+        # Resolve world version cheaply; load the world only on a cache miss
         try:
-            world_state = await self.get_world_state(experience)
+            server_version, world_state = await self._get_world_version_for_aoi(experience)
         except StateNotFoundError:
             logger.warning(f"World state not found for experience '{experience}'")
-            world_state = {"locations": {}}
-
-        # Load player view for inventory/state
+            server_version, world_state = 0, {"locations": {}}
+
+        cache_key = (experience, zone_id, server_version)
+        cached = self._aoi_cache.get(cache_key)
+        if cached is not None:
+            self._aoi_cache.move_to_end(cache_key)
+            self._aoi_stats["hits"] += 1
+            zone_description, areas = cached["zone_description"], cached["areas"]
+        else:
+            self._aoi_stats["misses"] += 1
+            if world_state is None:
+                world_state = await self.get_world_state(experience)
+            zone_data = world_state.get("locations", {}).get(zone_id, {})
+            zone_description = zone_data.get("description")
+            areas = await self._build_aoi_areas(experience, zone_data, world_state)
+            self._store_aoi(cache_key, {"zone_description": zone_description, "areas": areas})
+
+        # Load player view for inventory/state (per request)
         try:
             player_view = await self.get_player_view(experience, user_id)
         except StateNotFoundError:
             logger.warning(f"Player view not found for user '{user_id}'")
             player_view = {"player": {"current_location": None, "inventory": []}}
 
-        # Extract location data from world state
-        locations = world_state.get("locations", {})
-        zone_data = locations.get(zone_id, {})
+        # Build zone info from waypoint + world state
+        zone = {
+            "id": zone_id,
+            "name": primary_waypoint.get("name", zone_id),
+            "description": zone_description or primary_waypoint.get("description", ""),
+            "gps": primary_waypoint.get("location")  # Raw GPS dict {lat, lng}
+        }
+
+        # Extract player state
+        player_state = player_view.get("player", {})
+        player_info = {
+            "current_location": player_state.get("current_location"),
+            "current_area": player_state.get("current_area"),
+            "inventory": player_state.get("inventory", [])
+        }
+
+        # Construct AOI payload
+        # Use server's authoritative version from world.json metadata
+        aoi = {
+            "zone": zone,
+            "areas": areas,
+            "player": player_info,
+            "snapshot_version": server_version  # Server-authoritative version (not timestamp)
+        }
+
+        logger.info(
+            f"Built AOI for zone '{zone_id}' with {len(areas)} areas "
+            f"(user: {user_id}, cached={cached is not None})"
+        )
+
+        return aoi
 
-        # Build areas dict with their spots/items/NPCs
+    async def _get_world_version_for_aoi(
+        self,
+        experience: str
+    ) -> Tuple[int, Optional[Dict[str, Any]]]:
+        """
+        Get world _version without parsing world.json when possible.
+
+        Resident mode reads the version from memory. Otherwise the world file
+        (and journal) stat signature is compared to the last parse.
+
+        Returns:
+            (version, world_state) - world_state is set only if it had to be loaded
+        """
+        config = self.load_config(experience)
+        if config["state"]["model"] != "shared":
+            world_state = await self.get_world_state(experience)
+            return world_state.get("metadata", {}).get("_version", 0), world_state
+
+        world_path = self._get_world_state_path(experience, config)
+        if self.state_store:
+            if not self._state_exists(world_path):
+                raise StateNotFoundError(
+                    f"World state not found for '{experience}': {world_path}"
+                )
+            return self._peek_state(world_path).get("metadata", {}).get("_version", 0), None
+
+        try:
+            signature = self._world_file_signature(world_path)
+        except FileNotFoundError:
+            raise StateNotFoundError(
+                f"World state not found for '{experience}': {world_path}"
+            )
+
+        known = self._world_signatures.get(world_path)
+        if known and known[0] == signature:
+            return known[1], None
+
+        world_state = await self.get_world_state(experience)
+        version = world_state.get("metadata", {}).get("_version", 0)
+        self._world_signatures[world_path] = (signature, version)
+        return version, world_state
+
+    def _world_file_signature(self, world_path: Path) -> Tuple[int, ...]:
+        """Stat signature (mtime_ns, size) of world.json plus its journal."""
+        stat = world_path.stat()
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if self.journal:
+            journal_path = self.journal.journal_path(world_path)
+            if journal_path.exists():
+                journal_stat = journal_path.stat()
+                signature += (journal_stat.st_mtime_ns, journal_stat.st_size)
+        return signature
+
+    async def _build_aoi_areas(
+        self,
+        experience: str,
+        zone_data: Dict[str, Any],
+        world_state: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Build the areas > spots > items/NPCs block of an AOI for one zone."""
         # New structure: zone > areas > spots > items
         areas = {}
         for area_id, area_data in zone_data.get("areas", {}).items():
@@ -1609,44 +1985,9 @@ class UnifiedStateManager:
 
                 # Load templates and merge with instance data for items at this spot
                 for item_instance in spot_data.get("items", []):
-                    # Handle items stored as strings (e.g., "dream_bottle_1")
-                    if isinstance(item_instance, str):
-                        instance_id = item_instance
-                        template_id = item_instance  # Use instance_id as template_id
-                        item_instance = {"instance_id": instance_id, "template_id": template_id}
-                    else:
-                        instance_id = item_instance.get("instance_id") or item_instance.get("id")
-                        template_id = item_instance.get("template_id") or item_instance.get("type")
-
-                    if not template_id:
-                        logger.warning(
-                            f"Item instance {instance_id} missing template_id, skipping"
-                        )
-                        continue
-
-                    # Load template definition from markdown
-                    template = await self.template_loader.load_template(
-                        experience=experience,
-                        entity_type="items",
-                        template_id=template_id
-                    )
-
-                    if not template:
-                        logger.warning(
-                            f"Template not found: {template_id} (instance: {instance_id}), "
-                            f"using instance data only"
-                        )
-                        # Fallback: use instance data if template not found
-                        template = {}
-
-                    # Merge template + instance (instance overrides template)
-                    # Pass full item_instance so world.json booleans override template strings
-                    merged_item = self.template_loader.merge_template_instance(
-                        template=template,
-                        instance=item_instance  # Pass full instance data
-                    )
-
-                    spots[spot_id]["items"].append(merged_item)
+                    merged_item = await self._merge_aoi_item(experience, item_instance)
+                    if merged_item is not None:
+                        spots[spot_id]["items"].append(merged_item)
 
                 # Add NPC if present at this spot
                 npc_id = spot_data.get("npc")
@@ -1667,36 +2008,100 @@ class UnifiedStateManager:
                 "spots": spots
             }
 
-        # Build zone info from waypoint + world state
-        zone = {
-            "id": zone_id,
-            "name": primary_waypoint.get("name", zone_id),
-            "description": zone_data.get("description") or primary_waypoint.get("description", ""),
-            "gps": primary_waypoint.get("location")  # Raw GPS dict {lat, lng}
-        }
+        return areas
 
-        # Extract player state
-        player_state = player_view.get("player", {})
-        player_info = {
-            "current_location": player_state.get("current_location"),
-            "current_area": player_state.get("current_area"),
-            "inventory": player_state.get("inventory", [])
-        }
+    async def _merge_aoi_item(
+        self,
+        experience: str,
+        item_instance: Any
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Merge an item instance with its template (memoized).
 
-        # Construct AOI payload
-        # Use server's authoritative version from world.json metadata
-        server_version = world_state.get("metadata", {}).get("_version", 0)
+        Returns:
+            Merged item payload, or None if the instance has no template_id
+        """
+        # Handle items stored as strings (e.g., "dream_bottle_1")
+        if isinstance(item_instance, str):
+            instance_id = item_instance
+            template_id = item_instance  # Use instance_id as template_id
+            item_instance = {"instance_id": instance_id, "template_id": template_id}
+        else:
+            instance_id = item_instance.get("instance_id") or item_instance.get("id")
+            template_id = item_instance.get("template_id") or item_instance.get("type")
 
-        aoi = {
-            "zone": zone,
-            "areas": areas,
-            "player": player_info,
-            "snapshot_version": server_version  # Server-authoritative version (not timestamp)
-        }
+        if not template_id:
+            logger.warning(
+                f"Item instance {instance_id} missing template_id, skipping"
+            )
+            return None
 
-        logger.info(
-            f"Built AOI for zone '{zone_id}' with {len(areas)} areas "
-            f"(user: {user_id})"
+        # Unchanged instances produce identical payloads across world versions
+        cache_key = (experience, template_id, json.dumps(item_instance, sort_keys=True))
+        cached = self._aoi_item_cache.get(cache_key)
+        if cached is not None:
+            self._aoi_item_cache.move_to_end(cache_key)
+            self._aoi_stats["item_hits"] += 1
+            return cached
+        self._aoi_stats["item_misses"] += 1
+
+        # Load template definition from markdown
+        template = await self.template_loader.load_template(
+            experience=experience,
+            entity_type="items",
+            template_id=template_id
         )
 
-        return aoi
+        if not template:
+            logger.warning(
+                f"Template not found: {template_id} (instance: {instance_id}), "
+                f"using instance data only"
+            )
+            # Fallback: use instance data if template not found
+            template = {}
+
+        # Merge template + instance (instance overrides template)
+        # Pass full item_instance so world.json booleans override template strings
+        merged_item = self.template_loader.merge_template_instance(
+            template=template,
+            instance=item_instance  # Pass full instance data
+        )
+
+        self._aoi_item_cache[cache_key] = merged_item
+        if len(self._aoi_item_cache) > self.AOI_ITEM_CACHE_MAX:
+            self._aoi_item_cache.popitem(last=False)
+        return merged_item
+
+    def _store_aoi(self, cache_key: Tuple[str, str, int], entry: Dict[str, Any]) -> None:
+        """Cache an AOI areas block, dropping older versions of the same zone."""
+        experience, zone_id, version = cache_key
+        stale = [
+            key for key in self._aoi_cache
+            if key[0] == experience and key[1] == zone_id and key[2] != version
+        ]
+        for key in stale:
+            del self._aoi_cache[key]
+
+        self._aoi_cache[cache_key] = entry
+        if len(self._aoi_cache) > self.AOI_CACHE_MAX_ZONES:
+            self._aoi_cache.popitem(last=False)
+
+    def _invalidate_aoi(self, experience: str) -> None:
+        """Drop cached AOI blocks for an experience (world replaced wholesale)."""
+        for key in [k for k in self._aoi_cache if k[0] == experience]:
+            del self._aoi_cache[key]
+
+    def clear_aoi_cache(self) -> None:
+        """Clear cached AOI blocks and item payloads (e.g. after template edits)."""
+        self._aoi_cache.clear()
+        self._aoi_item_cache.clear()
+        self._world_signatures.clear()
+        logger.info("AOI cache cleared")
+
+    def get_aoi_cache_stats(self) -> Dict[str, Any]:
+        """Return AOI cache counters."""
+        return {
+            **self._aoi_stats,
+            "cached_zones": len(self._aoi_cache),
+            "cached_items": len(self._aoi_item_cache)
+        }
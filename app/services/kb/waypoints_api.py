@@ -2,25 +2,43 @@
 Waypoints API for KB Service
 
 Provides raw JSON access to waypoint markdown files.
+
+Responses carry an ETag derived from the waypoint files' paths, sizes and
+modification times. Clients revalidate with If-None-Match and get a 304
+without any file being read; parsed waypoints are cached per ETag so a
+changed directory is parsed once. Writes through the KB API publish
+NATSSubjects.KB_WAYPOINTS_CHANGED so readers drop their caches immediately.
 """
-from fastapi import APIRouter, HTTPException
-from typing import List, Dict, Any
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import JSONResponse
+from typing import List, Dict, Any, Optional, Tuple
+import hashlib
 import yaml
 import logging
 from pathlib import Path
 
+from app.shared.nats_client import NATSSubjects
 from .kb_mcp_server import kb_server
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/waypoints", tags=["Waypoints"])
 
+# experience -> (etag, parsed waypoints)
+_waypoint_cache: Dict[str, Tuple[str, List[Any]]] = {}
+
+# Set by the service lifespan; None when NATS is unavailable
+nats_client = None
+
 
 @router.get("/{experience}")
-async def get_waypoints_for_experience(experience: str) -> Dict[str, Any]:
+async def get_waypoints_for_experience(experience: str, request: Request) -> Response:
     """
     Get all waypoints for an experience as raw JSON.
 
+    Supports conditional requests: if If-None-Match matches the current
+    ETag, returns 304 Not Modified with no body.
+
     Args:
         experience: Experience name (e.g., "wylding-woods")
 
@@ -32,7 +50,6 @@ async def get_waypoints_for_experience(experience: str) -> Dict[str, Any]:
         }
     """
     try:
-        waypoints = []
         waypoints_path = f"experiences/{experience}/waypoints"
 
         # List waypoint files
@@ -47,43 +64,32 @@ async def get_waypoints_for_experience(experience: str) -> Dict[str, Any]:
                 detail=f"Experience not found: {experience}"
             )
 
-        # Read and parse each waypoint file
-        for file_info in result.get("files", []):
-            file_path = file_info.get("path")
-
-            # Skip index files
-            if Path(file_path).name.startswith("+"):
-                continue
-
-            # Read file
-            read_result = await kb_server.read_kb_file(
-                path=file_path,
-                parse_frontmatter=False
-            )
-
-            if not read_result.get("success"):
-                logger.warning(f"Failed to read waypoint file: {file_path}")
-                continue
-
-            # Extract YAML from markdown
-            content = read_result.get("content", "")
-            yaml_content = _extract_yaml_block(content)
-
-            if yaml_content:
-                try:
-                    waypoint = yaml.safe_load(yaml_content)
-                    waypoints.append(waypoint)
-                except yaml.YAMLError as e:
-                    logger.error(f"YAML parse error in {file_path}: {e}")
-                    continue
-
-        logger.info(f"Loaded {len(waypoints)} waypoints for experience '{experience}'")
-
-        return {
-            "success": True,
-            "waypoints": waypoints,
-            "count": len(waypoints)
-        }
+        files = [
+            file_info for file_info in result.get("files", [])
+            if not Path(file_info.get("path")).name.startswith("+")  # Skip index files
+        ]
+        etag = _compute_etag(files)
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=headers)
+
+        cached = _waypoint_cache.get(experience)
+        if cached and cached[0] == etag:
+            waypoints = cached[1]
+        else:
+            waypoints = await _load_waypoints(files)
+            _waypoint_cache[experience] = (etag, waypoints)
+            logger.info(f"Loaded {len(waypoints)} waypoints for experience '{experience}'")
+
+        return JSONResponse(
+            content={
+                "success": True,
+                "waypoints": waypoints,
+                "count": len(waypoints)
+            },
+            headers=headers
+        )
 
     except HTTPException:
         raise
@@ -95,6 +101,80 @@ async def get_waypoints_for_experience(experience: str) -> Dict[str, Any]:
         )
 
 
+async def _load_waypoints(files: List[Dict[str, Any]]) -> List[Any]:
+    """Read and parse each waypoint file."""
+    waypoints = []
+
+    for file_info in files:
+        file_path = file_info.get("path")
+
+        # Read file
+        read_result = await kb_server.read_kb_file(
+            path=file_path,
+            parse_frontmatter=False
+        )
+
+        if not read_result.get("success"):
+            logger.warning(f"Failed to read waypoint file: {file_path}")
+            continue
+
+        # Extract YAML from markdown
+        content = read_result.get("content", "")
+        yaml_content = _extract_yaml_block(content)
+
+        if yaml_content:
+            try:
+                waypoint = yaml.safe_load(yaml_content)
+                waypoints.append(waypoint)
+            except yaml.YAMLError as e:
+                logger.error(f"YAML parse error in {file_path}: {e}")
+                continue
+
+    return waypoints
+
+
+def _compute_etag(files: List[Dict[str, Any]]) -> str:
+    """ETag over waypoint file paths, sizes and modification times."""
+    signature = sorted(
+        (f.get("path", ""), f.get("size", 0), f.get("modified", "")) for f in files
+    )
+    digest = hashlib.sha1(repr(signature).encode()).hexdigest()[:16]
+    return f'"{digest}"'
+
+
+def waypoint_experience_for_path(path: str) -> Optional[str]:
+    """Return the experience whose waypoints live at path, if any."""
+    parts = Path(path.lstrip("/")).parts
+    if len(parts) >= 3 and parts[0] == "experiences" and parts[2] == "waypoints":
+        return parts[1]
+    return None
+
+
+async def notify_waypoints_changed(experience: Optional[str] = None) -> None:
+    """
+    Drop cached waypoints and tell readers to invalidate.
+
+    Args:
+        experience: Changed experience, or None if any experience may have changed
+    """
+    if experience is None:
+        _waypoint_cache.clear()
+    else:
+        _waypoint_cache.pop(experience, None)
+
+    # Readers in this process (WebSocket AOI) don't depend on NATS delivery
+    from app.services.locations.waypoint_reader import waypoint_reader
+    waypoint_reader.invalidate(experience)
+
+    if nats_client:
+        try:
+            await nats_client.publish(
+                NATSSubjects.KB_WAYPOINTS_CHANGED, {"experience": experience}
+            )
+        except Exception as e:
+            logger.warning(f"Could not publish waypoint invalidation: {e}")
+
+
 def _extract_yaml_block(markdown_content: str) -> str:
     """Extract YAML code block from markdown content."""
     lines = markdown_content.split("\n")
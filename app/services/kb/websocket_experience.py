@@ -184,6 +184,8 @@ async def handle_message_loop(
                 await handle_chat(websocket, connection_id, user_id, experience, message)
             elif message_type == "update_location":
                 await handle_update_location(websocket, connection_id, user_id, experience, message)
+            elif message_type == "sync":
+                await handle_sync(websocket, connection_id, user_id, experience, message)
             else:
                 logger.warning(f"Unknown message type: {message_type}")
                 await send_error(
@@ -407,6 +409,62 @@ async def handle_chat(
     })
 
 
+async def handle_sync(
+    websocket: WebSocket,
+    connection_id: str,
+    user_id: str,
+    experience: str,
+    message: Dict[str, Any]
+):
+    """
+    Handle sync request from a reconnecting client.
+
+    Replays journaled world deltas since the client's last applied version
+    instead of sending a full AOI.
+
+    Request: {"type": "sync", "since_version": 42}
+    Response: {"type": "world_deltas", "base_version": 42, "snapshot_version": 45, "deltas": [...]}
+              or {"type": "resync_required", ...} if the journal can't cover the gap
+              (client should send update_location for a fresh AOI)
+    """
+    since_version = message.get("since_version")
+    if not isinstance(since_version, int):
+        await send_error(websocket, "missing_since_version", "since_version (int) required")
+        return
+
+    state_manager = kb_agent.state_manager
+    if not state_manager:
+        await send_error(websocket, "server_error", "State manager not initialized")
+        return
+
+    result = await state_manager.get_world_deltas_since(experience, since_version, user_id)
+    timestamp = int(datetime.utcnow().timestamp() * 1000)
+
+    if result is None:
+        await websocket.send_json({
+            "type": "resync_required",
+            "since_version": since_version,
+            "timestamp": timestamp
+        })
+        logger.info(f"Sync from v{since_version} not covered by journal (user: {user_id})")
+        return
+
+    await websocket.send_json({
+        "type": "world_deltas",
+        "timestamp": timestamp,
+        **result
+    })
+
+    # Client is now at the latest version - track it for future deltas
+    if experience_manager:
+        experience_manager.update_client_version(connection_id, result["snapshot_version"])
+
+    logger.info(
+        f"Sent {len(result['deltas'])} delta(s) to user {user_id}: "
+        f"v{since_version} -> v{result['snapshot_version']}"
+    )
+
+
 async def handle_update_location(
     websocket: WebSocket,
     connection_id: str,
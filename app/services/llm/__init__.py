@@ -5,6 +5,7 @@ from .base import (
     LLMMessage,
     LLMResponse,
     LLMRequest,
+    CacheablePrompt,
     StreamChunk,
     LLMProviderError,
     LLMProviderInterface,
@@ -24,6 +25,7 @@ __all__ = [
     "LLMMessage",
     "LLMResponse",
     "LLMRequest",
+    "CacheablePrompt",
     "StreamChunk",
     "LLMProviderError",
     "LLMProviderInterface",
@@ -58,6 +58,21 @@ class LLMResponse:
     response_time_ms: Optional[int] = None
     metadata: Dict[str, Any] = None
 
+class CacheablePrompt(str):
+    """
+    System prompt split into a stable prefix and a per-request suffix.
+
+    Behaves as the plain concatenated string everywhere; providers that
+    support prompt caching can mark the end of the prefix as a cache
+    breakpoint.
+    """
+
+    def __new__(cls, prefix: str, suffix: str = ""):
+        prompt = super().__new__(cls, prefix + suffix)
+        prompt.prefix = prefix
+        prompt.suffix = suffix
+        return prompt
+
 @dataclass
 class LLMRequest:
     messages: List[LLMMessage]
@@ -2,10 +2,12 @@ import os
 import time
 import asyncio
 from typing import Optional, List, Dict, Any, AsyncGenerator, Union
-from anthropic import Anthropic, APIError, APIConnectionError, AuthenticationError
+import httpx
+from anthropic import AsyncAnthropic, APIError, APIConnectionError, AuthenticationError
 import logging
 from datetime import datetime
 
+from app.shared.config import settings
 from app.shared.instrumentation import instrumentation
 
 from .base import (
@@ -15,6 +17,7 @@ from .base import (
     LLMMessage,
     LLMResponse,
     LLMRequest,
+    CacheablePrompt,
     StreamChunk,
     LLMProviderError,
     LLMProviderInterface,
@@ -26,53 +29,77 @@ logger = logging.getLogger(__name__)
 class ClaudeProvider(LLMProviderInterface):
     """Claude provider implementation using the new interface"""
     
-    # Class-level connection pool
-    _client_pool = []
-    _pool_size = 3
-    _initialized = False
+    # Class-level shared async client: one keep-alive (HTTP/2 when available)
+    # connection pool for every provider instance in the process
+    _client: Optional[AsyncAnthropic] = None
+    _client_loop: Optional[asyncio.AbstractEventLoop] = None
+    _model_semaphores: Dict[str, asyncio.Semaphore] = {}
     
     def __init__(self):
         self.api_key = os.getenv('ANTHROPIC_API_KEY')
         if not self.api_key:
             raise ValueError("ANTHROPIC_API_KEY environment variable not set")
-        
-        # Initialize client pool on first use
-        if not ClaudeProvider._initialized:
-            self._init_connection_pool()
-            
-        # Get client from pool
-        self.client = self._get_pooled_client()
     
-    @classmethod
-    def _init_connection_pool(cls):
-        """Initialize connection pool with pre-established clients"""
-        logger.info(f"Initializing Claude connection pool with {cls._pool_size} connections")
-        
-        api_key = os.getenv('ANTHROPIC_API_KEY')
-        for i in range(cls._pool_size):
-            client = Anthropic(api_key=api_key)
-            cls._client_pool.append(client)
-            logger.debug(f"Created pooled client {i+1}/{cls._pool_size}")
+    @property
+    def client(self) -> AsyncAnthropic:
+        """Shared AsyncAnthropic client, created lazily on the running event loop"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
         
-        cls._initialized = True
-        logger.info("Claude connection pool initialized")
+        # httpx connections are bound to the loop that opened them
+        if ClaudeProvider._client is None or (loop is not None and ClaudeProvider._client_loop is not loop):
+            ClaudeProvider._client = self._create_client(self.api_key)
+            ClaudeProvider._client_loop = loop
+            ClaudeProvider._model_semaphores = {}
+        return ClaudeProvider._client
     
-    def _get_pooled_client(self):
-        """Get a client from the pool (round-robin)"""
-        if not ClaudeProvider._client_pool:
-            raise RuntimeError("Connection pool not initialized")
-        
-        # Simple round-robin selection
-        import threading
-        if not hasattr(ClaudeProvider, '_pool_index'):
-            ClaudeProvider._pool_index = 0
-            ClaudeProvider._pool_lock = threading.Lock()
+    @staticmethod
+    def _create_client(api_key: str) -> AsyncAnthropic:
+        """Build an AsyncAnthropic client on a bounded keep-alive httpx pool"""
+        http2 = settings.CLAUDE_HTTP2
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning("CLAUDE_HTTP2 enabled but h2 is not installed, using HTTP/1.1")
+                http2 = False
         
-        with ClaudeProvider._pool_lock:
-            client = ClaudeProvider._client_pool[ClaudeProvider._pool_index]
-            ClaudeProvider._pool_index = (ClaudeProvider._pool_index + 1) % len(ClaudeProvider._client_pool)
+        limits = httpx.Limits(
+            max_connections=settings.CLAUDE_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.CLAUDE_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.CLAUDE_KEEPALIVE_EXPIRY_S
+        )
+        timeout = httpx.Timeout(settings.CLAUDE_REQUEST_TIMEOUT_S, connect=10.0)
+        logger.info(
+            f"Initializing Claude connection pool (http2={http2}, "
+            f"max_connections={limits.max_connections}, keepalive={limits.max_keepalive_connections})"
+        )
         
-        return client
+        # base_url falls back to ANTHROPIC_BASE_URL / the public API inside the SDK
+        return AsyncAnthropic(
+            api_key=api_key,
+            max_retries=settings.CLAUDE_MAX_RETRIES,
+            timeout=timeout,
+            http_client=httpx.AsyncClient(http2=http2, limits=limits, timeout=timeout)
+        )
+    
+    @classmethod
+    async def close_pool(cls):
+        """Close the shared client and its connections"""
+        if cls._client is not None:
+            client, cls._client, cls._client_loop = cls._client, None, None
+            cls._model_semaphores = {}
+            await client.close()
+    
+    def _model_semaphore(self, model: str) -> asyncio.Semaphore:
+        """Per-model cap on in-flight requests, so one model can't drain the pool"""
+        semaphore = ClaudeProvider._model_semaphores.get(model)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(settings.CLAUDE_MAX_CONCURRENT_PER_MODEL)
+            ClaudeProvider._model_semaphores[model] = semaphore
+        return semaphore
     
     @property
     def provider_name(self) -> LLMProvider:
@@ -232,7 +259,7 @@ class ClaudeProvider(LLMProviderInterface):
         """Validate provider configuration"""
         try:
             # Make a minimal request to validate API key
-            response = self.client.messages.create(
+            response = await self.client.messages.create(
                 model="claude-3-haiku-20240307",
                 messages=[{"role": "user", "content": "Hi"}],
                 max_tokens=1
@@ -272,6 +299,32 @@ class ClaudeProvider(LLMProviderInterface):
             converted.append(claude_msg)
         return converted
     
+    def _system_param(self, system_prompt: str) -> Union[str, List[Dict[str, Any]]]:
+        """System prompt as text blocks with a cache breakpoint after a CacheablePrompt's stable prefix"""
+        if not (settings.CLAUDE_PROMPT_CACHING and isinstance(system_prompt, CacheablePrompt) and system_prompt.prefix):
+            return str(system_prompt)
+        
+        # Tools precede the system prompt in the cached prefix, so they are covered too
+        blocks = [{"type": "text", "text": system_prompt.prefix, "cache_control": {"type": "ephemeral"}}]
+        if system_prompt.suffix:
+            blocks.append({"type": "text", "text": system_prompt.suffix})
+        return blocks
+    
+    @staticmethod
+    def _usage_dict(usage: Any) -> Dict[str, int]:
+        """Token usage including prompt cache reads/writes (input_tokens counts uncached tokens only)"""
+        input_tokens = getattr(usage, "input_tokens", 0) or 0
+        output_tokens = getattr(usage, "output_tokens", 0) or 0
+        cache_read = getattr(usage, "cache_read_input_tokens", 0) or 0
+        cache_write = getattr(usage, "cache_creation_input_tokens", 0) or 0
+        return {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+            "cache_read_input_tokens": cache_read,
+            "cache_creation_input_tokens": cache_write
+        }
+    
     def _convert_tools(self, tools: List[Union[Dict[str, Any], Any]]) -> List[Dict[str, Any]]:
         """Convert tools to Claude format"""
         claude_tools = []
@@ -316,7 +369,7 @@ class ClaudeProvider(LLMProviderInterface):
             }
             
             if request.system_prompt:
-                params["system"] = request.system_prompt
+                params["system"] = self._system_param(request.system_prompt)
             
             if request.tools:
                 params["tools"] = self._convert_tools(request.tools)
@@ -329,7 +382,8 @@ class ClaudeProvider(LLMProviderInterface):
                 provider_timing.record_request_sent()
             
             # Make the API call
-            response = self.client.messages.create(**params)
+            async with self._model_semaphore(request.model):
+                response = await self.client.messages.create(**params)
             
             # Record first token (for non-streaming)
             if provider_timing:
@@ -364,21 +418,20 @@ class ClaudeProvider(LLMProviderInterface):
             logger.info(f"Final content length: {len(content)}")
             
             # Record completion with token counts
+            usage = self._usage_dict(response.usage)
             if provider_timing:
                 provider_timing.record_completion(
-                    input_tokens=response.usage.input_tokens,
-                    output_tokens=response.usage.output_tokens
+                    input_tokens=usage["input_tokens"],
+                    output_tokens=usage["output_tokens"],
+                    cache_read_input_tokens=usage["cache_read_input_tokens"],
+                    cache_creation_input_tokens=usage["cache_creation_input_tokens"]
                 )
             
             return LLMResponse(
                 content=content,
                 model=request.model,
                 provider=LLMProvider.CLAUDE,
-                usage={
-                    "input_tokens": response.usage.input_tokens,
-                    "output_tokens": response.usage.output_tokens,
-                    "total_tokens": response.usage.input_tokens + response.usage.output_tokens
-                },
+                usage=usage,
                 tool_calls=tool_calls if tool_calls else None,
                 finish_reason=response.stop_reason,
                 response_time_ms=response_time_ms,
@@ -416,7 +469,7 @@ class ClaudeProvider(LLMProviderInterface):
             }
             
             if request.system_prompt:
-                params["system"] = request.system_prompt
+                params["system"] = self._system_param(request.system_prompt)
             
             if request.tools:
                 params["tools"] = self._convert_tools(request.tools)
@@ -428,13 +481,13 @@ class ClaudeProvider(LLMProviderInterface):
             if provider_timing:
                 provider_timing.record_request_sent()
             
-            # Stream response
-            with self.client.messages.stream(**params) as stream:
+            # Stream response (the model slot is held until the stream closes)
+            async with self._model_semaphore(request.model), self.client.messages.stream(**params) as stream:
                 current_tool_call = None
                 tool_calls = []
                 first_token_received = False
                 
-                for chunk in stream:
+                async for chunk in stream:
                     if chunk.type == "message_start":
                         continue
                     elif chunk.type == "content_block_start":
@@ -477,23 +530,24 @@ class ClaudeProvider(LLMProviderInterface):
                                 metadata=request.metadata or {}
                             )
                     elif chunk.type == "message_stop":
-                        if hasattr(chunk, 'usage') and chunk.usage:
+                        # The stream helper attaches the final message snapshot, which carries usage
+                        usage_source = getattr(chunk, "usage", None) or getattr(getattr(chunk, "message", None), "usage", None)
+                        if usage_source:
                             # Record completion with token counts
+                            usage = self._usage_dict(usage_source)
                             if provider_timing:
                                 provider_timing.record_completion(
-                                    input_tokens=chunk.usage.input_tokens,
-                                    output_tokens=chunk.usage.output_tokens
+                                    input_tokens=usage["input_tokens"],
+                                    output_tokens=usage["output_tokens"],
+                                    cache_read_input_tokens=usage["cache_read_input_tokens"],
+                                    cache_creation_input_tokens=usage["cache_creation_input_tokens"]
                                 )
                             
                             yield StreamChunk(
                                 content="",
                                 model=request.model,
                                 provider=LLMProvider.CLAUDE,
-                                usage={
-                                    "input_tokens": chunk.usage.input_tokens,
-                                    "output_tokens": chunk.usage.output_tokens,
-                                    "total_tokens": chunk.usage.input_tokens + chunk.usage.output_tokens
-                                },
+                                usage=usage,
                                 metadata=request.metadata or {}
                             )
                         
@@ -522,7 +576,7 @@ class ClaudeProvider(LLMProviderInterface):
             start_time = time.time()
             
             # Make a minimal request
-            response = self.client.messages.create(
+            response = await self.client.messages.create(
                 model="claude-3-haiku-20240307",
                 messages=[{"role": "user", "content": "ping"}],
                 max_tokens=1
@@ -535,7 +589,8 @@ class ClaudeProvider(LLMProviderInterface):
                 "status": "healthy",
                 "response_time_ms": response_time,
                 "available_models": len(self.available_models),
-                "pool_size": len(self._client_pool),
+                "http2": settings.CLAUDE_HTTP2,
+                "max_connections": settings.CLAUDE_MAX_CONNECTIONS,
                 "timestamp": datetime.now().isoformat()
             }
         except Exception as e:
@@ -5,12 +5,16 @@ Provides AR waypoint and location data from KB content.
 """
 
 from .distance_utils import calculate_distance, is_within_radius
+from .spatial_index import WaypointSpatialIndex, get_spatial_index, invalidate_spatial_index
 from .waypoint_reader import WaypointReader
 from .waypoint_transformer import transform_to_unity_format
 
 __all__ = [
     "calculate_distance",
     "is_within_radius",
+    "WaypointSpatialIndex",
+    "get_spatial_index",
+    "invalidate_spatial_index",
     "WaypointReader",
     "transform_to_unity_format",
 ]
@@ -3,11 +3,11 @@ Shared location finding utilities.
 
 Used by both REST API (/locations/nearby) and WebSocket (AOI delivery).
 """
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Optional
 import logging
 
 from app.services.locations.waypoint_reader import waypoint_reader
-from app.services.locations.distance_utils import is_within_radius, calculate_distance
+from app.services.locations.spatial_index import get_spatial_index
 
 logger = logging.getLogger(__name__)
 
@@ -37,38 +37,9 @@ async def find_nearby_locations(
         # Load all waypoints for this experience from KB
         waypoints = await waypoint_reader.get_waypoints_for_experience(experience)
 
-        # Filter waypoints by distance and calculate distances for sorting
-        nearby_waypoints: List[Tuple[Dict[str, Any], float]] = []
-
-        for index, waypoint in enumerate(waypoints):
-            if not isinstance(waypoint, dict):
-                logger.warning(
-                    "Skipping waypoint at index %s: expected dict but got %s",
-                    index,
-                    type(waypoint)
-                )
-                continue
-
-            location = waypoint.get("location")
-            if isinstance(location, dict):
-                wp_lat = location.get("lat")
-                wp_lng = location.get("lng")
-
-                if isinstance(wp_lat, (int, float)) and isinstance(wp_lng, (int, float)):
-                    try:
-                        if is_within_radius(lat, lng, wp_lat, wp_lng, radius_m):
-                            distance = calculate_distance(lat, lng, wp_lat, wp_lng)
-                            nearby_waypoints.append((waypoint, distance))
-                    except Exception as distance_error:
-                        logger.warning(
-                            "Skipping waypoint %s due to distance calculation error: %s",
-                            waypoint.get("id", "<unknown>"),
-                            distance_error
-                        )
-
-        # Sort by distance (closest first)
-        nearby_waypoints.sort(key=lambda item: item[1])
-        sorted_waypoints = [waypoint for waypoint, _ in nearby_waypoints]
+        # Cached per experience; rebuilt only when the waypoint data changes
+        index = get_spatial_index(experience, waypoints)
+        sorted_waypoints = [waypoint for waypoint, _ in index.query_radius(lat, lng, radius_m)]
 
         logger.debug(
             f"Found {len(sorted_waypoints)} waypoints near "
@@ -80,3 +51,35 @@ async def find_nearby_locations(
     except Exception as e:
         logger.error(f"Error finding nearby locations: {e}", exc_info=True)
         return []
+
+
+async def find_nearest_locations(
+    lat: float,
+    lng: float,
+    k: int = 5,
+    max_distance_m: Optional[float] = None,
+    experience: str = "wylding-woods"
+) -> List[Dict[str, Any]]:
+    """
+    Find the k waypoints closest to GPS coordinates.
+
+    Args:
+        lat: Latitude
+        lng: Longitude
+        k: Maximum number of waypoints to return
+        max_distance_m: Optional cutoff distance in meters
+        experience: Experience name
+
+    Returns:
+        List of waypoints sorted by distance (closest first)
+    """
+    try:
+        waypoints = await waypoint_reader.get_waypoints_for_experience(experience)
+        index = get_spatial_index(experience, waypoints)
+        return [
+            waypoint for waypoint, _ in index.query_nearest(lat, lng, k, max_distance_m)
+        ]
+
+    except Exception as e:
+        logger.error(f"Error finding nearest locations: {e}", exc_info=True)
+        return []
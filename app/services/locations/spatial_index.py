@@ -0,0 +1,234 @@
+"""
+Spatial index for GPS waypoint lookup.
+
+Waypoints are packed into NumPy arrays sorted by latitude. Radius queries
+slice the latitude band with a binary search, drop candidates outside the
+longitude window, then run a vectorized haversine on what is left. Indexes
+are cached per experience and rebuilt when the waypoint data changes.
+"""
+import logging
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Must match distance_utils.calculate_distance
+EARTH_RADIUS_M = 6371000
+
+
+def _is_coordinate(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class WaypointSpatialIndex:
+    """
+    Immutable index over the GPS waypoints of one experience.
+
+    Waypoints without numeric location.lat/lng (pathway waypoints) are not
+    indexed, matching the behaviour of the scalar lookup.
+    """
+
+    def __init__(self, waypoints: List[Any]):
+        """
+        Build index.
+
+        Args:
+            waypoints: Waypoint dictionaries as returned by WaypointReader
+        """
+        indexed: List[Dict[str, Any]] = []
+        lats: List[float] = []
+        lngs: List[float] = []
+
+        for index, waypoint in enumerate(waypoints):
+            if not isinstance(waypoint, dict):
+                logger.warning(
+                    "Skipping waypoint at index %s: expected dict but got %s",
+                    index,
+                    type(waypoint)
+                )
+                continue
+
+            location = waypoint.get("location")
+            if not isinstance(location, dict):
+                continue
+
+            wp_lat = location.get("lat")
+            wp_lng = location.get("lng")
+            if not (_is_coordinate(wp_lat) and _is_coordinate(wp_lng)):
+                continue
+            if not (math.isfinite(wp_lat) and math.isfinite(wp_lng)):
+                logger.warning(
+                    "Skipping waypoint %s with non-finite coordinates: %s",
+                    waypoint.get("id", "<unknown>"),
+                    location
+                )
+                continue
+
+            indexed.append(waypoint)
+            lats.append(float(wp_lat))
+            lngs.append(float(wp_lng))
+
+        lat_deg = np.asarray(lats, dtype=np.float64)
+        lng_deg = np.asarray(lngs, dtype=np.float64)
+
+        # Positions are kept in input order so equal distances sort stably
+        self._waypoints = indexed
+        self._lat_rad = np.radians(lat_deg)
+        self._lng_rad = np.radians(lng_deg)
+        self._cos_lat = np.cos(self._lat_rad)
+        self._lng_deg = lng_deg
+
+        # Latitude-sorted view for band slicing
+        self._lat_order = np.argsort(lat_deg, kind="stable")
+        self._lat_sorted = lat_deg[self._lat_order]
+
+    def __len__(self) -> int:
+        return len(self._waypoints)
+
+    def _distances(self, lat: float, lng: float, positions: Optional[np.ndarray] = None) -> np.ndarray:
+        """Haversine distance in meters from (lat, lng) to indexed points."""
+        lat1 = math.radians(lat)
+        lng1 = math.radians(lng)
+        if positions is None:
+            lat2, lng2, cos2 = self._lat_rad, self._lng_rad, self._cos_lat
+        else:
+            lat2, lng2, cos2 = self._lat_rad[positions], self._lng_rad[positions], self._cos_lat[positions]
+
+        a = (
+            np.sin((lat2 - lat1) / 2) ** 2 +
+            math.cos(lat1) * cos2 * np.sin((lng2 - lng1) / 2) ** 2
+        )
+        return EARTH_RADIUS_M * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+    def _radius_candidates(self, lat: float, lng: float, radius_m: float) -> np.ndarray:
+        """Positions inside the bounding box of the search circle (input order)."""
+        angular = radius_m / EARTH_RADIUS_M
+        lat_span = math.degrees(angular)
+
+        lo = np.searchsorted(self._lat_sorted, lat - lat_span, side="left")
+        hi = np.searchsorted(self._lat_sorted, lat + lat_span, side="right")
+        candidates = np.sort(self._lat_order[lo:hi])
+
+        # Longitude window only applies when the circle doesn't reach a pole
+        sin_ratio = math.sin(min(angular, math.pi / 2)) / max(math.cos(math.radians(lat)), 1e-12)
+        if angular < math.pi / 2 and sin_ratio < 1.0:
+            lng_span = math.degrees(math.asin(sin_ratio))
+            delta = np.abs((self._lng_deg[candidates] - lng + 180.0) % 360.0 - 180.0)
+            candidates = candidates[delta <= lng_span]
+
+        return candidates
+
+    def query_radius(self, lat: float, lng: float, radius_m: float) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Find waypoints within radius_m of (lat, lng).
+
+        Returns:
+            (waypoint, distance_m) pairs sorted by distance (closest first)
+        """
+        if not self._waypoints or radius_m < 0:
+            return []
+
+        candidates = self._radius_candidates(lat, lng, radius_m)
+        if candidates.size == 0:
+            return []
+
+        distances = self._distances(lat, lng, candidates)
+        inside = distances <= radius_m
+        candidates = candidates[inside]
+        distances = distances[inside]
+
+        order = np.argsort(distances, kind="stable")
+        return [(self._waypoints[p], float(d)) for p, d in zip(candidates[order], distances[order])]
+
+    def query_nearest(
+        self,
+        lat: float,
+        lng: float,
+        k: int,
+        max_distance_m: Optional[float] = None
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Find the k waypoints closest to (lat, lng).
+
+        Args:
+            k: Maximum number of results
+            max_distance_m: Optional cutoff distance
+
+        Returns:
+            (waypoint, distance_m) pairs sorted by distance (closest first)
+        """
+        if not self._waypoints or k <= 0:
+            return []
+
+        if max_distance_m is not None:
+            return self.query_radius(lat, lng, max_distance_m)[:k]
+
+        distances = self._distances(lat, lng)
+        if k < distances.size:
+            positions = np.argpartition(distances, k - 1)[:k]
+            positions = np.sort(positions)
+        else:
+            positions = np.arange(distances.size)
+
+        order = np.argsort(distances[positions], kind="stable")
+        return [(self._waypoints[p], float(distances[p])) for p in positions[order]]
+
+
+# ===== PER-EXPERIENCE CACHE =====
+
+# experience -> (source list, fingerprint, index)
+_index_cache: Dict[str, Tuple[List[Any], Tuple, WaypointSpatialIndex]] = {}
+
+
+def _fingerprint(waypoints: List[Any]) -> Tuple:
+    """Identity of the indexed content: ids and coordinates in order."""
+    parts = []
+    for waypoint in waypoints:
+        if isinstance(waypoint, dict):
+            location = waypoint.get("location")
+            if isinstance(location, dict):
+                parts.append((waypoint.get("id"), location.get("lat"), location.get("lng")))
+                continue
+            parts.append((waypoint.get("id"), None, None))
+        else:
+            parts.append(None)
+    return tuple(parts)
+
+
+def get_spatial_index(experience: str, waypoints: List[Any]) -> WaypointSpatialIndex:
+    """
+    Get the cached index for an experience, rebuilding it if waypoints changed.
+
+    Args:
+        experience: Experience name
+        waypoints: Current waypoint list for the experience
+
+    Returns:
+        Spatial index over waypoints
+    """
+    cached = _index_cache.get(experience)
+
+    # Same list object as last build (e.g. served from a reader cache) - nothing changed
+    if cached and cached[0] is waypoints:
+        return cached[2]
+
+    fingerprint = _fingerprint(waypoints)
+    if cached and cached[1] == fingerprint:
+        # Refresh the source so the next call takes the identity fast path
+        _index_cache[experience] = (waypoints, fingerprint, cached[2])
+        return cached[2]
+
+    index = WaypointSpatialIndex(waypoints)
+    _index_cache[experience] = (waypoints, fingerprint, index)
+    logger.info(f"Built spatial index for '{experience}' ({len(index)} GPS waypoints)")
+    return index
+
+
+def invalidate_spatial_index(experience: Optional[str] = None) -> None:
+    """Drop the cached index for an experience (or all experiences)."""
+    if experience is None:
+        _index_cache.clear()
+    else:
+        _index_cache.pop(experience, None)
@@ -2,11 +2,21 @@
 Read waypoint data from KB service via HTTP.
 
 Gateway communicates with KB service via HTTP, not direct file access.
+
+Waypoints are cached per experience. Within the TTL the cached list is served
+without touching the KB service; after it, the reader revalidates with
+If-None-Match and keeps the cached list on 304. Concurrent misses for the same
+experience share one in-flight request, and a NATS message on
+NATSSubjects.KB_WAYPOINTS_CHANGED drops the cache immediately.
 """
+import asyncio
+import time
 import httpx
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from app.shared.config import settings
+from app.shared.nats_client import NATSSubjects
+from app.services.locations.spatial_index import invalidate_spatial_index
 
 logger = logging.getLogger(__name__)
 
@@ -14,11 +24,31 @@ logger = logging.getLogger(__name__)
 class WaypointReader:
     """
     Read and parse waypoint data from KB service via HTTP.
+
+    Returned lists are shared between callers and must be treated as read-only.
     """
 
-    def __init__(self, kb_service_url: str = None):
+    def __init__(self, kb_service_url: str = None, cache_ttl_s: Optional[float] = None):
         self.kb_service_url = kb_service_url or settings.KB_SERVICE_URL
         self.http_client = httpx.AsyncClient(timeout=30.0)
+        self.cache_ttl_s = (
+            settings.WAYPOINT_CACHE_TTL_SECONDS if cache_ttl_s is None else cache_ttl_s
+        )
+
+        # experience -> {"waypoints": [...], "etag": str | None, "fetched_at": monotonic}
+        self._cache: Dict[str, Dict[str, Any]] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+        # Bumped on invalidation so a fetch started before it can't repopulate the cache
+        self._generation: Dict[str, int] = {}
+
+        self._stats = {
+            "hits": 0,
+            "coalesced": 0,
+            "fetches": 0,
+            "not_modified": 0,
+            "stale_served": 0,
+            "invalidations": 0
+        }
 
     async def get_waypoints_for_experience(
         self,
@@ -33,32 +63,116 @@ class WaypointReader:
         Returns:
             List of waypoint dictionaries from KB
         """
+        entry = self._cache.get(experience)
+        if entry and time.monotonic() - entry["fetched_at"] < self.cache_ttl_s:
+            self._stats["hits"] += 1
+            return entry["waypoints"]
+
+        task = self._inflight.get(experience)
+        if task is None:
+            task = asyncio.create_task(self._fetch(experience))
+            self._inflight[experience] = task
+            task.add_done_callback(lambda t: self._clear_inflight(experience, t))
+        else:
+            self._stats["coalesced"] += 1
+
+        # Shield so one cancelled caller doesn't cancel the fetch for everyone else
+        return await asyncio.shield(task)
+
+    def _clear_inflight(self, experience: str, task: asyncio.Task) -> None:
+        if self._inflight.get(experience) is task:
+            del self._inflight[experience]
+
+    async def _fetch(self, experience: str) -> List[Dict[str, Any]]:
+        """Fetch (or revalidate) waypoints. Never raises."""
+        entry = self._cache.get(experience)
+        generation = self._generation.get(experience, 0)
+        self._stats["fetches"] += 1
+
         try:
             # Call KB service waypoints endpoint
             url = f"{self.kb_service_url}/waypoints/{experience}"
+            headers = {"If-None-Match": entry["etag"]} if entry and entry.get("etag") else {}
 
             logger.debug(f"Fetching waypoints from KB service: {url}")
 
-            response = await self.http_client.get(url)
+            response = await self.http_client.get(url, headers=headers)
+
+            if response.status_code == 304 and entry:
+                self._stats["not_modified"] += 1
+                entry["fetched_at"] = time.monotonic()
+                return entry["waypoints"]
+
             response.raise_for_status()
 
             data = response.json()
 
             if not data.get("success"):
                 logger.error(f"KB service returned error: {data.get('error')}")
-                return []
+                return self._serve_stale(entry)
 
             waypoints = data.get("waypoints", [])
             logger.info(f"Loaded {len(waypoints)} waypoints for experience '{experience}' from KB service")
 
+            if self._generation.get(experience, 0) == generation:
+                self._cache[experience] = {
+                    "waypoints": waypoints,
+                    "etag": response.headers.get("etag"),
+                    "fetched_at": time.monotonic()
+                }
             return waypoints
 
         except httpx.HTTPStatusError as e:
             logger.error(f"HTTP error fetching waypoints from KB service: {e.response.status_code}")
-            return []
+            return self._serve_stale(entry)
         except Exception as e:
             logger.error(f"Error loading waypoints for '{experience}': {e}", exc_info=True)
+            return self._serve_stale(entry)
+
+    def _serve_stale(self, entry: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Fall back to the last good list while the KB service is unavailable."""
+        if not entry:
             return []
+        self._stats["stale_served"] += 1
+        # Back off for one TTL instead of retrying on every request
+        entry["fetched_at"] = time.monotonic()
+        return entry["waypoints"]
+
+    def invalidate(self, experience: Optional[str] = None) -> None:
+        """
+        Drop cached waypoints so the next request refetches.
+
+        Args:
+            experience: Experience to invalidate, or None for all experiences
+        """
+        if experience is None:
+            experiences = set(self._cache) | set(self._inflight)
+        else:
+            experiences = {experience}
+        for exp in experiences:
+            self._cache.pop(exp, None)
+            self._inflight.pop(exp, None)
+            self._generation[exp] = self._generation.get(exp, 0) + 1
+
+        invalidate_spatial_index(experience)
+        self._stats["invalidations"] += 1
+        logger.debug(f"Invalidated waypoint cache for {experience or 'all experiences'}")
+
+    async def _handle_invalidation(self, data: Dict[str, Any]) -> None:
+        self.invalidate(data.get("experience") if isinstance(data, dict) else None)
+
+    async def subscribe_to_invalidations(self, nats_client) -> None:
+        """Drop cached waypoints whenever the KB service reports a change."""
+        await nats_client.subscribe(NATSSubjects.KB_WAYPOINTS_CHANGED, self._handle_invalidation)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return cache counters."""
+        return {
+            **self._stats,
+            "cached_experiences": len(self._cache),
+            "inflight": len(self._inflight),
+            "cache_ttl_s": self.cache_ttl_s
+        }
 
 
 # Global instance
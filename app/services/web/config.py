@@ -13,6 +13,9 @@ class WebSettings:
     # Gateway connection - use shared settings
     gateway_url: str = shared_settings.GATEWAY_URL
     api_key: str = shared_settings.API_KEY
+    gateway_max_connections: int = shared_settings.WEB_GATEWAY_MAX_CONNECTIONS
+    gateway_max_keepalive: int = shared_settings.WEB_GATEWAY_MAX_KEEPALIVE
+    gateway_keepalive_expiry: float = shared_settings.WEB_GATEWAY_KEEPALIVE_EXPIRY
     
     # Session configuration
     session_secret: str = shared_settings.SESSION_SECRET if hasattr(shared_settings, 'SESSION_SECRET') else "gaia-dev-session-secret-2025"
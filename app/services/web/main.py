@@ -14,6 +14,8 @@ from datetime import datetime
 from app.services.web.config import settings
 from app.services.web.routes import auth, chat, api, websocket, profile
 from app.services.web.components.gaia_ui import GaiaDesign, gaia_layout, gaia_auth_form, gaia_mobile_styles
+from app.services.web.utils.gateway_client import gateway_client
+from app.services.web.utils.sse_relay import drain_pending_saves
 from app.shared.logging import setup_service_logger
 
 # Setup logging
@@ -326,6 +328,8 @@ async def startup():
 async def shutdown():
     """Cleanup on shutdown"""
     logger.info(f"Shutting down {settings.service_name} service")
+    await drain_pending_saves()
+    await gateway_client.close()
 
 # Run the app
 if __name__ == "__main__":
@@ -1,5 +1,6 @@
 """Chat interface routes"""
 import json
+from contextlib import aclosing
 from datetime import datetime
 from fasthtml.components import Div, H2, Button, P, A, H1, Style
 from fasthtml.core import Script, NotStr
@@ -8,7 +9,8 @@ from app.services.web.components.gaia_ui import (
     gaia_layout, gaia_conversation_item, gaia_message_bubble,
     gaia_chat_input, gaia_loading_spinner, gaia_error_message, gaia_toast_script, gaia_mobile_styles
 )
-from app.services.web.utils.gateway_client import GaiaAPIClient
+from app.services.web.utils.gateway_client import gateway_client
+from app.services.web.utils.sse_relay import DONE_FRAME, SSERelay, save_reply_in_background
 from app.services.web.utils.chat_service_client import chat_service_client
 from app.shared.logging import setup_service_logger
 
@@ -641,6 +643,7 @@ def setup_routes(app):
         
         async def event_generator():
             logger.info(f"Starting SSE generator for conversation {conversation_id}")
+            relay = SSERelay()
             try:
                 # Get conversation history from chat service
                 if conversation_id:
@@ -653,79 +656,28 @@ def setup_routes(app):
                 else:
                     messages = [{"role": "user", "content": message}]
                 
-                # Start streaming from gateway
-                response_content = ""
-                async with GaiaAPIClient() as client:
-                    async for chunk in client.chat_completion_stream(messages, jwt_token, response_format="v0.3"):
-                        try:
-                            # Parse the chunk
-                            import json
-                            if chunk.strip() == "[DONE]":
-                                # Save BEFORE sending [DONE] to ensure it completes
-                                if conversation_id and response_content:
-                                    logger.info(f"Saving AI response (before DONE): conversation_id={conversation_id}, content_length={len(response_content)}")
-                                    try:
-                                        await chat_service_client.add_message(conversation_id, "assistant", response_content, jwt_token=jwt_token)
-                                        logger.info(f"Successfully saved AI response to conversation {conversation_id}")
-                                        await chat_service_client.update_conversation(user_id, conversation_id, preview=response_content, jwt_token=jwt_token)
-                                        logger.info(f"Successfully updated conversation preview")
-                                    except Exception as e:
-                                        logger.error(f"Failed to save AI response: {e}", exc_info=True)
-                                yield f"data: [DONE]\n\n"
-                                break
-                            
-                            chunk_data = json.loads(chunk)
-                            
-                            # Handle OpenAI-compatible format
-                            if chunk_data.get("object") == "chat.completion.chunk":
-                                # Extract content from OpenAI format
-                                choices = chunk_data.get("choices", [])
-                                if choices and choices[0].get("delta"):
-                                    content = choices[0]["delta"].get("content", "")
-                                    if content:
-                                        response_content += content
-                                        # Send the content chunk in our format
-                                        yield f"data: {json.dumps({'type': 'content', 'content': content})}\n\n"
-                                    
-                                    # Check for finish reason
-                                    finish_reason = choices[0].get("finish_reason")
-                                    if finish_reason == "stop":
-                                        # Save BEFORE sending [DONE] to ensure it completes
-                                        if conversation_id and response_content:
-                                            logger.info(f"Saving AI response (finish stop): conversation_id={conversation_id}, content_length={len(response_content)}")
-                                            try:
-                                                await chat_service_client.add_message(conversation_id, "assistant", response_content, jwt_token=jwt_token)
-                                                logger.info(f"Successfully saved AI response to conversation {conversation_id}")
-                                                await chat_service_client.update_conversation(user_id, conversation_id, preview=response_content, jwt_token=jwt_token)
-                                                logger.info(f"Successfully updated conversation preview")
-                                            except Exception as e:
-                                                logger.error(f"Failed to save AI response: {e}", exc_info=True)
-                                        yield f"data: [DONE]\n\n"
-                                        break
-                            elif chunk_data.get("error"):
-                                # Handle error responses
-                                yield f"data: {json.dumps({'type': 'error', 'error': chunk_data['error'].get('message', 'Unknown error')})}\n\n"
-                            else:
-                                # Handle other formats (fallback for non-OpenAI format)
-                                if chunk_data.get("type") == "content":
-                                    content = chunk_data.get("content", "")
-                                    response_content += content
-                                    yield f"data: {json.dumps({'type': 'content', 'content': content})}\n\n"
-                                elif chunk_data.get("type") == "error":
-                                    yield f"data: {json.dumps({'type': 'error', 'error': chunk_data.get('error')})}\n\n"
-                                
-                        except json.JSONDecodeError:
-                            logger.error(f"Failed to parse chunk: {chunk}")
-                            continue
+                # Relay the gateway stream over the shared keep-alive client;
+                # aclosing() hands the connection back to the pool on early exit
+                stream = gateway_client.chat_completion_stream(messages, jwt_token, response_format="v0.3")
+                async with aclosing(stream):
+                    async for chunk in stream:
+                        frame, finished = relay.relay(chunk)
+                        if frame:
+                            yield frame
+                        if finished:
+                            break
                 
-                # Log end of streaming (save should have happened before [DONE])
-                logger.info(f"End of streaming loop - conversation_id={conversation_id}, response_content_length={len(response_content) if response_content else 0}")
+                if not relay.done:
+                    # Gateway closed without a done frame; stop the browser reconnecting
+                    yield DONE_FRAME
                     
             except Exception as e:
                 logger.error(f"Streaming error: {e}", exc_info=True)
                 yield f"data: {json.dumps({'type': 'error', 'error': str(e)})}\n\n"
             finally:
-                logger.info(f"SSE generator completed - response_saved={conversation_id and response_content and 'will_save' or 'no_save'}")
+                # Persist off the response path; also runs if the browser disconnects
+                save_reply_in_background(relay, conversation_id, user_id, jwt_token)
+                logger.info(f"SSE generator completed - conversation_id={conversation_id}, done={relay.done}")
         
         return StreamingResponse(
             event_generator(),
@@ -766,9 +718,8 @@ def setup_routes(app):
                 messages = [{"role": "user", "content": message}]
             
             # Get response from gateway
-            async with GaiaAPIClient() as client:
-                response = await client.chat_completion(messages, jwt_token)
-                logger.info(f"Gateway response: {response}")
+            response = await gateway_client.chat_completion(messages, jwt_token)
+            logger.info(f"Gateway response: {response}")
             
             # v0.2 format returns response directly
             response_content = response.get("response", "Sorry, I couldn't process that.")
@@ -10,12 +10,13 @@ logger = setup_service_logger("gateway_client")
 class GaiaAPIClient:
     """Client for communicating with the Gaia Gateway"""
     
-    def __init__(self, base_url: str = None):
+    def __init__(self, base_url: str = None, limits: Optional[httpx.Limits] = None):
         self.base_url = base_url or settings.gateway_url
         self.client = httpx.AsyncClient(
             base_url=self.base_url,
             timeout=60.0,  # Increased timeout for LLM responses
-            follow_redirects=True
+            follow_redirects=True,
+            limits=limits or httpx.Limits()
         )
     
     async def __aenter__(self):
@@ -24,6 +25,10 @@ class GaiaAPIClient:
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         await self.client.aclose()
     
+    async def close(self):
+        """Close the client and its pooled connections"""
+        await self.client.aclose()
+    
     async def login(self, email: str, password: str) -> Dict[str, Any]:
         """Authenticate user via gateway"""
         try:
@@ -296,5 +301,11 @@ class GaiaAPIClient:
             return {"status": "unhealthy", "error": str(e)}
 
 
-# Global client instance
-gateway_client = GaiaAPIClient()
\ No newline at end of file
+# Global client instance - shared keep-alive pool; do not use it with `async with`
+gateway_client = GaiaAPIClient(
+    limits=httpx.Limits(
+        max_connections=settings.gateway_max_connections,
+        max_keepalive_connections=settings.gateway_max_keepalive,
+        keepalive_expiry=settings.gateway_keepalive_expiry
+    )
+)
\ No newline at end of file
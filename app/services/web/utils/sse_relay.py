@@ -0,0 +1,127 @@
+"""
+Gateway -> browser SSE relay for streamed chat replies.
+
+The gateway's v0.3 stream already emits content frames in the shape the
+chat page consumes ({"type": "content", "content": ...}), so those are
+forwarded verbatim, recognised by prefix instead of being decoded and
+re-encoded per token. Their payloads are kept as-is; the reply text is
+only decoded once, when it is persisted after the stream finishes.
+Other frames (OpenAI-style chunks, errors) take the slower parsing path.
+"""
+import asyncio
+import json
+from typing import List, Optional, Set, Tuple
+
+from app.shared.logging import setup_service_logger
+from app.services.web.utils.chat_service_client import chat_service_client
+
+logger = setup_service_logger("sse_relay")
+
+# json.dumps() output of the gateway's v0.3 content frames
+CONTENT_FRAME_PREFIX = '{"type": "content", '
+DONE_FRAME = "data: [DONE]\n\n"
+
+# Background saves, referenced until they finish so they are not collected
+_pending_saves: Set[asyncio.Task] = set()
+
+
+class SSERelay:
+    """Relays one chat stream and collects the assistant reply."""
+
+    def __init__(self):
+        # Encoded content frame payloads, in order
+        self._parts: List[str] = []
+        self.done = False
+
+    def relay(self, data: str) -> Tuple[Optional[str], bool]:
+        """
+        Turn one gateway `data:` payload into a browser frame.
+
+        Returns:
+            (frame to send or None, whether the stream is finished)
+        """
+        if data.startswith(CONTENT_FRAME_PREFIX):
+            self._parts.append(data)
+            return f"data: {data}\n\n", False
+
+        data = data.strip()
+        if data == "[DONE]":
+            return self._finish()
+
+        try:
+            chunk_data = json.loads(data)
+        except json.JSONDecodeError:
+            logger.error(f"Failed to parse chunk: {data[:100]}")
+            return None, False
+
+        if chunk_data.get("object") == "chat.completion.chunk":
+            choices = chunk_data.get("choices") or [{}]
+            content = (choices[0].get("delta") or {}).get("content")
+            frame = self._content_frame(content) if content else None
+            if choices[0].get("finish_reason") == "stop":
+                done_frame, _ = self._finish()
+                return (frame or "") + done_frame, True
+            return frame, False
+
+        chunk_type = chunk_data.get("type")
+        if chunk_type == "done":
+            return self._finish()
+        if chunk_type == "content":
+            return self._content_frame(chunk_data.get("content", "")), False
+        if chunk_data.get("error") or chunk_type == "error":
+            error = chunk_data.get("error")
+            if isinstance(error, dict):
+                error = error.get("message", "Unknown error")
+            return f"data: {json.dumps({'type': 'error', 'error': error})}\n\n", False
+        return None, False
+
+    @property
+    def has_content(self) -> bool:
+        return bool(self._parts)
+
+    @property
+    def content(self) -> str:
+        """The reply text so far"""
+        return "".join(json.loads(part).get("content", "") for part in self._parts)
+
+    def _content_frame(self, content: str) -> str:
+        payload = json.dumps({"type": "content", "content": content})
+        self._parts.append(payload)
+        return f"data: {payload}\n\n"
+
+    def _finish(self) -> Tuple[str, bool]:
+        self.done = True
+        return DONE_FRAME, True
+
+
+def save_reply_in_background(
+    relay: SSERelay,
+    conversation_id: Optional[str],
+    user_id: str,
+    jwt_token: Optional[str]
+) -> Optional[asyncio.Task]:
+    """Persist the relayed reply without holding up the browser stream"""
+    if not conversation_id or not relay.has_content:
+        return None
+    task = asyncio.create_task(_save_reply(relay, conversation_id, user_id, jwt_token))
+    _pending_saves.add(task)
+    task.add_done_callback(_pending_saves.discard)
+    return task
+
+
+async def drain_pending_saves(timeout_s: float = 10.0):
+    """Wait for in-flight reply saves, e.g. on shutdown"""
+    if _pending_saves:
+        await asyncio.wait(set(_pending_saves), timeout=timeout_s)
+
+
+async def _save_reply(relay: SSERelay, conversation_id: str, user_id: str, jwt_token: Optional[str]):
+    response_content = relay.content
+    if not response_content:
+        return
+    try:
+        await chat_service_client.add_message(conversation_id, "assistant", response_content, jwt_token=jwt_token)
+        await chat_service_client.update_conversation(user_id, conversation_id, preview=response_content, jwt_token=jwt_token)
+        logger.info(f"Saved AI response to conversation {conversation_id}, content_length={len(response_content)}")
+    except Exception as e:
+        logger.error(f"Failed to save AI response: {e}", exc_info=True)
@@ -70,6 +70,8 @@ class ProviderTiming:
     # Token counts
     input_tokens: int = 0
     output_tokens: int = 0
+    cache_read_input_tokens: int = 0
+    cache_creation_input_tokens: int = 0
     
     # Connection details
     connection_time: Optional[float] = None
@@ -90,11 +92,19 @@ class ProviderTiming:
             ttft = (self.first_token_received - self.request_sent) * 1000
             logger.info(f"[{self.request_id}] {self.provider} TTFT: {ttft:.2f}ms")
     
-    def record_completion(self, input_tokens: int = 0, output_tokens: int = 0):
-        """Record completion of provider response"""
+    def record_completion(
+        self,
+        input_tokens: int = 0,
+        output_tokens: int = 0,
+        cache_read_input_tokens: int = 0,
+        cache_creation_input_tokens: int = 0
+    ):
+        """Record completion of provider response (input_tokens excludes prompt-cache reads/writes)"""
         self.response_complete = time.time()
         self.input_tokens = input_tokens
         self.output_tokens = output_tokens
+        self.cache_read_input_tokens = cache_read_input_tokens
+        self.cache_creation_input_tokens = cache_creation_input_tokens
         
         if self.request_sent:
             total_duration = (self.response_complete - self.request_sent) * 1000
@@ -108,7 +118,9 @@ class ProviderTiming:
             "request_id": self.request_id,
             "input_tokens": self.input_tokens,
             "output_tokens": self.output_tokens,
-            "total_tokens": self.input_tokens + self.output_tokens
+            "total_tokens": self.input_tokens + self.output_tokens,
+            "cache_read_input_tokens": self.cache_read_input_tokens,
+            "cache_creation_input_tokens": self.cache_creation_input_tokens
         }
         
         if self.request_sent:
@@ -263,12 +275,18 @@ class PerformanceInstrumentationManager:
                         "requests": 0,
                         "total_time": 0,
                         "total_tokens": 0,
+                        "uncached_input_tokens": 0,
+                        "cached_input_tokens": 0,
+                        "cache_write_input_tokens": 0,
                         "ttft_times": []
                     }
                 
                 provider_stats[provider]["requests"] += 1
                 provider_stats[provider]["total_time"] += provider_timing.get("total_response_time_ms", 0)
                 provider_stats[provider]["total_tokens"] += provider_timing.get("total_tokens", 0)
+                provider_stats[provider]["uncached_input_tokens"] += provider_timing.get("input_tokens", 0)
+                provider_stats[provider]["cached_input_tokens"] += provider_timing.get("cache_read_input_tokens", 0)
+                provider_stats[provider]["cache_write_input_tokens"] += provider_timing.get("cache_creation_input_tokens", 0)
                 
                 if "ttft_ms" in provider_timing:
                     provider_stats[provider]["ttft_times"].append(provider_timing["ttft_ms"])
@@ -279,6 +297,9 @@ class PerformanceInstrumentationManager:
                 stats["avg_response_time_ms"] = stats["total_time"] / stats["requests"]
                 if stats["ttft_times"]:
                     stats["avg_ttft_ms"] = sum(stats["ttft_times"]) / len(stats["ttft_times"])
+                prompt_tokens = stats["uncached_input_tokens"] + stats["cached_input_tokens"] + stats["cache_write_input_tokens"]
+                if prompt_tokens:
+                    stats["prompt_cache_hit_rate"] = round(stats["cached_input_tokens"] / prompt_tokens, 3)
         
         summary["provider_stats"] = provider_stats
         
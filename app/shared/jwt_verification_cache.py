@@ -0,0 +1,250 @@
+"""
+In-process verification cache for Supabase JWTs.
+
+Checking a token's signature is pure CPU once the signing key is in
+memory, so the hot auth path needs no network I/O:
+
+- verified claims are kept in a bounded LRU keyed by token hash, each
+  entry expiring at the token's own exp
+- signing keys (SUPABASE_JWT_SECRET, plus the project's JWKS when
+  SUPABASE_JWKS_URL is set) are loaded ahead of time and refreshed in the
+  background
+- Redis is only a shared L2 so other replicas skip re-verification
+"""
+import asyncio
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+import jwt
+
+from app.shared.config import settings
+from app.shared.logging import get_logger
+from app.shared.redis_client import async_redis_client, CacheManager
+
+logger = get_logger("jwt_verification")
+
+# Redis copies never outlive the previous fixed auth cache TTL
+L2_MAX_TTL_S = 900
+
+
+class SupabaseSigningKeys:
+    """Supabase signing keys held in memory and refreshed in the background."""
+
+    UNKNOWN_KID_REFRESH_S = 30.0
+
+    def __init__(self, jwks_url: Optional[str] = None, refresh_interval_s: float = 600):
+        self.jwks_url = jwks_url
+        self.refresh_interval_s = refresh_interval_s
+
+        self._secret: Optional[str] = None
+        self._jwks: Dict[str, jwt.PyJWK] = {}
+        self._refreshed_at = 0.0
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._pending_refresh: Optional[asyncio.Task] = None
+
+    @property
+    def secret(self) -> Optional[str]:
+        if self._secret is None:
+            self._secret = os.getenv("SUPABASE_JWT_SECRET") or settings.SUPABASE_JWT_SECRET
+        return self._secret
+
+    async def refresh(self):
+        """Reload the HS256 secret and, if configured, the JWKS."""
+        self._secret = None
+        _ = self.secret
+        self._refreshed_at = time.monotonic()
+
+        if not self.jwks_url:
+            return
+        try:
+            async with httpx.AsyncClient(timeout=5.0) as client:
+                response = await client.get(self.jwks_url)
+                response.raise_for_status()
+            keyset = jwt.PyJWKSet.from_dict(response.json())
+            self._jwks = {key.key_id: key for key in keyset.keys if key.key_id}
+            logger.debug(f"Loaded {len(self._jwks)} JWKS signing keys")
+        except Exception as e:
+            # Keep the previous keys; the next refresh retries
+            logger.warning(f"JWKS refresh failed: {e}")
+
+    def start(self):
+        """Prefetch keys now and keep refreshing them in the background."""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self):
+        for task in (self._refresh_task, self._pending_refresh):
+            if task and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._refresh_task = None
+        self._pending_refresh = None
+
+    def verify(self, token: str) -> Dict[str, Any]:
+        """
+        Verify a token's signature and audience; no I/O.
+
+        Raises:
+            jwt.PyJWTError: If the token is invalid or expired
+            ValueError: If no HS256 secret is configured
+        """
+        header = jwt.get_unverified_header(token)
+        algorithm = header.get("alg")
+
+        if algorithm == "HS256":
+            if not self.secret:
+                logger.error("SUPABASE_JWT_SECRET environment variable not set.")
+                raise ValueError("SUPABASE_JWT_SECRET environment variable not set.")
+            return jwt.decode(token, self.secret, audience="authenticated", algorithms=["HS256"])
+
+        key = self._jwks.get(header.get("kid"))
+        if key is None:
+            self._schedule_refresh()  # Supabase may have rotated keys
+            raise jwt.InvalidTokenError("Unknown signing key")
+        return jwt.decode(token, key.key, audience="authenticated", algorithms=[key.algorithm_name])
+
+    async def _refresh_loop(self):
+        while True:
+            await self.refresh()
+            await asyncio.sleep(self.refresh_interval_s)
+
+    def _schedule_refresh(self):
+        if not self.jwks_url or time.monotonic() - self._refreshed_at < self.UNKNOWN_KID_REFRESH_S:
+            return
+        if self._pending_refresh is None or self._pending_refresh.done():
+            try:
+                self._pending_refresh = asyncio.get_running_loop().create_task(self.refresh())
+            except RuntimeError:
+                pass
+
+
+class JWTClaimsCache:
+    """Bounded LRU of verified claims, keyed by token hash, expiring at exp."""
+
+    def __init__(self, max_entries: int = 10000, default_ttl_s: int = L2_MAX_TTL_S):
+        self.max_entries = max_entries
+        self.default_ttl_s = default_ttl_s
+
+        # token hash -> (expires_at epoch seconds, claims)
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._stats = {
+            "hits": 0, "l2_hits": 0, "misses": 0, "verifications": 0,
+            "failures": 0, "evictions": 0, "verify_ms_total": 0.0, "auth_ms_total": 0.0
+        }
+
+    def expires_at(self, claims: Dict[str, Any]) -> float:
+        exp = claims.get("exp")
+        return float(exp) if isinstance(exp, (int, float)) else time.time() + self.default_ttl_s
+
+    def get(self, token_hash: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(token_hash)
+        if entry is None:
+            return None
+        expires_at, claims = entry
+        if expires_at <= time.time():
+            del self._entries[token_hash]
+            return None
+        self._entries.move_to_end(token_hash)
+        return claims
+
+    def set(self, token_hash: str, claims: Dict[str, Any]):
+        expires_at = self.expires_at(claims)
+        if expires_at <= time.time():
+            return
+        self._entries[token_hash] = (expires_at, claims)
+        self._entries.move_to_end(token_hash)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def record(self, outcome: str, auth_s: float, verify_s: Optional[float] = None):
+        """Count one lookup ("hits", "l2_hits", "misses" or "failures") and its latency."""
+        self._stats[outcome] += 1
+        self._stats["auth_ms_total"] += auth_s * 1000
+        if verify_s is not None:
+            self._stats["verifications"] += 1
+            self._stats["verify_ms_total"] += verify_s * 1000
+
+    def clear(self):
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = self._stats
+        lookups = stats["hits"] + stats["l2_hits"] + stats["misses"]
+        return {
+            "hits": stats["hits"],
+            "l2_hits": stats["l2_hits"],
+            "misses": stats["misses"],
+            "verifications": stats["verifications"],
+            "failures": stats["failures"],
+            "evictions": stats["evictions"],
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hit_rate": round(stats["hits"] / lookups, 3) if lookups else 0.0,
+            "avg_auth_ms": round(stats["auth_ms_total"] / lookups, 3) if lookups else 0.0,
+            "avg_verify_ms": round(stats["verify_ms_total"] / stats["verifications"], 3) if stats["verifications"] else 0.0
+        }
+
+
+async def verify_supabase_token(token: str) -> Dict[str, Any]:
+    """
+    Return the verified claims for a Supabase JWT.
+
+    Checks the in-process cache, then Redis, then verifies locally.
+
+    Raises:
+        jwt.PyJWTError: If the token is invalid or expired
+        ValueError: If no HS256 secret is configured
+    """
+    started = time.perf_counter()
+    token_hash = hashlib.sha256(token.encode()).hexdigest()
+
+    claims = jwt_claims_cache.get(token_hash)
+    if claims is not None:
+        jwt_claims_cache.record("hits", time.perf_counter() - started)
+        return claims
+
+    cache_key = CacheManager.auth_cache_key(token_hash)
+    try:
+        claims = await async_redis_client.get_json(cache_key)
+    except Exception as e:
+        logger.warning(f"JWT cache lookup failed: {e}")
+        claims = None
+    if claims and jwt_claims_cache.expires_at(claims) > time.time():
+        jwt_claims_cache.set(token_hash, claims)
+        jwt_claims_cache.record("l2_hits", time.perf_counter() - started)
+        return claims
+
+    verify_started = time.perf_counter()
+    try:
+        claims = supabase_signing_keys.verify(token)
+    except Exception:
+        jwt_claims_cache.record("failures", 0.0)
+        raise
+    verify_s = time.perf_counter() - verify_started
+    jwt_claims_cache.set(token_hash, claims)
+
+    ttl = int(min(L2_MAX_TTL_S, jwt_claims_cache.expires_at(claims) - time.time()))
+    if ttl > 0:
+        try:
+            await async_redis_client.set_json(cache_key, claims, ex=ttl)
+        except Exception as e:
+            logger.warning(f"JWT cache set failed: {e}")
+
+    jwt_claims_cache.record("misses", time.perf_counter() - started, verify_s)
+    return claims
+
+
+# Global instances
+supabase_signing_keys = SupabaseSigningKeys(
+    jwks_url=settings.SUPABASE_JWKS_URL,
+    refresh_interval_s=settings.JWT_KEYS_REFRESH_SECONDS
+)
+jwt_claims_cache = JWTClaimsCache(max_entries=settings.JWT_CLAIMS_CACHE_MAX_ENTRIES)
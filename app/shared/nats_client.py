@@ -175,6 +175,9 @@ class NATSSubjects:
     ASSET_SERVICE_REQUEST = "gaia.service.asset.request"
     CHAT_SERVICE_REQUEST = "gaia.service.chat.request"
 
+    # KB content events
+    KB_WAYPOINTS_CHANGED = "gaia.kb.waypoints.changed"  # {"experience": str | None}
+
     # World updates (for MMOIRL real-time events)
     @staticmethod
     def world_update_user(user_id: str) -> str:
@@ -22,7 +22,7 @@ from pydantic import BaseModel
 
 from .database import get_db_session
 from .logging import get_logger
-from .redis_client import redis_client
+from .redis_client import async_redis_client
 from .config import settings
 
 logger = get_logger("rbac")
@@ -203,7 +203,7 @@ class RBACManager:
         if context:
             cache_key += f":{context}"
         
-        cached = await redis_client.get(cache_key)
+        cached = await async_redis_client.get(cache_key)
         if cached is not None:
             return cached == "1"
         
@@ -213,7 +213,7 @@ class RBACManager:
         )
         
         # Cache result
-        await redis_client.setex(cache_key, self.cache_ttl, "1" if has_permission else "0")
+        await async_redis_client.setex(cache_key, self.cache_ttl, "1" if has_permission else "0")
         
         return has_permission
     
@@ -266,7 +266,7 @@ class RBACManager:
             cache_key += f":{resource_type}"
         
         # Check cache
-        cached = await redis_client.get(cache_key)
+        cached = await async_redis_client.get(cache_key)
         if cached:
             import json
             return json.loads(cached)
@@ -295,7 +295,7 @@ class RBACManager:
         
         # Cache result
         import json
-        await redis_client.setex(cache_key, self.cache_ttl, json.dumps(permissions))
+        await async_redis_client.setex(cache_key, self.cache_ttl, json.dumps(permissions))
         
         return permissions
     
@@ -707,7 +707,7 @@ class RBACManager:
         pattern = f"rbac:*:{user_id}:*"
         # Note: This is a simplified version. In production, you'd want
         # to track cache keys more precisely or use Redis SCAN
-        await redis_client.delete(f"rbac:user_perms:{user_id}")
+        await async_redis_client.delete(f"rbac:user_perms:{user_id}")
     
     async def _invalidate_team_cache(self, team_id: str):
         """Invalidate cache for all team members"""
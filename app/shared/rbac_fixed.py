@@ -14,7 +14,7 @@ import json
 
 from .database import get_db_session
 from .logging import get_logger
-from .redis_client import redis_client
+from .redis_client import async_redis_client
 from .config import settings
 
 logger = get_logger("rbac")
@@ -109,9 +109,9 @@ class RBACManager:
         # Check cache first
         cache_key = f"rbac:perm:{user_id}:{resource_type}:{resource_path}:{action}"
         
-        if redis_client.is_connected():
+        if async_redis_client.available:
             try:
-                cached = await redis_client.get(cache_key)
+                cached = await async_redis_client.get(cache_key)
                 if cached is not None:
                     return cached == "1"
             except Exception as e:
@@ -123,9 +123,9 @@ class RBACManager:
         )
         
         # Cache result
-        if redis_client.is_connected():
+        if async_redis_client.available:
             try:
-                await redis_client.setex(cache_key, self.cache_ttl, "1" if has_permission else "0")
+                await async_redis_client.setex(cache_key, self.cache_ttl, "1" if has_permission else "0")
             except Exception as e:
                 logger.warning(f"Redis cache set failed: {e}")
         
@@ -477,7 +477,7 @@ class RBACManager:
     
     async def _invalidate_user_cache(self, user_id: str):
         """Invalidate all cache entries for a user."""
-        if redis_client.is_connected():
+        if async_redis_client.available:
             try:
                 pattern = f"rbac:*:{user_id}:*"
                 # Note: This is a simplified version. In production, 
@@ -1,9 +1,11 @@
 """
 Simple RBAC implementation that works with asyncpg directly
 """
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Iterable, Optional, Tuple, Union
+from collections import OrderedDict
 from datetime import datetime
 from uuid import UUID
+import time
 import uuid
 import logging
 
@@ -14,13 +16,76 @@ from .config import settings
 
 logger = get_logger("rbac_simple")
 
+
+def _path_segments(path: str) -> List[str]:
+    """Split a KB path into segments; "/kb/users/x", "kb/users/x" and "users/x" are equivalent."""
+    segments = [segment for segment in path.split("/") if segment]
+    if segments and segments[0] == "kb":
+        segments = segments[1:]
+    return segments
+
+
+class KBPathTrie:
+    """Segment-wise prefix trie of KB roots; a path is covered if it is at or below a root."""
+    
+    _END = object()
+    
+    def __init__(self, roots: Iterable[str] = ()):
+        self._root: Dict[Any, Any] = {}
+        for root in roots:
+            self.add(root)
+    
+    def add(self, root: str):
+        node = self._root
+        for segment in _path_segments(root):
+            node = node.setdefault(segment, {})
+        node[self._END] = True
+    
+    def covers(self, path: str) -> bool:
+        node = self._root
+        if self._END in node:
+            return True
+        for segment in _path_segments(path):
+            node = node.get(segment)
+            if node is None:
+                return False
+            if self._END in node:
+                return True
+        return False
+
+
+class KBAccessSet:
+    """
+    Compiled KB read permissions for one user.
+    
+    roots are the user's accessible KB paths (get_accessible_kb_paths);
+    unrestricted mirrors check_kb_access granting blanket read access.
+    """
+    
+    def __init__(self, roots: List[str], unrestricted: bool = False):
+        self.roots = roots
+        self.unrestricted = unrestricted
+        self._trie = KBPathTrie(roots)
+    
+    def allows(self, path: str) -> bool:
+        return self.unrestricted or self._trie.covers(path)
+    
+    def within_roots(self, path: str) -> bool:
+        """True if path is at or below one of the accessible roots"""
+        return self._trie.covers(path)
+
+
 class SimpleRBACManager:
     """
     Simplified RBAC manager that works directly with asyncpg
     """
     
+    MAX_CACHED_ACCESS_SETS = 10000
+    
     def __init__(self):
         self.cache_ttl = getattr(settings, 'RBAC_CACHE_TTL', 300)  # 5 minutes
+        # user_id -> (expires_at, KBAccessSet)
+        self._kb_access_sets: "OrderedDict[str, Tuple[float, KBAccessSet]]" = OrderedDict()
 
     def ensure_uuid(self, user_id: Union[str, UUID]) -> str:
         """Ensure user_id is a valid UUID string"""
@@ -37,11 +102,42 @@ class SimpleRBACManager:
         
         raise TypeError(f"user_id must be str or UUID, got {type(user_id)}")
 
+    async def get_kb_access_set(self, user_id: str) -> KBAccessSet:
+        """
+        Get the user's compiled KB permissions, building them at most once per cache_ttl.
+        
+        Dropped by _invalidate_user_cache when the user's memberships change.
+        """
+        cached = self._kb_access_sets.get(user_id)
+        if cached and cached[0] > time.monotonic():
+            self._kb_access_sets.move_to_end(user_id)
+            return cached[1]
+        
+        roots = await self._load_accessible_kb_paths(user_id)
+        # Same outcome as check_kb_access: every authenticated user may read any KB path
+        # until team/workspace checks are implemented there
+        access_set = KBAccessSet(roots, unrestricted=True)
+        
+        self._kb_access_sets[user_id] = (time.monotonic() + self.cache_ttl, access_set)
+        self._kb_access_sets.move_to_end(user_id)
+        while len(self._kb_access_sets) > self.MAX_CACHED_ACCESS_SETS:
+            self._kb_access_sets.popitem(last=False)
+        return access_set
+    
+    async def _invalidate_user_cache(self, user_id: str):
+        """Drop the user's compiled KB permissions"""
+        self._kb_access_sets.pop(str(user_id), None)
+    
     async def get_accessible_kb_paths(self, user_id: str) -> List[str]:
         """
         Get all KB paths accessible to a user.
         Supports both UUID and email-based user identification.
         """
+        access_set = await self.get_kb_access_set(user_id)
+        return list(access_set.roots)
+    
+    async def _load_accessible_kb_paths(self, user_id: str) -> List[str]:
+        """Read the user's accessible KB roots from the database"""
         paths = []
         
         # Always include personal KB (using the user_id as-is for path)
@@ -60,22 +156,18 @@ class SimpleRBACManager:
             return paths
         
         try:
-            # Get team memberships
+            # Team and workspace memberships in one round trip
             async with get_db_session() as connection:
-                teams_result = await connection.fetch(
-                    "SELECT team_id FROM team_members WHERE user_id = $1",
-                    validated_user_id
-                )
-                for row in teams_result:
-                    paths.append(f"teams/{row['team_id']}")
-            
-                # Get workspace memberships
-                workspaces_result = await connection.fetch(
-                    "SELECT workspace_id FROM workspace_members WHERE user_id = $1",
+                memberships = await connection.fetch(
+                    """
+                    SELECT 'teams' AS kind, team_id::text AS id FROM team_members WHERE user_id = $1
+                    UNION ALL
+                    SELECT 'workspaces' AS kind, workspace_id::text AS id FROM workspace_members WHERE user_id = $1
+                    """,
                     validated_user_id
                 )
-                for row in workspaces_result:
-                    paths.append(f"workspaces/{row['workspace_id']}")
+                for row in memberships:
+                    paths.append(f"{row['kind']}/{row['id']}")
         except Exception as e:
             logger.error(f"Error getting team/workspace memberships: {e}")
             # Continue with just personal and shared paths
@@ -1,22 +1,47 @@
 """
 Redis client utility for caching and session management.
 Provides consistent Redis connection management across all services.
+
+redis_client wraps the synchronous redis.Redis for sync callers;
+async_redis_client is the asyncio-native client for async handlers.
 """
+import asyncio
 import json
 import logging
-from typing import Any, Optional, Union
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple, Union
 from redis import Redis
-from redis.exceptions import RedisError, ConnectionError
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError, ConnectionError, TimeoutError
 from app.shared.config import settings
 
 logger = logging.getLogger(__name__)
 
+
+def _redis_kwargs() -> Dict[str, Any]:
+    """Connection options shared by the sync and async clients."""
+    redis_kwargs = {
+        "decode_responses": True,
+        "socket_connect_timeout": 5,
+        "socket_timeout": 5,
+        "retry_on_timeout": True,
+        "health_check_interval": 30
+    }
+    
+    # If password is provided separately, use it
+    if settings.REDIS_PASSWORD:
+        redis_kwargs["password"] = settings.REDIS_PASSWORD
+    return redis_kwargs
+
+
 class RedisClient:
     """Redis client wrapper with connection pooling and error handling."""
     
     def __init__(self):
         self._client: Optional[Redis] = None
         self._connected = False
+        self._checked_at = 0.0
     
     @property
     def client(self) -> Redis:
@@ -28,22 +53,9 @@ class RedisClient:
     def _connect(self):
         """Initialize Redis connection."""
         try:
-            # Parse URL and override password if provided separately
-            redis_kwargs = {
-                "decode_responses": True,
-                "socket_connect_timeout": 5,
-                "socket_timeout": 5,
-                "retry_on_timeout": True,
-                "health_check_interval": 30
-            }
-            
-            # If password is provided separately, use it
-            if settings.REDIS_PASSWORD:
-                redis_kwargs["password"] = settings.REDIS_PASSWORD
-            
             self._client = Redis.from_url(
                 settings.REDIS_URL,
-                **redis_kwargs
+                **_redis_kwargs()
             )
             # Test connection
             self._client.ping()
@@ -55,12 +67,22 @@ class RedisClient:
             raise
     
     def is_connected(self) -> bool:
-        """Check if Redis is connected and healthy."""
+        """
+        Check if Redis is connected and healthy.
+        
+        The last PING result is reused for REDIS_HEALTH_RECHECK_SECONDS, so
+        callers can check before every operation without a round trip each.
+        """
+        now = time.monotonic()
+        if now - self._checked_at < settings.REDIS_HEALTH_RECHECK_SECONDS:
+            return self._connected
+        self._checked_at = now
         try:
             # Try to initialize if not already done
             if self._client is None:
                 self._connect()
             self._client.ping()
+            self._connected = True
             return True
         except (ConnectionError, RedisError):
             self._connected = False
@@ -196,6 +218,280 @@ class RedisClient:
 # Global Redis client instance
 redis_client = RedisClient()
 
+
+class AsyncRedisClient:
+    """
+    asyncio Redis client on one shared connection pool per event loop.
+    
+    Health is tracked from the outcome of real operations instead of a PING
+    per call: after a connection failure, operations short-circuit to their
+    miss value until REDIS_HEALTH_RECHECK_SECONDS has passed, then one is let
+    through to probe. Hot keys (auth results) can also be kept in a small
+    in-process L1 with a short TTL, making repeat lookups free.
+    """
+    
+    def __init__(self, l1_max_entries: int = 10000, l1_ttl_s: float = 5.0):
+        self.l1_max_entries = l1_max_entries
+        self.l1_ttl_s = l1_ttl_s
+        
+        self._client: Optional[aioredis.Redis] = None
+        self._raw_client: Optional[aioredis.Redis] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Closes of pools left behind on another loop, referenced until done
+        self._closing: set = set()
+        self._healthy = True
+        self._retry_at = 0.0
+        # key -> (expires_at, value)
+        self._l1: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._stats = {"l1_hits": 0, "hits": 0, "misses": 0, "errors": 0, "skipped": 0}
+    
+    @property
+    def client(self) -> aioredis.Redis:
+        """Shared client for the running loop."""
+        self._bind_loop()
+        if self._client is None:
+            self._client = aioredis.Redis.from_url(
+                settings.REDIS_URL,
+                max_connections=settings.REDIS_MAX_CONNECTIONS,
+                **_redis_kwargs()
+            )
+        return self._client
+    
+    @property
+    def raw_client(self) -> aioredis.Redis:
+        """Like client, but values come back as bytes (for binary payloads)."""
+        self._bind_loop()
+        if self._raw_client is None:
+            self._raw_client = aioredis.Redis.from_url(
+                settings.REDIS_URL,
+                max_connections=settings.REDIS_MAX_CONNECTIONS,
+                **{**_redis_kwargs(), "decode_responses": False}
+            )
+        return self._raw_client
+    
+    @property
+    def available(self) -> bool:
+        """Whether operations will be attempted (no I/O)."""
+        return self._healthy or time.monotonic() >= self._retry_at
+    
+    async def ping(self) -> bool:
+        """Round-trip health probe; updates the tracked health state."""
+        try:
+            await self.client.ping()
+            self._mark_healthy()
+            return True
+        except (ConnectionError, TimeoutError, RedisError, OSError) as e:
+            self._mark_unhealthy(e)
+            return False
+    
+    async def get(self, key: str, local: bool = False) -> Optional[str]:
+        """Get value by key; local=True consults and fills the in-process L1."""
+        if local:
+            found, value = self._l1_get(key)
+            if found:
+                return value
+        value = await self._call("GET", key, lambda c: c.get(key))
+        self._stats["hits" if value is not None else "misses"] += 1
+        if local and value is not None:
+            self._l1_set(key, value, self.l1_ttl_s)
+        return value
+    
+    async def set(self, key: str, value: str, ex: Optional[int] = None, local: bool = False) -> bool:
+        """Set key-value pair with optional expiration."""
+        if local:
+            self._l1_set(key, value, min(self.l1_ttl_s, ex) if ex else self.l1_ttl_s)
+        return bool(await self._call("SET", key, lambda c: c.set(key, value, ex=ex), False))
+    
+    async def setex(self, key: str, seconds: int, value: str) -> bool:
+        return await self.set(key, value, ex=seconds)
+    
+    async def delete(self, *keys: str) -> int:
+        """Delete keys from Redis and the local L1."""
+        if not keys:
+            return 0
+        for key in keys:
+            self._l1.pop(key, None)
+        return await self._call("DEL", keys[0], lambda c: c.delete(*keys), 0)
+    
+    async def mget(self, keys: List[str]) -> List[Optional[str]]:
+        """Get several keys in one round trip."""
+        if not keys:
+            return []
+        values = await self._call("MGET", keys[0], lambda c: c.mget(keys))
+        return values if values is not None else [None] * len(keys)
+    
+    async def set_many(self, mapping: Dict[str, str], ex: Optional[int] = None) -> bool:
+        """Set several keys in one pipelined round trip."""
+        if not mapping:
+            return True
+        
+        async def run(c):
+            async with c.pipeline(transaction=False) as pipe:
+                for key, value in mapping.items():
+                    pipe.set(key, value, ex=ex)
+                return await pipe.execute()
+        
+        return bool(await self._call("PIPELINE SET", next(iter(mapping)), run, False))
+    
+    async def get_json(self, key: str, local: bool = False) -> Optional[Any]:
+        """Get JSON value by key; decoded values are what the L1 holds."""
+        if local:
+            found, value = self._l1_get(key)
+            if found:
+                return value
+        raw = await self.get(key)
+        if raw is None:
+            return None
+        try:
+            value = json.loads(raw)
+        except json.JSONDecodeError as e:
+            logger.warning(f"Failed to decode JSON for key {key}: {e}")
+            return None
+        if local:
+            self._l1_set(key, value, self.l1_ttl_s)
+        return value
+    
+    async def set_json(self, key: str, value: Any, ex: Optional[int] = None, local: bool = False) -> bool:
+        """Set JSON value with optional expiration."""
+        try:
+            json_str = json.dumps(value)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Failed to encode JSON for key {key}: {e}")
+            return False
+        if local:
+            self._l1_set(key, value, min(self.l1_ttl_s, ex) if ex else self.l1_ttl_s)
+        return await self.set(key, json_str, ex=ex)
+    
+    async def hgetall_bytes(self, key: str) -> Dict[bytes, bytes]:
+        """Get a hash with binary field values."""
+        result = await self._call("HGETALL", key, lambda c: c.hgetall(key), raw=True)
+        return result or {}
+    
+    async def hset_bytes(self, key: str, mapping: Dict[str, bytes], ex: Optional[int] = None) -> bool:
+        """Replace a hash with binary field values in one pipelined round trip."""
+        
+        async def run(c):
+            async with c.pipeline(transaction=True) as pipe:
+                pipe.delete(key)
+                pipe.hset(key, mapping=mapping)
+                if ex:
+                    pipe.expire(key, ex)
+                return await pipe.execute()
+        
+        return bool(await self._call("HSET", key, run, False, raw=True))
+    
+    async def scan(self, cursor: int = 0, match: Optional[str] = None, count: int = 100) -> Tuple[int, List[str]]:
+        result = await self._call("SCAN", match or "*", lambda c: c.scan(cursor, match=match, count=count))
+        return result if result is not None else (0, [])
+    
+    async def scan_iter(self, match: Optional[str] = None, count: int = 100):
+        """Async generator for scanning Redis keys matching pattern."""
+        cursor = 0
+        while True:
+            cursor, keys = await self.scan(cursor, match=match, count=count)
+            for key in keys:
+                yield key
+            if cursor == 0:
+                break
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self._stats, "healthy": self._healthy, "l1_entries": len(self._l1)}
+    
+    async def close(self):
+        """Release the connection pools."""
+        clients = (self._client, self._raw_client)
+        self._client = None
+        self._raw_client = None
+        self._loop = None
+        await self._close_clients(clients)
+    
+    def _bind_loop(self):
+        """Replace clients created on another event loop; pools cannot cross loops."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        old_loop, clients = self._loop, (self._client, self._raw_client)
+        self._client = None
+        self._raw_client = None
+        self._loop = loop
+        if not any(clients):
+            return
+        
+        # Close the old pools on their own loop if it still runs, else from this one
+        if old_loop is not None and old_loop.is_running() and not old_loop.is_closed():
+            asyncio.run_coroutine_threadsafe(self._close_clients(clients), old_loop)
+        else:
+            task = loop.create_task(self._close_clients(clients))
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+    
+    @staticmethod
+    async def _close_clients(clients):
+        for client in clients:
+            if client is None:
+                continue
+            try:
+                # aclose() on redis-py 5+, close() before that
+                close = getattr(client, "aclose", None) or client.close
+                await close()
+            except Exception as e:
+                logger.warning(f"Error closing async Redis pool: {e}")
+    
+    async def _call(self, op: str, key: str, fn, default: Any = None, raw: bool = False) -> Any:
+        if not self.available:
+            self._stats["skipped"] += 1
+            return default
+        try:
+            result = await fn(self.raw_client if raw else self.client)
+        except (ConnectionError, TimeoutError, OSError) as e:
+            self._mark_unhealthy(e)
+            return default
+        except RedisError as e:
+            self._stats["errors"] += 1
+            logger.warning(f"Redis {op} failed for key {key}: {e}")
+            return default
+        self._mark_healthy()
+        return result
+    
+    def _mark_healthy(self):
+        if not self._healthy:
+            logger.info("Redis connection restored")
+        self._healthy = True
+    
+    def _mark_unhealthy(self, error: Exception):
+        self._stats["errors"] += 1
+        if self._healthy:
+            logger.warning(f"Redis unavailable, skipping operations for {settings.REDIS_HEALTH_RECHECK_SECONDS}s: {error}")
+        self._healthy = False
+        self._retry_at = time.monotonic() + settings.REDIS_HEALTH_RECHECK_SECONDS
+    
+    def _l1_get(self, key: str) -> Tuple[bool, Any]:
+        entry = self._l1.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._l1[key]
+            return False, None
+        self._l1.move_to_end(key)
+        self._stats["l1_hits"] += 1
+        return True, value
+    
+    def _l1_set(self, key: str, value: Any, ttl_s: float):
+        if ttl_s <= 0:
+            return
+        self._l1[key] = (time.monotonic() + ttl_s, value)
+        self._l1.move_to_end(key)
+        while len(self._l1) > self.l1_max_entries:
+            self._l1.popitem(last=False)
+
+
+# Global async Redis client instance
+async_redis_client = AsyncRedisClient(
+    l1_max_entries=settings.REDIS_L1_MAX_ENTRIES,
+    l1_ttl_s=settings.REDIS_L1_TTL_SECONDS
+)
+
 # Cache decorators and utilities
 class CacheManager:
     """Higher-level cache management utilities."""
@@ -13,7 +13,8 @@ from fastapi.security import APIKeyHeader, HTTPBearer, HTTPAuthorizationCredenti
 from typing import Optional, Union, Dict, Any
 from datetime import datetime
 from sqlalchemy.orm import Session
-from app.shared.redis_client import redis_client, CacheManager
+from app.shared.redis_client import async_redis_client, CacheManager
+from app.shared.jwt_verification_cache import verify_supabase_token
 
 logger = logging.getLogger(__name__)
 
@@ -75,22 +76,21 @@ async def validate_user_api_key(api_key: str, db: Session) -> Optional[Authentic
         key_hash = hash_api_key(api_key)
         cache_key = CacheManager.api_key_cache_key(key_hash)
         
-        # Try to get cached validation result
-        if redis_client.is_connected():
-            try:
-                cached_result = redis_client.get_json(cache_key)
-                if cached_result:
-                    logger.debug("User API key validation cache hit")
-                    return AuthenticationResult(
-                        auth_type="user_api_key",
-                        user_id=cached_result["user_id"],
-                        api_key=api_key,
-                        api_key_id=cached_result["api_key_id"],
-                        scopes=cached_result.get("scopes", []),
-                        email=cached_result.get("email")
-                    )
-            except Exception as e:
-                logger.warning(f"API key cache lookup failed: {e}")
+        # Try to get cached validation result (in-process L1, then Redis)
+        try:
+            cached_result = await async_redis_client.get_json(cache_key, local=True)
+            if cached_result:
+                logger.debug("User API key validation cache hit")
+                return AuthenticationResult(
+                    auth_type="user_api_key",
+                    user_id=cached_result["user_id"],
+                    api_key=api_key,
+                    api_key_id=cached_result["api_key_id"],
+                    scopes=cached_result.get("scopes", []),
+                    email=cached_result.get("email")
+                )
+        except Exception as e:
+            logger.warning(f"API key cache lookup failed: {e}")
         
         # Look up the API key in the database using raw SQL for compatibility
         result = db.execute(
@@ -128,18 +128,17 @@ async def validate_user_api_key(api_key: str, db: Session) -> Optional[Authentic
         )
         
         # Cache successful validation for 10 minutes
-        if redis_client.is_connected():
-            try:
-                cache_data = {
-                    "user_id": str(result.user_id),
-                    "api_key_id": str(result.id),
-                    "scopes": result.permissions or [],
-                    "email": result.email
-                }
-                redis_client.set_json(cache_key, cache_data, ex=600)  # 10 minutes
-                logger.debug("User API key validation cached")
-            except Exception as e:
-                logger.warning(f"API key cache set failed: {e}")
+        try:
+            cache_data = {
+                "user_id": str(result.user_id),
+                "api_key_id": str(result.id),
+                "scopes": result.permissions or [],
+                "email": result.email
+            }
+            await async_redis_client.set_json(cache_key, cache_data, ex=600, local=True)  # 10 minutes
+            logger.debug("User API key validation cached")
+        except Exception as e:
+            logger.warning(f"API key cache set failed: {e}")
         
         return auth_result
         
@@ -163,42 +162,9 @@ async def validate_supabase_jwt(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # Generate cache key from token hash
-    token_hash = hashlib.sha256(credentials.credentials.encode()).hexdigest()
-    cache_key = CacheManager.auth_cache_key(token_hash)
-    
-    # Try to get cached validation result
-    if redis_client.is_connected():
-        try:
-            cached_payload = redis_client.get_json(cache_key)
-            if cached_payload:
-                logger.debug("JWT validation cache hit")
-                return cached_payload
-        except Exception as e:
-            logger.warning(f"JWT cache lookup failed: {e}")
-    
     try:
-        jwt_secret = os.getenv("SUPABASE_JWT_SECRET")
-        if not jwt_secret:
-            logger.error("SUPABASE_JWT_SECRET environment variable not set.")
-            raise ValueError("SUPABASE_JWT_SECRET environment variable not set.")
-
-        payload = jwt.decode(
-            credentials.credentials,
-            jwt_secret,
-            audience="authenticated",
-            algorithms=["HS256"]
-        )
-        
-        # Cache successful validation for 15 minutes
-        if redis_client.is_connected():
-            try:
-                redis_client.set_json(cache_key, payload, ex=900)  # 15 minutes
-                logger.debug("JWT validation cached")
-            except Exception as e:
-                logger.warning(f"JWT cache set failed: {e}")
-        
-        return payload
+        # In-process claims cache, then Redis, then local signature check
+        return await verify_supabase_token(credentials.credentials)
     except jwt.PyJWTError as e:
         logger.error(f"JWT validation error: {str(e)}")
         raise HTTPException(
@@ -238,43 +204,9 @@ async def get_current_user_ws(websocket: WebSocket, token: str) -> dict:
             detail="No authentication token provided"
         )
 
-    # Generate cache key from token hash
-    token_hash = hashlib.sha256(token.encode()).hexdigest()
-    cache_key = CacheManager.auth_cache_key(token_hash)
-
-    # Try to get cached validation result
-    if redis_client.is_connected():
-        try:
-            cached_payload = redis_client.get_json(cache_key)
-            if cached_payload:
-                logger.debug("WebSocket JWT validation cache hit")
-                return cached_payload
-        except Exception as e:
-            logger.warning(f"WebSocket JWT cache lookup failed: {e}")
-
     try:
-        jwt_secret = os.getenv("SUPABASE_JWT_SECRET")
-        if not jwt_secret:
-            logger.error("SUPABASE_JWT_SECRET environment variable not set")
-            await websocket.close(code=1011, reason="Server configuration error")
-            raise ValueError("SUPABASE_JWT_SECRET environment variable not set")
-
-        payload = jwt.decode(
-            token,
-            jwt_secret,
-            audience="authenticated",
-            algorithms=["HS256"]
-        )
-
-        # Cache successful validation for 15 minutes
-        if redis_client.is_connected():
-            try:
-                redis_client.set_json(cache_key, payload, ex=900)  # 15 minutes
-                logger.debug("WebSocket JWT validation cached")
-            except Exception as e:
-                logger.warning(f"WebSocket JWT cache set failed: {e}")
-
-        return payload
+        # In-process claims cache, then Redis, then local signature check
+        return await verify_supabase_token(token)
 
     except jwt.PyJWTError as e:
         logger.error(f"WebSocket JWT validation error: {str(e)}")
@@ -620,6 +552,9 @@ async def revoke_user_api_key(user_id: str, api_key_id: str, db: Session) -> boo
     
     db.delete(api_key_record)
     db.commit()
+    
+    # Stop serving the revoked key from the validation cache
+    await async_redis_client.delete(CacheManager.api_key_cache_key(api_key_record.key_hash))
     return True
 
 async def get_user_api_keys(user_id: str, db: Session) -> list:
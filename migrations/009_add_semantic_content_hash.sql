@@ -0,0 +1,10 @@
+-- Migration 009: Add Content Hash to Semantic Index Metadata
+-- Created: 2026-10-16
+-- Purpose: Let the batched indexer skip re-embedding files whose mtime changed
+--          but whose content did not (git checkout, volume resync, touch)
+
+ALTER TABLE kb_semantic_index_metadata
+ADD COLUMN IF NOT EXISTS content_hash TEXT;
+
+COMMENT ON COLUMN kb_semantic_index_metadata.content_hash IS
+    'sha256 of the file content at last indexing; NULL for rows written before migration 009';
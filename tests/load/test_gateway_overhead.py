@@ -0,0 +1,74 @@
+"""
+Load test for the gateway's per-request overhead.
+
+Sends requests through the full gateway ASGI app (middleware, routing,
+serialization) to a local stub chat service and reads the
+gateway_overhead histogram, i.e. the time spent in the gateway on top of
+the upstream round-trip. Auth is overridden with a fixed principal, since
+the real dependency needs a database or Supabase to validate against.
+
+Requests are sent one at a time: the stub, the client and the gateway
+share the test's event loop, so with requests in flight concurrently
+each one's overhead would also count the time it queues behind the
+others (~25 ms at 16 in flight), which is not gateway work.
+"""
+import httpx
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+from app.gateway import main as gateway
+from app.gateway.upstream_pool import UpstreamPool
+
+# Mark all tests in this file as load tests
+pytestmark = pytest.mark.load
+
+PAYLOAD = {"conversations": [{"id": str(i), "title": f"Conversation {i}"} for i in range(50)]}
+
+
+async def _stub_conversations(request: web.Request) -> web.Response:
+    return web.json_response(PAYLOAD)
+
+
+@pytest_asyncio.fixture
+async def stub_chat(monkeypatch):
+    """Serve the stub chat service on a random local port and route the gateway to it."""
+    app = web.Application()
+    app.router.add_get("/conversations", _stub_conversations)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    pool = UpstreamPool(max_connections=32, max_keepalive_connections=32)
+    monkeypatch.setitem(gateway.SERVICE_URLS, "chat", f"http://127.0.0.1:{port}")
+    monkeypatch.setattr(gateway, "upstream_pool", pool)
+    gateway.app.dependency_overrides[gateway.get_current_auth_legacy] = lambda: {"user_id": "load-test"}
+
+    yield pool
+
+    gateway.app.dependency_overrides.pop(gateway.get_current_auth_legacy, None)
+    await pool.close()
+    await runner.cleanup()
+
+
+class TestGatewayOverhead:
+
+    @pytest.mark.asyncio
+    async def test_gateway_overhead_stays_in_low_milliseconds(self, stub_chat):
+        transport = httpx.ASGITransport(app=gateway.app)
+
+        async with httpx.AsyncClient(transport=transport, base_url="http://gateway") as client:
+            for _ in range(532):  # The first few warm the keep-alive pool
+                response = await client.get("/api/v1/conversations")
+                assert response.status_code == 200
+
+        stats = stub_chat.get_stats()["services"]["chat"]
+        print("Gateway overhead:", stats["gateway_overhead"])
+        print("Upstream latency:", stats["upstream_latency"])
+
+        # Full middleware/routing/serialization stack: ~0.9 ms avg, one bucket of headroom
+        assert stats["gateway_overhead"]["p50_ms"] <= 2.5
+        assert stats["gateway_overhead"]["p95_ms"] <= 5
+        assert stats["circuit"]["state"] == "closed"
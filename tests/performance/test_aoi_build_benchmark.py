@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+AOI build benchmark: build time vs. item count per zone.
+
+Compares a cold build (world parse + template merge for every item) with a
+warm build (cached areas, only the player block rebuilt) for zones of
+increasing size. Runs offline against a temporary KB.
+
+Usage:
+    PYTHONPATH=. python tests/performance/test_aoi_build_benchmark.py
+    pytest tests/performance/test_aoi_build_benchmark.py -m performance -s
+"""
+import asyncio
+import json
+import shutil
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Any, List
+
+import pytest
+
+from app.services.kb.unified_state_manager import UnifiedStateManager
+from app.services.kb.template_loader import TemplateLoader
+
+EXPERIENCE = "bench-shared"
+ITEM_COUNTS = [10, 100, 1000, 5000]
+ITEMS_PER_SPOT = 10
+TEMPLATES = 20
+RUNS = 20
+
+
+def create_bench_kb(root: Path, item_count: int) -> None:
+    """Create a shared experience with one zone holding item_count items."""
+    exp_path = root / "experiences" / EXPERIENCE
+    (exp_path / "state").mkdir(parents=True)
+    (exp_path / "templates" / "items").mkdir(parents=True)
+    (root / "players").mkdir(exist_ok=True)
+
+    (exp_path / "config.json").write_text(json.dumps({
+        "id": EXPERIENCE,
+        "name": "AOI Benchmark",
+        "version": "1.0.0",
+        "state": {"model": "shared"}
+    }))
+
+    for t in range(TEMPLATES):
+        (exp_path / "templates" / "items" / f"item_{t}.md").write_text(
+            f"# Item {t}\n\n> **Name**: Item {t}\n\n## Description\n\nBenchmark item {t}.\n\n"
+            f"## Properties\n\n- **Collectible**: yes\n- **Glow**: blue\n"
+        )
+
+    spots: Dict[str, Any] = {}
+    for i in range(item_count):
+        spot = spots.setdefault(f"spot_{i // ITEMS_PER_SPOT}", {"name": "Spot", "items": []})
+        spot["items"].append({
+            "instance_id": f"item_{i}",
+            "template_id": f"item_{i % TEMPLATES}",
+            "collectible": True
+        })
+
+    world = {
+        "locations": {"zone_1": {"description": "Bench zone", "areas": {"area_1": {"spots": spots}}}},
+        "npcs": {},
+        "metadata": {"_version": 1}
+    }
+    (exp_path / "state" / "world.json").write_text(json.dumps(world, indent=2))
+
+
+async def time_builds(manager: UnifiedStateManager, cold: bool) -> List[float]:
+    waypoints = [{"id": "zone_1", "name": "Zone 1", "location": {"lat": 0, "lng": 0}}]
+    timings = []
+    for _ in range(RUNS):
+        if cold:
+            manager.clear_aoi_cache()
+            manager.template_loader.clear_cache()
+        start = time.perf_counter()
+        aoi = await manager.build_aoi(EXPERIENCE, "bench_user", waypoints)
+        timings.append((time.perf_counter() - start) * 1000)
+        assert aoi is not None
+    return timings
+
+
+async def run_benchmark() -> List[Dict[str, Any]]:
+    results = []
+    for item_count in ITEM_COUNTS:
+        temp_dir = Path(tempfile.mkdtemp())
+        try:
+            create_bench_kb(temp_dir, item_count)
+            manager = UnifiedStateManager(temp_dir)
+            manager.template_loader = TemplateLoader(temp_dir)
+            await manager.ensure_player_initialized(EXPERIENCE, "bench_user")
+
+            cold = await time_builds(manager, cold=True)
+            warm = await time_builds(manager, cold=False)
+            results.append({
+                "items": item_count,
+                "cold_ms": statistics.median(cold),
+                "warm_ms": statistics.median(warm)
+            })
+        finally:
+            shutil.rmtree(temp_dir)
+    return results
+
+
+def print_results(results: List[Dict[str, Any]]) -> None:
+    print(f"\n{'items':>8} {'cold (ms)':>12} {'warm (ms)':>12} {'speedup':>9}")
+    for r in results:
+        speedup = r["cold_ms"] / r["warm_ms"] if r["warm_ms"] else float("inf")
+        print(f"{r['items']:>8} {r['cold_ms']:>12.3f} {r['warm_ms']:>12.3f} {speedup:>8.1f}x")
+
+
+@pytest.mark.performance
+@pytest.mark.asyncio
+async def test_aoi_build_time_vs_item_count():
+    """Warm (cached) AOI builds should not scale with items per zone."""
+    results = await run_benchmark()
+    print_results(results)
+
+    largest = results[-1]
+    assert largest["warm_ms"] < largest["cold_ms"]
+
+
+if __name__ == "__main__":
+    import logging
+    logging.disable(logging.WARNING)  # State manager logs each merge at WARNING
+    print_results(asyncio.run(run_benchmark()))
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Waypoint lookup benchmark: scalar haversine loop vs. spatial index.
+
+Measures radius and k-nearest query latency for increasing waypoint counts.
+Runs offline; no KB service required.
+
+Usage:
+    PYTHONPATH=. python tests/performance/test_spatial_index_benchmark.py
+    pytest tests/performance/test_spatial_index_benchmark.py -m performance -s
+"""
+import random
+import statistics
+import time
+from typing import Any, Dict, List
+
+import pytest
+
+from app.services.locations.distance_utils import calculate_distance, is_within_radius
+from app.services.locations.spatial_index import WaypointSpatialIndex
+
+WAYPOINT_COUNTS = [100, 1000, 10000, 50000]
+CENTER = (37.906, -122.547)
+SPREAD_DEG = 0.5  # ~55km box around the center
+RADIUS_M = 1000
+K = 10
+RUNS = 50
+
+
+def make_waypoints(count: int) -> List[Dict[str, Any]]:
+    rng = random.Random(count)
+    return [
+        {
+            "id": f"wp_{i}",
+            "location": {
+                "lat": CENTER[0] + rng.uniform(-SPREAD_DEG, SPREAD_DEG),
+                "lng": CENTER[1] + rng.uniform(-SPREAD_DEG, SPREAD_DEG),
+            },
+        }
+        for i in range(count)
+    ]
+
+
+def scalar_radius(waypoints: List[Dict[str, Any]], lat: float, lng: float, radius_m: float):
+    hits = []
+    for wp in waypoints:
+        loc = wp["location"]
+        if is_within_radius(lat, lng, loc["lat"], loc["lng"], radius_m):
+            hits.append((wp, calculate_distance(lat, lng, loc["lat"], loc["lng"])))
+    hits.sort(key=lambda item: item[1])
+    return hits
+
+
+def median_ms(fn) -> float:
+    timings = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def run_benchmark() -> List[Dict[str, Any]]:
+    results = []
+    for count in WAYPOINT_COUNTS:
+        waypoints = make_waypoints(count)
+
+        start = time.perf_counter()
+        index = WaypointSpatialIndex(waypoints)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        results.append({
+            "waypoints": count,
+            "build_ms": build_ms,
+            "scalar_ms": median_ms(lambda: scalar_radius(waypoints, *CENTER, RADIUS_M)),
+            "radius_ms": median_ms(lambda: index.query_radius(*CENTER, RADIUS_M)),
+            "nearest_ms": median_ms(lambda: index.query_nearest(*CENTER, K)),
+        })
+    return results
+
+
+def print_results(results: List[Dict[str, Any]]) -> None:
+    print(f"\n{'waypoints':>10} {'build (ms)':>11} {'scalar (ms)':>12} {'radius (ms)':>12} {'k-nn (ms)':>10}")
+    for r in results:
+        print(
+            f"{r['waypoints']:>10} {r['build_ms']:>11.3f} {r['scalar_ms']:>12.3f} "
+            f"{r['radius_ms']:>12.3f} {r['nearest_ms']:>10.3f}"
+        )
+
+
+@pytest.mark.performance
+def test_spatial_index_query_time_vs_waypoint_count():
+    """Indexed queries on 10k waypoints should stay under a millisecond."""
+    results = run_benchmark()
+    print_results(results)
+
+    ten_k = next(r for r in results if r["waypoints"] == 10000)
+    assert ten_k["radius_ms"] < 1.0
+    assert ten_k["nearest_ms"] < 1.0
+
+
+if __name__ == "__main__":
+    print_results(run_benchmark())
@@ -0,0 +1,130 @@
+"""
+Unit tests for the bounded, evicting AgentPool used by HotLoadedChatService.
+"""
+import asyncio
+
+import pytest
+
+from app.services.chat.agent_pool import AgentPool
+
+
+class FakeAgent:
+
+    def __init__(self, name):
+        self.name = name
+        self.exited = False
+
+    async def __aexit__(self, *exc):
+        self.exited = True
+
+
+class Factory:
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.created = []
+
+    async def __call__(self, key):
+        await asyncio.sleep(self.delay)
+        agent = FakeAgent(key)
+        self.created.append(agent)
+        return agent, f"llm-{key}"
+
+
+class TestAgentPool:
+
+    @pytest.mark.asyncio
+    async def test_agents_are_shared_per_key(self):
+        factory = Factory()
+        pool = AgentPool(factory, max_agents=4)
+
+        for _ in range(3):
+            async with pool.lease("louisa") as (agent, llm):
+                assert llm == "llm-louisa"
+
+        stats = pool.get_stats()
+        assert len(factory.created) == 1
+        assert (stats["hits"], stats["misses"], stats["size"]) == (2, 1, 1)
+        assert stats["hit_rate"] == 0.667
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_create_one_agent(self):
+        factory = Factory(delay=0.02)
+        pool = AgentPool(factory)
+
+        async def use():
+            async with pool.lease("louisa"):
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(use() for _ in range(5)))
+
+        assert len(factory.created) == 1
+        assert pool.get_stats()["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_creation_releases_its_lock(self):
+        async def failing_factory(key):
+            raise RuntimeError("boom")
+
+        pool = AgentPool(failing_factory)
+
+        with pytest.raises(RuntimeError):
+            async with pool.lease("louisa"):
+                pass
+
+        assert not pool._creation_locks
+        assert pool.get_stats()["size"] == 0
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction_exits_agent(self):
+        factory = Factory()
+        pool = AgentPool(factory, max_agents=2)
+
+        for key in ("a", "b", "a", "c"):
+            async with pool.lease(key):
+                pass
+
+        evicted = factory.created[1]
+        assert evicted.name == "b" and evicted.exited
+        assert list(pool._entries) == ["a", "c"]
+        assert pool.get_stats()["evictions_lru"] == 1
+
+    @pytest.mark.asyncio
+    async def test_agents_in_use_are_not_evicted(self):
+        factory = Factory()
+        pool = AgentPool(factory, max_agents=1)
+
+        async with pool.lease("a") as (agent_a, _):
+            async with pool.lease("b"):
+                pass
+            # "a" is busy, so the newer idle agent goes instead
+            assert not agent_a.exited
+            assert list(pool._entries) == ["a"]
+
+    @pytest.mark.asyncio
+    async def test_idle_agents_are_evicted(self):
+        factory = Factory()
+        pool = AgentPool(factory, idle_ttl_s=0.05)
+
+        async with pool.lease("a"):
+            pass
+        pool.start_reaper(interval_s=0.02)
+        await asyncio.sleep(0.12)
+
+        assert factory.created[0].exited
+        assert pool.get_stats()["evictions_idle"] == 1
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_close_errors_are_counted(self):
+        async def failing_close(value):
+            raise RuntimeError("boom")
+
+        pool = AgentPool(Factory(), close=failing_close)
+        async with pool.lease("a"):
+            pass
+
+        await pool.close()
+
+        assert pool.get_stats()["close_errors"] == 1
+        assert pool.get_stats()["size"] == 0
@@ -0,0 +1,98 @@
+"""Unit tests for cache-aware routing prompt assembly.
+
+The routing prompt is a CacheablePrompt: a stable prefix (persona, tool
+docs, experience catalog) memoized per persona and catalog version,
+followed by the per-request context. ClaudeProvider marks the end of the
+prefix as a prompt-cache breakpoint.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.services.chat.unified_chat import UnifiedChatHandler
+from app.services.llm import CacheablePrompt
+from app.services.llm.claude_provider import ClaudeProvider
+from app.shared.prompt_manager import PromptManager
+
+PERSONA = ("You are Louisa, a dream-bottle keeper.", "louisa")
+CATALOG = [{"id": "wylding-woods", "name": "Wylding Woods", "description": "A forest."}]
+
+
+def context(conversation_id, message_count=0):
+    return {"user_id": "user-1", "conversation_id": conversation_id, "message_count": message_count}
+
+
+@pytest.fixture
+def handler():
+    handler = UnifiedChatHandler()
+    handler._get_experience_catalog = AsyncMock(return_value=CATALOG)
+    with patch.object(PromptManager, "get_system_prompt_and_persona", AsyncMock(return_value=PERSONA)):
+        yield handler
+
+
+class TestRoutingPromptPrefix:
+
+    @pytest.mark.asyncio
+    async def test_volatile_fields_stay_out_of_the_prefix(self, handler):
+        first = await handler.get_routing_prompt(context("conv-1", 3))
+        second = await handler.get_routing_prompt(context("conv-2", 7))
+
+        assert isinstance(first, CacheablePrompt)
+        assert first.prefix == second.prefix
+        assert "conv-1" not in first.prefix and "conv-1" in first.suffix
+        assert "Message count: 7" in second.suffix
+        assert str(first) == first.prefix + first.suffix
+        assert first.prefix.startswith(PERSONA[0])
+        assert "Wylding Woods" in first.prefix
+
+    @pytest.mark.asyncio
+    async def test_prefix_is_memoized_per_persona_and_catalog_version(self, handler):
+        await handler.get_routing_prompt(context("conv-1"))
+        await handler.get_routing_prompt(context("conv-2"))
+        assert handler._prompt_prefix_stats == {"hits": 1, "misses": 1}
+
+        handler._experience_catalog_version += 1
+        await handler.get_routing_prompt(context("conv-3"))
+        assert handler._prompt_prefix_stats["misses"] == 2
+
+    @pytest.mark.asyncio
+    async def test_directive_contexts_get_their_own_prefix(self, handler):
+        plain = await handler.get_routing_prompt(context("conv-1"))
+        directive = await handler.get_routing_prompt({**context("conv-1"), "response_format": "v0.3"})
+
+        assert "DIRECTIVE-ENHANCED RESPONSES" not in plain.prefix
+        assert "DIRECTIVE-ENHANCED RESPONSES" in directive.prefix
+
+
+class TestClaudePromptCaching:
+
+    @pytest.fixture
+    def provider(self, monkeypatch):
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+        return ClaudeProvider()
+
+    def test_cacheable_prompt_gets_a_breakpoint(self, provider):
+        blocks = provider._system_param(CacheablePrompt("stable", " volatile"))
+
+        assert blocks == [
+            {"type": "text", "text": "stable", "cache_control": {"type": "ephemeral"}},
+            {"type": "text", "text": " volatile"},
+        ]
+
+    def test_plain_prompt_is_sent_as_text(self, provider):
+        assert provider._system_param("plain") == "plain"
+
+    def test_usage_reports_cached_and_uncached_tokens(self, provider):
+        usage = provider._usage_dict(SimpleNamespace(
+            input_tokens=40, output_tokens=10, cache_read_input_tokens=2000, cache_creation_input_tokens=0
+        ))
+
+        assert usage == {
+            "input_tokens": 40,
+            "output_tokens": 10,
+            "total_tokens": 50,
+            "cache_read_input_tokens": 2000,
+            "cache_creation_input_tokens": 0,
+        }
@@ -0,0 +1,85 @@
+"""Unit tests for streaming-first routing in UnifiedChatHandler.
+
+The routing call is streamed: direct answers are forwarded chunk by chunk,
+and tool calls that arrive at the end of the stream are handed back for
+dispatch in the same shape as the non-streaming routing response.
+"""
+
+import asyncio
+
+import pytest
+from unittest.mock import patch
+
+from app.services.chat import unified_chat
+from app.services.chat.unified_chat import UnifiedChatHandler, RouteType
+
+
+def fake_stream(events):
+    async def chat_completion_stream(**kwargs):
+        for event in events:
+            yield event
+    return chat_completion_stream
+
+
+async def collect(handler, events):
+    decision = {}
+    with patch.object(unified_chat.chat_service, "chat_completion_stream", fake_stream(events)):
+        chunks = [
+            chunk async for chunk in handler._stream_routing_response(
+                [{"role": "user", "content": "hi"}], "system", [], "chat-test", asyncio.Queue(), decision
+            )
+        ]
+    return chunks, decision
+
+
+class TestStreamingRouting:
+    """Tests for UnifiedChatHandler._stream_routing_response."""
+
+    @pytest.mark.asyncio
+    async def test_direct_answer_is_forwarded_while_streaming(self):
+        handler = UnifiedChatHandler()
+        chunks, decision = await collect(handler, [
+            {"type": "model_selection", "model": "claude-haiku-4-5", "provider": "claude"},
+            {"type": "content", "content": "Hello there. ", "model": "claude-haiku-4-5"},
+            {"type": "content", "content": "How can I help?", "model": "claude-haiku-4-5"},
+            {"type": "content", "content": "", "model": "claude-haiku-4-5", "finish_reason": "end_turn"},
+            {"type": "metadata", "response_time_ms": 10},
+        ])
+
+        text = "".join(chunk["choices"][0]["delta"]["content"] for chunk in chunks)
+        assert text.replace(" ", "") == "Hellothere.HowcanIhelp?"
+        assert decision["routing_response"]["response"] == "Hello there. How can I help?"
+        assert decision["routing_response"]["tool_calls"] is None
+        assert "first_content_time" in decision
+
+    @pytest.mark.asyncio
+    async def test_tool_call_is_returned_for_dispatch(self):
+        handler = UnifiedChatHandler()
+        tool_call = {"id": "t1", "type": "function", "function": {"name": "use_mcp_agent", "arguments": ""}}
+        chunks, decision = await collect(handler, [
+            {"type": "content", "content": "", "model": "claude-haiku-4-5",
+             "finish_reason": "tool_use", "tool_calls": [tool_call]},
+        ])
+
+        assert chunks == []
+        routing_response = decision["routing_response"]
+        assert routing_response["tool_calls"][0]["function"]["name"] == "use_mcp_agent"
+        assert handler._parse_tool_arguments(routing_response["tool_calls"][0]) == {}
+        assert "first_content_time" not in decision
+
+    @pytest.mark.asyncio
+    async def test_error_without_fallback_raises(self):
+        handler = UnifiedChatHandler()
+        with pytest.raises(RuntimeError, match="boom"):
+            await collect(handler, [{"type": "error", "error": "boom"}])
+
+    def test_time_to_first_chunk_metrics(self):
+        handler = UnifiedChatHandler()
+        handler._routing_metrics["total_requests"] = 3
+        for ttfc_ms in (100, 200, 300):
+            handler._record_time_to_first_chunk(RouteType.DIRECT, ttfc_ms)
+
+        summary = handler.get_metrics()["time_to_first_chunk"][RouteType.DIRECT.value]
+        assert summary["count"] == 3
+        assert summary["avg_ms"] == 200.0
+        assert summary["p50_ms"] == 200
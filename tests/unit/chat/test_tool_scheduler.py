@@ -0,0 +1,110 @@
+"""
+Unit tests for ToolCallScheduler (parallel read-only tools, serialized mutations).
+"""
+import asyncio
+import time
+
+import pytest
+
+from app.services.chat.tool_scheduler import ToolCallScheduler, is_read_only
+
+
+class RecordingExecutor:
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.events = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, tool_name, arguments):
+        self.events.append(("start", tool_name))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        self.events.append(("end", tool_name))
+        if arguments.get("fail"):
+            raise RuntimeError("kb down")
+        return {"success": True, "content": tool_name}
+
+
+class TestToolCallScheduler:
+
+    def test_classification(self):
+        assert is_read_only("search_knowledge_base")
+        assert is_read_only("get_player_inventory")
+        assert not is_read_only("grant_quest_reward")
+        assert not is_read_only("execute_game_command")
+
+    @pytest.mark.asyncio
+    async def test_read_only_calls_run_concurrently_in_order(self):
+        executor = RecordingExecutor(delay=0.1)
+        calls = [("check_quest_state", {}), ("get_player_inventory", {}), ("search_knowledge_base", {})]
+
+        started = time.perf_counter()
+        results = await ToolCallScheduler().run(calls, executor, "user-1")
+        elapsed = time.perf_counter() - started
+
+        assert [r["content"] for r in results] == ["check_quest_state", "get_player_inventory", "search_knowledge_base"]
+        assert executor.max_in_flight == 3
+        assert elapsed < 0.2  # max(tool), not sum(tool)
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_capped(self):
+        executor = RecordingExecutor(delay=0.02)
+        calls = [("read_kb_file", {"path": str(i)}) for i in range(6)]
+
+        await ToolCallScheduler(max_concurrency=2).run(calls, executor, "user-1")
+
+        assert executor.max_in_flight == 2
+
+    @pytest.mark.asyncio
+    async def test_mutation_is_a_barrier(self):
+        executor = RecordingExecutor(delay=0.02)
+        calls = [
+            ("check_quest_state", {}),
+            ("accept_bottle_from_player", {"experience": "wylding-woods"}),
+            ("grant_quest_reward", {"experience": "wylding-woods"}),
+            ("get_player_inventory", {}),
+        ]
+
+        results = await ToolCallScheduler().run(calls, executor, "user-1")
+
+        assert executor.events == [
+            ("start", "check_quest_state"), ("end", "check_quest_state"),
+            ("start", "accept_bottle_from_player"), ("end", "accept_bottle_from_player"),
+            ("start", "grant_quest_reward"), ("end", "grant_quest_reward"),
+            ("start", "get_player_inventory"), ("end", "get_player_inventory"),
+        ]
+        assert [r["content"] for r in results] == [name for name, _ in calls]
+
+    @pytest.mark.asyncio
+    async def test_mutations_serialize_across_requests_per_experience(self):
+        scheduler = ToolCallScheduler()
+        executor = RecordingExecutor(delay=0.02)
+        reward = [("grant_quest_reward", {"experience": "wylding-woods"})]
+
+        await asyncio.gather(
+            scheduler.run(reward, executor, "user-1"),
+            scheduler.run(reward, executor, "user-1"),
+        )
+        assert executor.max_in_flight == 1
+
+        other = RecordingExecutor(delay=0.02)
+        await asyncio.gather(
+            scheduler.run(reward, other, "user-1"),
+            scheduler.run(reward, other, "user-2"),
+        )
+        assert other.max_in_flight == 2
+        assert scheduler._mutation_locks == {}
+
+    @pytest.mark.asyncio
+    async def test_failure_does_not_cancel_siblings(self):
+        executor = RecordingExecutor(delay=0.01)
+        calls = [("search_knowledge_base", {"fail": True}), ("read_kb_file", {})]
+
+        results = await ToolCallScheduler().run(calls, executor, "user-1")
+
+        assert results[0] == {"success": False, "error": "kb down"}
+        assert results[1]["success"] is True
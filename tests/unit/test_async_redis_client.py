@@ -0,0 +1,127 @@
+"""
+Unit tests for AsyncRedisClient (health tracking, L1, batched helpers).
+"""
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from redis.exceptions import ConnectionError
+
+from app.shared.redis_client import AsyncRedisClient
+
+
+class FakeAsyncRedis:
+
+    def __init__(self):
+        self.data = {}
+        self.calls = []
+        self.down = False
+
+    async def _op(self, name):
+        self.calls.append(name)
+        if self.down:
+            raise ConnectionError("connection refused")
+
+    async def get(self, key):
+        await self._op("get")
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        await self._op("set")
+        self.data[key] = value
+        return True
+
+    async def delete(self, *keys):
+        await self._op("delete")
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    async def mget(self, keys):
+        await self._op("mget")
+        return [self.data.get(key) for key in keys]
+
+    async def ping(self):
+        await self._op("ping")
+        return True
+
+    async def aclose(self):
+        self.calls.append("aclose")
+
+
+@pytest.fixture
+def client():
+    redis = AsyncRedisClient(l1_max_entries=2, l1_ttl_s=60)
+    fake = FakeAsyncRedis()
+    with patch.object(AsyncRedisClient, "client", new=fake):
+        yield redis, fake
+
+
+class TestAsyncRedisClient:
+
+    @pytest.mark.asyncio
+    async def test_no_ping_per_operation(self, client):
+        redis, fake = client
+
+        await redis.set("k", "v")
+        assert await redis.get("k") == "v"
+
+        assert fake.calls == ["set", "get"]
+
+    @pytest.mark.asyncio
+    async def test_local_json_is_served_from_l1(self, client):
+        redis, fake = client
+        await redis.set_json("auth:token", {"sub": "u1"}, ex=900, local=True)
+        fake.calls.clear()
+
+        assert await redis.get_json("auth:token", local=True) == {"sub": "u1"}
+        assert fake.calls == []
+        assert redis.get_stats()["l1_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_l1_is_bounded_and_cleared_by_delete(self, client):
+        redis, fake = client
+        for key in ("a", "b", "c"):
+            await redis.set_json(key, key, local=True)
+        assert redis.get_stats()["l1_entries"] == 2
+
+        await redis.delete("c")
+        fake.calls.clear()
+        assert await redis.get_json("c", local=True) is None
+        assert fake.calls == ["get"]
+
+    @pytest.mark.asyncio
+    async def test_failure_short_circuits_until_recheck(self, client):
+        redis, fake = client
+        fake.down = True
+
+        assert await redis.get("k") is None
+        assert not redis.available
+        assert await redis.get("k") is None
+        assert fake.calls == ["get"]  # Second call skipped without touching Redis
+
+        fake.down = False
+        redis._retry_at = 0
+        assert await redis.set("k", "v")
+        assert redis.get_stats()["healthy"]
+
+    @pytest.mark.asyncio
+    async def test_mget_is_one_round_trip(self, client):
+        redis, fake = client
+        fake.data.update({"a": "1", "c": "3"})
+
+        assert await redis.mget(["a", "b", "c"]) == ["1", None, "3"]
+        assert fake.calls == ["mget"]
+
+    @pytest.mark.asyncio
+    async def test_rebinding_to_a_new_loop_closes_old_pools(self):
+        redis = AsyncRedisClient()
+        old_loop = asyncio.new_event_loop()
+        old_client, old_raw = FakeAsyncRedis(), FakeAsyncRedis()
+        redis._loop, redis._client, redis._raw_client = old_loop, old_client, old_raw
+        old_loop.close()
+
+        redis._bind_loop()
+        await asyncio.wait(set(redis._closing))
+
+        assert redis._loop is asyncio.get_running_loop()
+        assert redis._client is None and redis._raw_client is None
+        assert old_client.calls == ["aclose"] and old_raw.calls == ["aclose"]
@@ -0,0 +1,108 @@
+"""
+Unit tests for local command intent matching in front of the LLM classifier.
+"""
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.services.kb.command_intent_matcher import CommandIntentMatcher, CommandMatchMetrics
+from app.services.kb.command_registry import MarkdownCommandRegistry
+from app.services.kb.kb_agent import KBIntelligentAgent
+
+COMMANDS = {
+    "go": ["go", "move", "walk", "travel"],
+    "look": ["look", "observe", "look around"],
+    "collect": ["collect", "take", "pick up", "grab"],
+    "inventory": ["inventory", "inv", "bag"],
+    "talk": ["talk", "speak", "chat"],
+}
+
+
+@pytest.fixture
+def matcher():
+    return CommandIntentMatcher(COMMANDS)
+
+
+class TestCommandIntentMatcher:
+
+    @pytest.mark.parametrize("message,command,stage", [
+        ("look", "look", "exact"),
+        ("  LOOK! ", "look", "exact"),
+        ("look around", "look", "exact"),
+        ("go north", "go", "token"),
+        ("please walk to the fountain", "go", "token"),
+        ("pick up the dream bottle", "collect", "token"),
+        ("I want to grab the bottle", "collect", "token"),
+        ("inven", "inventory", "prefix"),
+        ("colect bottle", "collect", "fuzzy"),
+    ])
+    def test_matches(self, matcher, message, command, stage):
+        matched, confidence, matched_stage = matcher.match(message)
+        assert matched == command
+        assert matched_stage == stage
+        assert confidence >= 0.8
+
+    @pytest.mark.parametrize("message", [
+        "what is in my pocket?",
+        "",
+        "please",
+        "ta",  # too short for a prefix
+    ])
+    def test_no_match(self, matcher, message):
+        assert matcher.match(message)[0] is None
+
+    def test_command_name_beats_other_commands_alias(self):
+        matcher = CommandIntentMatcher({"look": ["look", "examine"], "examine": ["examine"]})
+        assert matcher.match("examine")[0] == "examine"
+
+    def test_alias_shared_by_two_commands_is_ambiguous(self):
+        matcher = CommandIntentMatcher({"go": ["go", "head"], "collect": ["collect", "head"]})
+        assert matcher.match("head north")[0] is None
+
+    def test_metrics(self):
+        metrics = CommandMatchMetrics()
+        metrics.record_local("exact", 0.02)
+        metrics.record_local("token", 0.04)
+        metrics.record_llm(400.0)
+
+        stats = metrics.get_stats()
+        assert stats["local_hits"] == 2
+        assert stats["llm_fallbacks"] == 1
+        assert stats["hit_rate"] == pytest.approx(0.667)
+        assert stats["hits_by_stage"] == {"exact": 1, "token": 1}
+        assert stats["estimated_ms_saved"] == pytest.approx(2 * (400.0 - 0.03), abs=0.1)
+
+
+class TestDetectCommandType:
+
+    @pytest.fixture
+    def agent(self, tmp_path: Path):
+        game_logic = tmp_path / "experiences" / "exp" / "game-logic"
+        admin_logic = tmp_path / "experiences" / "exp" / "admin-logic"
+        game_logic.mkdir(parents=True)
+        admin_logic.mkdir(parents=True)
+        (game_logic / "go.md").write_text("---\ncommand: go\naliases: [move, walk]\n---\n# Go\n")
+        (game_logic / "look.md").write_text("---\ncommand: look\naliases: [observe]\n---\n# Look\n")
+        (admin_logic / "reset.md").write_text("---\ncommand: @reset\naliases: [reset]\n---\n# Reset\n")
+
+        agent = KBIntelligentAgent()
+        agent.command_registry = MarkdownCommandRegistry(tmp_path, check_interval_s=3600)
+        agent.llm_service = AsyncMock()
+        agent.llm_service.chat_completion.return_value = {"response": "look"}
+        return agent
+
+    @pytest.mark.asyncio
+    async def test_alias_match_skips_llm(self, agent):
+        assert await agent._detect_command_type("walk north", "exp") == ("go", False)
+        agent.llm_service.chat_completion.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_low_confidence_falls_back_to_llm(self, agent):
+        assert await agent._detect_command_type("what's over there by the trees?", "exp") == ("look", False)
+        agent.llm_service.chat_completion.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_admin_aliases_are_not_matched_without_prefix(self, agent):
+        await agent._detect_command_type("reset", "exp")
+        agent.llm_service.chat_completion.assert_awaited_once()
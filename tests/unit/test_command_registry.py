@@ -0,0 +1,83 @@
+"""
+Unit tests for the compiled markdown command registry.
+"""
+import os
+from pathlib import Path
+
+import pytest
+
+from app.services.kb.command_registry import MarkdownCommandRegistry, parse_command_frontmatter
+
+EXPERIENCE = "test-exp"
+
+
+def write_command(kb_root: Path, logic_dir: str, name: str, frontmatter: str, body: str = "Rules.") -> Path:
+    path = kb_root / "experiences" / EXPERIENCE / logic_dir / f"{name}.md"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"---\n{frontmatter}\n---\n\n# {name}\n\n{body}\n")
+    return path
+
+
+@pytest.fixture
+def kb_root(tmp_path: Path) -> Path:
+    write_command(tmp_path, "game-logic", "go", "command: go\naliases: [move, walk, travel]")
+    write_command(tmp_path, "game-logic", "look", "command: look\naliases: [examine]")
+    write_command(tmp_path, "admin-logic", "reset", "command: @reset\naliases: []")
+    return tmp_path
+
+
+class TestParseCommandFrontmatter:
+
+    def test_parses_name_aliases_and_admin_flag(self):
+        content = "---\ncommand: go\naliases: [move, walk]\nrequires_admin: true\n---\nbody"
+        assert parse_command_frontmatter(content, False) == ("go", ["move", "walk"], True)
+
+    def test_requires_command_field(self):
+        assert parse_command_frontmatter("---\naliases: [a]\n---\n", False) is None
+        assert parse_command_frontmatter("# No frontmatter", False) is None
+
+
+class TestMarkdownCommandRegistry:
+
+    def test_compiles_commands_once(self, kb_root):
+        registry = MarkdownCommandRegistry(kb_root, check_interval_s=3600)
+
+        commands = registry.get_commands(EXPERIENCE)
+        assert commands["go"].keywords == ["go", "move", "walk", "travel"]
+        assert commands["go"].requires_admin is False
+        assert commands["@reset"].requires_admin is True  # admin-logic default
+
+        assert "Rules." in registry.get_markdown(EXPERIENCE, "look")
+        assert registry.get_markdown(EXPERIENCE, "reset", is_admin_command=True) is not None
+        assert registry.get_markdown(EXPERIENCE, "reset") is None
+        assert registry.get_markdown(EXPERIENCE, "missing") is None
+
+        stats = registry.get_stats()
+        assert stats["compiles"] == 1
+        assert stats["lookups"] == 5
+
+    def test_recompiles_when_file_mtime_changes(self, kb_root):
+        registry = MarkdownCommandRegistry(kb_root, check_interval_s=0)
+        assert "fly" not in registry.get_commands(EXPERIENCE)["go"].aliases
+
+        path = write_command(kb_root, "game-logic", "go", "command: go\naliases: [fly]")
+        os.utime(path, ns=(1, 1))
+
+        assert registry.get_commands(EXPERIENCE)["go"].aliases == ["fly"]
+        assert registry.get_stats()["compiles"] == 2
+
+    def test_skips_mtime_check_within_interval(self, kb_root):
+        registry = MarkdownCommandRegistry(kb_root, check_interval_s=3600)
+        registry.get_commands(EXPERIENCE)
+
+        write_command(kb_root, "game-logic", "jump", "command: jump")
+        assert "jump" not in registry.get_commands(EXPERIENCE)
+
+        # KB write hook
+        assert registry.invalidate_path(f"experiences/{EXPERIENCE}/game-logic/jump.md")
+        assert "jump" in registry.get_commands(EXPERIENCE)
+
+    def test_invalidate_path_ignores_other_files(self, kb_root):
+        registry = MarkdownCommandRegistry(kb_root)
+        assert not registry.invalidate_path(f"experiences/{EXPERIENCE}/waypoints/wp.md")
+        assert registry.get_stats()["invalidations"] == 0
@@ -0,0 +1,155 @@
+"""
+Unit tests for the LLM command response cache.
+"""
+import copy
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.services.kb.command_registry import MarkdownCommandRegistry
+from app.services.kb.command_response_cache import CommandResponseCache
+from app.services.kb.kb_agent import KBIntelligentAgent
+
+PLAYER_VIEW = {
+    "player": {"current_location": "woander_store", "inventory": []},
+    "session": {"last_active": "2026-10-16T10:00:00Z", "turns_taken": 3},
+    "metadata": {"_version": 4},
+}
+WORLD = {
+    "locations": {
+        "woander_store": {"items": [{"instance_id": "bottle_1"}]},
+        "waypoint_28a": {"items": []},
+    },
+    "npcs": {"louisa": {"mood": "happy"}},
+    "metadata": {"_version": 10},
+}
+MARKDOWN = "# Look\n\nDescribe the area."
+OUTCOME = {"success": True, "narrative": "A cozy shop.", "state_updates": None, "metadata": {}}
+
+
+def key_for(player_view=PLAYER_VIEW, world=WORLD, message="look", markdown=MARKDOWN):
+    return CommandResponseCache.make_key("exp", "look", message, player_view, world, markdown)
+
+
+class TestCacheKey:
+
+    def test_ignores_volatile_fields_and_message_formatting(self):
+        view = copy.deepcopy(PLAYER_VIEW)
+        view["session"]["turns_taken"] = 99
+        view["metadata"]["_version"] = 50
+        world = copy.deepcopy(WORLD)
+        world["metadata"]["_version"] = 11
+        world["locations"]["waypoint_28a"]["items"].append({"instance_id": "elsewhere"})
+
+        assert key_for(view, world, message="  Look! ") == key_for()
+
+    def test_changes_with_relevant_state_and_markdown(self):
+        view = copy.deepcopy(PLAYER_VIEW)
+        view["player"]["inventory"].append("bottle_1")
+        world = copy.deepcopy(WORLD)
+        world["locations"]["woander_store"]["items"] = []
+        npcs = copy.deepcopy(WORLD)
+        npcs["npcs"]["louisa"]["mood"] = "sad"
+
+        keys = {
+            key_for(), key_for(player_view=view), key_for(world=world),
+            key_for(world=npcs), key_for(markdown=MARKDOWN + "!"), key_for(message="look up"),
+        }
+        assert len(keys) == 6
+
+
+class TestCommandResponseCache:
+
+    @pytest.mark.asyncio
+    async def test_lru_and_ttl(self):
+        cache = CommandResponseCache(max_entries=2, ttl_s=60, use_redis=False)
+        await cache.set("a", "exp", {"v": 1})
+        await cache.set("b", "exp", {"v": 2})
+        assert await cache.get("a") == {"v": 1}  # a is now most recent
+        await cache.set("c", "exp", {"v": 3})
+
+        assert await cache.get("b") is None
+        assert await cache.get("a") == {"v": 1}
+        assert cache.get_stats()["evictions"] == 1
+
+        expired = CommandResponseCache(ttl_s=0, use_redis=False)
+        await expired.set("a", "exp", {"v": 1})
+        assert await expired.get("a") is None
+
+    @pytest.mark.asyncio
+    async def test_returns_private_copies(self):
+        cache = CommandResponseCache(use_redis=False)
+        await cache.set("a", "exp", {"state_updates": {"items": []}})
+        (await cache.get("a"))["state_updates"]["items"].append("x")
+        assert await cache.get("a") == {"state_updates": {"items": []}}
+
+    @pytest.mark.asyncio
+    async def test_invalidate_by_experience(self):
+        cache = CommandResponseCache(use_redis=False)
+        await cache.set("a", "exp1", {})
+        await cache.set("b", "exp2", {})
+        assert cache.invalidate("exp1") == 1
+        assert await cache.get("a") is None
+        assert await cache.get("b") == {}
+
+
+class TestProcessLlmCommandCaching:
+
+    @pytest.fixture
+    def agent(self, tmp_path: Path):
+        game_logic = tmp_path / "experiences" / "exp" / "game-logic"
+        game_logic.mkdir(parents=True)
+        (game_logic / "look.md").write_text("---\ncommand: look\naliases: [observe]\n---\n" + MARKDOWN)
+
+        agent = KBIntelligentAgent()
+        agent.command_registry = MarkdownCommandRegistry(tmp_path, check_interval_s=3600)
+        agent.response_cache = CommandResponseCache(use_redis=False)
+        agent.state_manager = MagicMock()
+        agent.state_manager.get_player_view = AsyncMock(side_effect=lambda *_: copy.deepcopy(PLAYER_VIEW))
+        agent.state_manager.get_world_state = AsyncMock(side_effect=lambda *_: copy.deepcopy(WORLD))
+        agent.state_manager.load_config.return_value = {"state": {"model": "shared"}, "capabilities": {}}
+        agent._execute_markdown_command = AsyncMock(return_value=dict(OUTCOME))
+        return agent
+
+    @pytest.mark.asyncio
+    async def test_repeat_command_skips_model(self, agent):
+        first = await agent.process_llm_command("user_1", "exp", {"message": "look"})
+        second = await agent.process_llm_command("user_2", "exp", {"message": "look"})
+
+        assert first.message_to_player == second.message_to_player == "A cozy shop."
+        agent._execute_markdown_command.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_experience_opt_out(self, agent):
+        agent.state_manager.load_config.return_value = {
+            "state": {"model": "shared"}, "capabilities": {"llm_response_cache": False}
+        }
+        await agent.process_llm_command("user_1", "exp", {"message": "look"})
+        await agent.process_llm_command("user_1", "exp", {"message": "look"})
+
+        assert agent._execute_markdown_command.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_state_changing_outcomes_are_not_cached(self, agent):
+        agent._apply_state_updates = AsyncMock()
+        agent._execute_markdown_command.return_value = {
+            **OUTCOME,
+            "narrative": "You walk to the waypoint.",
+            "state_updates": {"player": {"current_location": "waypoint_28a"}},
+        }
+        await agent.process_llm_command("user_1", "exp", {"message": "look"})
+        await agent.process_llm_command("user_2", "exp", {"message": "look"})
+
+        assert agent._execute_markdown_command.await_count == 2
+        assert agent.response_cache.get_stats()["stores"] == 0
+
+    @pytest.mark.asyncio
+    async def test_error_outcomes_are_not_cached(self, agent):
+        agent._execute_markdown_command.return_value = {
+            "success": False, "narrative": "A system error occurred", "metadata": {"error": "boom"}
+        }
+        await agent.process_llm_command("user_1", "exp", {"message": "look"})
+        await agent.process_llm_command("user_1", "exp", {"message": "look"})
+
+        assert agent._execute_markdown_command.await_count == 2
@@ -0,0 +1,98 @@
+"""
+Unit tests for ConversationHistoryCache (token-budgeted conversation tails).
+"""
+import pytest
+
+from app.services.chat.conversation_history_cache import ConversationHistoryCache, estimate_tokens
+
+
+def make_messages(count, content="x" * 40):
+    return [
+        {"role": "user" if i % 2 == 0 else "assistant", "content": f"{i}:{content}", "created_at": str(i)}
+        for i in range(count)
+    ]
+
+
+class FakeLoader:
+
+    def __init__(self, messages):
+        self.messages = messages
+        self.calls = []
+
+    def __call__(self, conversation_id, limit):
+        self.calls.append((conversation_id, limit))
+        return self.messages[-limit:], len(self.messages)
+
+
+class TestConversationHistoryCache:
+
+    @pytest.mark.asyncio
+    async def test_loads_bounded_tail_once(self):
+        loader = FakeLoader(make_messages(500))
+        cache = ConversationHistoryCache(loader, token_budget=10_000, max_load=20)
+
+        first = await cache.get_history("conv")
+        second = await cache.get_history("conv")
+
+        assert loader.calls == [("conv", 20)]
+        assert len(first["messages"]) == 20
+        assert first["messages"][-1]["content"].startswith("499:")
+        assert first["total_count"] == 500
+        assert "480 earlier messages" in first["summary"]
+        assert second == first
+        assert cache.stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_window_respects_token_budget_and_starts_with_user(self):
+        messages = make_messages(30)
+        budget = estimate_tokens(messages[0]["content"]) * 5
+        cache = ConversationHistoryCache(FakeLoader(messages), token_budget=budget, max_load=30)
+
+        history = await cache.get_history("conv")
+
+        assert len(history["messages"]) <= 5
+        assert history["messages"][0]["role"] == "user"
+        assert sum(estimate_tokens(m["content"]) for m in history["messages"]) <= budget
+        assert "- User:" in history["summary"] or "- Assistant:" in history["summary"]
+
+    @pytest.mark.asyncio
+    async def test_append_writes_through_without_reloading(self):
+        loader = FakeLoader(make_messages(4))
+        cache = ConversationHistoryCache(loader, token_budget=10_000, max_load=20)
+        await cache.get_history("conv")
+
+        cache.append("conv", {"role": "user", "content": "new turn", "created_at": "5"})
+        history = await cache.get_history("conv")
+
+        assert len(loader.calls) == 1
+        assert history["messages"][-1]["content"] == "new turn"
+        assert history["total_count"] == 5
+        assert history["summary"] is None
+
+    @pytest.mark.asyncio
+    async def test_append_during_load_is_not_lost(self):
+        cache = None
+
+        def racing_loader(conversation_id, limit):
+            # A message is persisted while the window is being read
+            cache.append(conversation_id, {"role": "user", "content": "raced", "created_at": "9"})
+            return make_messages(2), 2
+
+        cache = ConversationHistoryCache(racing_loader, token_budget=10_000, max_load=20)
+        await cache.get_history("conv")
+
+        # The stale window was not cached, so the next call reloads
+        assert cache.stats()["conversations"] == 0
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction_and_invalidate(self):
+        loader = FakeLoader(make_messages(2))
+        cache = ConversationHistoryCache(loader, max_conversations=2)
+        for conversation_id in ("a", "b", "c"):
+            await cache.get_history(conversation_id)
+        assert cache.stats()["conversations"] == 2
+        assert cache.stats()["evictions"] == 1
+
+        cache.invalidate("c")
+        await cache.get_history("c")
+        assert loader.calls[-1] == ("c", cache.max_load)
@@ -0,0 +1,153 @@
+"""
+Unit tests for the batched ConversationPersistencePipeline.
+"""
+import asyncio
+import threading
+import uuid
+
+import pytest
+
+from app.services.chat.conversation_persistence import ConversationPersistencePipeline
+
+
+class FakeStore:
+
+    def __init__(self, known=()):
+        self.known = set(known)
+        self.batches = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def add_messages_batch(self, items):
+        self.release.wait()
+        self.batches.append(items)
+        return [
+            {"id": str(uuid.uuid4()), **item} if item["conversation_id"] in self.known else None
+            for item in items
+        ]
+
+
+def turn(text):
+    return [{"role": "user", "content": text}, {"role": "assistant", "content": f"re: {text}"}]
+
+
+class TestConversationPersistencePipeline:
+
+    @pytest.mark.asyncio
+    async def test_turns_are_coalesced_into_one_transaction(self):
+        conversations = [str(uuid.uuid4()) for _ in range(5)]
+        store = FakeStore(known=conversations)
+        pipeline = ConversationPersistencePipeline(store, flush_interval_s=0.05)
+
+        results = await asyncio.gather(*(
+            pipeline.save_turn(conversation_id, turn(str(i))) for i, conversation_id in enumerate(conversations)
+        ))
+
+        assert len(store.batches) == 1
+        assert len(store.batches[0]) == 10
+        for conversation_id, saved in zip(conversations, results):
+            assert [m["role"] for m in saved] == ["user", "assistant"]
+            assert all(m["conversation_id"] == conversation_id for m in saved)
+        await pipeline.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_batch_size_is_capped(self):
+        conversation_id = str(uuid.uuid4())
+        store = FakeStore(known=[conversation_id])
+        pipeline = ConversationPersistencePipeline(store, flush_interval_s=0.05, max_batch_messages=4)
+
+        await asyncio.gather(*(pipeline.save_turn(conversation_id, turn(str(i))) for i in range(4)))
+
+        assert [len(batch) for batch in store.batches] == [4, 4]
+        await pipeline.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_unknown_conversation_returns_none(self):
+        pipeline = ConversationPersistencePipeline(FakeStore(), flush_interval_s=0)
+
+        saved = await pipeline.save_turn(str(uuid.uuid4()), turn("hi"))
+
+        assert saved == [None, None]
+        await pipeline.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_invalid_conversation_id_is_rejected(self):
+        pipeline = ConversationPersistencePipeline(FakeStore(), flush_interval_s=0)
+
+        with pytest.raises(ValueError):
+            await pipeline.save_turn("user_fallback_123", turn("hi"))
+
+    @pytest.mark.asyncio
+    async def test_full_queue_applies_backpressure(self):
+        conversation_id = str(uuid.uuid4())
+        store = FakeStore(known=[conversation_id])
+        store.release.clear()  # Simulate a stalled database
+        pipeline = ConversationPersistencePipeline(store, flush_interval_s=0, max_batch_messages=2, queue_size=1)
+
+        tasks = [asyncio.create_task(pipeline.save_turn(conversation_id, turn(str(i)))) for i in range(4)]
+        await asyncio.sleep(0.05)
+
+        # One turn is being written, one is queued, the rest wait to enqueue
+        assert pipeline.stats()["queued_turns"] == 1
+        assert not any(task.done() for task in tasks)
+
+        store.release.set()
+        await asyncio.gather(*tasks)
+        assert sum(len(batch) for batch in store.batches) == 8
+        await pipeline.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_store_failure_is_raised_to_callers(self):
+        class FailingStore:
+            def add_messages_batch(self, items):
+                raise RuntimeError("db down")
+
+        pipeline = ConversationPersistencePipeline(FailingStore(), flush_interval_s=0)
+
+        with pytest.raises(RuntimeError, match="db down"):
+            await pipeline.save_turn(str(uuid.uuid4()), turn("hi"))
+        assert pipeline.stats()["failed_flushes"] == 1
+        await pipeline.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_writes_through_when_flusher_cannot_start(self, monkeypatch):
+        conversation_id = str(uuid.uuid4())
+        store = FakeStore(known=[conversation_id])
+        pipeline = ConversationPersistencePipeline(store, flush_interval_s=0.05)
+        monkeypatch.setattr(asyncio, "create_task", lambda coro: coro)
+
+        saved = await asyncio.wait_for(pipeline.save_turn(conversation_id, turn("hi")), 1)
+
+        assert [m["role"] for m in saved] == ["user", "assistant"]
+        assert pipeline.stats()["direct_writes"] == 1
+
+    @pytest.mark.asyncio
+    async def test_restarted_flusher_keeps_queued_turns(self):
+        conversation_id = str(uuid.uuid4())
+        store = FakeStore(known=[conversation_id])
+        pipeline = ConversationPersistencePipeline(store, flush_interval_s=0)
+        await pipeline.save_turn(conversation_id, turn("first"))
+
+        # Flusher dies with a turn still queued
+        pipeline._worker.cancel()
+        await asyncio.sleep(0)
+        stranded = asyncio.get_running_loop().create_future()
+        pipeline._queue.put_nowait(([{**turn("stranded")[0], "conversation_id": conversation_id}], stranded))
+
+        await pipeline.save_turn(conversation_id, turn("second"))
+
+        assert (await stranded)[0]["content"] == "stranded"
+        await pipeline.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_save_times_out_when_not_committed(self):
+        conversation_id = str(uuid.uuid4())
+        store = FakeStore(known=[conversation_id])
+        store.release.clear()
+        pipeline = ConversationPersistencePipeline(store, flush_interval_s=0, save_timeout_s=0.05)
+
+        with pytest.raises(asyncio.TimeoutError):
+            await pipeline.save_turn(conversation_id, turn("hi"))
+
+        store.release.set()
+        await pipeline.shutdown()
@@ -0,0 +1,170 @@
+"""
+Unit tests for the gateway CacheMiddleware (raw-bytes entries, ETags,
+coalescing, stale-while-revalidate, principal vary rules).
+"""
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.gateway import cache_middleware
+from app.gateway.cache_middleware import CacheMiddleware
+
+
+class FakeRedis:
+
+    def __init__(self):
+        self.hashes = {}
+
+    async def hgetall_bytes(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    async def hset_bytes(self, key, mapping, ex=None):
+        self.hashes[key] = {k.encode(): v for k, v in mapping.items()}
+        return True
+
+
+class Upstream:
+
+    def __init__(self, body=b'{"ok": true}', status=200, delay=0.0):
+        self.body = body
+        self.status = status
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self, scope, receive, send):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        await send({"type": "http.response.start", "status": self.status,
+                    "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(self.body)).encode())]})
+        # Two chunks to exercise streaming
+        await send({"type": "http.response.body", "body": self.body[:3], "more_body": True})
+        await send({"type": "http.response.body", "body": self.body[3:]})
+
+
+async def request(app, path="/api/v1/chat/personas", headers=()):
+    scope = {"type": "http", "method": "GET", "path": path, "query_string": b"", "headers": list(headers)}
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, receive, send)
+    start = messages[0]
+    body = b"".join(m.get("body", b"") for m in messages[1:])
+    return start["status"], dict(start["headers"]), body
+
+
+@pytest.fixture
+def redis():
+    fake = FakeRedis()
+
+    async def verify(token):
+        return {"sub": token}
+
+    with patch.object(cache_middleware, "async_redis_client", fake), \
+         patch.object(cache_middleware, "verify_supabase_token", verify):
+        yield fake
+
+
+def bearer(user):
+    return (b"authorization", f"Bearer {user}".encode())
+
+
+class TestCacheMiddleware:
+
+    @pytest.mark.asyncio
+    async def test_miss_then_hit_with_raw_body(self, redis):
+        upstream = Upstream()
+        app = CacheMiddleware(upstream)
+
+        status, headers, body = await request(app, headers=[bearer("alice")])
+        assert (status, headers[b"x-cache"], body) == (200, b"MISS", upstream.body)
+        miss_etag = headers[b"etag"]
+
+        status, headers, body = await request(app, headers=[bearer("alice")])
+        assert (status, headers[b"x-cache"], body) == (200, b"HIT", upstream.body)
+        assert headers[b"etag"] == miss_etag
+        assert headers[b"content-length"] == str(len(upstream.body)).encode()
+        assert upstream.calls == 1
+
+        stored = next(iter(redis.hashes.values()))
+        assert stored[b"body"] == upstream.body
+
+    @pytest.mark.asyncio
+    async def test_entries_vary_by_principal(self, redis):
+        upstream = Upstream()
+        app = CacheMiddleware(upstream)
+
+        await request(app, headers=[bearer("alice")])
+        await request(app, headers=[bearer("bob")])
+
+        assert upstream.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_if_none_match_returns_304(self, redis):
+        app = CacheMiddleware(Upstream())
+        await request(app, headers=[bearer("alice")])
+        _, headers, _ = await request(app, headers=[bearer("alice")])
+
+        status, _, body = await request(app, headers=[bearer("alice"), (b"if-none-match", headers[b"etag"])])
+
+        assert status == 304
+        assert body == b""
+
+    @pytest.mark.asyncio
+    async def test_first_response_can_be_revalidated(self, redis):
+        upstream = Upstream()
+        app = CacheMiddleware(upstream)
+        _, headers, _ = await request(app, headers=[bearer("alice")])
+
+        redis.hashes.clear()  # Force another miss
+        status, headers, body = await request(app, headers=[bearer("alice"), (b"if-none-match", headers[b"etag"])])
+
+        assert (status, headers[b"x-cache"], body) == (304, b"MISS", b"")
+        assert upstream.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_upstream_call(self, redis):
+        upstream = Upstream(delay=0.05)
+        app = CacheMiddleware(upstream)
+
+        results = await asyncio.gather(*(request(app, headers=[bearer("alice")]) for _ in range(5)))
+
+        assert upstream.calls == 1
+        assert all(body == upstream.body for _, _, body in results)
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_is_served_and_refreshed(self, redis):
+        upstream = Upstream()
+        app = CacheMiddleware(upstream)
+        await request(app, path="/health")
+
+        # Age the entry past its 10s TTL but inside the stale window
+        key, stored = next(iter(redis.hashes.items()))
+        meta = cache_middleware.json.loads(stored[b"meta"])
+        meta["stored_at"] = time.time() - 15
+        stored[b"meta"] = cache_middleware.json.dumps(meta).encode()
+
+        _, headers, body = await request(app, path="/health")
+        await asyncio.sleep(0.01)
+
+        assert headers[b"x-cache"] == b"STALE"
+        assert body == upstream.body
+        assert upstream.calls == 2  # Background refresh
+        assert cache_middleware.json.loads(redis.hashes[key][b"meta"])["stored_at"] > meta["stored_at"]
+
+    @pytest.mark.asyncio
+    async def test_errors_are_not_cached(self, redis):
+        upstream = Upstream(status=500)
+        app = CacheMiddleware(upstream)
+
+        await request(app, headers=[bearer("alice")])
+        await request(app, headers=[bearer("alice")])
+
+        assert upstream.calls == 2
+        assert redis.hashes == {}
@@ -0,0 +1,188 @@
+"""
+Unit tests for the gateway UpstreamPool (circuit breakers, latency
+histograms, per-service clients) and the overhead middleware.
+"""
+import asyncio
+
+import httpx
+import pytest
+
+from app.gateway.overhead_middleware import GatewayOverheadMiddleware
+from app.gateway.upstream_pool import (
+    BREAKER_CLOSED,
+    BREAKER_HALF_OPEN,
+    BREAKER_OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+    LatencyHistogram,
+    UpstreamPool,
+)
+
+
+def make_pool(handler, **kwargs):
+    pool = UpstreamPool(**kwargs)
+    pool._clients["chat"] = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return pool
+
+
+class TestLatencyHistogram:
+
+    def test_percentiles_use_bucket_bounds(self):
+        histogram = LatencyHistogram(buckets_ms=(1, 10, 100))
+        for ms in (0.5, 0.7, 5, 50):
+            histogram.observe(ms / 1000)
+
+        assert histogram.percentile(0.5) == 1
+        assert histogram.percentile(0.75) == 10
+        assert histogram.percentile(1.0) == 100
+        assert histogram.get_stats()["buckets"] == {"le_1": 2, "le_10": 1, "le_100": 1, "inf": 0}
+
+    def test_overflow_reports_max(self):
+        histogram = LatencyHistogram(buckets_ms=(1,))
+        histogram.observe(0.25)
+
+        assert histogram.percentile(0.99) == 250
+
+
+class TestCircuitBreaker:
+
+    def test_opens_after_consecutive_failures(self):
+        breaker = CircuitBreaker("chat", failure_threshold=2, reset_timeout_s=60)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == BREAKER_CLOSED
+
+        breaker.record_failure()
+        assert breaker.state == BREAKER_OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.before_request()
+
+    def test_half_open_admits_a_single_probe(self):
+        breaker = CircuitBreaker("chat", failure_threshold=1, reset_timeout_s=0)
+        breaker.record_failure()
+
+        breaker.before_request()
+        assert breaker.state == BREAKER_HALF_OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.before_request()
+
+        breaker.record_success()
+        assert breaker.state == BREAKER_CLOSED
+        breaker.before_request()
+
+    def test_failed_probe_reopens(self):
+        breaker = CircuitBreaker("chat", failure_threshold=3, reset_timeout_s=0)
+        for _ in range(3):
+            breaker.record_failure()
+        breaker.before_request()
+
+        breaker.record_failure()
+
+        assert breaker.state == BREAKER_OPEN
+        assert breaker.get_stats()["opened"] == 2
+
+
+class TestUpstreamPool:
+
+    @pytest.mark.asyncio
+    async def test_request_records_latency_and_success(self):
+        pool = make_pool(lambda request: httpx.Response(200, json={"ok": True}))
+
+        response = await pool.request("chat", "GET", "http://chat/health")
+
+        assert response.content == b'{"ok":true}'
+        stats = pool.get_stats()["services"]["chat"]
+        assert stats["upstream_latency"]["count"] == 1
+        assert stats["circuit"]["successes"] == 1
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_server_errors_trip_the_breaker(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(503)
+
+        pool = make_pool(handler, failure_threshold=2, reset_timeout_s=60)
+        for _ in range(2):
+            assert (await pool.request("chat", "GET", "http://chat/x")).status_code == 503
+
+        with pytest.raises(CircuitOpenError):
+            await pool.request("chat", "GET", "http://chat/x")
+        assert len(calls) == 2
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_client_errors_do_not_trip_the_breaker(self):
+        pool = make_pool(lambda request: httpx.Response(404), failure_threshold=1)
+
+        for _ in range(3):
+            await pool.request("chat", "GET", "http://chat/missing")
+
+        assert pool.breaker("chat").state == BREAKER_CLOSED
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_connection_errors_count_as_failures(self):
+        def handler(request):
+            raise httpx.ConnectError("refused", request=request)
+
+        pool = make_pool(handler, failure_threshold=1, reset_timeout_s=60)
+
+        with pytest.raises(httpx.ConnectError):
+            await pool.request("chat", "GET", "http://chat/x")
+        assert pool.breaker("chat").state == BREAKER_OPEN
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_clients_are_per_service(self):
+        pool = UpstreamPool(max_connections=7, max_keepalive_connections=3)
+
+        assert pool.client("chat") is pool.client("chat")
+        assert pool.client("chat") is not pool.client("kb")
+        await pool.close()
+        assert not pool._clients
+
+
+class TestGatewayOverheadMiddleware:
+
+    @pytest.mark.asyncio
+    async def test_overhead_is_whole_request_minus_upstream(self):
+        async def slow_upstream(request):
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, json={"ok": True})
+
+        pool = make_pool(slow_upstream)
+
+        async def endpoint(scope, receive, send):
+            await asyncio.sleep(0.02)  # Gateway work outside the proxy call
+            response = await pool.request("chat", "GET", "http://chat/x")
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": response.content})
+
+        transport = httpx.ASGITransport(app=GatewayOverheadMiddleware(endpoint))
+        async with httpx.AsyncClient(transport=transport, base_url="http://gateway") as client:
+            assert (await client.get("/x")).status_code == 200
+
+        stats = pool.get_stats()["services"]["chat"]
+        assert stats["gateway_overhead"]["count"] == 1
+        assert 20 <= stats["gateway_overhead"]["max_ms"] < 45
+        assert stats["upstream_latency"]["max_ms"] >= 50
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_requests_without_upstream_call_are_not_recorded(self):
+        pool = make_pool(lambda request: httpx.Response(200))
+
+        async def endpoint(scope, receive, send):
+            await send({"type": "http.response.start", "status": 204, "headers": []})
+            await send({"type": "http.response.body", "body": b""})
+
+        transport = httpx.ASGITransport(app=GatewayOverheadMiddleware(endpoint))
+        async with httpx.AsyncClient(transport=transport, base_url="http://gateway") as client:
+            await client.get("/health")
+
+        assert pool.get_stats()["services"] == {}
+        await pool.close()
@@ -0,0 +1,95 @@
+"""
+Unit tests for the in-process JWT verification cache.
+"""
+import time
+from unittest.mock import AsyncMock, patch
+
+import jwt
+import pytest
+
+from app.shared import jwt_verification_cache as verification
+from app.shared.jwt_verification_cache import JWTClaimsCache, SupabaseSigningKeys
+
+SECRET = "test-secret"
+
+
+def make_token(exp_in=3600, secret=SECRET, sub="user-1"):
+    return jwt.encode(
+        {"sub": sub, "aud": "authenticated", "exp": int(time.time()) + exp_in},
+        secret,
+        algorithm="HS256"
+    )
+
+
+@pytest.fixture
+def verifier():
+    keys = SupabaseSigningKeys()
+    keys._secret = SECRET
+    cache = JWTClaimsCache(max_entries=2)
+    redis = AsyncMock()
+    redis.get_json.return_value = None
+    with patch.object(verification, "supabase_signing_keys", keys), \
+         patch.object(verification, "jwt_claims_cache", cache), \
+         patch.object(verification, "async_redis_client", redis):
+        yield cache, redis
+
+
+class TestJWTVerificationCache:
+
+    @pytest.mark.asyncio
+    async def test_second_lookup_is_served_in_process(self, verifier):
+        cache, redis = verifier
+        token = make_token()
+
+        first = await verification.verify_supabase_token(token)
+        second = await verification.verify_supabase_token(token)
+
+        assert first["sub"] == second["sub"] == "user-1"
+        assert redis.get_json.await_count == 1
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["verifications"] == 1
+
+    @pytest.mark.asyncio
+    async def test_redis_copy_is_used_as_l2(self, verifier):
+        cache, redis = verifier
+        redis.get_json.return_value = {"sub": "user-2", "exp": time.time() + 60}
+
+        claims = await verification.verify_supabase_token(make_token(sub="user-2"))
+
+        assert claims["sub"] == "user-2"
+        assert cache.get_stats()["l2_hits"] == 1
+        assert cache.get_stats()["verifications"] == 0
+
+    @pytest.mark.asyncio
+    async def test_invalid_token_is_rejected_and_not_cached(self, verifier):
+        cache, _ = verifier
+
+        with pytest.raises(jwt.PyJWTError):
+            await verification.verify_supabase_token(make_token(secret="wrong"))
+        assert cache.get_stats()["entries"] == 0
+        assert cache.get_stats()["failures"] == 1
+
+    def test_entries_expire_at_token_exp(self):
+        cache = JWTClaimsCache()
+        cache.set("live", {"exp": time.time() + 60})
+        cache.set("expired", {"exp": time.time() - 1})
+
+        assert cache.get("live") is not None
+        assert cache.get("expired") is None
+
+    def test_lru_is_bounded(self):
+        cache = JWTClaimsCache(max_entries=2)
+        for token_hash in ("a", "b", "c"):
+            cache.set(token_hash, {"exp": time.time() + 60})
+
+        assert cache.get("a") is None
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_missing_secret_raises_value_error(self):
+        keys = SupabaseSigningKeys()
+        keys._secret = ""
+
+        with pytest.raises(ValueError):
+            keys.verify(make_token())
@@ -0,0 +1,68 @@
+"""
+Unit tests for compiled KB permissions (KBPathTrie / KBAccessSet) in rbac_simple.
+"""
+import uuid
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.shared.rbac_simple import KBAccessSet, KBPathTrie, SimpleRBACManager
+
+
+class TestKBPathTrie:
+
+    def test_covers_paths_at_or_below_roots(self):
+        trie = KBPathTrie(["users/alice", "shared", "teams/t1"])
+
+        assert trie.covers("users/alice")
+        assert trie.covers("users/alice/notes/today.md")
+        assert trie.covers("shared/readme.md")
+        assert not trie.covers("users/bob/notes.md")
+        assert not trie.covers("teams/t2/doc.md")
+
+    def test_matches_whole_segments_only(self):
+        trie = KBPathTrie(["users/alice"])
+
+        assert not trie.covers("users/alice2/notes.md")
+
+    def test_kb_prefix_forms_are_equivalent(self):
+        trie = KBPathTrie(["/kb/users/alice"])
+
+        assert trie.covers("users/alice/a.md")
+        assert trie.covers("kb/users/alice/a.md")
+        assert trie.covers("/kb/users/alice/a.md")
+
+
+class TestKBAccessSet:
+
+    def test_restricted_set_only_allows_roots(self):
+        access_set = KBAccessSet(["users/alice", "shared"])
+
+        assert access_set.allows("shared/x.md")
+        assert not access_set.allows("teams/t1/x.md")
+
+    def test_unrestricted_set_still_reports_roots(self):
+        access_set = KBAccessSet(["users/alice"], unrestricted=True)
+
+        assert access_set.allows("teams/t1/x.md")
+        assert not access_set.within_roots("teams/t1/x.md")
+
+
+class TestCompiledAccessSetCache:
+
+    @pytest.mark.asyncio
+    async def test_access_set_is_built_once_until_invalidated(self):
+        manager = SimpleRBACManager()
+        user_id = str(uuid.uuid4())
+        loader = AsyncMock(return_value=[f"users/{user_id}", "shared", "teams/t1"])
+
+        with patch.object(manager, "_load_accessible_kb_paths", loader):
+            first = await manager.get_kb_access_set(user_id)
+            second = await manager.get_kb_access_set(user_id)
+            paths = await manager.get_accessible_kb_paths(user_id)
+            await manager._invalidate_user_cache(user_id)
+            await manager.get_kb_access_set(user_id)
+
+        assert first is second
+        assert paths == [f"users/{user_id}", "shared", "teams/t1"]
+        assert loader.await_count == 2
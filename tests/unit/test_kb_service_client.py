@@ -0,0 +1,124 @@
+"""
+Unit tests for the shared KBServiceClient used by KBToolExecutor.
+"""
+import asyncio
+
+import httpx
+import pytest
+
+from app.services.chat.kb_service_client import KBServiceClient
+
+
+class Handler:
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.requests = []
+
+    def __call__(self, request):
+        self.requests.append(request)
+        outcome = self.outcomes.pop(0) if len(self.outcomes) > 1 else self.outcomes[0]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return httpx.Response(outcome, json={"status": "success"})
+
+
+def make_client(handler, **kwargs):
+    kb = KBServiceClient("http://kb", retry_base_delay_s=0, **kwargs)
+    kb._client = httpx.AsyncClient(base_url=kb.base_url, transport=httpx.MockTransport(handler))
+    # Bind to the running loop so the property reuses it
+    kb._client_loop = asyncio.get_running_loop()
+    return kb
+
+
+class TestKBServiceClient:
+
+    @pytest.mark.asyncio
+    async def test_client_is_reused_across_calls(self):
+        handler = Handler(200)
+        kb = make_client(handler)
+        client = kb.client
+
+        for _ in range(3):
+            response = await kb.request("check_quest_state", "POST", "/experience/x/quest/state", json={})
+            assert response.status_code == 200
+
+        assert kb.client is client
+        assert len(handler.requests) == 3
+        stats = kb.get_stats()["tools"]["check_quest_state"]
+        assert stats["calls"] == 3
+        assert stats["latency"]["count"] == 3
+        await kb.close()
+
+    @pytest.mark.asyncio
+    async def test_client_replaced_on_loop_change_is_closed(self):
+        kb = make_client(Handler(200))
+        old_client = kb._client
+        old_loop = asyncio.new_event_loop()
+        old_loop.close()
+        kb._client_loop = old_loop
+
+        client = kb.client
+        await asyncio.wait(set(kb._closing))
+
+        assert client is not old_client
+        assert old_client.is_closed and not client.is_closed
+        await kb.close()
+
+    @pytest.mark.asyncio
+    async def test_per_tool_timeouts(self):
+        handler = Handler(200)
+        kb = make_client(handler, default_timeout_s=30.0)
+
+        await kb.request("get_player_inventory", "GET", "/experience/x/player/inventory")
+        await kb.request("search_knowledge_base", "POST", "/search", json={})
+
+        assert handler.requests[0].extensions["timeout"]["read"] == 10.0
+        assert handler.requests[1].extensions["timeout"]["read"] == 30.0
+        await kb.close()
+
+    @pytest.mark.asyncio
+    async def test_idempotent_tool_retries_unavailable(self):
+        handler = Handler(503, 503, 200)
+        kb = make_client(handler, max_retries=2)
+
+        response = await kb.request("search_knowledge_base", "POST", "/search", json={})
+
+        assert response.status_code == 200
+        assert len(handler.requests) == 3
+        assert kb.get_stats()["tools"]["search_knowledge_base"]["retries"] == 2
+        await kb.close()
+
+    @pytest.mark.asyncio
+    async def test_state_changing_tool_is_not_resent(self):
+        handler = Handler(503, 200)
+        kb = make_client(handler, max_retries=2)
+
+        response = await kb.request("grant_quest_reward", "POST", "/experience/x/quest/reward", json={})
+
+        assert response.status_code == 503
+        assert len(handler.requests) == 1
+        await kb.close()
+
+    @pytest.mark.asyncio
+    async def test_connect_errors_are_retried_for_every_tool(self):
+        handler = Handler(httpx.ConnectError("refused"), 200)
+        kb = make_client(handler, max_retries=1)
+
+        response = await kb.request("grant_quest_reward", "POST", "/experience/x/quest/reward", json={})
+
+        assert response.status_code == 200
+        assert len(handler.requests) == 2
+        await kb.close()
+
+    @pytest.mark.asyncio
+    async def test_exhausted_retries_raise_and_count_errors(self):
+        handler = Handler(httpx.ConnectError("refused"))
+        kb = make_client(handler, max_retries=1)
+
+        with pytest.raises(httpx.ConnectError):
+            await kb.request("read_kb_file", "POST", "/read", json={})
+
+        assert len(handler.requests) == 2
+        assert kb.get_stats()["tools"]["read_kb_file"]["errors"] == 1
+        await kb.close()
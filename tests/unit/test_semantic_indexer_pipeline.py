@@ -0,0 +1,147 @@
+"""
+Unit tests for the batched pgvector indexing pipeline in SemanticIndexer.
+"""
+import os
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from app.services.kb import kb_semantic_search
+from app.services.kb.kb_semantic_search import SemanticIndexer
+
+PARAGRAPH = "This paragraph is long enough to be kept as a chunk by the indexer. "
+
+
+class FakeModel:
+
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts, batch_size=32, convert_to_numpy=True):
+        self.calls.append(list(texts))
+        return np.ones((len(texts), 4), dtype=np.float32)
+
+
+class FakeConnection:
+
+    def __init__(self, metadata_rows):
+        self.metadata_rows = metadata_rows
+        self.executed = []
+        self.copied = []
+        self.executemany_calls = []
+
+    async def fetch(self, query, *args):
+        return self.metadata_rows
+
+    async def execute(self, query, *args):
+        self.executed.append((query, args))
+
+    async def executemany(self, query, args, timeout=None):
+        self.executemany_calls.append((query, list(args)))
+
+    async def copy_records_to_table(self, table, records, columns, timeout=None):
+        self.copied.extend(records)
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield
+
+
+class FakeDatabase:
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.acquires = 0
+
+    @asynccontextmanager
+    async def acquire(self):
+        self.acquires += 1
+        yield self.conn
+
+
+@pytest.fixture
+def kb(tmp_path: Path) -> Path:
+    for i in range(5):
+        (tmp_path / f"doc{i}.md").write_text(f"{PARAGRAPH}{i}\n\n{PARAGRAPH}{i}b\n\nshort")
+    return tmp_path
+
+
+@pytest.fixture
+def indexer(monkeypatch):
+    monkeypatch.setattr(kb_semantic_search, "PGVECTOR_ASYNCPG_AVAILABLE", True)
+
+    async def register_vector(conn):
+        conn.registered = True
+    monkeypatch.setattr(kb_semantic_search, "register_vector", register_vector, raising=False)
+
+    indexer = SemanticIndexer()
+    indexer.EMBED_BATCH_CHUNKS = 4
+    indexer._embedding_model = FakeModel()
+    indexer._get_embedding_model = lambda: indexer._embedding_model
+    return indexer
+
+
+def use_db(indexer, metadata_rows=()):
+    conn = FakeConnection(list(metadata_rows))
+    indexer.db = FakeDatabase(conn)
+    return conn
+
+
+class TestPgvectorIndexPipeline:
+
+    @pytest.mark.asyncio
+    async def test_batches_embeddings_and_bulk_writes(self, indexer, kb):
+        conn = use_db(indexer)
+        await indexer._run_pgvector_index(kb, "root")
+
+        # 10 chunks across 5 files, encoded in batches of >= 4 chunks rather than per file
+        assert sum(len(call) for call in indexer._embedding_model.calls) == 10
+        assert len(indexer._embedding_model.calls) < 5
+
+        assert len(conn.copied) == 10
+        assert {record[2] for record in conn.copied} == {
+            f"root:doc{i}.md:{j}" for i in range(5) for j in range(2)
+        }
+        metadata = [row for query, rows in conn.executemany_calls for row in rows]
+        assert sorted(row[0] for row in metadata) == [f"doc{i}.md" for i in range(5)]
+
+        # One connection for the metadata read, one long-lived writer connection
+        assert indexer.db.acquires == 2
+        assert conn.registered
+
+        status = indexer._progress_info(kb)
+        assert status["current_status"] == "completed"
+        assert status["files_written"] == 5
+        assert status["chunks_written"] == 10
+
+    @pytest.mark.asyncio
+    async def test_unchanged_content_is_not_re_embedded(self, indexer, kb):
+        prepared = SemanticIndexer._prepare_file(kb / "doc0.md", "doc0.md")
+        conn = use_db(indexer, [
+            {"relative_path": "doc0.md", "mtime": 0.0, "content_hash": prepared["content_hash"]},
+            {"relative_path": "doc1.md", "mtime": os.stat(kb / "doc1.md").st_mtime, "content_hash": None},
+        ])
+        await indexer._run_pgvector_index(kb, "root")
+
+        embedded = [text for call in indexer._embedding_model.calls for text in call]
+        assert len(embedded) == 6  # doc2-doc4 only
+        progress = indexer.indexing_progress
+        assert progress["files_to_index"] == 4  # doc1 skipped by mtime
+        assert progress["files_unchanged"] == 1
+        assert progress["files_written"] == 3
+        assert any("UPDATE kb_semantic_index_metadata" in query for query, _ in conn.executemany_calls)
+
+    @pytest.mark.asyncio
+    async def test_write_failure_is_counted_not_fatal(self, indexer, kb):
+        conn = use_db(indexer)
+
+        async def failing_copy(*args, **kwargs):
+            raise RuntimeError("copy failed")
+        conn.copy_records_to_table = failing_copy
+
+        await indexer._run_pgvector_index(kb, "root")
+
+        assert indexer.indexing_progress["status"] == "completed"
+        assert indexer.indexing_progress["files_failed"] == 5
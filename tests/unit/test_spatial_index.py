@@ -0,0 +1,137 @@
+"""
+Unit tests for the waypoint spatial index.
+
+Results must match the scalar haversine lookup exactly (same waypoints, same
+order) while skipping malformed and non-GPS waypoints.
+"""
+import random
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.services.locations.distance_utils import calculate_distance
+from app.services.locations.spatial_index import (
+    WaypointSpatialIndex,
+    get_spatial_index,
+    invalidate_spatial_index,
+)
+from app.services.locations.location_finder import find_nearby_locations, find_nearest_locations
+
+
+def make_waypoints(count: int, seed: int = 7, center=(37.906, -122.547), spread=0.05):
+    rng = random.Random(seed)
+    return [
+        {
+            "id": f"wp_{i}",
+            "location": {
+                "lat": center[0] + rng.uniform(-spread, spread),
+                "lng": center[1] + rng.uniform(-spread, spread),
+            },
+        }
+        for i in range(count)
+    ]
+
+
+def scalar_nearby(waypoints, lat, lng, radius_m):
+    """Reference implementation (the original per-waypoint loop)."""
+    hits = []
+    for wp in waypoints:
+        loc = wp.get("location") if isinstance(wp, dict) else None
+        if isinstance(loc, dict) and isinstance(loc.get("lat"), (int, float)) and isinstance(loc.get("lng"), (int, float)):
+            distance = calculate_distance(lat, lng, loc["lat"], loc["lng"])
+            if distance <= radius_m:
+                hits.append((wp, distance))
+    hits.sort(key=lambda item: item[1])
+    return hits
+
+
+@pytest.fixture(autouse=True)
+def clear_index_cache():
+    invalidate_spatial_index()
+    yield
+    invalidate_spatial_index()
+
+
+class TestWaypointSpatialIndex:
+
+    @pytest.mark.parametrize("radius_m", [0, 50, 500, 2000, 20000])
+    def test_query_radius_matches_scalar(self, radius_m):
+        waypoints = make_waypoints(2000)
+        index = WaypointSpatialIndex(waypoints)
+
+        result = index.query_radius(37.906, -122.547, radius_m)
+        expected = scalar_nearby(waypoints, 37.906, -122.547, radius_m)
+
+        assert [wp["id"] for wp, _ in result] == [wp["id"] for wp, _ in expected]
+        for (_, d), (_, expected_d) in zip(result, expected):
+            assert d == pytest.approx(expected_d, rel=1e-9)
+
+    def test_query_radius_across_antimeridian(self):
+        waypoints = [
+            {"id": "east", "location": {"lat": 0.0, "lng": 179.999}},
+            {"id": "west", "location": {"lat": 0.0, "lng": -179.999}},
+            {"id": "far", "location": {"lat": 0.0, "lng": 170.0}},
+        ]
+        index = WaypointSpatialIndex(waypoints)
+
+        result = index.query_radius(0.0, 180.0, 1000)
+
+        assert sorted(wp["id"] for wp, _ in result) == ["east", "west"]
+
+    def test_query_nearest(self):
+        waypoints = make_waypoints(1000)
+        index = WaypointSpatialIndex(waypoints)
+
+        result = index.query_nearest(37.906, -122.547, 10)
+        expected = scalar_nearby(waypoints, 37.906, -122.547, float("inf"))[:10]
+
+        assert [wp["id"] for wp, _ in result] == [wp["id"] for wp, _ in expected]
+        assert len(index.query_nearest(37.906, -122.547, 5000)) == 1000
+        assert index.query_nearest(37.906, -122.547, 0) == []
+
+    def test_skips_malformed_and_pathway_waypoints(self):
+        waypoints = [
+            "not-a-dict",
+            {"id": "pathway", "waypoint_type": "pathway"},
+            {"id": "bad", "location": {"lat": "37.9", "lng": -122.5}},
+            {"id": "good", "location": {"lat": 37.906, "lng": -122.547}},
+        ]
+        index = WaypointSpatialIndex(waypoints)
+
+        assert len(index) == 1
+        assert [wp["id"] for wp, _ in index.query_radius(37.906, -122.547, 10)] == ["good"]
+
+
+class TestSpatialIndexCache:
+
+    def test_reuses_index_until_waypoints_change(self):
+        waypoints = make_waypoints(50)
+
+        first = get_spatial_index("exp", waypoints)
+        assert get_spatial_index("exp", waypoints) is first
+        # Equal content in a fresh list (new HTTP response) reuses the index
+        assert get_spatial_index("exp", [dict(wp) for wp in waypoints]) is first
+
+        moved = [dict(wp) for wp in waypoints]
+        moved[0] = {"id": "wp_0", "location": {"lat": 0.0, "lng": 0.0}}
+        rebuilt = get_spatial_index("exp", moved)
+        assert rebuilt is not first
+
+        invalidate_spatial_index("exp")
+        assert get_spatial_index("exp", moved) is not rebuilt
+
+    @pytest.mark.asyncio
+    async def test_location_finder_uses_index(self):
+        waypoints = make_waypoints(500)
+        reader = AsyncMock(return_value=waypoints)
+
+        with patch(
+            "app.services.locations.location_finder.waypoint_reader.get_waypoints_for_experience",
+            reader,
+        ):
+            nearby = await find_nearby_locations(37.906, -122.547, 1000, "exp")
+            nearest = await find_nearest_locations(37.906, -122.547, k=3, experience="exp")
+
+        expected = scalar_nearby(waypoints, 37.906, -122.547, 1000)
+        assert [wp["id"] for wp in nearby] == [wp["id"] for wp, _ in expected]
+        assert [wp["id"] for wp in nearest] == [wp["id"] for wp, _ in expected[:3]]
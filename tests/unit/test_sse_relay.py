@@ -0,0 +1,79 @@
+"""
+Unit tests for the web service's gateway -> browser SSE relay.
+"""
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.services.web.utils import sse_relay
+from app.services.web.utils.sse_relay import DONE_FRAME, SSERelay, save_reply_in_background
+
+
+def content_payload(text):
+    return json.dumps({"type": "content", "content": text})
+
+
+class TestSSERelay:
+
+    def test_v03_content_frames_pass_through_verbatim(self):
+        relay = SSERelay()
+        payload = content_payload('Hé said "hi"\n')
+
+        frame, finished = relay.relay(payload)
+
+        assert frame == f"data: {payload}\n\n"
+        assert not finished
+        assert relay.content == 'Hé said "hi"\n'
+
+    def test_reply_is_assembled_in_order(self):
+        relay = SSERelay()
+        for text in ("Once ", "upon ", "a time"):
+            relay.relay(content_payload(text))
+
+        assert relay.relay('{"type": "done"}') == (DONE_FRAME, True)
+        assert relay.done
+        assert relay.content == "Once upon a time"
+
+    def test_openai_chunks_are_converted(self):
+        relay = SSERelay()
+        chunk = {"object": "chat.completion.chunk", "choices": [{"delta": {"content": "Hi"}}]}
+        last = {"object": "chat.completion.chunk", "choices": [{"delta": {}, "finish_reason": "stop"}]}
+
+        frame, _ = relay.relay(json.dumps(chunk))
+        done_frame, finished = relay.relay(json.dumps(last))
+
+        assert json.loads(frame[len("data: "):]) == {"type": "content", "content": "Hi"}
+        assert (done_frame, finished) == (DONE_FRAME, True)
+        assert relay.content == "Hi"
+
+    def test_errors_and_unknown_frames(self):
+        relay = SSERelay()
+
+        frame, finished = relay.relay('{"error": {"message": "rate limited"}}')
+        assert json.loads(frame[len("data: "):]) == {"type": "error", "error": "rate limited"}
+        assert not finished
+
+        assert relay.relay('{"type": "metadata", "model": "x"}') == (None, False)
+        assert relay.relay("not json") == (None, False)
+        assert relay.relay("[DONE]") == (DONE_FRAME, True)
+
+    @pytest.mark.asyncio
+    async def test_reply_is_saved_in_background(self):
+        relay = SSERelay()
+        relay.relay(content_payload("Hello"))
+        client = AsyncMock()
+
+        with patch.object(sse_relay, "chat_service_client", client):
+            task = save_reply_in_background(relay, "conv-1", "user-1", "jwt")
+            await task
+
+        client.add_message.assert_awaited_once_with("conv-1", "assistant", "Hello", jwt_token="jwt")
+        client.update_conversation.assert_awaited_once_with("user-1", "conv-1", preview="Hello", jwt_token="jwt")
+        assert not sse_relay._pending_saves
+
+    def test_nothing_to_save(self):
+        assert save_reply_in_background(SSERelay(), "conv-1", "user-1", "jwt") is None
+        relay = SSERelay()
+        relay.relay(content_payload("Hello"))
+        assert save_reply_in_background(relay, None, "user-1", "jwt") is None
@@ -6,8 +6,10 @@ for both shared and isolated state models.
 """
 
 import pytest
+import asyncio
 import json
 import tempfile
+import time
 import shutil
 from pathlib import Path
 from datetime import datetime
@@ -18,6 +20,10 @@ from app.services.kb.unified_state_manager import (
     StateNotFoundError,
     StateLockError
 )
+from app.services.kb.resident_state_store import ResidentStateStore
+from app.services.kb.state_lock_manager import StateLockManager, LockTimeoutError
+from app.services.kb.state_journal import StateJournal
+from app.services.kb.template_loader import TemplateLoader
 
 
 @pytest.fixture
@@ -549,6 +555,85 @@ async def test_update_without_locking(temp_kb, shared_experience):
     assert updated["world_flags"]["direct_update"] is True
 
 
+@pytest.mark.asyncio
+async def test_concurrent_locked_updates_serialize(temp_kb, shared_experience):
+    """Test concurrent locked updates all apply and each bumps the version."""
+    manager = UnifiedStateManager(temp_kb)
+
+    await asyncio.gather(*[
+        manager.update_world_state(
+            shared_experience, {"world_flags": {f"flag_{i}": True}}, use_locking=True
+        )
+        for i in range(10)
+    ])
+
+    world = await manager.get_world_state(shared_experience)
+    assert world["metadata"]["_version"] == 11
+    assert all(world["world_flags"][f"flag_{i}"] for i in range(10))
+    assert manager.get_lock_stats()["acquired"] == 10
+
+
+@pytest.mark.asyncio
+async def test_lock_wait_does_not_block_event_loop(temp_kb, shared_experience):
+    """Test a held lock times out without freezing other coroutines."""
+    lock_manager = StateLockManager()
+    world_path = temp_kb / "experiences" / shared_experience / "state" / "world.json"
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        for _ in range(10):
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    async def contender():
+        with pytest.raises(LockTimeoutError):
+            async with lock_manager.acquire(world_path, timeout_ms=200):
+                pass
+
+    async with lock_manager.acquire(world_path, timeout_ms=1000):
+        await asyncio.gather(ticker(), contender())
+
+    assert ticks == 10
+    stats = lock_manager.get_stats()
+    assert stats["timeouts"] == 1
+    assert stats["contended"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_lock_wait_releases_file_lock(temp_kb, shared_experience):
+    """Test a file lock taken after its waiter was cancelled is released."""
+    world_path = temp_kb / "experiences" / shared_experience / "state" / "world.json"
+    holder, waiter = StateLockManager(), StateLockManager()
+
+    async def wait_for_lock():
+        async with waiter.acquire(world_path, timeout_ms=2000):
+            pass
+
+    async with holder.acquire(world_path, timeout_ms=1000):
+        task = asyncio.create_task(wait_for_lock())
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    # The waiter's thread takes the flock after the holder lets go, then drops it
+    await asyncio.sleep(0.2)
+    async with StateLockManager().acquire(world_path, timeout_ms=100):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_locked_update_timeout_raises_state_lock_error(temp_kb, shared_experience):
+    """Test lock timeouts surface as StateLockError."""
+    manager = UnifiedStateManager(temp_kb)
+    world_path = temp_kb / "experiences" / shared_experience / "state" / "world.json"
+
+    async with manager.lock_manager.acquire(world_path, timeout_ms=1000):
+        with pytest.raises(StateLockError):
+            await manager._locked_update(world_path, {"world_flags": {"x": 1}}, 50)
+
+
 # ===== MERGE TESTS =====
 
 @pytest.mark.asyncio
@@ -575,5 +660,370 @@ async def test_deep_merge_updates(temp_kb, shared_experience):
     assert "npc_2" in updated["entities"]
 
 
+# ===== RESIDENT STATE TESTS =====
+
+@pytest.mark.asyncio
+async def test_resident_update_defers_disk_write(temp_kb, shared_experience):
+    """Test resident mode applies updates in memory and flushes later."""
+    store = ResidentStateStore(flush_interval_s=60, max_pending_writes=1000)
+    manager = UnifiedStateManager(temp_kb, state_store=store)
+
+    updated = await manager.update_world_state(
+        shared_experience, {"world_flags": {"resident": True}}
+    )
+    assert updated["metadata"]["_version"] == 2
+
+    # Not on disk yet
+    world_path = temp_kb / "experiences" / shared_experience / "state" / "world.json"
+    assert "resident" not in json.loads(world_path.read_text())["world_flags"]
+
+    # But visible to readers
+    world = await manager.get_world_state(shared_experience)
+    assert world["world_flags"]["resident"] is True
+
+    await manager.close()
+    on_disk = json.loads(world_path.read_text())
+    assert on_disk["world_flags"]["resident"] is True
+    assert on_disk["metadata"]["_version"] == 2
+
+
+@pytest.mark.asyncio
+async def test_resident_reads_return_copies(temp_kb, shared_experience):
+    """Test callers cannot mutate the resident document."""
+    manager = UnifiedStateManager(temp_kb, state_store=ResidentStateStore())
+
+    world = await manager.get_world_state(shared_experience)
+    world["world_flags"]["test_flag"] = False
+
+    world_again = await manager.get_world_state(shared_experience)
+    assert world_again["world_flags"]["test_flag"] is True
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_resident_bootstrap_visible_before_flush(temp_kb, shared_experience):
+    """Test a bootstrapped player exists before the view is flushed."""
+    store = ResidentStateStore(flush_interval_s=60)
+    manager = UnifiedStateManager(temp_kb, state_store=store)
+
+    await manager.ensure_player_initialized(shared_experience, "user123")
+    view_path = temp_kb / "players" / "user123" / shared_experience / "view.json"
+    assert not view_path.exists()
+
+    view = await manager.get_player_view(shared_experience, "user123")
+    assert view["player"]["inventory"] == []
+
+    await manager.close()
+    assert view_path.exists()
+
+
+@pytest.mark.asyncio
+async def test_resident_flush_batches_dirty_documents(temp_kb, shared_experience):
+    """Test many updates to one document coalesce into a single write."""
+    store = ResidentStateStore(flush_interval_s=60, max_pending_writes=1000)
+    manager = UnifiedStateManager(temp_kb, state_store=store)
+
+    for i in range(10):
+        await manager.update_world_state(shared_experience, {"world_flags": {"count": i}})
+
+    assert store.get_stats()["pending_writes"] == 10
+    assert await store.flush() == 1
+
+    stats = manager.get_state_store_stats()
+    assert stats["enabled"] is True
+    assert stats["dirty_documents"] == 0
+    assert stats["documents_flushed"] == 1
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_resident_close_waits_for_in_flight_flush(temp_kb, shared_experience):
+    """Test close() lets a running flush finish before the final flush."""
+    store = ResidentStateStore(flush_interval_s=60, max_pending_writes=1000)
+    manager = UnifiedStateManager(temp_kb, state_store=store)
+    world_path = temp_kb / "experiences" / shared_experience / "state" / "world.json"
+
+    write_batch = store._write_batch
+    calls = []
+
+    def slow_first_write(batch):
+        calls.append(batch)
+        if len(calls) == 1:
+            time.sleep(0.2)
+        return write_batch(batch)
+
+    store._write_batch = slow_first_write
+
+    await manager.update_world_state(shared_experience, {"world_flags": {"count": 1}})
+    store._flush_requested.set()
+    await asyncio.sleep(0.05)  # Background flush is now writing count=1
+    await manager.update_world_state(shared_experience, {"world_flags": {"count": 2}})
+
+    await manager.close()
+    await asyncio.sleep(0.3)  # Nothing may land on disk after close()
+
+    assert len(calls) == 2
+    assert json.loads(world_path.read_text())["world_flags"]["count"] == 2
+
+
+@pytest.mark.asyncio
+async def test_resident_discard_reloads_from_disk(temp_kb, shared_experience):
+    """Test discard_resident_state drops pending changes and rereads disk."""
+    manager = UnifiedStateManager(temp_kb, state_store=ResidentStateStore(flush_interval_s=60))
+
+    await manager.update_world_state(shared_experience, {"world_flags": {"stale": True}})
+    assert manager.discard_resident_state(shared_experience) == 1
+
+    world = await manager.get_world_state(shared_experience)
+    assert "stale" not in world["world_flags"]
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_resident_store_evicts_clean_documents_lru(temp_kb):
+    """Test only clean documents are evicted once max_documents is reached."""
+    store = ResidentStateStore(flush_interval_s=60, max_pending_writes=1000, max_documents=2)
+    paths = [temp_kb / f"doc{i}.json" for i in range(4)]
+    for i, path in enumerate(paths[:3]):
+        path.write_text(json.dumps({"n": i}))
+
+    store.read(paths[0])
+    store.read(paths[1])
+    store.read(paths[0])  # doc1 is now least recently used
+    store.read(paths[2])
+    assert list(store._documents) == [paths[0], paths[2]]
+
+    store.write(paths[3], {"n": 3})
+    store.write(paths[2], {"n": 22})
+    assert list(store._documents) == [paths[3], paths[2]]  # Dirty documents stay
+    assert store.get_stats()["evictions"] == 2
+
+    await store.close()
+    assert json.loads(paths[3].read_text()) == {"n": 3}
+    assert json.loads(paths[2].read_text()) == {"n": 22}
+
+
+@pytest.mark.asyncio
+async def test_resident_flush_serializes_a_snapshot(temp_kb):
+    """Test flush writes the document as it was when the flush started."""
+    store = ResidentStateStore(flush_interval_s=60, max_pending_writes=1000)
+    path = temp_kb / "doc.json"
+    document = {"items": [1]}
+    store.write(path, document)
+
+    write_batch = store._write_batch
+
+    def mutate_then_write(batch):
+        document["items"].append(2)  # A later in-place change on the loop side
+        return write_batch(batch)
+
+    store._write_batch = mutate_then_write
+    assert await store.flush() == 1
+    assert json.loads(path.read_text()) == {"items": [1]}
+    await store.close()
+
+
+# ===== DELTA JOURNAL TESTS =====
+
+@pytest.mark.asyncio
+async def test_journal_update_appends_delta(temp_kb, shared_experience):
+    """Test journaled updates append deltas instead of rewriting world.json."""
+    manager = UnifiedStateManager(temp_kb, journal=StateJournal(compact_every=100))
+    world_path = temp_kb / "experiences" / shared_experience / "state" / "world.json"
+    snapshot_before = world_path.read_text()
+
+    await manager.update_world_state(shared_experience, {"world_flags": {"a": 1}})
+    await manager.update_world_state(
+        shared_experience, {"inventory": {"$append": {"instance_id": "bottle_1"}}}
+    )
+
+    # Snapshot untouched, journal holds two entries
+    assert world_path.read_text() == snapshot_before
+    journal_lines = manager.journal.journal_path(world_path).read_text().splitlines()
+    assert [json.loads(line)["v"] for line in journal_lines] == [2, 3]
+
+    # Reads replay snapshot + tail
+    world = await manager.get_world_state(shared_experience)
+    assert world["world_flags"]["a"] == 1
+    assert world["inventory"] == [{"instance_id": "bottle_1"}]
+    assert world["metadata"]["_version"] == 3
+
+
+@pytest.mark.asyncio
+async def test_journal_compaction_writes_snapshot(temp_kb, shared_experience):
+    """Test compaction folds the journal into world.json and keeps a tail."""
+    manager = UnifiedStateManager(
+        temp_kb, journal=StateJournal(compact_every=3, retain_entries=1)
+    )
+    world_path = temp_kb / "experiences" / shared_experience / "state" / "world.json"
+
+    for i in range(3):
+        await manager.update_world_state(shared_experience, {"world_flags": {"count": i}})
+
+    snapshot = json.loads(world_path.read_text())
+    assert snapshot["metadata"]["_version"] == 4
+    assert snapshot["world_flags"]["count"] == 2
+
+    journal_lines = manager.journal.journal_path(world_path).read_text().splitlines()
+    assert len(journal_lines) == 1
+
+    world = await manager.get_world_state(shared_experience)
+    assert world["metadata"]["_version"] == 4
+
+
+@pytest.mark.asyncio
+async def test_world_deltas_since_version(temp_kb, shared_experience):
+    """Test reconnecting clients get deltas since their version, or None."""
+    manager = UnifiedStateManager(
+        temp_kb, journal=StateJournal(compact_every=100, retain_entries=2)
+    )
+
+    for i in range(3):
+        await manager.update_world_state(shared_experience, {"world_flags": {"count": i}})
+
+    result = await manager.get_world_deltas_since(shared_experience, 2, "user123")
+    assert result["base_version"] == 2
+    assert result["snapshot_version"] == 4
+    assert [d["snapshot_version"] for d in result["deltas"]] == [3, 4]
+
+    up_to_date = await manager.get_world_deltas_since(shared_experience, 4, "user123")
+    assert up_to_date["deltas"] == []
+
+    # Client ahead of server (e.g. after reset) must resync
+    assert await manager.get_world_deltas_since(shared_experience, 99, "user123") is None
+
+
+@pytest.mark.asyncio
+async def test_world_deltas_since_version_after_compaction_gap(temp_kb, shared_experience):
+    """Test a client behind a compaction that dropped its deltas must resync."""
+    manager = UnifiedStateManager(
+        temp_kb, journal=StateJournal(compact_every=3, retain_entries=0)
+    )
+
+    for i in range(3):
+        await manager.update_world_state(shared_experience, {"world_flags": {"count": i}})
+
+    assert await manager.get_world_deltas_since(shared_experience, 1, "user123") is None
+    up_to_date = await manager.get_world_deltas_since(shared_experience, 4, "user123")
+    assert up_to_date["deltas"] == []
+
+
+@pytest.mark.asyncio
+async def test_journal_updates_reuse_replayed_state(temp_kb, shared_experience):
+    """Test non-resident journaled updates don't replay the journal each time."""
+    manager = UnifiedStateManager(temp_kb, journal=StateJournal(compact_every=100))
+
+    for i in range(5):
+        await manager.update_world_state(shared_experience, {"world_flags": {"count": i}})
+    world = await manager.get_world_state(shared_experience)
+
+    assert world["world_flags"]["count"] == 4
+    assert world["metadata"]["_version"] == 6
+    assert manager.journal.get_stats()["replayed_entries"] == 0
+
+    # A write by another process changes the signature and forces a replay
+    other = UnifiedStateManager(temp_kb, journal=StateJournal(compact_every=100))
+    await other.update_world_state(shared_experience, {"world_flags": {"count": 99}})
+    world = await manager.get_world_state(shared_experience)
+    assert world["world_flags"]["count"] == 99
+    assert manager.journal.get_stats()["replayed_entries"] == 6
+
+
+@pytest.mark.asyncio
+async def test_restore_from_template_discards_journal(temp_kb, shared_experience):
+    """Test a template restore doesn't replay stale deltas."""
+    manager = UnifiedStateManager(temp_kb, journal=StateJournal())
+    state_path = temp_kb / "experiences" / shared_experience / "state"
+    with open(state_path / "world.template.json", 'w') as f:
+        json.dump({"world_flags": {"pristine": True}, "metadata": {}}, f)
+
+    await manager.update_world_state(shared_experience, {"world_flags": {"dirty": True}})
+    await manager.update_world_state(shared_experience, {"world_flags": {"dirty": 2}})
+    await manager.restore_from_template(shared_experience)
+
+    world = await manager.get_world_state(shared_experience)
+    assert world["world_flags"] == {"pristine": True}
+    assert world["metadata"]["_version"] == 1
+
+
+# ===== AOI CACHE TESTS =====
+
+@pytest.fixture
+def aoi_experience(temp_kb, shared_experience):
+    """Add a zone with items and an item template to the shared experience."""
+    exp_path = temp_kb / "experiences" / shared_experience
+    world_path = exp_path / "state" / "world.json"
+    world = json.loads(world_path.read_text())
+    world["locations"] = {
+        "store": {
+            "description": "A tiny store",
+            "areas": {
+                "main": {
+                    "name": "Main Room",
+                    "spots": {
+                        "shelf": {"items": [{"instance_id": "bottle_1", "template_id": "bottle"}]}
+                    }
+                }
+            }
+        }
+    }
+    world_path.write_text(json.dumps(world))
+
+    template_dir = exp_path / "templates" / "items"
+    template_dir.mkdir(parents=True)
+    (template_dir / "bottle.md").write_text(
+        "# Bottle\n\n> **Name**: Dream Bottle\n\n## Description\n\nA glowing bottle.\n"
+    )
+    return shared_experience
+
+
+@pytest.mark.asyncio
+async def test_build_aoi_caches_zone_by_world_version(temp_kb, aoi_experience):
+    """Test repeat AOI builds reuse the cached areas until the world changes."""
+    manager = UnifiedStateManager(temp_kb)
+    manager.template_loader = TemplateLoader(temp_kb)  # Singleton may point at another KB
+    await manager.ensure_player_initialized(aoi_experience, "user123")
+    waypoints = [{"id": "store", "name": "Store", "location": {"lat": 1, "lng": 2}}]
+
+    first = await manager.build_aoi(aoi_experience, "user123", waypoints)
+    second = await manager.build_aoi(aoi_experience, "user123", waypoints)
+
+    assert first["areas"] == second["areas"]
+    item = second["areas"]["main"]["spots"]["shelf"]["items"][0]
+    assert item["name"] == "Dream Bottle"
+    assert item["instance_id"] == "bottle_1"
+    assert second["zone"]["description"] == "A tiny store"
+    assert manager.get_aoi_cache_stats()["hits"] == 1
+
+    # World change bumps _version and invalidates the zone entry
+    await manager.update_world_state(aoi_experience, {
+        "locations": {"store": {"areas": {"main": {"spots": {"shelf": {
+            "items": {"$remove": {"instance_id": "bottle_1"}}
+        }}}}}}
+    })
+    third = await manager.build_aoi(aoi_experience, "user123", waypoints)
+
+    assert third["snapshot_version"] == first["snapshot_version"] + 1
+    assert third["areas"]["main"]["spots"]["shelf"]["items"] == []
+    assert manager.get_aoi_cache_stats()["misses"] == 2
+
+
+@pytest.mark.asyncio
+async def test_build_aoi_rebuilds_player_block(temp_kb, aoi_experience):
+    """Test the player block reflects the latest view on cache hits."""
+    manager = UnifiedStateManager(temp_kb)
+    await manager.ensure_player_initialized(aoi_experience, "user123")
+    waypoints = [{"id": "store"}]
+
+    await manager.build_aoi(aoi_experience, "user123", waypoints)
+    await manager.update_player_view(
+        aoi_experience, "user123", {"player": {"inventory": [{"instance_id": "gem"}]}}
+    )
+    aoi = await manager.build_aoi(aoi_experience, "user123", waypoints)
+
+    assert aoi["player"]["inventory"] == [{"instance_id": "gem"}]
+    assert manager.get_aoi_cache_stats()["hits"] == 1
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
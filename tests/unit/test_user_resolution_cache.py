@@ -0,0 +1,107 @@
+"""
+Unit tests for UserResolutionCache and ChatConversationStore user resolution.
+"""
+import uuid
+from unittest.mock import patch
+
+from app.services.chat.conversation_store import ChatConversationStore
+from app.services.chat.user_resolution_cache import UserResolutionCache
+
+
+class FakeUser:
+
+    def __init__(self, email=None):
+        self.id = uuid.uuid4()
+        self.email = email
+
+
+class TestUserResolutionCache:
+
+    def test_get_after_set(self):
+        cache = UserResolutionCache(use_redis=False)
+        user_uuid = uuid.uuid4()
+
+        assert cache.get("id:abc") is None
+        cache.set("id:abc", user_uuid)
+
+        assert cache.get("id:abc") == user_uuid
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    def test_entries_expire(self):
+        cache = UserResolutionCache(ttl_s=0, use_redis=False)
+        cache.set("id:abc", uuid.uuid4())
+
+        assert cache.get("id:abc") is None
+
+    def test_lru_eviction(self):
+        cache = UserResolutionCache(max_entries=2, use_redis=False)
+        for key in ("id:a", "id:b"):
+            cache.set(key, uuid.uuid4())
+        cache.get("id:a")  # Refresh a so b is the least recently used
+        cache.set("id:c", uuid.uuid4())
+
+        assert cache.get("id:b") is None
+        assert cache.get("id:a") is not None
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_invalidate_user_drops_every_identity(self):
+        cache = UserResolutionCache(use_redis=False)
+        user_uuid, other_uuid = uuid.uuid4(), uuid.uuid4()
+        cache.set("email:a@example.com", user_uuid)
+        cache.set(f"id:{user_uuid}", user_uuid)
+        cache.set("email:b@example.com", other_uuid)
+
+        assert cache.invalidate_user(user_uuid) == 2
+        assert cache.get("email:a@example.com") is None
+        assert cache.get("email:b@example.com") == other_uuid
+
+
+class TestStoreUserResolution:
+
+    def make_store(self):
+        with patch("app.services.chat.conversation_store.settings") as settings:
+            settings.CHAT_USER_CACHE_REDIS = False
+            settings.CHAT_USER_CACHE_MAX_ENTRIES = 100
+            settings.CHAT_USER_CACHE_TTL_SECONDS = 300
+            settings.CHAT_HISTORY_TOKEN_BUDGET = 1000
+            settings.CHAT_HISTORY_MAX_LOAD = 10
+            settings.CHAT_HISTORY_CACHE_MAX_CONVERSATIONS = 10
+            settings.CHAT_HISTORY_CACHE_TTL_SECONDS = 60
+            return ChatConversationStore()
+
+    def test_repeat_resolution_skips_database(self):
+        store = self.make_store()
+        user = FakeUser("a@example.com")
+
+        with patch.object(store, "_get_or_create_user", return_value=user) as lookup:
+            first = store._resolve_user_id("a@example.com")
+            second = store._resolve_user_id("a@example.com")
+
+        assert first == second == user.id
+        lookup.assert_called_once()
+
+    def test_email_and_id_are_cached_separately(self):
+        store = self.make_store()
+        by_email, by_id = FakeUser("a@example.com"), FakeUser()
+
+        with patch.object(store, "_get_or_create_user", side_effect=[by_email, by_id]) as lookup:
+            assert store._resolve_user_id("sub-1", "a@example.com") == by_email.id
+            assert store._resolve_user_id("sub-1") == by_id.id
+            assert store._resolve_user_id("sub-2", "a@example.com") == by_email.id
+
+        assert lookup.call_count == 2
+
+    def test_invalidate_user_forces_lookup(self):
+        store = self.make_store()
+        user = FakeUser()
+
+        with patch.object(store, "_get_or_create_user", return_value=user) as lookup:
+            store._resolve_user_id("sub-1")
+            store.invalidate_user(user.id, ("sub-1",))
+            store._resolve_user_id("sub-1")
+
+        assert lookup.call_count == 2
+        assert store.get_cache_stats()["user_resolution"]["invalidations"] == 1
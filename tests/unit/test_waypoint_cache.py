@@ -0,0 +1,161 @@
+"""
+Unit tests for waypoint caching.
+
+Covers the KB side (ETag / If-None-Match on /waypoints/{experience}) and the
+reader side (TTL cache, conditional revalidation, single-flight coalescing,
+invalidation, stale fallback).
+"""
+import asyncio
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.services.kb import waypoints_api
+from app.services.kb.kb_mcp_server import KBMCPServer
+from app.services.locations.waypoint_reader import WaypointReader
+
+WAYPOINTS = [{"id": "wp_1", "location": {"lat": 37.9, "lng": -122.5}}]
+
+
+def make_reader(handler, ttl_s: float = 30.0) -> WaypointReader:
+    reader = WaypointReader(kb_service_url="http://kb", cache_ttl_s=ttl_s)
+    reader.http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return reader
+
+
+class TestWaypointReaderCache:
+
+    @pytest.mark.asyncio
+    async def test_serves_cached_list_within_ttl(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(200, json={"success": True, "waypoints": WAYPOINTS})
+
+        reader = make_reader(handler)
+        first = await reader.get_waypoints_for_experience("exp")
+        second = await reader.get_waypoints_for_experience("exp")
+
+        assert first == WAYPOINTS
+        assert second is first
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_request(self):
+        calls = []
+
+        async def handler(request):
+            calls.append(request)
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, json={"success": True, "waypoints": WAYPOINTS})
+
+        reader = make_reader(handler)
+        results = await asyncio.gather(
+            *(reader.get_waypoints_for_experience("exp") for _ in range(1000))
+        )
+
+        assert len(calls) == 1
+        assert all(result == WAYPOINTS for result in results)
+        assert reader.get_stats()["coalesced"] == 999
+
+    @pytest.mark.asyncio
+    async def test_revalidates_with_etag_after_ttl(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if request.headers.get("if-none-match") == '"v1"':
+                return httpx.Response(304, headers={"ETag": '"v1"'})
+            return httpx.Response(
+                200, json={"success": True, "waypoints": WAYPOINTS}, headers={"ETag": '"v1"'}
+            )
+
+        reader = make_reader(handler, ttl_s=0)
+        first = await reader.get_waypoints_for_experience("exp")
+        second = await reader.get_waypoints_for_experience("exp")
+
+        assert second is first
+        assert len(calls) == 2
+        assert calls[1].headers["if-none-match"] == '"v1"'
+        assert reader.get_stats()["not_modified"] == 1
+
+    @pytest.mark.asyncio
+    async def test_invalidate_forces_refetch(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(200, json={"success": True, "waypoints": WAYPOINTS})
+
+        reader = make_reader(handler)
+        await reader.get_waypoints_for_experience("exp")
+        await reader._handle_invalidation({"experience": "exp"})
+        await reader.get_waypoints_for_experience("exp")
+
+        assert len(calls) == 2
+        assert "if-none-match" not in calls[1].headers
+
+    @pytest.mark.asyncio
+    async def test_serves_stale_list_when_kb_unavailable(self):
+        responses = [
+            httpx.Response(200, json={"success": True, "waypoints": WAYPOINTS}),
+            httpx.Response(503),
+        ]
+
+        reader = make_reader(lambda request: responses.pop(0), ttl_s=0)
+        first = await reader.get_waypoints_for_experience("exp")
+        second = await reader.get_waypoints_for_experience("exp")
+
+        assert second is first
+        assert reader.get_stats()["stale_served"] == 1
+
+
+class TestWaypointsApiETag:
+
+    @pytest.fixture
+    def client(self, tmp_path: Path):
+        waypoint_dir = tmp_path / "experiences" / "exp" / "waypoints"
+        waypoint_dir.mkdir(parents=True)
+        (waypoint_dir / "wp_1.md").write_text("# WP 1\n\n```yaml\nid: wp_1\nlocation:\n  lat: 37.9\n  lng: -122.5\n```\n")
+
+        app = FastAPI()
+        app.include_router(waypoints_api.router)
+        waypoints_api._waypoint_cache.clear()
+        with patch.object(waypoints_api, "kb_server", KBMCPServer(str(tmp_path))):
+            yield TestClient(app), waypoint_dir
+        waypoints_api._waypoint_cache.clear()
+
+    def test_conditional_request_returns_304(self, client):
+        test_client, _ = client
+
+        response = test_client.get("/waypoints/exp")
+        assert response.status_code == 200
+        assert response.json()["waypoints"][0]["id"] == "wp_1"
+        etag = response.headers["etag"]
+
+        cached = test_client.get("/waypoints/exp", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+
+    def test_etag_changes_when_waypoint_file_changes(self, client):
+        test_client, waypoint_dir = client
+        etag = test_client.get("/waypoints/exp").headers["etag"]
+
+        path = waypoint_dir / "wp_2.md"
+        path.write_text("```yaml\nid: wp_2\n```\n")
+        os.utime(path, (1, 1))
+
+        response = test_client.get("/waypoints/exp", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+        assert response.json()["count"] == 2
+
+    def test_waypoint_experience_for_path(self):
+        assert waypoints_api.waypoint_experience_for_path("experiences/exp/waypoints/wp.md") == "exp"
+        assert waypoints_api.waypoint_experience_for_path("/experiences/exp/waypoints/wp.md") == "exp"
+        assert waypoints_api.waypoint_experience_for_path("experiences/exp/templates/item.md") is None